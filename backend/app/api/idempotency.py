@@ -0,0 +1,53 @@
+from collections.abc import Callable
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.idempotency import (
+    IDEMPOTENT_REPLAYED_HEADER,
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    StoredResponse,
+    claim_idempotency_key,
+    store_idempotent_response,
+)
+
+
+def run_idempotent_write(
+    db: Session,
+    *,
+    key: str,
+    scope: str,
+    user_id: str,
+    request_hash: str,
+    status_code: int,
+    run_transaction: Callable[[Session, Callable[[], dict]], dict],
+    operation: Callable[[], BaseModel],
+) -> Response:
+    """Runs ``operation`` at most once per (user, scope, key) and answers repeats with the stored response.
+
+    Failed operations roll the claim back with the rest of the transaction, so the client may retry them.
+    """
+
+    def _operation() -> dict:
+        stored = claim_idempotency_key(db, scope=scope, user_id=user_id, key=key, request_hash=request_hash)
+        if stored is not None:
+            return {"response": stored, "replayed": True}
+        response = StoredResponse(status_code=status_code, body=operation().model_dump_json().encode("utf-8"))
+        store_idempotent_response(db, scope=scope, user_id=user_id, key=key, response=response)
+        return {"response": response, "replayed": False}
+
+    try:
+        result = run_transaction(db, _operation)
+    except IdempotencyKeyReusedError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except IdempotencyInProgressError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc), headers={"Retry-After": "1"}) from exc
+    stored: StoredResponse = result["response"]
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={IDEMPOTENT_REPLAYED_HEADER: "true" if result["replayed"] else "false"},
+    )
@@ -0,0 +1,99 @@
+from collections.abc import Callable, Mapping
+from typing import Literal
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.api.deps import get_current_user
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+from app.core.observability import _route_template
+from app.core.rate_limit import RateLimit, get_rate_limiter, rate_limit_headers, record_rate_limit_decision
+from app.core.security import AuthUser
+from app.services.signup_protection_service import get_client_ip
+
+RATE_LIMITED_REQUESTS_TOTAL = REGISTRY.counter(
+    "kidario_rate_limited_requests_total",
+    "Requests rejected with 429 by route rate limits.",
+    ("scope", "route"),
+)
+
+
+def _enforce(
+    request: Request,
+    *,
+    scope: str,
+    identity: str,
+    limit_setting: str,
+    window_seconds: int,
+    costs: Mapping[str, int],
+    default_cost: int,
+) -> None:
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return
+    route_name = getattr(request.scope.get("route"), "name", "")
+    cost = costs.get(route_name, default_cost)
+    limit = int(getattr(settings, limit_setting))
+    if cost <= 0 or limit <= 0:
+        return
+
+    decision = get_rate_limiter().hit(
+        scope,
+        [RateLimit(f"route:{scope}:{identity}", limit=limit, window_seconds=window_seconds, cost=cost)],
+    )
+    record_rate_limit_decision(request, decision)
+    if not decision.allowed:
+        RATE_LIMITED_REQUESTS_TOTAL.inc(scope=scope, route=_route_template(request))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas requisições. Tente novamente em instantes.",
+            headers=rate_limit_headers(decision),
+        )
+
+
+def rate_limit(
+    scope: str,
+    *,
+    per: Literal["user", "ip"],
+    limit_setting: str,
+    window_seconds: int,
+    costs: Mapping[str, int] | None = None,
+    default_cost: int = 1,
+) -> Callable[..., None]:
+    """Router dependency enforcing a shared budget of ``limit_setting`` units per ``window_seconds``.
+
+    Each request spends ``costs[endpoint_name]`` units (``default_cost`` when absent; 0 exempts the route),
+    counted per authenticated user or per client IP.
+    """
+
+    if limit_setting not in Settings.model_fields:
+        raise ValueError(f"Unknown rate limit setting: {limit_setting}")
+    resolved_costs = dict(costs or {})
+
+    if per == "user":
+
+        def _per_user(request: Request, user: AuthUser = Depends(get_current_user)) -> None:
+            _enforce(
+                request,
+                scope=scope,
+                identity=user.user_id,
+                limit_setting=limit_setting,
+                window_seconds=window_seconds,
+                costs=resolved_costs,
+                default_cost=default_cost,
+            )
+
+        return _per_user
+
+    def _per_ip(request: Request) -> None:
+        _enforce(
+            request,
+            scope=scope,
+            identity=get_client_ip(request, get_settings()),
+            limit_setting=limit_setting,
+            window_seconds=window_seconds,
+            costs=resolved_costs,
+            default_cost=default_cost,
+        )
+
+    return _per_ip
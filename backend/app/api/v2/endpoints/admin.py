@@ -1,7 +1,10 @@
 from collections.abc import Callable
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -15,6 +18,7 @@ from app.schemas.v2_admin import (
     TeacherActivationPatch,
     TeacherActivationResponse,
 )
+from app.services.admin_export_service import AdminExportValidationError, build_admin_export
 from app.services.admin_service import get_admin_dashboard
 from app.services.profile_v2_service import ProfileNotFoundError, set_teacher_activation_v2
 
@@ -61,6 +65,33 @@ def get_admin_dashboard_endpoint(
     return AdminDashboardResponse(**data)
 
 
+@router.get("/exports/{dataset}", response_class=StreamingResponse)
+def export_admin_dataset(
+    dataset: Literal["bookings", "payment_orders", "payment_splits", "teachers", "parents", "reviews"],
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    date_from: datetime | None = Query(default=None, alias="from"),
+    date_to: datetime | None = Query(default=None, alias="to"),
+    export_status: str | None = Query(default=None, alias="status", max_length=40),
+    _: AuthUser = Security(get_current_admin),
+) -> StreamingResponse:
+    # No request-scoped session: the export opens its own read-only session for as long as the body streams.
+    try:
+        export = build_admin_export(
+            dataset,
+            export_format=export_format,
+            date_from=date_from,
+            date_to=date_to,
+            status=export_status,
+        )
+    except AdminExportValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    return StreamingResponse(
+        export.chunks,
+        media_type=export.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
+    )
+
+
 @router.get("/access", response_model=AdminAccessResponse)
 def get_admin_access(
     _: AuthUser = Security(get_current_admin),
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -7,6 +8,7 @@ from app.core.config import get_settings
 from app.db.session import get_db
 from app.schemas.v2_auth import AuthSignupRequest, AuthSignupResponse
 from app.services.auth_service import AuthSignupError, TeacherSignupProfilePhoto, signup_with_profile
+from app.services.profile_photo_service import ProfilePhotoUploadError, read_profile_photo_upload
 from app.services.signup_protection_service import (
     SignupProtectionError,
     enforce_signup_protection,
@@ -73,11 +75,14 @@ async def post_auth_teacher_signup(
             detail="role must be 'teacher' for this endpoint.",
         )
 
-    file_bytes = await profile_photo.read()
-
     try:
+        file_bytes = await read_profile_photo_upload(profile_photo, settings.profile_photo_max_upload_bytes)
+    except ProfilePhotoUploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+
+    def _signup() -> dict:
         enforce_signup_protection(settings=settings, payload=signup_payload, client_ip=client_ip)
-        data = signup_with_profile(
+        return signup_with_profile(
             db,
             settings,
             signup_payload,
@@ -87,6 +92,10 @@ async def post_auth_teacher_signup(
                 file_bytes=file_bytes,
             ),
         )
+
+    try:
+        # Captcha, Supabase Auth, image processing and storage upload all block.
+        data = await run_in_threadpool(_signup)
     except SignupProtectionError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
     except AuthSignupError as exc:
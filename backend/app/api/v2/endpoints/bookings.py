@@ -3,14 +3,18 @@ from datetime import date
 from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
+import anyio.to_thread
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, Security, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_teacher_user, get_current_user
+from app.api.idempotency import run_idempotent_write
 from app.core.config import get_settings
+from app.core.fast_json import trusted_json_response
+from app.core.idempotency import IDEMPOTENCY_KEY_HEADER, request_fingerprint
 from app.core.security import AuthUser
-from app.db.session import get_db
+from app.db.session import ReadSession, get_async_db, get_db
 from app.schemas.v2_bookings import (
     Booking,
     BookingCancelRequest,
@@ -28,15 +32,16 @@ from app.services.booking_v2_service import (
     BookingNotFoundError,
     BookingPermissionError,
     BookingValidationError,
+    build_teacher_availability_slots_v2,
     cancel_booking_v2,
     complete_booking_v2,
     create_booking_v2,
     decide_booking_v2,
     get_booking_v2,
-    get_teacher_availability_slots_v2,
     get_teacher_follow_up_context_v2,
     list_parent_bookings_v2,
     list_teacher_bookings_v2,
+    load_teacher_availability_v2,
     reschedule_booking_v2,
     retry_booking_payment_v2,
     teacher_reschedule_booking_v2,
@@ -90,10 +95,22 @@ def _handle_booking_error(exc: Exception) -> None:
 @router.post("/bookings", response_model=Booking, status_code=status.HTTP_201_CREATED)
 def post_booking_endpoint(
     payload: BookingCreateRequest,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
     user: AuthUser = Security(get_current_user),
     db: Session = Depends(get_db),
-) -> Booking:
+) -> Booking | Response:
     try:
+        if idempotency_key:
+            return run_idempotent_write(
+                db,
+                key=idempotency_key,
+                scope="bookings.create",
+                user_id=user.user_id,
+                request_hash=request_fingerprint(payload),
+                status_code=status.HTTP_201_CREATED,
+                run_transaction=_run_write_transaction,
+                operation=lambda: Booking(**create_booking_v2(db, user, payload)),
+            )
         data = _run_write_transaction(db, lambda: create_booking_v2(db, user, payload))
     except Exception as exc:
         _handle_booking_error(exc)
@@ -109,7 +126,7 @@ def list_parent_bookings_endpoint(
     offset: int = Query(default=0, ge=0),
     user: AuthUser = Security(get_current_user),
     db: Session = Depends(get_db),
-) -> BookingsResponse:
+) -> Response:
     try:
         data = list_parent_bookings_v2(
             db,
@@ -122,7 +139,7 @@ def list_parent_bookings_endpoint(
         )
     except Exception as exc:
         _handle_booking_error(exc)
-    return BookingsResponse(**data)
+    return trusted_json_response(data, BookingsResponse)
 
 
 @router.get("/teachers/me/bookings", response_model=BookingsResponse)
@@ -133,7 +150,7 @@ def list_teacher_bookings_endpoint(
     offset: int = Query(default=0, ge=0),
     user: AuthUser = Security(get_current_teacher_user),
     db: Session = Depends(get_db),
-) -> BookingsResponse:
+) -> Response:
     try:
         data = list_teacher_bookings_v2(
             db,
@@ -145,7 +162,7 @@ def list_teacher_bookings_endpoint(
         )
     except Exception as exc:
         _handle_booking_error(exc)
-    return BookingsResponse(**data)
+    return trusted_json_response(data, BookingsResponse)
 
 
 @router.get("/bookings/{booking_id}", response_model=Booking)
@@ -193,10 +210,22 @@ def post_booking_decision_endpoint(
 def post_booking_payment_retry_endpoint(
     booking_id: UUID,
     payload: BookingPaymentRetryRequest,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
     user: AuthUser = Security(get_current_user),
     db: Session = Depends(get_db),
-) -> Booking:
+) -> Booking | Response:
     try:
+        if idempotency_key:
+            return run_idempotent_write(
+                db,
+                key=idempotency_key,
+                scope="bookings.payment_retry",
+                user_id=user.user_id,
+                request_hash=request_fingerprint(payload, booking_id=booking_id),
+                status_code=status.HTTP_200_OK,
+                run_transaction=_run_write_transaction,
+                operation=lambda: Booking(**retry_booking_payment_v2(db, user, booking_id, payload)),
+            )
         data = _run_write_transaction(db, lambda: retry_booking_payment_v2(db, user, booking_id, payload))
     except Exception as exc:
         _handle_booking_error(exc)
@@ -265,16 +294,17 @@ def get_teacher_follow_up_context_endpoint(
     "/teachers/{teacher_id}/availability/slots",
     response_model=TeacherAvailabilitySlotsResponse,
 )
-def get_teacher_slots_endpoint(
+async def get_teacher_slots_endpoint(
     teacher_id: UUID,
     date_from: date = Query(alias="from"),
     date_to: date = Query(alias="to"),
     duration_minutes: int = Query(default=60, ge=15, le=300),
     _: AuthUser = Security(get_current_user),
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_async_db),
 ) -> TeacherAvailabilitySlotsResponse:
     try:
-        data = get_teacher_availability_slots_v2(db, teacher_id, date_from, date_to, duration_minutes)
+        availability = await db.run_sync(load_teacher_availability_v2, teacher_id, date_from, date_to, duration_minutes)
     except Exception as exc:
         _handle_booking_error(exc)
+    data = await anyio.to_thread.run_sync(build_teacher_availability_slots_v2, availability)
     return TeacherAvailabilitySlotsResponse(**data)
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_user
 from app.core.config import get_settings
 from app.core.security import AuthUser
-from app.db.session import get_db
+from app.db.session import ReadSession, get_async_db, get_db
 from app.schemas.v2_chat import (
     ChatMessageCreateRequest,
     ChatMessageCreateResponse,
@@ -76,41 +76,41 @@ def post_chat_thread_from_booking(
 
 
 @router.get("/chat/threads", response_model=ChatThreadsResponse)
-def get_chat_threads(
+async def get_chat_threads(
     limit: int = Query(default=30, ge=1, le=200),
     booking_status: str | None = Query(default=None, alias="status"),
     user: AuthUser = Security(get_current_user),
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_async_db),
 ) -> ChatThreadsResponse:
     try:
-        data = list_threads(db, user, limit=limit, booking_status=booking_status)
+        data = await db.run_sync(list_threads, user, limit=limit, booking_status=booking_status)
     except Exception as exc:
         _handle_chat_error(exc)
     return ChatThreadsResponse(**data)
 
 
 @router.get("/chat/threads/{thread_id}", response_model=ChatThreadResponse)
-def get_chat_thread(
+async def get_chat_thread(
     thread_id: UUID,
     user: AuthUser = Security(get_current_user),
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_async_db),
 ) -> ChatThreadResponse:
     try:
-        data = get_thread(db, user, thread_id)
+        data = await db.run_sync(get_thread, user, thread_id)
     except Exception as exc:
         _handle_chat_error(exc)
     return ChatThreadResponse(**data)
 
 
 @router.get("/chat/threads/{thread_id}/messages", response_model=ChatMessagesResponse)
-def get_chat_messages(
+async def get_chat_messages(
     thread_id: UUID,
     limit: int = Query(default=60, ge=1, le=200),
     user: AuthUser = Security(get_current_user),
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_async_db),
 ) -> ChatMessagesResponse:
     try:
-        data = get_thread_messages(db, user, thread_id, limit)
+        data = await db.run_sync(get_thread_messages, user, thread_id, limit)
     except Exception as exc:
         _handle_chat_error(exc)
     return ChatMessagesResponse(**data)
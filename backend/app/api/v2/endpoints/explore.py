@@ -1,19 +1,27 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import anyio.to_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.session import get_db
+from app.core.fast_json import trusted_content
+from app.core.response_cache import EXPLORE_TEACHERS_TAG, serve_cached_json, teacher_cache_tag
+from app.db.session import ReadSession, get_async_db
 from app.schemas.v2_explore import (
     ExploreModalityFilter,
     ExploreSort,
     ExploreTeachersResponse,
     TeacherPublicProfile,
 )
-from app.services.explore_v2_service import ExploreNotFoundError, get_explore_teacher_detail, list_explore_teachers
+from app.services.explore_v2_service import (
+    ExploreNotFoundError,
+    build_explore_teacher_detail,
+    build_explore_teachers,
+    load_explore_teacher_detail,
+    load_explore_teachers,
+)
 
 router = APIRouter(prefix="/explore", tags=["v2-explore"])
 
@@ -34,7 +42,8 @@ def _raise_http_from_sql_error(exc: SQLAlchemyError) -> None:
 
 
 @router.get("/teachers", response_model=ExploreTeachersResponse)
-def get_explore_teachers_endpoint(
+async def get_explore_teachers_endpoint(
+    request: Request,
     query: str | None = Query(default=None),
     skill: str | None = Query(default=None),
     city: str | None = Query(default=None),
@@ -52,54 +61,71 @@ def get_explore_teachers_endpoint(
     radius_km: float | None = Query(default=None, gt=0),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
-) -> ExploreTeachersResponse:
-    try:
-        data = list_explore_teachers(
-            db,
-            query=query,
-            skill=skill,
-            city=city,
-            state=state,
-            modality=modality,
-            available_from=available_from,
-            available_to=available_to,
-            duration_minutes=duration_minutes,
-            min_rating=min_rating,
-            has_reviews=has_reviews,
-            max_hourly_rate_cents=max_hourly_rate_cents,
-            sort=sort,
-            near_lat=near_lat,
-            near_lng=near_lng,
-            radius_km=radius_km,
-            limit=limit,
-            offset=offset,
-        )
-    except SQLAlchemyError as exc:
-        _raise_http_from_sql_error(exc)
-    return ExploreTeachersResponse(**data)
+    db: ReadSession = Depends(get_async_db),
+) -> Response:
+    params = {
+        "query": query,
+        "skill": skill,
+        "city": city,
+        "state": state,
+        "modality": modality,
+        "available_from": available_from,
+        "available_to": available_to,
+        "duration_minutes": duration_minutes,
+        "min_rating": min_rating,
+        "has_reviews": has_reviews,
+        "max_hourly_rate_cents": max_hourly_rate_cents,
+        "sort": sort,
+        "near_lat": near_lat,
+        "near_lng": near_lng,
+        "radius_km": radius_km,
+        "limit": limit,
+        "offset": offset,
+    }
+
+    async def build() -> tuple[object, set[str]]:
+        try:
+            page = await db.run_sync(load_explore_teachers, **params)
+        except SQLAlchemyError as exc:
+            _raise_http_from_sql_error(exc)
+        # Slot generation and photo URL signing would block the event loop.
+        data = await anyio.to_thread.run_sync(build_explore_teachers, page)
+        tags = {EXPLORE_TEACHERS_TAG, *(teacher_cache_tag(item["teacher_id"]) for item in data["teachers"])}
+        return trusted_content(data, ExploreTeachersResponse), tags
+
+    return await serve_cached_json(request, namespace="explore.teachers", params=params, build=build)
 
 
 @router.get("/teachers/{teacher_id}", response_model=TeacherPublicProfile)
-def get_explore_teacher_detail_endpoint(
+async def get_explore_teacher_detail_endpoint(
+    request: Request,
     teacher_id: UUID,
     available_from: datetime | None = Query(default=None),
     available_to: datetime | None = Query(default=None),
     duration_minutes: int | None = Query(default=None, ge=15, le=300),
     modality: ExploreModalityFilter | None = Query(default=None),
-    db: Session = Depends(get_db),
-) -> TeacherPublicProfile:
-    try:
-        data = get_explore_teacher_detail(
-            db,
-            teacher_id,
-            available_from=available_from,
-            available_to=available_to,
-            duration_minutes=duration_minutes,
-            modality=modality,
-        )
-    except ExploreNotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
-    except SQLAlchemyError as exc:
-        _raise_http_from_sql_error(exc)
-    return TeacherPublicProfile(**data)
+    db: ReadSession = Depends(get_async_db),
+) -> Response:
+    params = {
+        "available_from": available_from,
+        "available_to": available_to,
+        "duration_minutes": duration_minutes,
+        "modality": modality,
+    }
+
+    async def build() -> tuple[object, set[str]]:
+        try:
+            loaded = await db.run_sync(load_explore_teacher_detail, teacher_id, **params)
+        except ExploreNotFoundError as exc:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+        except SQLAlchemyError as exc:
+            _raise_http_from_sql_error(exc)
+        data = await anyio.to_thread.run_sync(build_explore_teacher_detail, loaded)
+        return trusted_content(data, TeacherPublicProfile), {teacher_cache_tag(teacher_id)}
+
+    return await serve_cached_json(
+        request,
+        namespace="explore.teacher_detail",
+        params={"teacher_id": teacher_id, **params},
+        build=build,
+    )
@@ -1,9 +1,14 @@
 from fastapi import APIRouter
 
+from app.core.circuit_breaker import OPEN, circuit_breaker_snapshots
 
 router = APIRouter(tags=["v2-health"])
 
 
 @router.get("/health")
-def get_health() -> dict[str, str]:
-    return {"status": "ok"}
+def get_health() -> dict[str, object]:
+    # Always 200: an open circuit degrades features (payments, photo signing, geocoding, LLM plans) but the
+    # API itself is up and must stay in the load balancer.
+    breakers = circuit_breaker_snapshots()
+    degraded = any(snapshot["state"] == OPEN for snapshot in breakers.values())
+    return {"status": "degraded" if degraded else "ok", "circuit_breakers": breakers}
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_admin, get_current_user
 from app.core.config import get_settings
 from app.core.security import AuthUser
-from app.db.session import get_db
+from app.db.session import ReadSession, get_async_db, get_db
 from app.schemas.v2_notifications import (
     Notification,
     NotificationCreateRequest,
@@ -139,15 +139,15 @@ def put_notification_preferences_endpoint(
 
 
 @router.get("/notifications", response_model=NotificationsResponse)
-def list_notifications_endpoint(
+async def list_notifications_endpoint(
     notification_status: str | None = Query(default=None, alias="status"),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     user: AuthUser = Security(get_current_user),
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(get_async_db),
 ) -> NotificationsResponse:
     try:
-        data = list_notifications_v2(db, user, status=notification_status, limit=limit, offset=offset)
+        data = await db.run_sync(list_notifications_v2, user, status=notification_status, limit=limit, offset=offset)
     except Exception as exc:
         _handle_notification_error(exc)
     return NotificationsResponse(**data)
@@ -1,12 +1,14 @@
 from collections.abc import Callable
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, Security, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_teacher_user, get_current_user
+from app.api.idempotency import run_idempotent_write
 from app.core.config import get_settings
+from app.core.idempotency import IDEMPOTENCY_KEY_HEADER, request_fingerprint
 from app.core.security import AuthUser
 from app.db.session import get_db
 from app.schemas.v2_packages import (
@@ -118,10 +120,22 @@ def patch_my_package_plan_endpoint(
 @router.post("/packages/purchases", response_model=BookingPackage, status_code=status.HTTP_201_CREATED)
 def create_package_purchase_endpoint(
     payload: PackagePurchaseCreateRequest,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
     user: AuthUser = Security(get_current_user),
     db: Session = Depends(get_db),
-) -> BookingPackage:
+) -> BookingPackage | Response:
     try:
+        if idempotency_key:
+            return run_idempotent_write(
+                db,
+                key=idempotency_key,
+                scope="packages.purchase",
+                user_id=user.user_id,
+                request_hash=request_fingerprint(payload),
+                status_code=status.HTTP_201_CREATED,
+                run_transaction=_run_write_transaction,
+                operation=lambda: BookingPackage(**create_package_purchase_v2(db, user, payload)),
+            )
         data = _run_write_transaction(db, lambda: create_package_purchase_v2(db, user, payload))
     except Exception as exc:
         _handle_package_error(exc)
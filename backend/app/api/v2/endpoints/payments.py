@@ -1,13 +1,14 @@
 import secrets
 from collections.abc import Callable
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, Security, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, Security, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_teacher_user, get_current_user
 from app.core.config import get_settings
+from app.core.fast_json import trusted_json_response
 from app.core.security import AuthUser
 from app.db.session import get_db
 from app.schemas.v2_bookings import PaymentOrder, PaymentOrdersResponse
@@ -127,28 +128,30 @@ def get_booking_payment_endpoint(
 def list_parent_payments_endpoint(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, max_length=200),
     user: AuthUser = Security(get_current_user),
     db: Session = Depends(get_db),
-) -> PaymentOrdersResponse:
+) -> Response:
     try:
-        data = list_parent_payments_v2(db, user, limit=limit, offset=offset)
+        data = list_parent_payments_v2(db, user, limit=limit, offset=offset, cursor=cursor)
     except Exception as exc:
         _handle_payment_error(exc)
-    return PaymentOrdersResponse(**data)
+    return trusted_json_response(data, PaymentOrdersResponse)
 
 
 @router.get("/teachers/me/payments", response_model=PaymentOrdersResponse)
 def list_teacher_payments_endpoint(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, max_length=200),
     user: AuthUser = Security(get_current_teacher_user),
     db: Session = Depends(get_db),
-) -> PaymentOrdersResponse:
+) -> Response:
     try:
-        data = list_teacher_payments_v2(db, user, limit=limit, offset=offset)
+        data = list_teacher_payments_v2(db, user, limit=limit, offset=offset, cursor=cursor)
     except Exception as exc:
         _handle_payment_error(exc)
-    return PaymentOrdersResponse(**data)
+    return trusted_json_response(data, PaymentOrdersResponse)
 
 
 @router.get("/teachers/me/payout-profile", response_model=TeacherPayoutProfile)
@@ -2,6 +2,7 @@ from collections.abc import Callable
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, Security, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -23,7 +24,11 @@ from app.schemas.v2_profiles import (
     TeacherProfilePhotoUploadResponse,
     TeacherProfileUpdateRequest,
 )
-from app.services.profile_photo_service import ProfilePhotoUploadError, upload_teacher_profile_photo
+from app.services.profile_photo_service import (
+    ProfilePhotoUploadError,
+    read_profile_photo_upload,
+    upload_teacher_profile_photo,
+)
 from app.services.profile_v2_service import (
     ProfileConflictError,
     ProfileNotFoundError,
@@ -221,13 +226,16 @@ async def upload_my_teacher_photo_endpoint(
     user: AuthUser = Security(get_current_user),
     db: Session = Depends(get_db),
 ) -> TeacherProfilePhotoUploadResponse:
-    file_bytes = await file.read()
+    settings = get_settings()
     try:
-        data = _run_write_transaction(
+        file_bytes = await read_profile_photo_upload(file, settings.profile_photo_max_upload_bytes)
+        # Image processing (process pool) and the storage upload block; keep them off the event loop.
+        data = await run_in_threadpool(
+            _run_write_transaction,
             db,
             lambda: upload_teacher_profile_photo(
                 db,
-                get_settings(),
+                settings,
                 user,
                 file_name=file.filename,
                 content_type=file.content_type,
@@ -235,7 +243,8 @@ async def upload_my_teacher_photo_endpoint(
             ),
         )
     except ProfilePhotoUploadError as exc:
-        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+        headers = {"Retry-After": "5"} if exc.status_code == status.HTTP_429_TOO_MANY_REQUESTS else None
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail, headers=headers) from exc
     except Exception as exc:
         _handle_profile_error(exc)
     return TeacherProfilePhotoUploadResponse(**data)
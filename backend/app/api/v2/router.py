@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.rate_limit import rate_limit
 from app.api.v2.endpoints.admin import router as admin_router
 from app.api.v2.endpoints.auth import router as auth_router
 from app.api.v2.endpoints.bookings import router as bookings_router
@@ -13,16 +14,52 @@ from app.api.v2.endpoints.profiles import router as profiles_router
 from app.api.v2.endpoints.reviews import router as reviews_router
 from app.api.v2.endpoints.teacher_control import router as teacher_control_router
 
+# Budgets are read from settings per request; costs are keyed by endpoint function name.
+explore_rate_limit = rate_limit(
+    "explore",
+    per="ip",
+    limit_setting="rate_limit_explore_per_minute",
+    window_seconds=60,
+    costs={"get_explore_teachers_endpoint": 5},
+)
+availability_slots_rate_limit = rate_limit(
+    "availability_slots",
+    per="user",
+    limit_setting="rate_limit_availability_slots_per_minute",
+    window_seconds=60,
+    costs={"get_teacher_slots_endpoint": 1},
+    default_cost=0,
+)
+payment_retry_rate_limit = rate_limit(
+    "payment_retry",
+    per="user",
+    limit_setting="rate_limit_payment_retries_per_hour",
+    window_seconds=3600,
+    costs={"post_booking_payment_retry_endpoint": 1},
+    default_cost=0,
+)
+chat_messages_rate_limit = rate_limit(
+    "chat_messages",
+    per="user",
+    limit_setting="rate_limit_chat_messages_per_minute",
+    window_seconds=60,
+    costs={"post_chat_message": 1},
+    default_cost=0,
+)
+
 api_router = APIRouter()
 api_router.include_router(auth_router)
 api_router.include_router(health_router)
 api_router.include_router(profiles_router)
-api_router.include_router(explore_router)
-api_router.include_router(bookings_router)
+api_router.include_router(explore_router, dependencies=[Depends(explore_rate_limit)])
+api_router.include_router(
+    bookings_router,
+    dependencies=[Depends(availability_slots_rate_limit), Depends(payment_retry_rate_limit)],
+)
 api_router.include_router(payments_router)
 api_router.include_router(packages_router)
 api_router.include_router(reviews_router)
 api_router.include_router(notifications_router)
-api_router.include_router(chat_router)
+api_router.include_router(chat_router, dependencies=[Depends(chat_messages_rate_limit)])
 api_router.include_router(teacher_control_router)
 api_router.include_router(admin_router)
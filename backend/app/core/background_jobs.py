@@ -0,0 +1,134 @@
+import logging
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Condition, Lock
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_JOBS = REGISTRY.gauge(
+    "kidario_background_jobs",
+    "Background jobs running or queued.",
+    ("queue",),
+)
+BACKGROUND_JOB_RUNS_TOTAL = REGISTRY.counter(
+    "kidario_background_job_runs_total",
+    "Background job attempts by outcome (succeeded, retried, failed).",
+    ("queue", "outcome"),
+)
+BACKGROUND_JOB_REJECTIONS_TOTAL = REGISTRY.counter(
+    "kidario_background_job_rejections_total",
+    "Background jobs not enqueued because the same key was in flight or the queue was full.",
+    ("queue", "reason"),
+)
+
+
+class BackgroundJobQueue:
+    """Bounded thread pool for I/O-bound work that must stay off the request path.
+
+    Jobs are keyed: submitting a key that is already queued or running is a no-op, so concurrent
+    requests for the same work share one run. A failing job is retried with exponential backoff up to
+    ``max_attempts``. With ``workers=0`` jobs run inline in the submitting thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        workers: int,
+        max_pending: int,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 2.0,
+    ) -> None:
+        self.name = name
+        self.workers = max(0, workers)
+        self.capacity = max(1, self.workers + max(0, max_pending))
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff_seconds = max(0.0, retry_backoff_seconds)
+        self._in_flight: set[Hashable] = set()
+        self._idle = Condition(Lock())
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"jobs-{self.name}")
+            return self._executor
+
+    def submit(self, key: Hashable, func: Callable[..., Any], *args: Any) -> bool:
+        with self._idle:
+            if key in self._in_flight:
+                BACKGROUND_JOB_REJECTIONS_TOTAL.inc(queue=self.name, reason="duplicate")
+                return False
+            if len(self._in_flight) >= self.capacity:
+                BACKGROUND_JOB_REJECTIONS_TOTAL.inc(queue=self.name, reason="saturated")
+                return False
+            self._in_flight.add(key)
+        BACKGROUND_JOBS.inc(queue=self.name)
+
+        if self.workers == 0:
+            self._run(key, func, args)
+            return True
+        try:
+            self._get_executor().submit(self._run, key, func, args)
+        except BaseException:
+            self._finish(key)
+            raise
+        return True
+
+    def _run(self, key: Hashable, func: Callable[..., Any], args: tuple) -> None:
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    func(*args)
+                except Exception:
+                    if attempt == self.max_attempts:
+                        BACKGROUND_JOB_RUNS_TOTAL.inc(queue=self.name, outcome="failed")
+                        logger.exception("Background job %s %r failed after %s attempts.", self.name, key, attempt)
+                        return
+                    BACKGROUND_JOB_RUNS_TOTAL.inc(queue=self.name, outcome="retried")
+                    time.sleep(self.retry_backoff_seconds * (2 ** (attempt - 1)))
+                    continue
+                BACKGROUND_JOB_RUNS_TOTAL.inc(queue=self.name, outcome="succeeded")
+                return
+        finally:
+            self._finish(key)
+
+    def _finish(self, key: Hashable) -> None:
+        BACKGROUND_JOBS.dec(queue=self.name)
+        with self._idle:
+            self._in_flight.discard(key)
+            self._idle.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._in_flight, timeout=timeout)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_activity_plan_job_queue() -> BackgroundJobQueue:
+    settings = get_settings()
+    return BackgroundJobQueue(
+        "activity_plan",
+        workers=settings.activity_plan_job_workers,
+        max_pending=settings.activity_plan_job_max_pending,
+        max_attempts=settings.activity_plan_job_max_attempts,
+        retry_backoff_seconds=settings.activity_plan_job_retry_backoff_seconds,
+    )
+
+
+def shutdown_background_jobs() -> None:
+    if get_activity_plan_job_queue.cache_info().currsize:
+        get_activity_plan_job_queue().shutdown()
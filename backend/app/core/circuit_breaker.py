@@ -0,0 +1,181 @@
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from threading import Lock
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_BREAKER_STATE = REGISTRY.gauge(
+    "kidario_circuit_breaker_state",
+    "Circuit breaker state per provider (0 closed, 1 half-open, 2 open).",
+    ("breaker",),
+)
+CIRCUIT_BREAKER_REJECTIONS_TOTAL = REGISTRY.counter(
+    "kidario_circuit_breaker_rejections_total",
+    "Calls failed fast because the provider's circuit was open.",
+    ("breaker",),
+)
+CIRCUIT_BREAKER_TRANSITIONS_TOTAL = REGISTRY.counter(
+    "kidario_circuit_breaker_transitions_total",
+    "Circuit breaker state changes, by provider and new state.",
+    ("breaker", "state"),
+)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after_seconds: float) -> None:
+        super().__init__(f"{name} is unavailable (circuit open).")
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+
+
+class BreakerCall:
+    def __init__(self) -> None:
+        # None: decided by whether the guarded block raised. Set it to record an outcome explicitly,
+        # e.g. False for a 4xx the provider answered promptly.
+        self.failed: bool | None = None
+
+
+class CircuitBreaker:
+    """Tracks the last calls to one provider and fails fast while it is unhealthy.
+
+    Opens when at least ``minimum_calls`` of the last ``window_size`` calls were recorded and the share of
+    failed or slow (over ``slow_call_seconds``) calls reaches ``failure_rate_threshold``. After
+    ``open_seconds`` one probe call is let through: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        settings_provider: Callable[[], Settings] = get_settings,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._settings_provider = settings_provider
+        self._clock = clock
+        self._lock = Lock()
+        self._outcomes: deque[bool] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        CIRCUIT_BREAKER_STATE.set(_STATE_VALUES[CLOSED], breaker=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self._settings_provider())
+
+    def _current_state(self, settings: Settings) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= settings.circuit_breaker_open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        if state == OPEN:
+            self._opened_at = self._clock()
+        if state != HALF_OPEN:
+            self._probe_in_flight = False
+        if state == CLOSED:
+            self._outcomes.clear()
+        CIRCUIT_BREAKER_STATE.set(_STATE_VALUES[state], breaker=self.name)
+        CIRCUIT_BREAKER_TRANSITIONS_TOTAL.inc(breaker=self.name, state=state)
+
+    def _acquire(self) -> None:
+        settings = self._settings_provider()
+        if not settings.circuit_breaker_enabled:
+            return
+        with self._lock:
+            state = self._current_state(settings)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            retry_after = max(0.0, settings.circuit_breaker_open_seconds - (self._clock() - self._opened_at))
+        CIRCUIT_BREAKER_REJECTIONS_TOTAL.inc(breaker=self.name)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _record(self, failed: bool, duration_seconds: float) -> None:
+        settings = self._settings_provider()
+        if not settings.circuit_breaker_enabled:
+            return
+        bad = failed or duration_seconds >= settings.circuit_breaker_slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN if bad else CLOSED)
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append(bad)
+            while len(self._outcomes) > max(1, settings.circuit_breaker_window_size):
+                self._outcomes.popleft()
+            recorded = len(self._outcomes)
+            if recorded >= max(1, settings.circuit_breaker_minimum_calls):
+                failure_rate = sum(self._outcomes) / recorded
+                if failure_rate >= settings.circuit_breaker_failure_rate_threshold:
+                    self._transition(OPEN)
+
+    @contextmanager
+    def guard(self) -> Iterator[BreakerCall]:
+        """Raises ``CircuitOpenError`` without running the block while the circuit is open."""
+
+        self._acquire()
+        call = BreakerCall()
+        started_at = self._clock()
+        raised = True
+        try:
+            yield call
+            raised = False
+        finally:
+            self._record(raised if call.failed is None else call.failed, self._clock() - started_at)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            state = self._current_state(self._settings_provider())
+            recorded = len(self._outcomes)
+            return {
+                "state": state,
+                "recent_calls": recorded,
+                "failure_rate": round(sum(self._outcomes) / recorded, 3) if recorded else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+            self._outcomes.clear()
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = Lock()
+
+
+def circuit_breaker(name: str) -> CircuitBreaker:
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(name)
+        return breaker
+
+
+def circuit_breaker_snapshots() -> dict[str, dict[str, object]]:
+    with _BREAKERS_LOCK:
+        breakers = sorted(_BREAKERS.items())
+    return {name: breaker.snapshot() for name, breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    for breaker in breakers:
+        breaker.reset()
@@ -0,0 +1,223 @@
+import importlib
+import time
+import zlib
+from collections.abc import Sequence
+from functools import lru_cache
+from types import ModuleType
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+
+GZIP = "gzip"
+BROTLI = "br"
+
+COMPRESSION_RATIO_BUCKETS = (1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0, 12.0, 16.0, 24.0)
+COMPRESSION_SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+HTTP_RESPONSE_COMPRESSION_RATIO = REGISTRY.histogram(
+    "kidario_http_response_compression_ratio",
+    "Uncompressed / compressed body size of compressed responses, by encoding.",
+    ("encoding",),
+    buckets=COMPRESSION_RATIO_BUCKETS,
+)
+HTTP_RESPONSE_COMPRESSION_SECONDS = REGISTRY.histogram(
+    "kidario_http_response_compression_seconds",
+    "CPU time spent compressing one response body, by encoding.",
+    ("encoding",),
+    buckets=COMPRESSION_SECONDS_BUCKETS,
+)
+HTTP_RESPONSE_BYTES_TOTAL = REGISTRY.counter(
+    "kidario_http_response_bytes_total",
+    "Body bytes of compressed responses before and after compression, by encoding and stage.",
+    ("encoding", "stage"),
+)
+
+# Chunks this large are compressed in a worker thread so they don't stall the event loop.
+_THREAD_MINIMUM_SIZE = 128 * 1024
+
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/x-ndjson",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+_SKIPPED_STATUS_CODES = frozenset({204, 206, 304})
+
+
+@lru_cache(maxsize=1)
+def _brotli() -> ModuleType | None:
+    try:
+        return importlib.import_module("brotli")
+    except ImportError:
+        return None
+
+
+def available_encodings() -> tuple[str, ...]:
+    # Server preference order: brotli compresses JSON noticeably smaller than gzip at similar CPU cost.
+    return (BROTLI, GZIP) if _brotli() is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding: str | None, available: Sequence[str]) -> str | None:
+    """Picks the client's highest-q encoding among ``available``; ties go to the server's order."""
+
+    if not accept_encoding:
+        return None
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        qualities[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type.startswith("text/"):
+        # Server-sent events must reach the client event by event, unbuffered.
+        return media_type != "text/event-stream"
+    return media_type in _COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, settings: Settings) -> None:
+        self.encoding = encoding
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.cpu_seconds = 0.0
+        if encoding == BROTLI:
+            brotli = _brotli()
+            self._brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=settings.compression_brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        # thread_time: CPU of the calling thread only, so concurrent requests don't inflate it.
+        started_at = time.thread_time()
+        if self.encoding == BROTLI:
+            output = self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        else:
+            output = self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+        self.cpu_seconds += time.thread_time() - started_at
+        self.input_bytes += len(data)
+        self.output_bytes += len(output)
+        return output
+
+    def record_metrics(self) -> None:
+        if not self.output_bytes:
+            return
+        HTTP_RESPONSE_COMPRESSION_RATIO.observe(self.input_bytes / self.output_bytes, encoding=self.encoding)
+        HTTP_RESPONSE_COMPRESSION_SECONDS.observe(self.cpu_seconds, encoding=self.encoding)
+        HTTP_RESPONSE_BYTES_TOTAL.inc(self.input_bytes, encoding=self.encoding, stage="uncompressed")
+        HTTP_RESPONSE_BYTES_TOTAL.inc(self.output_bytes, encoding=self.encoding, stage="compressed")
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip compression of response bodies.
+
+    Bodies sent in one message are compressed once they reach ``compression_minimum_size``; streamed bodies are
+    compressed chunk by chunk, each chunk flushed so the client can decode it right away.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        settings = get_settings()
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), available_encodings())
+        await _CompressionResponder(self.app, settings, encoding)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, settings: Settings, encoding: str | None) -> None:
+        self.app = app
+        self.settings = settings
+        self.encoding = encoding
+        self.send: Send | None = None
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.compressor: _StreamCompressor | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in _SKIPPED_STATUS_CODES
+                or "content-encoding" in headers
+                or "no-transform" in headers.get("cache-control", "").lower()
+                or not _is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Held back until the first body chunk shows whether the response is worth compressing.
+                self.start_message = message
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.settings.compression_minimum_size:
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+            self.compressor = _StreamCompressor(self.encoding, self.settings)
+            compressed = await self._compress(body, final=not more_body)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(compressed))
+            await self.send(start_message)
+            await self.send({**message, "body": compressed})
+        else:
+            await self.send({**message, "body": await self._compress(body, final=not more_body)})
+        if not more_body:
+            self.compressor.record_metrics()
+
+    async def _compress(self, body: bytes, *, final: bool) -> bytes:
+        if len(body) >= _THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(lambda: self.compressor.compress(body, final=final))
+        return self.compressor.compress(body, final=final)
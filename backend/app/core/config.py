@@ -23,6 +23,48 @@ class Settings(BaseSettings):
     supabase_http_timeout_seconds: float = 15.0
     trust_proxy_headers: bool = True
 
+    metrics_enabled: bool = True
+    metrics_bearer_token: str | None = None
+
+    tracing_otlp_endpoint: str | None = None
+    tracing_service_name: str = "kidario-backend"
+    tracing_sample_ratio: float = 1.0
+    tracing_export_timeout_seconds: float = 5.0
+
+    sql_inspection_enabled: bool = False
+    sql_slow_query_threshold_ms: float = 100.0
+    sql_explain_slow_queries: bool = True
+    sql_repeated_statement_threshold: int = 5
+
+    response_cache_backend: str = "memory"
+    response_cache_ttl_seconds: int = 30
+    response_cache_stale_while_revalidate_seconds: int = 30
+    response_cache_max_entries: int = 1024
+    fast_json_responses_enabled: bool = False
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    teacher_overview_snapshot_ttl_seconds: int = 60
+
+    rate_limit_backend: str = "memory"
+    rate_limit_memory_max_keys: int = 100_000
+    rate_limit_enabled: bool = True
+    rate_limit_explore_per_minute: int = 300
+    rate_limit_availability_slots_per_minute: int = 60
+    rate_limit_chat_messages_per_minute: int = 30
+    rate_limit_payment_retries_per_hour: int = 10
+
+    idempotency_key_ttl_seconds: int = 86_400
+    idempotency_wait_timeout_seconds: float = 30.0
+
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_window_size: int = 20
+    circuit_breaker_minimum_calls: int = 10
+    circuit_breaker_failure_rate_threshold: float = 0.5
+    circuit_breaker_slow_call_seconds: float = 5.0
+    circuit_breaker_open_seconds: float = 30.0
+
     signup_rate_limit_window_seconds: int = 300
     signup_rate_limit_max_attempts_per_ip: int = 20
     signup_rate_limit_max_attempts_per_email: int = 8
@@ -37,12 +79,23 @@ class Settings(BaseSettings):
     profile_photo_signed_url_ttl_seconds: int = 3600
     profile_photo_target_size_pixels: int = 512
     profile_photo_jpeg_quality: int = 82
+    profile_photo_webp_quality: int = 80
+    profile_photo_processing_timeout_seconds: float = 20.0
+    profile_photo_upload_concurrency: int = 4
+    image_process_pool_workers: int = 2
+    image_process_pool_max_pending: int = 4
     storage_s3_endpoint_url: str | None = None
     storage_s3_region: str = "us-east-1"
     storage_s3_access_key_id: str | None = None
     storage_s3_secret_access_key: str | None = None
 
     database_url: str
+    async_database_enabled: bool = True
+    async_database_url: str | None = None
+    async_database_pool_size: int = 10
+    async_database_max_overflow: int = 10
+    warmup_enabled: bool = False
+    warmup_database_connections: int = 2
 
     admin_emails: str = ""
     teacher_activity_llm_enabled: bool = False
@@ -51,6 +104,14 @@ class Settings(BaseSettings):
     teacher_activity_llm_base_url: str = "https://api.openai.com/v1"
     teacher_activity_llm_timeout_seconds: float = 8.0
     teacher_activity_llm_ca_bundle: str | None = None
+    activity_plan_job_workers: int = 2
+    activity_plan_job_max_pending: int = 50
+    activity_plan_job_max_attempts: int = 3
+    activity_plan_job_retry_backoff_seconds: float = 2.0
+    activity_plan_precompute_horizon_days: int = 7
+    activity_plan_precompute_batch_size: int = 200
+    activity_plan_precompute_concurrency: int = 4
+    teacher_activity_llm_requests_per_minute: int = 60
 
     google_geocoding_api_key: str | None = None
     google_geocoding_base_url: str = "https://maps.googleapis.com/maps/api/geocode/json"
@@ -59,6 +120,14 @@ class Settings(BaseSettings):
     viacep_base_url: str = "https://viacep.com.br/ws"
     viacep_timeout_seconds: float = 4.0
     viacep_ca_bundle: str | None = None
+    geocode_cache_enabled: bool = True
+    geocode_cache_ttl_seconds: int = 15_552_000
+    geocode_cache_negative_ttl_seconds: int = 86_400
+    geocode_cache_failure_ttl_seconds: int = 300
+    address_backfill_batch_size: int = 200
+    address_backfill_concurrency: int = 4
+    viacep_requests_per_minute: int = 120
+    google_geocoding_requests_per_minute: int = 600
 
     pagarme_secret_key: str | None = None
     pagarme_base_url: str = "https://api.pagar.me/core/v5"
@@ -75,6 +144,15 @@ class Settings(BaseSettings):
     pagarme_recipient_anticipation_type: str = "full"
     pagarme_recipient_anticipation_volume_percentage: str = "0"
     pagarme_recipient_anticipation_delay: str = "365"
+    payment_reconciliation_min_age_seconds: int = 900
+    payment_reconciliation_recheck_seconds: int = 900
+    payment_reconciliation_batch_size: int = 100
+    payment_reconciliation_concurrency: int = 4
+    pagarme_reconciliation_requests_per_minute: int = 120
+    booking_payment_expiry_grace_seconds: int = 300
+    booking_decision_timeout_hours: int = 48
+    booking_sweep_batch_size: int = 500
+    admin_export_batch_size: int = 1000
     platform_fee_percent: float = 20.0
     parent_service_fee_percent: float = 8.0
 
@@ -93,6 +171,22 @@ class Settings(BaseSettings):
             raise ValueError("signup_captcha_provider must be 'turnstile' or 'recaptcha'.")
         return normalized
 
+    @field_validator("response_cache_backend")
+    @classmethod
+    def validate_response_cache_backend(cls, value: str) -> str:
+        normalized = value.strip().lower()
+        if normalized not in {"memory", "postgres", "disabled"}:
+            raise ValueError("response_cache_backend must be 'memory', 'postgres' or 'disabled'.")
+        return normalized
+
+    @field_validator("rate_limit_backend")
+    @classmethod
+    def validate_rate_limit_backend(cls, value: str) -> str:
+        normalized = value.strip().lower()
+        if normalized not in {"memory", "postgres"}:
+            raise ValueError("rate_limit_backend must be 'memory' or 'postgres'.")
+        return normalized
+
     @field_validator("supabase_jwt_leeway_seconds")
     @classmethod
     def validate_supabase_jwt_leeway_seconds(cls, value: int) -> int:
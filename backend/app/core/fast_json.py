@@ -0,0 +1,73 @@
+import importlib
+from collections.abc import Mapping
+from decimal import Decimal
+from functools import lru_cache
+from types import ModuleType
+from typing import Any
+from uuid import UUID
+
+import pydantic_core
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+
+
+@lru_cache(maxsize=1)
+def _orjson() -> ModuleType | None:
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+def _orjson_default(value: object) -> object:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        # Same as pydantic's JSON output for Decimal fields.
+        return str(value)
+    if isinstance(value, set | frozenset):
+        return list(value)
+    if isinstance(value, UUID):
+        # orjson only encodes uuid.UUID itself; asyncpg returns its own subclass.
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # orjson when installed, pydantic's Rust encoder otherwise. Both write UUIDs, datetimes (UTC as "Z") and
+    # dates the way pydantic serializes the response models.
+    orjson = _orjson()
+    if orjson is None or isinstance(content, BaseModel):
+        return pydantic_core.to_json(content)
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded straight from models or plain dicts, without ``jsonable_encoder``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_content(data: Mapping[str, Any], model: type[BaseModel]) -> Mapping[str, Any] | BaseModel:
+    """Returns ``data`` as-is when fast JSON is on, otherwise validated through ``model``.
+
+    Only for service payloads already shaped exactly like ``model``: every field present (defaults included)
+    with its JSON type. ``model`` stays the endpoint's ``response_model`` for the OpenAPI schema.
+    """
+
+    if get_settings().fast_json_responses_enabled:
+        return data
+    return model.model_validate(data)
+
+
+def trusted_json_response(
+    data: Mapping[str, Any],
+    model: type[BaseModel],
+    *,
+    status_code: int = 200,
+) -> Response:
+    # Returning a Response also skips FastAPI's own response_model validation and serialization.
+    return FastJSONResponse(trusted_content(data, model), status_code=status_code)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import count
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+IDEMPOTENT_REQUESTS_TOTAL = REGISTRY.counter(
+    "kidario_idempotent_requests_total",
+    "Write requests carrying an Idempotency-Key, by scope and result (executed, replayed, reused, in_progress).",
+    ("scope", "result"),
+)
+
+_LOCK_NOT_AVAILABLE = "55P03"
+_PURGE_EVERY_CLAIMS = 500
+_PURGE_BATCH_SIZE = 500
+_claims = count(1)
+
+
+class IdempotencyKeyReusedError(Exception):
+    pass
+
+
+class IdempotencyInProgressError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: bytes
+
+
+def request_fingerprint(payload: BaseModel | Mapping[str, object] | None = None, **extra: object) -> str:
+    # Stable hash of what the client asked for, so a key reused for a different request is rejected.
+    document = payload.model_dump(mode="json") if isinstance(payload, BaseModel) else dict(payload or {})
+    document.update({name: str(value) for name, value in extra.items()})
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _purge_expired_keys(db: Session) -> None:
+    # Bounded so an occasional purge never slows the request that triggers it.
+    db.execute(
+        text(
+            """
+            delete from idempotency_keys
+            where ctid = any(array(
+              select ctid
+              from idempotency_keys
+              where expires_at <= now()
+              limit :batch_size
+              for update skip locked
+            ))
+            """
+        ),
+        {"batch_size": _PURGE_BATCH_SIZE},
+    )
+
+
+def claim_idempotency_key(
+    db: Session,
+    *,
+    scope: str,
+    user_id: str,
+    key: str,
+    request_hash: str,
+    settings: Settings | None = None,
+) -> StoredResponse | None:
+    """Claims ``key`` inside the caller's write transaction; returns the stored response when it already ran.
+
+    The row is written in the same transaction as the operation, so a concurrent duplicate blocks on its
+    unique key until the first request commits (and then replays it) or rolls back (and then runs itself).
+    """
+
+    resolved_settings = settings or get_settings()
+    params = {"scope": scope, "user_id": user_id, "key": key}
+    wait_ms = max(1, int(resolved_settings.idempotency_wait_timeout_seconds * 1000))
+    try:
+        db.execute(text(f"set local lock_timeout = {wait_ms}"))
+        claimed = db.execute(
+            text(
+                """
+                insert into idempotency_keys (scope, user_id, idempotency_key, request_hash, expires_at)
+                values (:scope, :user_id, :key, :request_hash, now() + make_interval(secs => :ttl_seconds))
+                on conflict (user_id, scope, idempotency_key) do update
+                set request_hash = excluded.request_hash,
+                    response_status = null,
+                    response_body = null,
+                    created_at = now(),
+                    expires_at = excluded.expires_at
+                where idempotency_keys.expires_at <= now()
+                returning idempotency_key
+                """
+            ),
+            {**params, "request_hash": request_hash, "ttl_seconds": resolved_settings.idempotency_key_ttl_seconds},
+        ).first()
+    except OperationalError as exc:
+        if getattr(getattr(exc, "orig", None), "sqlstate", None) == _LOCK_NOT_AVAILABLE:
+            IDEMPOTENT_REQUESTS_TOTAL.inc(scope=scope, result="in_progress")
+            raise IdempotencyInProgressError("A request with this Idempotency-Key is still being processed.") from exc
+        raise
+    db.execute(text("set local lock_timeout to default"))
+    if claimed:
+        IDEMPOTENT_REQUESTS_TOTAL.inc(scope=scope, result="executed")
+        if next(_claims) % _PURGE_EVERY_CLAIMS == 0:
+            _purge_expired_keys(db)
+        return None
+
+    row = (
+        db.execute(
+            text(
+                """
+                select request_hash, response_status, response_body
+                from idempotency_keys
+                where user_id = :user_id
+                  and scope = :scope
+                  and idempotency_key = :key
+                """
+            ),
+            params,
+        )
+        .mappings()
+        .first()
+    )
+    if not row or row["request_hash"] != request_hash:
+        IDEMPOTENT_REQUESTS_TOTAL.inc(scope=scope, result="reused")
+        raise IdempotencyKeyReusedError("Idempotency-Key was already used for a different request.")
+    if row["response_status"] is None:
+        IDEMPOTENT_REQUESTS_TOTAL.inc(scope=scope, result="in_progress")
+        raise IdempotencyInProgressError("A request with this Idempotency-Key is still being processed.")
+    IDEMPOTENT_REQUESTS_TOTAL.inc(scope=scope, result="replayed")
+    return StoredResponse(status_code=int(row["response_status"]), body=bytes(row["response_body"]))
+
+
+def store_idempotent_response(
+    db: Session,
+    *,
+    scope: str,
+    user_id: str,
+    key: str,
+    response: StoredResponse,
+) -> None:
+    db.execute(
+        text(
+            """
+            update idempotency_keys
+            set response_status = :response_status,
+                response_body = :response_body
+            where user_id = :user_id
+              and scope = :scope
+              and idempotency_key = :key
+            """
+        ),
+        {
+            "scope": scope,
+            "user_id": user_id,
+            "key": key,
+            "response_status": response.status_code,
+            "response_body": response.body,
+        },
+    )
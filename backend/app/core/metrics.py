@@ -0,0 +1,294 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.tracing import SPAN_KIND_CLIENT, start_span
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_QUERY_START_ATTR = "_kidario_query_started_at"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape_label_value(extra[1])}"')
+    if not pairs:
+        return ""
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def _label_values(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            totals[0] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            return sum(series[0]) if series else 0
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), totals[0])) for key, (counts, totals) in self._series.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = _format_number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "kidario_http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION_SECONDS = REGISTRY.histogram(
+    "kidario_http_request_duration_seconds",
+    "HTTP request latency, by route template.",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "kidario_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    ("method",),
+)
+HTTP_REQUEST_DB_QUERIES = REGISTRY.histogram(
+    "kidario_http_request_db_queries",
+    "SQL statements executed per HTTP request, by route template.",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_DURATION_SECONDS = REGISTRY.histogram(
+    "kidario_http_request_db_duration_seconds",
+    "Total time spent executing SQL per HTTP request, by route template.",
+    ("method", "route"),
+)
+DB_STATEMENT_DURATION_SECONDS = REGISTRY.histogram(
+    "kidario_db_statement_duration_seconds",
+    "Latency of individual SQL statements.",
+)
+OUTBOUND_REQUESTS_TOTAL = REGISTRY.counter(
+    "kidario_outbound_requests_total",
+    "Outbound HTTP calls, by integration and outcome (2xx/4xx/5xx/error).",
+    ("integration", "outcome"),
+)
+OUTBOUND_REQUEST_DURATION_SECONDS = REGISTRY.histogram(
+    "kidario_outbound_request_duration_seconds",
+    "Outbound HTTP call latency, by integration.",
+    ("integration",),
+)
+
+
+@dataclass
+class RequestDbStats:
+    query_count: int = 0
+    duration_seconds: float = 0.0
+
+
+_request_db_stats: ContextVar[RequestDbStats | None] = ContextVar("kidario_request_db_stats", default=None)
+
+
+def start_request_db_stats() -> RequestDbStats:
+    stats = RequestDbStats()
+    _request_db_stats.set(stats)
+    return stats
+
+
+def current_request_db_stats() -> RequestDbStats | None:
+    return _request_db_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    setattr(context, _QUERY_START_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, _QUERY_START_ATTR, None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    DB_STATEMENT_DURATION_SECONDS.observe(elapsed)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.duration_seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+class OutboundCall:
+    def __init__(self, integration: str) -> None:
+        self.integration = integration
+        self.status_code: int | None = None
+        self.failed = False
+
+
+@contextmanager
+def observe_outbound_request(integration: str) -> Iterator[OutboundCall]:
+    call = OutboundCall(integration)
+    start = time.perf_counter()
+    failed = True
+    with start_span(f"HTTP {integration}", kind=SPAN_KIND_CLIENT, attributes={"peer.service": integration}) as span:
+        try:
+            yield call
+            failed = False
+        finally:
+            if call.status_code is not None:
+                outcome = f"{call.status_code // 100}xx"
+                span.set_attribute("http.status_code", call.status_code)
+            else:
+                outcome = "error" if failed or call.failed else "2xx"
+            if outcome == "error" or (call.status_code or 0) >= 500:
+                span.set_error(outcome)
+            OUTBOUND_REQUESTS_TOTAL.inc(integration=integration, outcome=outcome)
+            OUTBOUND_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - start, integration=integration)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
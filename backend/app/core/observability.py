@@ -1,11 +1,29 @@
 import logging
+import re
 import time
 import uuid
 
-from fastapi import Request
+from fastapi import FastAPI, Request
+from starlette.routing import compile_path
+
+from app.core.config import get_settings
+from app.core.metrics import (
+    HTTP_REQUEST_DB_DURATION_SECONDS,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION_SECONDS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_REQUESTS_TOTAL,
+    RequestDbStats,
+    start_request_db_stats,
+)
+from app.core.query_inspector import QUERY_COUNT_HEADER, report_request_queries, start_request_query_log
+from app.core.rate_limit import apply_rate_limit_headers
+from app.core.tracing import SPAN_KIND_SERVER, TRACEPARENT_HEADER, parse_traceparent, start_span
 
 REQUEST_ID_HEADER = "X-Request-ID"
 _LOGGER_NAME = "kidario.api"
+_UNMATCHED_ROUTE = "unmatched"
+_route_templates_by_app: dict[int, list[tuple[re.Pattern[str], str]]] = {}
 
 
 def configure_logging() -> None:
@@ -15,16 +33,81 @@ def configure_logging() -> None:
     )
 
 
+def _get_route_templates(app: FastAPI) -> list[tuple[re.Pattern[str], str]]:
+    templates = _route_templates_by_app.get(id(app))
+    if templates is None:
+        templates = [(compile_path(path)[0], path) for path in app.openapi().get("paths", {})]
+        _route_templates_by_app[id(app)] = templates
+    return templates
+
+
+def _route_template(request: Request) -> str:
+    # Included routers may expose only their own (unprefixed) path on scope["route"], so resolve the
+    # full template from the OpenAPI paths to keep label cardinality bounded and names stable.
+    route_path = getattr(request.scope.get("route"), "path", None)
+    if not route_path:
+        return _UNMATCHED_ROUTE
+    for pattern, template in _get_route_templates(request.app):
+        if template.endswith(route_path) and pattern.match(request.url.path):
+            return template
+    return route_path
+
+
+def _record_request_metrics(
+    request: Request,
+    *,
+    status_code: int,
+    elapsed_seconds: float,
+    db_stats: RequestDbStats,
+) -> None:
+    method = request.method
+    route = _route_template(request)
+    HTTP_REQUESTS_TOTAL.inc(method=method, route=route, status=str(status_code))
+    HTTP_REQUEST_DURATION_SECONDS.observe(elapsed_seconds, method=method, route=route)
+    HTTP_REQUEST_DB_QUERIES.observe(db_stats.query_count, method=method, route=route)
+    HTTP_REQUEST_DB_DURATION_SECONDS.observe(db_stats.duration_seconds, method=method, route=route)
+
+
 async def request_observability_middleware(request: Request, call_next):
+    with start_span(
+        f"{request.method} {request.url.path}",
+        kind=SPAN_KIND_SERVER,
+        remote_parent=parse_traceparent(request.headers.get(TRACEPARENT_HEADER)),
+        attributes={"http.method": request.method, "http.target": request.url.path},
+    ) as span:
+        response = await _observe_request(request, call_next)
+        if span.sampled:
+            route = _route_template(request)
+            span.update_name(f"{request.method} {route}")
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("kidario.request_id", request.state.request_id)
+            if response.status_code >= 500:
+                span.set_error(f"HTTP {response.status_code}")
+        return response
+
+
+async def _observe_request(request: Request, call_next):
     request_id = request.headers.get(REQUEST_ID_HEADER) or str(uuid.uuid4())
     request.state.request_id = request_id
 
     start = time.perf_counter()
     logger = logging.getLogger(_LOGGER_NAME)
+    db_stats = start_request_db_stats()
+    settings = get_settings()
+    query_log = start_request_query_log(settings)
+    HTTP_REQUESTS_IN_FLIGHT.inc(method=request.method)
 
     try:
         response = await call_next(request)
     except Exception:
+        HTTP_REQUESTS_IN_FLIGHT.dec(method=request.method)
+        _record_request_metrics(
+            request,
+            status_code=500,
+            elapsed_seconds=time.perf_counter() - start,
+            db_stats=db_stats,
+        )
         elapsed_ms = (time.perf_counter() - start) * 1000
         logger.exception(
             "request_failed method=%s path=%s request_id=%s duration_ms=%.2f",
@@ -35,14 +118,34 @@ async def request_observability_middleware(request: Request, call_next):
         )
         raise
 
-    elapsed_ms = (time.perf_counter() - start) * 1000
+    HTTP_REQUESTS_IN_FLIGHT.dec(method=request.method)
+    elapsed_seconds = time.perf_counter() - start
+    _record_request_metrics(
+        request,
+        status_code=response.status_code,
+        elapsed_seconds=elapsed_seconds,
+        db_stats=db_stats,
+    )
+    elapsed_ms = elapsed_seconds * 1000
     response.headers[REQUEST_ID_HEADER] = request_id
+    apply_rate_limit_headers(request, response)
+    if query_log is not None:
+        response.headers[QUERY_COUNT_HEADER] = str(query_log.count)
+        report_request_queries(
+            query_log,
+            settings,
+            method=request.method,
+            path=request.url.path,
+            request_id=request_id,
+        )
     logger.info(
-        "request_completed method=%s path=%s status=%s request_id=%s duration_ms=%.2f",
+        "request_completed method=%s path=%s status=%s request_id=%s duration_ms=%.2f db_queries=%s db_ms=%.2f",
         request.method,
         request.url.path,
         response.status_code,
         request_id,
         elapsed_ms,
+        db_stats.query_count,
+        db_stats.duration_seconds * 1000,
     )
     return response
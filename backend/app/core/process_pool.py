@@ -0,0 +1,106 @@
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from threading import BoundedSemaphore, Lock
+from typing import Any, TypeVar
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY
+
+_T = TypeVar("_T")
+
+PROCESS_POOL_JOBS = REGISTRY.gauge(
+    "kidario_process_pool_jobs",
+    "CPU-bound jobs running or queued in a process pool.",
+    ("pool",),
+)
+PROCESS_POOL_REJECTIONS_TOTAL = REGISTRY.counter(
+    "kidario_process_pool_rejections_total",
+    "Jobs rejected because the process pool was saturated.",
+    ("pool",),
+)
+
+
+class ProcessPoolSaturatedError(Exception):
+    pass
+
+
+class ProcessPoolTimeoutError(Exception):
+    pass
+
+
+class BoundedProcessPool:
+    """Process pool that rejects work instead of queueing it without limit.
+
+    Admits at most ``workers + max_pending`` jobs at a time. With ``workers=0`` jobs run inline in the
+    calling thread (same admission limit), which keeps tests and single-core deploys simple.
+    """
+
+    def __init__(self, name: str, *, workers: int, max_pending: int) -> None:
+        self.name = name
+        self.workers = max(0, workers)
+        self.capacity = max(1, self.workers + max(0, max_pending))
+        self._slots = BoundedSemaphore(self.capacity)
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process (uvicorn, exporters) can deadlock the child.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def run(self, func: Callable[..., _T], *args: Any, timeout: float | None = None) -> _T:
+        if not self._slots.acquire(blocking=False):
+            PROCESS_POOL_REJECTIONS_TOTAL.inc(pool=self.name)
+            raise ProcessPoolSaturatedError(f"{self.name} pool is saturated.")
+        PROCESS_POOL_JOBS.inc(pool=self.name)
+        if self.workers == 0:
+            try:
+                return func(*args)
+            finally:
+                self._release()
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the worker is done, even when the caller stops waiting on a timeout.
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            raise ProcessPoolTimeoutError(f"{self.name} job did not finish in {timeout}s.") from exc
+
+    def _release(self) -> None:
+        PROCESS_POOL_JOBS.dec(pool=self.name)
+        self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_image_process_pool() -> BoundedProcessPool:
+    settings = get_settings()
+    return BoundedProcessPool(
+        "image",
+        workers=settings.image_process_pool_workers,
+        max_pending=settings.image_process_pool_max_pending,
+    )
+
+
+def shutdown_process_pools() -> None:
+    if get_image_process_pool.cache_info().currsize:
+        get_image_process_pool().shutdown()
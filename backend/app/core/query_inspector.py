@@ -0,0 +1,182 @@
+import logging
+import re
+import time
+from collections import Counter as CounterDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import Settings
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+_LOGGER_NAME = "kidario.sql"
+_STARTED_AT_ATTR = "_kidario_inspect_started_at"
+_EXPLAINABLE_PREFIXES = ("select", "with")
+_EXPLAIN_SAVEPOINT = "kidario_explain"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_logger = logging.getLogger(_LOGGER_NAME)
+
+
+@dataclass(frozen=True)
+class RecordedStatement:
+    statement: str
+    parameters: object
+    duration_ms: float
+
+
+@dataclass
+class QueryLog:
+    statements: list[RecordedStatement] = field(default_factory=list)
+    slow_threshold_ms: float | None = None
+    explain_slow: bool = False
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated_statements(self, min_repeats: int) -> list[tuple[str, int]]:
+        counts = CounterDict(item.statement for item in self.statements)
+        return [(statement, total) for statement, total in counts.most_common() if total >= min_repeats]
+
+    def describe(self) -> str:
+        lines = [f"{self.count} SQL statements:"]
+        for index, item in enumerate(self.statements, start=1):
+            lines.append(f"{index:>3}. ({item.duration_ms:.2f} ms) {item.statement}")
+        return "\n".join(lines)
+
+
+_request_query_log: ContextVar[QueryLog | None] = ContextVar("kidario_request_query_log", default=None)
+_active_captures: list[QueryLog] = []
+_active_captures_lock = Lock()
+
+
+def _normalize_statement(statement: str) -> str:
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+def _explain(conn, statement: str, parameters) -> str | None:
+    if conn.dialect.name != "postgresql":
+        return None
+    if not statement.lstrip().lower().startswith(_EXPLAINABLE_PREFIXES):
+        return None
+    # A raw DBAPI cursor keeps the EXPLAIN out of the cursor events (and out of the recorded statements).
+    # It runs inside its own savepoint: a failing EXPLAIN would otherwise abort the request's transaction.
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(f"EXPLAIN {statement}", parameters)
+                return "\n".join(str(row[0]) for row in cursor.fetchall())
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        finally:
+            cursor.close()
+    except Exception as exc:
+        return f"EXPLAIN failed: {exc}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    setattr(context, _STARTED_AT_ATTR, time.perf_counter())
+
+
+def record_statement(statement: str, parameters=None, duration_ms: float = 0.0) -> RecordedStatement | None:
+    """Count a statement in the active captures and request log (None when nothing is listening).
+
+    The engine hook calls it for every cursor execution; test sessions that never reach a driver call it
+    from their ``execute`` so ``capture_queries`` budgets still apply.
+    """
+
+    request_log = _request_query_log.get()
+    if request_log is None and not _active_captures:
+        return None
+    recorded = RecordedStatement(
+        statement=_normalize_statement(statement),
+        parameters=parameters,
+        duration_ms=duration_ms,
+    )
+    with _active_captures_lock:
+        for capture in _active_captures:
+            capture.statements.append(recorded)
+    if request_log is not None:
+        request_log.statements.append(recorded)
+    return recorded
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started_at = getattr(context, _STARTED_AT_ATTR, None)
+    duration_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else 0.0
+    recorded = record_statement(statement, parameters, duration_ms)
+    request_log = _request_query_log.get()
+    if recorded is None or request_log is None:
+        return
+
+    if request_log.slow_threshold_ms is not None and duration_ms >= request_log.slow_threshold_ms:
+        plan = _explain(conn, statement, parameters) if request_log.explain_slow else None
+        _logger.warning(
+            "slow_query duration_ms=%.2f statement=%s%s",
+            duration_ms,
+            recorded.statement,
+            f"\n{plan}" if plan else "",
+        )
+
+
+def install_query_inspection(engine: Engine) -> Engine:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+def start_request_query_log(settings: Settings) -> QueryLog | None:
+    if not settings.sql_inspection_enabled or settings.env == "production":
+        return None
+    log = QueryLog(
+        slow_threshold_ms=settings.sql_slow_query_threshold_ms,
+        explain_slow=settings.sql_explain_slow_queries,
+    )
+    _request_query_log.set(log)
+    return log
+
+
+def report_request_queries(
+    log: QueryLog,
+    settings: Settings,
+    *,
+    method: str,
+    path: str,
+    request_id: str,
+) -> None:
+    for statement, total in log.repeated_statements(settings.sql_repeated_statement_threshold):
+        distinct_parameters = {repr(item.parameters) for item in log.statements if item.statement == statement}
+        _logger.warning(
+            "repeated_query method=%s path=%s request_id=%s executions=%s distinct_parameters=%s statement=%s",
+            method,
+            path,
+            request_id,
+            total,
+            len(distinct_parameters),
+            statement,
+        )
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    log = QueryLog()
+    with _active_captures_lock:
+        _active_captures.append(log)
+    try:
+        yield log
+    finally:
+        with _active_captures_lock:
+            _active_captures.remove(log)
@@ -0,0 +1,300 @@
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+
+from fastapi import Request, Response
+from sqlalchemy import text
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_DECISIONS_TOTAL = REGISTRY.counter(
+    "kidario_rate_limit_decisions_total",
+    "Rate limit checks by scope and result (allowed, limited, error).",
+    ("scope", "result"),
+)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    key: str
+    limit: int
+    window_seconds: float
+    cost: int = 1
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after_seconds: float
+    retry_after_seconds: float = 0.0
+    key: str | None = None
+
+
+ALLOW_ALL = RateLimitDecision(allowed=True, limit=0, remaining=0, reset_after_seconds=0.0)
+
+_DECISIONS_STATE_KEY = "rate_limit_decisions"
+
+
+def _gcra(rule: RateLimit, tat: float | None, now: float) -> tuple[RateLimitDecision, float]:
+    # Generic cell rate algorithm: a token bucket of `limit` tokens refilled over `window_seconds`,
+    # stored as one timestamp per key (the "theoretical arrival time" of the next request). A request
+    # of cost n takes n tokens.
+    emission_interval = rule.window_seconds / rule.limit
+    current_tat = max(tat if tat is not None else now, now)
+    new_tat = current_tat + emission_interval * max(1, rule.cost)
+    allow_at = new_tat - rule.window_seconds
+    if now < allow_at:
+        decision = RateLimitDecision(
+            allowed=False,
+            limit=rule.limit,
+            remaining=0,
+            reset_after_seconds=current_tat - now,
+            retry_after_seconds=allow_at - now,
+            key=rule.key,
+        )
+        return decision, current_tat
+    decision = RateLimitDecision(
+        allowed=True,
+        limit=rule.limit,
+        remaining=int(math.floor((now - allow_at) / emission_interval + 1e-9)),
+        reset_after_seconds=new_tat - now,
+        key=rule.key,
+    )
+    return decision, new_tat
+
+
+def _decide(
+    rules: Sequence[RateLimit],
+    tats: dict[str, float],
+    now: float,
+) -> tuple[RateLimitDecision, dict[str, float]]:
+    # All-or-nothing: a request is counted against every key only when every key allows it.
+    decisions = []
+    new_tats: dict[str, float] = {}
+    for rule in rules:
+        decision, new_tat = _gcra(rule, tats.get(rule.key), now)
+        decisions.append(decision)
+        new_tats[rule.key] = new_tat
+    denied = [decision for decision in decisions if not decision.allowed]
+    if denied:
+        return max(denied, key=lambda decision: decision.retry_after_seconds), {}
+    return min(decisions, key=lambda decision: decision.remaining), new_tats
+
+
+def _active_rules(rules: Sequence[RateLimit]) -> list[RateLimit]:
+    return [rule for rule in rules if rule.limit > 0 and rule.window_seconds > 0]
+
+
+class RequestRateLimiter:
+    """Spaces calls evenly so concurrent workers stay under ``requests_per_minute`` in total."""
+
+    def __init__(self, requests_per_minute: int) -> None:
+        self.interval_seconds = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = Lock()
+
+    def wait(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval_seconds
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RateLimiterBackend(ABC):
+    @abstractmethod
+    def hit(self, rules: Sequence[RateLimit]) -> RateLimitDecision:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryRateLimiterBackend(RateLimiterBackend):
+    """Per-process limiter. Keys are dropped once their bucket is full again, oldest first beyond ``max_keys``."""
+
+    _SWEEP_EVERY_HITS = 1000
+
+    def __init__(self, *, max_keys: int, clock: Callable[[], float] = time.time) -> None:
+        self._max_keys = max(1, max_keys)
+        self._clock = clock
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._hits = 0
+        self._lock = Lock()
+
+    def hit(self, rules: Sequence[RateLimit]) -> RateLimitDecision:
+        rules = _active_rules(rules)
+        if not rules:
+            return ALLOW_ALL
+        with self._lock:
+            now = self._clock()
+            tats = {rule.key: self._tats[rule.key] for rule in rules if rule.key in self._tats}
+            decision, new_tats = _decide(rules, tats, now)
+            for key, tat in new_tats.items():
+                self._tats[key] = tat
+                self._tats.move_to_end(key)
+            self._hits += 1
+            if self._hits % self._SWEEP_EVERY_HITS == 0:
+                self._sweep(now)
+            while len(self._tats) > self._max_keys:
+                self._tats.popitem(last=False)
+        return decision
+
+    def _sweep(self, now: float) -> None:
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+
+class PostgresRateLimiterBackend(RateLimiterBackend):
+    """Limiter shared by every worker and host, stored in the unlogged `rate_limit_buckets` table (sql/024)."""
+
+    _PURGE_EVERY_HITS = 500
+
+    def __init__(self, engine_factory: Callable[[], object]) -> None:
+        self._engine_factory = engine_factory
+        self._hits = 0
+        self._lock = Lock()
+
+    def hit(self, rules: Sequence[RateLimit]) -> RateLimitDecision:
+        rules = _active_rules(rules)
+        if not rules:
+            return ALLOW_ALL
+        keys = sorted({rule.key for rule in rules})
+        with self._lock:
+            self._hits += 1
+            purge_expired = self._hits % self._PURGE_EVERY_HITS == 0
+        with self._engine_factory().begin() as conn:
+            # Rows are created first so concurrent first hits serialize on the row lock below.
+            conn.execute(
+                text(
+                    """
+                    insert into rate_limit_buckets (bucket_key, tat)
+                    select unnest(cast(:keys as text[])), clock_timestamp()
+                    on conflict (bucket_key) do nothing
+                    """
+                ),
+                {"keys": keys},
+            )
+            rows = (
+                conn.execute(
+                    text(
+                        """
+                        select
+                          bucket_key,
+                          extract(epoch from tat)::float8 as tat,
+                          extract(epoch from clock_timestamp())::float8 as now
+                        from rate_limit_buckets
+                        where bucket_key = any(cast(:keys as text[]))
+                        order by bucket_key
+                        for update
+                        """
+                    ),
+                    {"keys": keys},
+                )
+                .mappings()
+                .all()
+            )
+            now = float(rows[0]["now"]) if rows else time.time()
+            decision, new_tats = _decide(rules, {row["bucket_key"]: float(row["tat"]) for row in rows}, now)
+            if new_tats:
+                conn.execute(
+                    text(
+                        """
+                        update rate_limit_buckets b
+                        set tat = to_timestamp(v.tat)
+                        from unnest(cast(:keys as text[]), cast(:tats as float8[])) as v(bucket_key, tat)
+                        where b.bucket_key = v.bucket_key
+                        """
+                    ),
+                    {"keys": list(new_tats), "tats": list(new_tats.values())},
+                )
+            if purge_expired:
+                conn.execute(text("delete from rate_limit_buckets where tat <= now()"))
+        return decision
+
+    def clear(self) -> None:
+        with self._engine_factory().begin() as conn:
+            conn.execute(text("delete from rate_limit_buckets"))
+
+
+class RateLimiter:
+    """Checks requests against one or more keyed limits on a shared backend.
+
+    Backend failures fail open: a broken limiter must not take signup or explore down with it.
+    """
+
+    def __init__(self, backend: RateLimiterBackend) -> None:
+        self.backend = backend
+
+    def hit(self, scope: str, rules: Sequence[RateLimit]) -> RateLimitDecision:
+        try:
+            decision = self.backend.hit(rules)
+        except Exception:
+            RATE_LIMIT_DECISIONS_TOTAL.inc(scope=scope, result="error")
+            logger.warning("Rate limiter backend failed; allowing request (scope=%s).", scope, exc_info=True)
+            return ALLOW_ALL
+        RATE_LIMIT_DECISIONS_TOTAL.inc(scope=scope, result="allowed" if decision.allowed else "limited")
+        return decision
+
+
+def build_rate_limiter(settings: Settings) -> RateLimiter:
+    if settings.rate_limit_backend == "postgres":
+        from app.db.session import get_engine
+
+        return RateLimiter(PostgresRateLimiterBackend(get_engine))
+    return RateLimiter(InMemoryRateLimiterBackend(max_keys=settings.rate_limit_memory_max_keys))
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    return build_rate_limiter(get_settings())
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> dict[str, str]:
+    headers = {
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(max(0, decision.remaining)),
+        "RateLimit-Reset": str(max(0, math.ceil(decision.reset_after_seconds))),
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after_seconds)))
+    return headers
+
+
+def record_rate_limit_decision(request: Request, decision: RateLimitDecision) -> None:
+    if not decision.limit:
+        return
+    decisions = getattr(request.state, _DECISIONS_STATE_KEY, None)
+    if decisions is None:
+        decisions = []
+        setattr(request.state, _DECISIONS_STATE_KEY, decisions)
+    decisions.append(decision)
+
+
+def apply_rate_limit_headers(request: Request, response: Response) -> None:
+    # Applied by the request middleware so the headers also reach endpoints returning a Response directly.
+    decisions: list[RateLimitDecision] = getattr(request.state, _DECISIONS_STATE_KEY, None) or []
+    if not decisions:
+        return
+    tightest = min(decisions, key=lambda decision: decision.remaining)
+    for name, value in rate_limit_headers(tightest).items():
+        response.headers.setdefault(name, value)
@@ -0,0 +1,354 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
+from threading import Lock
+from typing import TypeVar
+from uuid import UUID
+
+import anyio.to_thread
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.fast_json import dumps
+
+_T = TypeVar("_T")
+
+EXPLORE_TEACHERS_TAG = "explore:teachers"
+CACHE_STATUS_HEADER = "X-Cache"
+
+_PENDING_TAGS_KEY = "kidario_response_cache_pending_tags"
+_LOGGER_NAME = "kidario.response_cache"
+_logger = logging.getLogger(_LOGGER_NAME)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    tags: frozenset[str]
+    expires_at: float
+
+
+class ResponseCacheBackend:
+    def get(self, key: str) -> CachedResponse | None:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class DisabledResponseCacheBackend(ResponseCacheBackend):
+    def get(self, key: str) -> CachedResponse | None:
+        return None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        return None
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+
+class InMemoryResponseCacheBackend(ResponseCacheBackend):
+    def __init__(self, *, max_entries: int, clock: Callable[[], float] = time.time) -> None:
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+
+class PostgresResponseCacheBackend(ResponseCacheBackend):
+    """Shared cache stored in the unlogged `response_cache_entries` table (sql/022)."""
+
+    _PURGE_EVERY_WRITES = 200
+
+    def __init__(self, engine_factory: Callable[[], object]) -> None:
+        self._engine_factory = engine_factory
+        self._writes = 0
+        self._lock = Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        try:
+            with self._engine_factory().connect() as conn:
+                row = (
+                    conn.execute(
+                        text(
+                            """
+                            select etag, body, tags, extract(epoch from expires_at) as expires_at
+                            from response_cache_entries
+                            where cache_key = :cache_key
+                              and expires_at > now()
+                            """
+                        ),
+                        {"cache_key": key},
+                    )
+                    .mappings()
+                    .first()
+                )
+        except Exception:
+            _logger.warning("response_cache_get_failed key=%s", key, exc_info=True)
+            return None
+        if not row:
+            return None
+        return CachedResponse(
+            body=bytes(row["body"]),
+            etag=str(row["etag"]),
+            tags=frozenset(row["tags"] or ()),
+            expires_at=float(row["expires_at"]),
+        )
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._writes += 1
+            purge_expired = self._writes % self._PURGE_EVERY_WRITES == 0
+        try:
+            with self._engine_factory().begin() as conn:
+                conn.execute(
+                    text(
+                        """
+                        insert into response_cache_entries (cache_key, etag, body, tags, expires_at)
+                        values (:cache_key, :etag, :body, cast(:tags as text[]), to_timestamp(:expires_at))
+                        on conflict (cache_key) do update
+                        set etag = excluded.etag,
+                            body = excluded.body,
+                            tags = excluded.tags,
+                            expires_at = excluded.expires_at,
+                            created_at = now()
+                        """
+                    ),
+                    {
+                        "cache_key": key,
+                        "etag": entry.etag,
+                        "body": entry.body,
+                        "tags": sorted(entry.tags),
+                        "expires_at": entry.expires_at,
+                    },
+                )
+                if purge_expired:
+                    conn.execute(text("delete from response_cache_entries where expires_at <= now()"))
+        except Exception:
+            _logger.warning("response_cache_set_failed key=%s", key, exc_info=True)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tag_list = sorted(set(tags))
+        if not tag_list:
+            return
+        try:
+            with self._engine_factory().begin() as conn:
+                conn.execute(
+                    text("delete from response_cache_entries where tags && cast(:tags as text[])"),
+                    {"tags": tag_list},
+                )
+        except Exception:
+            _logger.warning("response_cache_invalidate_failed tags=%s", tag_list, exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            with self._engine_factory().begin() as conn:
+                conn.execute(text("delete from response_cache_entries"))
+        except Exception:
+            _logger.warning("response_cache_clear_failed", exc_info=True)
+
+
+def build_response_cache_backend(settings: Settings) -> ResponseCacheBackend:
+    if settings.response_cache_backend == "disabled" or settings.response_cache_ttl_seconds <= 0:
+        return DisabledResponseCacheBackend()
+    if settings.response_cache_backend == "postgres":
+        from app.db.session import get_engine
+
+        return PostgresResponseCacheBackend(get_engine)
+    return InMemoryResponseCacheBackend(max_entries=settings.response_cache_max_entries)
+
+
+@lru_cache
+def get_response_cache() -> ResponseCacheBackend:
+    return build_response_cache_backend(get_settings())
+
+
+def teacher_cache_tag(teacher_id: UUID | str) -> str:
+    return f"teacher:{teacher_id}"
+
+
+def _normalize_cache_param(value: object) -> object:
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        return normalized or None
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def build_cache_key(namespace: str, params: Mapping[str, object]) -> str:
+    normalized = {}
+    for name, value in params.items():
+        normalized_value = _normalize_cache_param(value)
+        if normalized_value is not None:
+            normalized[name] = normalized_value
+    digest = hashlib.sha256(
+        json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _build_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _cache_control_header(settings: Settings) -> str:
+    max_age = max(0, settings.response_cache_ttl_seconds)
+    stale = max(0, settings.response_cache_stale_while_revalidate_seconds)
+    if stale:
+        return f"public, max-age={max_age}, stale-while-revalidate={stale}"
+    return f"public, max-age={max_age}"
+
+
+async def serve_cached_json(
+    request: Request,
+    *,
+    namespace: str,
+    params: Mapping[str, object],
+    build: Callable[[], Awaitable[tuple[BaseModel | Mapping[str, object], Iterable[str]]]],
+) -> Response:
+    settings = get_settings()
+    cache = get_response_cache()
+    key = build_cache_key(namespace, params)
+
+    async def _call(func: Callable[..., _T], *args: object) -> _T:
+        # The in-memory backend is a dict lookup; the Postgres backend does blocking I/O, kept off the event loop.
+        if isinstance(cache, InMemoryResponseCacheBackend | DisabledResponseCacheBackend):
+            return func(*args)
+        return await anyio.to_thread.run_sync(func, *args)
+
+    entry = await _call(cache.get, key)
+    cache_status = "HIT"
+    if entry is None:
+        cache_status = "MISS"
+        content, tags = await build()
+        body = dumps(content)
+        entry = CachedResponse(
+            body=body,
+            etag=_build_etag(body),
+            tags=frozenset(tags),
+            expires_at=time.time() + settings.response_cache_ttl_seconds,
+        )
+        await _call(cache.set, key, entry)
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": _cache_control_header(settings),
+        CACHE_STATUS_HEADER: cache_status,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def invalidate_on_commit(db: Session, tags: Iterable[str]) -> None:
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        get_response_cache().invalidate_tags(tags)
+        return
+    info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+
+def invalidate_teacher_public_cache(db: Session, teacher_id: UUID | str | None) -> None:
+    tags = {EXPLORE_TEACHERS_TAG}
+    if teacher_id is not None:
+        tags.add(teacher_cache_tag(teacher_id))
+    invalidate_on_commit(db, tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_pending_invalidations(session: Session) -> None:
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        get_response_cache().invalidate_tags(tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_invalidations(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_TAGS_KEY, None)
@@ -5,7 +5,7 @@ import ssl
 from pydantic import BaseModel
 
 from app.core.config import get_settings
-from app.core.ssl_utils import build_ssl_context
+from app.core.ssl_utils import shared_ssl_context
 
 SUPPORTED_JWKS_ALGORITHMS = {"RS256", "ES256", "EDDSA"}
 
@@ -40,7 +40,7 @@ class SupabaseJWTVerifier:
     def _build_ssl_context(ca_bundle_path: str | None) -> ssl.SSLContext:
         # Prefer an explicit CA bundle when configured, but fall back cleanly if
         # a local path becomes stale after a Python/venv upgrade.
-        return build_ssl_context(ca_bundle_path)
+        return shared_ssl_context(ca_bundle_path)
 
     def _get_jwk_client(self):
         if self._jwk_client is None:
@@ -52,6 +52,10 @@ class SupabaseJWTVerifier:
             )
         return self._jwk_client
 
+    def prefetch_jwks(self) -> int:
+        # Fills PyJWKClient's key-set cache (and imports PyJWT's crypto backends) ahead of the first token.
+        return len(self._get_jwk_client().get_jwk_set().keys)
+
     def _decode_with_jwks(self, token: str, algorithm: str) -> dict:
         if algorithm not in SUPPORTED_JWKS_ALGORITHMS:
             raise InvalidTokenError(f"Unsupported JWT algorithm for JWKS verification: {algorithm}")
@@ -1,4 +1,5 @@
 import ssl
+from functools import lru_cache
 
 import certifi
 
@@ -25,3 +26,10 @@ def build_ssl_context(ca_bundle_path: str | None = None) -> ssl.SSLContext:
             continue
 
     return ssl.create_default_context()
+
+
+@lru_cache(maxsize=16)
+def shared_ssl_context(ca_bundle_path: str | None = None) -> ssl.SSLContext:
+    # Loading a CA bundle costs a few milliseconds; outbound calls reuse one context per bundle instead.
+    # SSLContext is safe to share between threads once configured.
+    return build_ssl_context((ca_bundle_path or "").strip() or None)
@@ -0,0 +1,360 @@
+import json
+import logging
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import Any, TypeVar
+from urllib import request
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import Settings, get_settings
+
+TRACEPARENT_HEADER = "traceparent"
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_STATUS_UNSET = 0
+_STATUS_ERROR = 2
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_LOGGER_NAME = "kidario.tracing"
+_logger = logging.getLogger(_LOGGER_NAME)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class Span:
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        *,
+        trace_id: str,
+        parent_span_id: str | None,
+        kind: int,
+        attributes: dict[str, Any] | None = None,
+        sampled: bool = True,
+    ) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        # Unsampled spans only carry the trace context: children inherit the decision, nothing is exported.
+        self.sampled = sampled
+        self.attributes: dict[str, Any] = dict(attributes or {}) if sampled else {}
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: int | None = None
+        self.status_code = _STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def set_error(self, message: str) -> None:
+        self.status_code = _STATUS_ERROR
+        self.status_message = message[:500]
+
+    def end(self) -> None:
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        if self.sampled:
+            self._tracer.export(self)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class _NoopSpan:
+    trace_id = ""
+    span_id = ""
+    traceparent = ""
+    sampled = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def update_name(self, name: str) -> None:
+        return None
+
+    def set_error(self, message: str) -> None:
+        return None
+
+    def end(self) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Span | None] = ContextVar("kidario_current_span", default=None)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def span_to_otlp(span: Span) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": span.status_code, "message": span.status_message},
+    }
+    if span.parent_span_id:
+        payload["parentSpanId"] = span.parent_span_id
+    return payload
+
+
+class OtlpHttpSpanExporter:
+    """Batches finished spans and posts them as OTLP/HTTP JSON from a daemon thread."""
+
+    def __init__(
+        self,
+        *,
+        endpoint: str,
+        service_name: str,
+        timeout_seconds: float,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        flush_interval_seconds: float = 2.0,
+    ) -> None:
+        self._url = f"{endpoint.rstrip('/')}/v1/traces"
+        self._service_name = service_name
+        self._timeout_seconds = timeout_seconds
+        self._max_batch_size = max_batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=max_queue_size)
+        self._worker = threading.Thread(target=self._run, name="kidario-otlp-exporter", daemon=True)
+        self._worker.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            _logger.debug("trace_span_dropped name=%s", span.name)
+
+    def _drain(self, first: Span) -> list[Span]:
+        batch = [first]
+        while len(batch) < self._max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self._flush_interval_seconds)
+            except queue.Empty:
+                continue
+            self._send(self._drain(first))
+
+    def _send(self, spans: list[Span]) -> None:
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": self._service_name})},
+                    "scopeSpans": [{"scope": {"name": "kidario"}, "spans": [span_to_otlp(span) for span in spans]}],
+                }
+            ]
+        }
+        req = request.Request(
+            url=self._url,
+            data=json.dumps(body).encode("utf-8"),
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with request.urlopen(req, timeout=self._timeout_seconds):
+                return
+        except Exception as exc:
+            _logger.warning("trace_export_failed spans=%s reason=%s", len(spans), exc)
+
+
+class Tracer:
+    def __init__(self, exporter: Any, *, sample_ratio: float = 1.0) -> None:
+        self._exporter = exporter
+        self._sample_ratio = max(0.0, min(1.0, sample_ratio))
+
+    def export(self, span: Span) -> None:
+        self._exporter.export(span)
+
+    def create_span(
+        self,
+        name: str,
+        *,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: dict[str, Any] | None = None,
+        parent: Span | None = None,
+        remote_parent: tuple[str, str, bool] | None = None,
+    ) -> Span:
+        parent = parent if parent is not None else _current_span.get()
+        if parent is not None:
+            trace_id, parent_span_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+        elif remote_parent is not None:
+            trace_id, parent_span_id, sampled = remote_parent
+        else:
+            trace_id, parent_span_id = secrets.token_hex(16), None
+            sampled = self._sample_ratio >= 1.0 or random.random() < self._sample_ratio
+        return Span(
+            self,
+            name,
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            kind=kind,
+            attributes=attributes,
+            sampled=sampled,
+        )
+
+
+def build_tracer(settings: Settings) -> Tracer | None:
+    if not settings.tracing_otlp_endpoint:
+        return None
+    exporter = OtlpHttpSpanExporter(
+        endpoint=settings.tracing_otlp_endpoint,
+        service_name=settings.tracing_service_name,
+        timeout_seconds=settings.tracing_export_timeout_seconds,
+    )
+    return Tracer(exporter, sample_ratio=settings.tracing_sample_ratio)
+
+
+@lru_cache
+def get_tracer() -> Tracer | None:
+    return build_tracer(get_settings())
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    if not value:
+        return None
+    match = _TRACEPARENT_RE.match(value.strip().lower())
+    if not match:
+        return None
+    trace_id, parent_span_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_span_id == "0" * 16:
+        return None
+    return trace_id, parent_span_id, bool(int(flags, 16) & 0x01)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    *,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: dict[str, Any] | None = None,
+    remote_parent: tuple[str, str, bool] | None = None,
+) -> Iterator[Span | _NoopSpan]:
+    tracer = get_tracer()
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+
+    span = tracer.create_span(name, kind=kind, attributes=attributes, remote_parent=remote_parent)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.set_error(f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def traced(name: str) -> Callable[[_F], _F]:
+    def decorator(func: _F) -> _F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if get_tracer() is None:
+                return func(*args, **kwargs)
+            with start_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def inject_trace_headers(req: request.Request) -> None:
+    span = _current_span.get()
+    if span is not None:
+        req.add_header(TRACEPARENT_HEADER, span.traceparent)
+
+
+_SQL_SPAN_ATTR = "_kidario_sql_span"
+_MAX_STATEMENT_ATTRIBUTE_LENGTH = 2000
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    tracer = get_tracer()
+    parent = _current_span.get()
+    if tracer is None or parent is None or not parent.sampled:
+        return
+    span = tracer.create_span(
+        "db.query",
+        kind=SPAN_KIND_CLIENT,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:_MAX_STATEMENT_ATTRIBUTE_LENGTH],
+        },
+        parent=parent,
+    )
+    setattr(context, _SQL_SPAN_ATTR, span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = getattr(context, _SQL_SPAN_ATTR, None)
+    if span is not None:
+        span.set_attribute("db.rows_affected", cursor.rowcount)
+        span.end()
+
+
+def _handle_error(exception_context) -> None:
+    span = getattr(exception_context.execution_context, _SQL_SPAN_ATTR, None)
+    if span is not None:
+        span.set_error(str(exception_context.original_exception))
+        span.end()
+
+
+def instrument_engine_tracing(engine: Engine) -> Engine:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+WARMUP_STEP_SECONDS = REGISTRY.gauge(
+    "kidario_warmup_step_seconds",
+    "Duration of each start-up warm-up step in the last warm-up run.",
+    ("step",),
+)
+WARMUP_FAILURES_TOTAL = REGISTRY.counter(
+    "kidario_warmup_failures_total",
+    "Start-up warm-up steps that failed; the first request then pays for them instead.",
+    ("step",),
+)
+
+
+def _warm_database(settings: Settings) -> None:
+    from app.db.session import get_engine
+
+    engine = get_engine()
+    connections = []
+    try:
+        # Held open together so the pool ends up with that many established connections, not one reused.
+        for _ in range(max(1, settings.warmup_database_connections)):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.exec_driver_sql("select 1")
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def _warm_ssl_contexts(settings: Settings) -> None:
+    from app.core.ssl_utils import shared_ssl_context
+
+    bundles = {
+        None,
+        settings.supabase_jwks_ca_bundle,
+        settings.pagarme_ca_bundle,
+        settings.teacher_activity_llm_ca_bundle,
+        settings.google_geocoding_ca_bundle,
+        settings.viacep_ca_bundle,
+    }
+    for ca_bundle_path in bundles:
+        shared_ssl_context(ca_bundle_path)
+
+
+def _warm_jwks(_: Settings) -> None:
+    from app.core.security import get_jwt_verifier
+
+    get_jwt_verifier().prefetch_jwks()
+
+
+WARMUP_STEPS: tuple[tuple[str, Callable[[Settings], None]], ...] = (
+    ("database", _warm_database),
+    ("ssl", _warm_ssl_contexts),
+    ("jwks", _warm_jwks),
+)
+
+
+def warm_up(settings: Settings | None = None) -> dict[str, bool]:
+    """Runs every warm-up step and reports which ones succeeded; failures are logged, never raised."""
+
+    settings = settings or get_settings()
+    results: dict[str, bool] = {}
+    for name, step in WARMUP_STEPS:
+        started_at = time.perf_counter()
+        try:
+            step(settings)
+            results[name] = True
+        except Exception:
+            WARMUP_FAILURES_TOTAL.inc(step=name)
+            logger.warning("warmup_step_failed step=%s", name, exc_info=True)
+            results[name] = False
+        duration = time.perf_counter() - started_at
+        WARMUP_STEP_SECONDS.set(duration, step=name)
+        logger.info("warmup_step step=%s ok=%s duration_ms=%.1f", name, results[name], duration * 1000)
+    return results
+
+
+def start_warmup() -> threading.Thread | None:
+    # Runs beside the server instead of inside lifespan startup, so the port binds and health checks
+    # answer right away; requests arriving meanwhile simply build what they need themselves.
+    if not get_settings().warmup_enabled:
+        return None
+    thread = threading.Thread(target=warm_up, name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -1,17 +1,27 @@
-from collections.abc import Generator
-from functools import lru_cache
+from collections.abc import AsyncGenerator, Callable, Generator
+from functools import lru_cache, partial
+from typing import Any, TypeVar
+from uuid import uuid4
 
+import anyio.to_thread
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.metrics import instrument_engine
+from app.core.query_inspector import install_query_inspection
+from app.core.tracing import instrument_engine_tracing
+
+_T = TypeVar("_T")
 
 
 @lru_cache
 def get_engine() -> Engine:
     settings = get_settings()
-    return create_engine(settings.database_url, pool_pre_ping=True, future=True)
+    engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
+    return instrument_engine_tracing(install_query_inspection(instrument_engine(engine)))
 
 
 @lru_cache
@@ -30,3 +40,90 @@ def get_db() -> Generator[Session, None, None]:
         if db.in_transaction():
             db.rollback()
         db.close()
+
+
+def async_database_url(settings: Settings) -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    query = dict(url.query)
+    # libpq's sslmode is spelled ssl for asyncpg (same values: require, verify-full, ...).
+    sslmode = query.pop("sslmode", None)
+    if sslmode:
+        query["ssl"] = sslmode
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+
+# Prepared statements live on the server connection, which a transaction pooler (Supabase/PgBouncer, port 6543)
+# swaps between transactions: keep no asyncpg or SQLAlchemy statement cache and never reuse a statement name.
+ASYNCPG_CONNECT_ARGS: dict[str, Any] = {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+    "prepared_statement_name_func": lambda: f"__kidario_{uuid4().hex}__",
+}
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    settings = get_settings()
+    engine = create_async_engine(
+        async_database_url(settings),
+        pool_pre_ping=True,
+        pool_size=settings.async_database_pool_size,
+        max_overflow=settings.async_database_max_overflow,
+        connect_args=ASYNCPG_CONNECT_ARGS,
+    )
+    # Statements run through the sync facade (AsyncSession.run_sync included), so the usual query metrics,
+    # inspection and tracing hooks apply unchanged.
+    instrument_engine_tracing(install_query_inspection(instrument_engine(engine.sync_engine)))
+    return engine
+
+
+@lru_cache
+def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
+class ThreadedReadSession:
+    """``AsyncSession.run_sync`` over a regular Session in the threadpool, used when the async engine is off."""
+
+    def __init__(self, db: Session) -> None:
+        self.sync_session = db
+
+    async def run_sync(self, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        return await anyio.to_thread.run_sync(partial(fn, self.sync_session, *args, **kwargs))
+
+
+ReadSession = AsyncSession | ThreadedReadSession
+
+
+async def get_async_db() -> AsyncGenerator[ReadSession, None]:
+    """Session for async read endpoints: ``await db.run_sync(load_function, *args)``.
+
+    With the async engine, the sync load function runs on the event loop and every query awaits asyncpg, so
+    waiting on Postgres holds no threadpool thread. Keep anything else off the loop: storage URL signing, slot
+    generation and similar work go through ``anyio.to_thread.run_sync`` once the rows are loaded.
+    """
+
+    if not get_settings().async_database_enabled:
+        db = get_session_maker()()
+        try:
+            yield ThreadedReadSession(db)
+        finally:
+            await anyio.to_thread.run_sync(db.close)
+        return
+
+    async with get_async_session_maker()() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            if db.in_transaction():
+                await db.rollback()
@@ -1,15 +1,37 @@
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v2.endpoints.health import get_health
 from app.api.v2.router import api_router as api_v2_router
+from app.core.background_jobs import shutdown_background_jobs
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
 from app.core.observability import configure_logging, request_observability_middleware
+from app.core.process_pool import shutdown_process_pools
+from app.core.warmup import start_warmup
+from app.db.session import dispose_async_engine
 
 settings = get_settings()
 configure_logging()
 
-app = FastAPI(title="Kidario Backend", version="0.1.0")
+# Environments where /metrics may be scraped without KIDARIO_METRICS_BEARER_TOKEN.
+_OPEN_METRICS_ENVS = frozenset({"development", "local", "test"})
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    start_warmup()
+    yield
+    shutdown_process_pools()
+    shutdown_background_jobs()
+    await dispose_async_engine()
+
+
+app = FastAPI(title="Kidario Backend", version="0.1.0", lifespan=lifespan)
 app.middleware("http")(request_observability_middleware)
 
 app.add_middleware(
@@ -19,11 +41,32 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so it compresses the final body and headers of every response.
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(api_v2_router, prefix=settings.api_v2_prefix)
 
 
 @app.get("/api/v1/health", include_in_schema=False)
-def get_legacy_health() -> dict[str, str]:
+def get_legacy_health() -> dict[str, object]:
     # Compatibility only: some deploy health checks still point to the retired v1 prefix.
     return get_health()
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics(authorization: str | None = Header(default=None)) -> Response:
+    current_settings = get_settings()
+    if not current_settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not current_settings.metrics_bearer_token:
+        # Route names, SQL counts and provider error rates are not public outside local development.
+        if current_settings.env not in _OPEN_METRICS_ENVS:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Metrics require KIDARIO_METRICS_BEARER_TOKEN outside development.",
+            )
+    else:
+        expected = f"Bearer {current_settings.metrics_bearer_token}"
+        if not hmac.compare_digest(authorization or "", expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token.")
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
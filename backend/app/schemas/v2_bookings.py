@@ -77,6 +77,17 @@ class PaymentCharge(BaseModel):
     updated_at: datetime
 
 
+class PaymentSplit(BaseModel):
+    id: UUID
+    payment_order_id: UUID
+    teacher_id: UUID | None = None
+    split_role: Literal["platform", "teacher"]
+    type: Literal["flat", "percentage"]
+    amount_cents: int | None = None
+    percentage: float | None = None
+    created_at: datetime
+
+
 class PaymentOrder(BaseModel):
     id: UUID
     parent_id: UUID
@@ -93,12 +104,14 @@ class PaymentOrder(BaseModel):
     paid_at: datetime | None = None
     expires_at: datetime | None = None
     charges: list[PaymentCharge] = Field(default_factory=list)
+    splits: list[PaymentSplit] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
 
 
 class PaymentOrdersResponse(BaseModel):
     payments: list[PaymentOrder]
+    next_cursor: str | None = None
 
 
 class TeacherAvailabilitySlotDay(BaseModel):
@@ -0,0 +1,254 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.rate_limit import RequestRateLimiter
+from app.core.tracing import traced
+from app.services.booking_v2_service import build_teacher_activity_plan_context
+from app.services.teacher_activity_planner_service import (
+    TeacherActivityPlanInput,
+    activity_plan_llm_configured,
+    build_activity_plan_context_hash,
+    bulk_persist_booking_activity_plans,
+    generate_teacher_activity_plan,
+)
+
+PRECOMPUTE_STATUSES = ("confirmada",)
+
+
+@dataclass
+class PlanCandidate:
+    booking_id: str
+    teacher_id: str
+    child_id: str
+    starts_at: datetime
+    planner_input: TeacherActivityPlanInput
+    context_hash: str
+    current_context_hash: str | None
+    current_source: str | None
+
+
+@dataclass
+class PrecomputeSummary:
+    scanned: int = 0
+    stale: int = 0
+    written: int = 0
+    sources: Counter = field(default_factory=Counter)
+
+
+def _load_candidate_page(
+    db: Session,
+    *,
+    statuses: tuple[str, ...],
+    starts_after: datetime | None,
+    starts_before: datetime | None,
+    teacher_id: str | None,
+    cursor: tuple[datetime, str] | None,
+    batch_size: int,
+) -> list[PlanCandidate]:
+    where_clauses = ["b.status = any(:statuses)"]
+    params: dict[str, object] = {"statuses": list(statuses), "batch_size": batch_size}
+    if starts_after is not None:
+        where_clauses.append("b.starts_at >= :starts_after")
+        params["starts_after"] = starts_after
+    if starts_before is not None:
+        where_clauses.append("b.starts_at < :starts_before")
+        params["starts_before"] = starts_before
+    if teacher_id:
+        where_clauses.append("b.teacher_id = :teacher_id")
+        params["teacher_id"] = teacher_id
+    if cursor is not None:
+        where_clauses.append("(b.starts_at, b.id) > (:cursor_starts_at, cast(:cursor_id as uuid))")
+        params["cursor_starts_at"], params["cursor_id"] = cursor
+
+    rows = (
+        db.execute(
+            text(
+                f"""
+                select
+                  b.id,
+                  b.teacher_id,
+                  b.child_id,
+                  b.starts_at,
+                  c.name as child_name,
+                  c.birth_month_year as child_birth_month_year,
+                  c.focus_points as child_focus_points,
+                  coalesce(completed_counter.completed_lessons_with_child, 0) as completed_lessons_with_child,
+                  latest_follow_up.booking_id as latest_follow_up_booking_id,
+                  latest_follow_up.summary as latest_follow_up_summary,
+                  latest_follow_up.objectives as latest_follow_up_objectives,
+                  latest_follow_up.next_objectives as latest_follow_up_next_objectives,
+                  bap.context_hash as plan_context_hash,
+                  bap.source as plan_source
+                from bookings b
+                join children c on c.id = b.child_id
+                left join booking_activity_plans bap on bap.booking_id = b.id
+                left join lateral (
+                  select count(*)::int as completed_lessons_with_child
+                  from bookings b_completed
+                  where b_completed.teacher_id = b.teacher_id
+                    and b_completed.child_id = b.child_id
+                    and b_completed.status = 'concluida'
+                    and b_completed.starts_at < b.starts_at
+                ) completed_counter on true
+                left join lateral (
+                  select bf.booking_id, bf.summary, bf.objectives, bf.next_objectives
+                  from booking_follow_ups bf
+                  join bookings b_follow_up on b_follow_up.id = bf.booking_id
+                  where b_follow_up.teacher_id = b.teacher_id
+                    and b_follow_up.child_id = b.child_id
+                    and b_follow_up.starts_at < b.starts_at
+                  order by b_follow_up.starts_at desc, bf.updated_at desc
+                  limit 1
+                ) latest_follow_up on true
+                where {' and '.join(where_clauses)}
+                order by b.starts_at asc, b.id asc
+                limit :batch_size
+                """
+            ),
+            params,
+        )
+        .mappings()
+        .all()
+    )
+
+    candidates = []
+    for row in rows:
+        latest_follow_up = None
+        if row["latest_follow_up_booking_id"] is not None:
+            latest_follow_up = {
+                "summary": row["latest_follow_up_summary"],
+                "objectives": row["latest_follow_up_objectives"],
+                "next_objectives": row["latest_follow_up_next_objectives"],
+            }
+        context = build_teacher_activity_plan_context(
+            row,
+            completed_lessons_with_child=int(row["completed_lessons_with_child"] or 0),
+            latest_previous_follow_up=latest_follow_up,
+        )
+        planner_input = context["planner_input"]
+        candidates.append(
+            PlanCandidate(
+                booking_id=str(row["id"]),
+                teacher_id=str(row["teacher_id"]),
+                child_id=str(row["child_id"]),
+                starts_at=row["starts_at"],
+                planner_input=planner_input,
+                context_hash=build_activity_plan_context_hash(planner_input),
+                current_context_hash=row["plan_context_hash"],
+                current_source=row["plan_source"],
+            )
+        )
+    return candidates
+
+
+def _needs_plan(candidate: PlanCandidate, llm_configured: bool) -> bool:
+    if candidate.current_context_hash != candidate.context_hash:
+        return True
+    # Retry LLM plans that previously fell back (LLM down, retries exhausted).
+    return llm_configured and candidate.current_source == "fallback"
+
+
+def _generate_plans(
+    candidates: list[PlanCandidate],
+    settings: Settings,
+    *,
+    concurrency: int,
+    rate_limiter: RequestRateLimiter,
+) -> list[dict]:
+    llm_configured = activity_plan_llm_configured(settings)
+
+    def _generate(candidate: PlanCandidate) -> dict:
+        if llm_configured:
+            rate_limiter.wait()
+        plan = generate_teacher_activity_plan(candidate.planner_input, settings)
+        return {
+            "booking_id": candidate.booking_id,
+            "teacher_id": candidate.teacher_id,
+            "child_id": candidate.child_id,
+            "source": plan["source"],
+            "activities": plan["activities"],
+            "context_hash": candidate.context_hash,
+        }
+
+    if not llm_configured or concurrency <= 1:
+        return [_generate(candidate) for candidate in candidates]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="activity-plan-precompute") as executor:
+        return list(executor.map(_generate, candidates))
+
+
+@traced("activity_plan.precompute")
+def precompute_activity_plans(
+    db: Session,
+    *,
+    statuses: tuple[str, ...] = PRECOMPUTE_STATUSES,
+    starts_after: datetime | None = None,
+    starts_before: datetime | None = None,
+    teacher_id: str | None = None,
+    limit: int = 0,
+    dry_run: bool = False,
+    settings: Settings | None = None,
+) -> PrecomputeSummary:
+    # Scans bookings in keyset pages. Plans that are missing or built from an outdated context are
+    # generated concurrently (LLM calls rate limited) and written with one statement per page.
+    resolved_settings = settings or get_settings()
+    llm_configured = activity_plan_llm_configured(resolved_settings)
+    batch_size = max(1, resolved_settings.activity_plan_precompute_batch_size)
+    rate_limiter = RequestRateLimiter(resolved_settings.teacher_activity_llm_requests_per_minute)
+    summary = PrecomputeSummary()
+    cursor: tuple[datetime, str] | None = None
+
+    while True:
+        page_size = batch_size if limit <= 0 else min(batch_size, limit - summary.scanned)
+        if page_size <= 0:
+            break
+        candidates = _load_candidate_page(
+            db,
+            statuses=statuses,
+            starts_after=starts_after,
+            starts_before=starts_before,
+            teacher_id=teacher_id,
+            cursor=cursor,
+            batch_size=page_size,
+        )
+        if not candidates:
+            break
+        summary.scanned += len(candidates)
+        cursor = (candidates[-1].starts_at, candidates[-1].booking_id)
+
+        stale = [candidate for candidate in candidates if _needs_plan(candidate, llm_configured)]
+        summary.stale += len(stale)
+        if dry_run or not stale:
+            db.rollback()
+            continue
+
+        # Release the connection while the page's plans are generated.
+        db.rollback()
+        plans = _generate_plans(
+            stale,
+            resolved_settings,
+            concurrency=resolved_settings.activity_plan_precompute_concurrency,
+            rate_limiter=rate_limiter,
+        )
+        summary.sources.update(plan["source"] for plan in plans)
+        summary.written += bulk_persist_booking_activity_plans(db, plans)
+        db.commit()
+
+    return summary
+
+
+def precompute_upcoming_activity_plans(db: Session, *, settings: Settings | None = None, **kwargs) -> PrecomputeSummary:
+    resolved_settings = settings or get_settings()
+    now = datetime.now(UTC)
+    return precompute_activity_plans(
+        db,
+        starts_after=now,
+        starts_before=now + timedelta(days=max(1, resolved_settings.activity_plan_precompute_horizon_days)),
+        settings=resolved_settings,
+        **kwargs,
+    )
@@ -1,17 +1,124 @@
 import json
 import logging
+import re
+import unicodedata
 from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 from urllib import error, parse, request
 
-from app.core.config import Settings
-from app.core.ssl_utils import build_ssl_context
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.circuit_breaker import CircuitOpenError, circuit_breaker
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY, observe_outbound_request
+from app.core.rate_limit import RequestRateLimiter
+from app.core.ssl_utils import shared_ssl_context
+from app.core.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
 HttpJsonGet = Callable[[str, float, str | None], Mapping[str, Any] | None]
 
+GEOCODE_CACHE_LOOKUPS_TOTAL = REGISTRY.counter(
+    "kidario_geocode_cache_lookups_total",
+    "Geocode cache lookups by kind (postal_code, address) and result (hit, negative_hit, miss).",
+    ("kind", "result"),
+)
+
+# Google statuses that say nothing about the address itself; cached only as short-lived failures.
+_GOOGLE_UNAVAILABLE_STATUSES = {"OVER_DAILY_LIMIT", "OVER_QUERY_LIMIT", "REQUEST_DENIED", "UNKNOWN_ERROR"}
+
+
+_VIACEP_BREAKER = circuit_breaker("viacep")
+_GOOGLE_GEOCODING_BREAKER = circuit_breaker("google_geocoding")
+
+
+class _ProviderUnavailableError(Exception):
+    pass
+
+
+class GeocodeCache:
+    """Lookup results keyed by kind and normalized key. ``None`` payloads are cached negative results."""
+
+    def get(self, kind: str, key: str) -> tuple[bool, dict | None]:
+        return False, None
+
+    def set(self, kind: str, key: str, payload: dict | None, ttl_seconds: int) -> None:
+        return None
+
+
+class PostgresGeocodeCache(GeocodeCache):
+    """Shared cache in the `geocode_cache` table (sql/025). Errors are logged and treated as misses."""
+
+    def __init__(self, engine_factory: Callable[[], object]) -> None:
+        self._engine_factory = engine_factory
+
+    def get(self, kind: str, key: str) -> tuple[bool, dict | None]:
+        try:
+            with self._engine_factory().connect() as conn:
+                row = (
+                    conn.execute(
+                        text(
+                            """
+                            select payload
+                            from geocode_cache
+                            where cache_kind = :cache_kind
+                              and cache_key = :cache_key
+                              and expires_at > now()
+                            """
+                        ),
+                        {"cache_kind": kind, "cache_key": key},
+                    )
+                    .mappings()
+                    .first()
+                )
+        except Exception:
+            logger.warning("Geocode cache lookup failed (kind=%s).", kind, exc_info=True)
+            return False, None
+        if row is None:
+            return False, None
+        return True, row["payload"]
+
+    def set(self, kind: str, key: str, payload: dict | None, ttl_seconds: int) -> None:
+        if ttl_seconds <= 0:
+            return
+        try:
+            with self._engine_factory().begin() as conn:
+                conn.execute(
+                    text(
+                        """
+                        insert into geocode_cache (cache_kind, cache_key, payload, expires_at)
+                        values (:cache_kind, :cache_key, cast(:payload as jsonb), now() + make_interval(secs => :ttl_seconds))
+                        on conflict (cache_kind, cache_key) do update
+                        set payload = excluded.payload,
+                            expires_at = excluded.expires_at,
+                            updated_at = now()
+                        """
+                    ),
+                    {
+                        "cache_kind": kind,
+                        "cache_key": key,
+                        "payload": json.dumps(payload) if payload is not None else None,
+                        "ttl_seconds": ttl_seconds,
+                    },
+                )
+        except Exception:
+            logger.warning("Geocode cache write failed (kind=%s).", kind, exc_info=True)
+
+
+@lru_cache
+def get_geocode_cache() -> GeocodeCache:
+    if not get_settings().geocode_cache_enabled:
+        return GeocodeCache()
+    from app.db.session import get_engine
+
+    return PostgresGeocodeCache(get_engine)
+
 
 def _clean_text(value: object) -> str | None:
     if value is None:
@@ -33,7 +140,7 @@ def _normalized_postal_code(value: object) -> str | None:
 
 def _http_json_get(url: str, timeout_seconds: float, ca_bundle_path: str | None) -> Mapping[str, Any] | None:
     req = request.Request(url=url, method="GET", headers={"Accept": "application/json"})
-    ssl_context = build_ssl_context(ca_bundle_path)
+    ssl_context = shared_ssl_context(ca_bundle_path)
     try:
         with request.urlopen(req, timeout=timeout_seconds, context=ssl_context) as response:
             payload_raw = response.read().decode("utf-8")
@@ -56,7 +163,11 @@ def _fetch_viacep_address(
     http_json_get: HttpJsonGet = _http_json_get,
 ) -> dict[str, Any]:
     url = f"{settings.viacep_base_url.rstrip('/')}/{postal_code}/json/"
-    payload = http_json_get(url, settings.viacep_timeout_seconds, settings.viacep_ca_bundle)
+    with _VIACEP_BREAKER.guard() as breaker_call, observe_outbound_request("viacep") as call:
+        payload = http_json_get(url, settings.viacep_timeout_seconds, settings.viacep_ca_bundle)
+        call.failed = breaker_call.failed = payload is None
+    if payload is None:
+        raise _ProviderUnavailableError("viacep")
     if not payload or payload.get("erro") is True:
         return {}
 
@@ -127,8 +238,13 @@ def _fetch_google_coordinates(
     query["components"] = "|".join(components)
 
     url = f"{settings.google_geocoding_base_url}?{parse.urlencode(query)}"
-    payload = http_json_get(url, settings.google_geocoding_timeout_seconds, settings.google_geocoding_ca_bundle)
-    if not payload or payload.get("status") != "OK":
+    with _GOOGLE_GEOCODING_BREAKER.guard() as breaker_call, observe_outbound_request("google_geocoding") as call:
+        payload = http_json_get(url, settings.google_geocoding_timeout_seconds, settings.google_geocoding_ca_bundle)
+        call.failed = payload is None
+        breaker_call.failed = payload is None or payload.get("status") in _GOOGLE_UNAVAILABLE_STATUSES
+    if payload is None or payload.get("status") in _GOOGLE_UNAVAILABLE_STATUSES:
+        raise _ProviderUnavailableError("google_geocoding")
+    if payload.get("status") != "OK":
         return None
 
     results = payload.get("results")
@@ -142,11 +258,46 @@ def _fetch_google_coordinates(
     return float(lat), float(lng)
 
 
+def _normalized_address_key(address: str, postal_code: str | None) -> str:
+    decomposed = unicodedata.normalize("NFKD", address)
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    collapsed = re.sub(r"[^a-z0-9]+", " ", ascii_text).strip()
+    return f"{collapsed}|{postal_code or ''}"
+
+
+def _cached_lookup(
+    settings: Settings,
+    cache: GeocodeCache,
+    kind: str,
+    key: str,
+    fetch: Callable[[], dict | None],
+) -> dict | None:
+    # Positive results live for geocode_cache_ttl_seconds, "not found" for the negative TTL and
+    # provider failures (timeouts, quota) only briefly so a flapping provider is not hammered.
+    found, payload = cache.get(kind, key)
+    if found:
+        GEOCODE_CACHE_LOOKUPS_TOTAL.inc(kind=kind, result="hit" if payload is not None else "negative_hit")
+        return payload
+    GEOCODE_CACHE_LOOKUPS_TOTAL.inc(kind=kind, result="miss")
+    try:
+        payload = fetch()
+    except CircuitOpenError:
+        # Provider known to be down: skip it without caching anything for this key.
+        return None
+    except _ProviderUnavailableError:
+        cache.set(kind, key, None, settings.geocode_cache_failure_ttl_seconds)
+        return None
+    ttl_seconds = settings.geocode_cache_ttl_seconds if payload else settings.geocode_cache_negative_ttl_seconds
+    cache.set(kind, key, payload or None, ttl_seconds)
+    return payload or None
+
+
 def enrich_address_coordinates(
     settings: Settings,
     values: Mapping[str, Any],
     *,
     http_json_get: HttpJsonGet = _http_json_get,
+    cache: GeocodeCache | None = None,
 ) -> dict[str, Any]:
     enriched = dict(values)
     postal_code = _normalized_postal_code(enriched.get("postal_code"))
@@ -156,7 +307,19 @@ def enrich_address_coordinates(
     if not settings.google_geocoding_enabled:
         return enriched
 
-    viacep_values = _fetch_viacep_address(settings, postal_code, http_json_get=http_json_get) if postal_code else {}
+    resolved_cache = cache or GeocodeCache()
+    viacep_values = {}
+    if postal_code:
+        viacep_values = (
+            _cached_lookup(
+                settings,
+                resolved_cache,
+                "postal_code",
+                postal_code,
+                lambda: _fetch_viacep_address(settings, postal_code, http_json_get=http_json_get),
+            )
+            or {}
+        )
     geocode_values = dict(enriched)
     for field, value in viacep_values.items():
         if not value:
@@ -165,7 +328,125 @@ def enrich_address_coordinates(
         if not enriched.get(field):
             enriched[field] = value
 
-    coordinates = _fetch_google_coordinates(settings, geocode_values, http_json_get=http_json_get)
-    if coordinates:
-        enriched["latitude"], enriched["longitude"] = coordinates
+    address = _build_google_address(geocode_values)
+    if not address:
+        return enriched
+
+    def _fetch_coordinates() -> dict | None:
+        coordinates = _fetch_google_coordinates(settings, geocode_values, http_json_get=http_json_get)
+        return {"latitude": coordinates[0], "longitude": coordinates[1]} if coordinates else None
+
+    location = _cached_lookup(
+        settings,
+        resolved_cache,
+        "address",
+        _normalized_address_key(address, _normalized_postal_code(geocode_values.get("postal_code"))),
+        _fetch_coordinates,
+    )
+    if location:
+        enriched["latitude"], enriched["longitude"] = float(location["latitude"]), float(location["longitude"])
     return enriched
+
+
+@dataclass
+class AddressBackfillSummary:
+    scanned: int = 0
+    geocoded: int = 0
+    failed: int = 0
+
+
+def _paced_http_json_get(settings: Settings, http_json_get: HttpJsonGet) -> HttpJsonGet:
+    viacep_limiter = RequestRateLimiter(settings.viacep_requests_per_minute)
+    google_limiter = RequestRateLimiter(settings.google_geocoding_requests_per_minute)
+
+    def _get(url: str, timeout_seconds: float, ca_bundle_path: str | None) -> Mapping[str, Any] | None:
+        limiter = viacep_limiter if url.startswith(settings.viacep_base_url) else google_limiter
+        limiter.wait()
+        return http_json_get(url, timeout_seconds, ca_bundle_path)
+
+    return _get
+
+
+@traced("address_geocoding.backfill")
+def backfill_address_coordinates(
+    db: Session,
+    *,
+    limit: int = 0,
+    dry_run: bool = False,
+    settings: Settings | None = None,
+    cache: GeocodeCache | None = None,
+    http_json_get: HttpJsonGet = _http_json_get,
+) -> AddressBackfillSummary:
+    # Geocodes addresses missing coordinates in keyset pages: lookups run concurrently (cache first,
+    # provider calls paced per provider) and each page is written with one statement.
+    resolved_settings = settings or get_settings()
+    resolved_cache = cache or get_geocode_cache()
+    batch_size = max(1, resolved_settings.address_backfill_batch_size)
+    paced_get = _paced_http_json_get(resolved_settings, http_json_get)
+    summary = AddressBackfillSummary()
+    cursor: str | None = None
+
+    while True:
+        page_size = batch_size if limit <= 0 else min(batch_size, limit - summary.scanned)
+        if page_size <= 0:
+            break
+        rows = (
+            db.execute(
+                text(
+                    """
+                    select id, street, number, district, city, state, postal_code, country
+                    from addresses
+                    where (latitude is null or longitude is null)
+                      and (cast(:cursor as uuid) is null or id > cast(:cursor as uuid))
+                    order by id
+                    limit :page_size
+                    """
+                ),
+                {"cursor": cursor, "page_size": page_size},
+            )
+            .mappings()
+            .all()
+        )
+        # Release the connection while the page is geocoded.
+        db.rollback()
+        if not rows:
+            break
+        summary.scanned += len(rows)
+        cursor = str(rows[-1]["id"])
+        if dry_run:
+            continue
+
+        def _geocode(row: Mapping[str, Any]) -> dict[str, Any]:
+            return enrich_address_coordinates(resolved_settings, row, http_json_get=paced_get, cache=resolved_cache)
+
+        concurrency = max(1, resolved_settings.address_backfill_concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="address-backfill") as executor:
+            results = list(executor.map(_geocode, rows))
+
+        located = [result for result in results if result.get("latitude") is not None]
+        summary.failed += len(results) - len(located)
+        if not located:
+            continue
+        db.execute(
+            text(
+                """
+                update addresses a
+                set latitude = v.latitude,
+                    longitude = v.longitude,
+                    updated_at = now()
+                from unnest(cast(:ids as uuid[]), cast(:latitudes as numeric[]), cast(:longitudes as numeric[]))
+                  as v(id, latitude, longitude)
+                where a.id = v.id
+                  and (a.latitude is null or a.longitude is null)
+                """
+            ),
+            {
+                "ids": [str(result["id"]) for result in located],
+                "latitudes": [result["latitude"] for result in located],
+                "longitudes": [result["longitude"] for result in located],
+            },
+        )
+        db.commit()
+        summary.geocoded += len(located)
+
+    return summary
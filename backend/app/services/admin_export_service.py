@@ -0,0 +1,349 @@
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY
+from app.db.session import get_session_maker
+
+ADMIN_EXPORT_ROWS_TOTAL = REGISTRY.counter(
+    "kidario_admin_export_rows_total",
+    "Rows streamed by admin exports, by dataset and format.",
+    ("dataset", "format"),
+)
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# Leading characters a spreadsheet would evaluate as a formula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class AdminExportValidationError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    select_sql: str
+    date_column: str
+    status_column: str | None
+    order_by: str
+
+
+EXPORT_DATASETS: dict[str, ExportDataset] = {
+    "bookings": ExportDataset(
+        select_sql="""
+            select
+              b.id as booking_id,
+              b.parent_id,
+              u_parent.email as parent_email,
+              b.teacher_id,
+              u_teacher.email as teacher_email,
+              b.child_id,
+              b.package_id,
+              b.starts_at,
+              b.duration_minutes,
+              b.modality,
+              b.status,
+              b.teacher_decision_status,
+              b.payment_flow_status,
+              coalesce(po.amount_cents, 0) as amount_cents,
+              coalesce(po.currency, b.currency, 'BRL') as currency,
+              b.cancellation_reason,
+              b.created_at,
+              b.confirmed_at,
+              b.completed_at,
+              b.canceled_at
+            from bookings b
+            join parents p on p.id = b.parent_id
+            join users u_parent on u_parent.id = p.user_id
+            join teachers t on t.id = b.teacher_id
+            join users u_teacher on u_teacher.id = t.user_id
+            left join lateral (
+              select amount_cents, currency
+              from payment_orders
+              where booking_id = b.id
+              order by created_at desc
+              limit 1
+            ) po on true
+        """,
+        date_column="b.starts_at",
+        status_column="b.status",
+        order_by="b.starts_at desc, b.id",
+    ),
+    "payment_orders": ExportDataset(
+        select_sql="""
+            select
+              po.id as payment_order_id,
+              po.booking_id,
+              po.package_id,
+              po.parent_id,
+              u_parent.email as parent_email,
+              po.provider,
+              po.provider_order_id,
+              po.requested_payment_method,
+              po.status,
+              po.amount_cents,
+              po.currency,
+              po.created_at,
+              po.authorized_at,
+              po.paid_at,
+              po.expires_at,
+              po.updated_at
+            from payment_orders po
+            join parents p on p.id = po.parent_id
+            join users u_parent on u_parent.id = p.user_id
+        """,
+        date_column="po.created_at",
+        status_column="po.status",
+        order_by="po.created_at desc, po.id",
+    ),
+    "payment_splits": ExportDataset(
+        select_sql="""
+            select
+              ps.id as payment_split_id,
+              ps.payment_order_id,
+              ps.payment_charge_id,
+              ps.teacher_id,
+              ps.provider,
+              ps.provider_recipient_id,
+              ps.split_role,
+              ps.type,
+              ps.amount_cents,
+              ps.percentage,
+              ps.liable,
+              ps.charge_processing_fee,
+              ps.charge_remainder_fee,
+              po.status as payment_status,
+              ps.created_at
+            from payment_splits ps
+            join payment_orders po on po.id = ps.payment_order_id
+        """,
+        date_column="ps.created_at",
+        status_column="po.status",
+        order_by="ps.created_at desc, ps.id",
+    ),
+    "teachers": ExportDataset(
+        select_sql="""
+            select
+              t.id as teacher_id,
+              t.user_id,
+              u.first_name,
+              u.last_name,
+              u.email,
+              t.phone,
+              a.city,
+              a.state,
+              t.modality,
+              t.hourly_rate_cents,
+              t.is_active,
+              t.created_at
+            from teachers t
+            join users u on u.id = t.user_id
+            join addresses a on a.id = t.address_id
+        """,
+        date_column="t.created_at",
+        status_column="case when t.is_active then 'active' else 'inactive' end",
+        order_by="t.created_at desc, t.id",
+    ),
+    "parents": ExportDataset(
+        select_sql="""
+            select
+              p.id as parent_id,
+              p.user_id,
+              u.first_name,
+              u.last_name,
+              u.email,
+              p.phone,
+              a.city,
+              a.state,
+              (select count(*) from children c where c.parent_id = p.id) as children_count,
+              p.created_at
+            from parents p
+            join users u on u.id = p.user_id
+            join addresses a on a.id = p.address_id
+        """,
+        date_column="p.created_at",
+        status_column=None,
+        order_by="p.created_at desc, p.id",
+    ),
+    "reviews": ExportDataset(
+        select_sql="""
+            select
+              br.id as review_id,
+              br.booking_id,
+              b.parent_id,
+              b.teacher_id,
+              br.rating,
+              br.comment,
+              br.is_public,
+              br.status,
+              br.submitted_at,
+              br.created_at,
+              br.updated_at
+            from booking_reviews br
+            join bookings b on b.id = br.booking_id
+        """,
+        date_column="br.submitted_at",
+        status_column="br.status",
+        order_by="br.submitted_at desc, br.id",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class AdminExport:
+    filename: str
+    media_type: str
+    chunks: Iterator[bytes]
+
+
+def _export_query(
+    spec: ExportDataset,
+    *,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    status: str | None,
+) -> tuple[str, dict[str, object]]:
+    where: list[str] = []
+    params: dict[str, object] = {}
+    if date_from is not None:
+        where.append(f"{spec.date_column} >= :date_from")
+        params["date_from"] = date_from
+    if date_to is not None:
+        where.append(f"{spec.date_column} < :date_to")
+        params["date_to"] = date_to
+    if status:
+        where.append(f"{spec.status_column} = :status")
+        params["status"] = status
+    where_sql = f"where {' and '.join(where)}" if where else ""
+    return f"{spec.select_sql} {where_sql} order by {spec.order_by}", params
+
+
+def iter_admin_export_rows(
+    db: Session,
+    dataset: str,
+    *,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: str | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Mapping[str, object]]:
+    # yield_per makes psycopg use a server-side cursor: rows arrive batch_size at a time instead of the
+    # whole result being buffered client-side.
+    sql, params = _export_query(EXPORT_DATASETS[dataset], date_from=date_from, date_to=date_to, status=status)
+    result = db.execute(text(sql), params, execution_options={"yield_per": max(1, batch_size)})
+    for partition in result.mappings().partitions():
+        yield from partition
+
+
+def _export_value(value: object) -> object:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _csv_cell(value: object) -> object:
+    value = _export_value(value)
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(rows: Iterable[Mapping[str, object]], *, flush_every: int = 500) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    header_written = False
+    for row in rows:
+        if not header_written:
+            writer.writerow(list(row.keys()))
+            header_written = True
+        writer.writerow([_csv_cell(value) for value in row.values()])
+        pending += 1
+        if pending >= flush_every:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(rows: Iterable[Mapping[str, object]], *, flush_every: int = 500) -> Iterator[bytes]:
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps({key: _export_value(value) for key, value in row.items()}, ensure_ascii=False))
+        if len(lines) >= flush_every:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _counted(rows: Iterable[Mapping[str, object]], dataset: str, export_format: str) -> Iterator[Mapping[str, object]]:
+    for row in rows:
+        ADMIN_EXPORT_ROWS_TOTAL.inc(dataset=dataset, format=export_format)
+        yield row
+
+
+def build_admin_export(
+    dataset: str,
+    *,
+    export_format: str = "csv",
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: str | None = None,
+    session_factory: Callable[[], Session] | None = None,
+) -> AdminExport:
+    # Validation happens here, before the response starts; the rows are only read while the body streams.
+    spec = EXPORT_DATASETS.get(dataset)
+    if spec is None:
+        raise AdminExportValidationError(f"Unknown export dataset: {dataset}.")
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise AdminExportValidationError("format must be 'csv' or 'ndjson'.")
+    if status and spec.status_column is None:
+        raise AdminExportValidationError(f"The {dataset} export has no status filter.")
+    if date_from is not None and date_to is not None and date_to <= date_from:
+        raise AdminExportValidationError("to must be after from.")
+
+    settings = get_settings()
+    resolved_session_factory = session_factory or get_session_maker()
+    encode = iter_csv if export_format == "csv" else iter_ndjson
+
+    def _chunks() -> Iterator[bytes]:
+        # A dedicated session, independent of the request's, lives exactly as long as the stream. The
+        # read-only repeatable-read transaction gives the whole export one consistent snapshot.
+        with resolved_session_factory() as export_db:
+            export_db.execute(text("set transaction isolation level repeatable read, read only"))
+            rows = iter_admin_export_rows(
+                export_db,
+                dataset,
+                date_from=date_from,
+                date_to=date_to,
+                status=status,
+                batch_size=settings.admin_export_batch_size,
+            )
+            yield from encode(_counted(rows, dataset, export_format))
+            export_db.rollback()
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return AdminExport(
+        filename=f"kidario-{dataset.replace('_', '-')}-{stamp}.{export_format}",
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        chunks=_chunks(),
+    )
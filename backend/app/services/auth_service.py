@@ -7,8 +7,10 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.core.config import Settings
+from app.core.metrics import observe_outbound_request
 from app.core.security import AuthUser
-from app.core.ssl_utils import build_ssl_context
+from app.core.ssl_utils import shared_ssl_context
+from app.core.tracing import inject_trace_headers
 from app.schemas.v2_auth import AuthSignupRequest
 from app.services.profile_v2_service import (
     ProfileConflictError,
@@ -57,19 +59,22 @@ def _http_json_request(
 ) -> tuple[int, dict[str, Any]]:
     data = json.dumps(body).encode("utf-8") if body is not None else None
     req = request.Request(url=url, data=data, method=method, headers=headers)
-    ssl_context = build_ssl_context(ca_bundle_path)
-
-    try:
-        with request.urlopen(req, timeout=timeout_seconds, context=ssl_context) as response:
-            payload_raw = response.read().decode("utf-8")
+    ssl_context = shared_ssl_context(ca_bundle_path)
+
+    with observe_outbound_request("supabase_auth") as call:
+        inject_trace_headers(req)
+        try:
+            with request.urlopen(req, timeout=timeout_seconds, context=ssl_context) as response:
+                payload_raw = response.read().decode("utf-8")
+                payload = json.loads(payload_raw) if payload_raw else {}
+                return int(response.status), payload
+        except error.HTTPError as exc:
+            call.status_code = exc.code
+            payload_raw = exc.read().decode("utf-8") if exc.fp is not None else ""
             payload = json.loads(payload_raw) if payload_raw else {}
-            return int(response.status), payload
-    except error.HTTPError as exc:
-        payload_raw = exc.read().decode("utf-8") if exc.fp is not None else ""
-        payload = json.loads(payload_raw) if payload_raw else {}
-        return int(exc.code), payload
-    except error.URLError as exc:
-        raise AuthSignupError(f"Could not reach Supabase Auth: {exc.reason}", status_code=503) from exc
+            return int(exc.code), payload
+        except error.URLError as exc:
+            raise AuthSignupError(f"Could not reach Supabase Auth: {exc.reason}", status_code=503) from exc
 
 
 def _extract_auth_error(payload: dict[str, Any], fallback: str) -> str:
@@ -0,0 +1,508 @@
+import logging
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+from app.core.response_cache import invalidate_teacher_public_cache
+from app.core.tracing import traced
+from app.services.booking_v2_service import _order_code, _update_payment_order_from_provider_response
+from app.services.pagarme_service import PagarmeIntegrationError, cancel_charge
+
+logger = logging.getLogger(__name__)
+
+BOOKINGS_SWEPT_TOTAL = REGISTRY.counter(
+    "kidario_bookings_swept_total",
+    "Pending bookings canceled by the lifecycle sweeper, by reason.",
+    ("reason",),
+)
+SWEEP_AUTHORIZATION_VOIDS_TOTAL = REGISTRY.counter(
+    "kidario_booking_sweep_authorization_voids_total",
+    "Credit card authorizations voided for timed-out bookings, by result.",
+    ("result",),
+)
+
+ChargeCanceler = Callable[[str, int], Mapping[str, Any]]
+
+PAYMENT_EXPIRED = "payment_expired"
+DECISION_TIMEOUT = "decision_timeout"
+
+_CANCELLATION_REASONS = {
+    PAYMENT_EXPIRED: "Prazo de pagamento expirado.",
+    DECISION_TIMEOUT: "Prazo de resposta da professora expirado.",
+}
+
+_NOTIFICATION_COPY = {
+    PAYMENT_EXPIRED: {
+        "parent": ("Reserva expirada", "O prazo de pagamento da aula expirou e o horário foi liberado."),
+        "teacher": ("Reserva expirada", "O pagamento da aula não foi concluído e o horário foi liberado."),
+    },
+    DECISION_TIMEOUT: {
+        "parent": ("Reserva cancelada", "A professora não respondeu a tempo e o horário foi liberado."),
+        "teacher": ("Reserva cancelada", "O prazo para responder à solicitação expirou e o horário foi liberado."),
+    },
+}
+
+
+@dataclass
+class BookingSweepSummary:
+    expired_payments: int = 0
+    timed_out_decisions: int = 0
+    stranded_authorizations: int = 0
+    voided_authorizations: int = 0
+    void_failures: int = 0
+    notifications: int = 0
+
+
+def _pagarme_charge_canceler(settings: Settings) -> ChargeCanceler:
+    def _cancel(provider_charge_id: str, amount_cents: int) -> Mapping[str, Any]:
+        return cancel_charge(settings, provider_charge_id=provider_charge_id, amount_cents=amount_cents)
+
+    return _cancel
+
+
+# Pix/boleto orders whose QR code or slip lapsed (plus a grace period for late webhooks) while the booking
+# still waits for payment.
+_EXPIRED_PAYMENT_WHERE = """
+                where po.booking_id is not null
+                  and po.requested_payment_method in ('pix', 'boleto')
+                  and po.status in ('created', 'pending')
+                  and b.status = 'pendente'
+                  and (
+                    po.expires_at < now() - make_interval(secs => :grace_seconds)
+                    or exists (
+                      select 1
+                      from payment_charges pc
+                      where pc.payment_order_id = po.id
+                        and pc.status in ('pending', 'processing')
+                        and pc.expires_at < now() - make_interval(secs => :grace_seconds)
+                    )
+                  )
+"""
+
+# Requests the teacher never answered, either within the timeout or before the class started. Reschedules
+# reset the decision, so the clock runs from the booking's last update.
+_DECISION_TIMEOUT_WHERE = """
+                where b.status = 'pendente'
+                  and b.teacher_decision_status = 'pending'
+                  and (
+                    b.updated_at < now() - make_interval(hours => :timeout_hours)
+                    or b.starts_at <= now()
+                  )
+"""
+
+
+# Card authorizations still held on cancelled bookings, i.e. voids that failed when the booking was released.
+# The grace period keeps this pass away from a cancellation that is voiding its authorization right now.
+_STRANDED_AUTHORIZATION_WHERE = """
+                where po.requested_payment_method = 'credit_card'
+                  and po.status = 'authorized'
+                  and b.status = 'cancelada'
+                  and b.canceled_at < now() - make_interval(secs => :grace_seconds)
+"""
+
+
+def _sweep_params(settings: Settings) -> dict[str, object]:
+    return {
+        "grace_seconds": settings.booking_payment_expiry_grace_seconds,
+        "timeout_hours": settings.booking_decision_timeout_hours,
+    }
+
+
+def _count_due(db: Session, settings: Settings) -> tuple[int, int, int]:
+    params = _sweep_params(settings)
+    expired = db.execute(
+        text(
+            f"""
+            select count(*)
+            from payment_orders po
+            join bookings b on b.id = po.booking_id
+            {_EXPIRED_PAYMENT_WHERE}
+            """
+        ),
+        params,
+    ).scalar_one()
+    timed_out = db.execute(text(f"select count(*) from bookings b {_DECISION_TIMEOUT_WHERE}"), params).scalar_one()
+    stranded = db.execute(
+        text(
+            f"""
+            select count(*)
+            from payment_orders po
+            join bookings b on b.id = po.booking_id
+            {_STRANDED_AUTHORIZATION_WHERE}
+            """
+        ),
+        params,
+    ).scalar_one()
+    db.rollback()
+    return int(expired or 0), int(timed_out or 0), int(stranded or 0)
+
+
+def _expire_overdue_payments(db: Session, settings: Settings, batch_size: int) -> list[dict]:
+    # One statement per batch: lock due orders with their bookings (skipping rows a webhook or user request
+    # holds), expire the order and its open charges, and cancel the booking so the slot is free again.
+    rows = (
+        db.execute(
+            text(
+                f"""
+                with due as (
+                  select po.id as payment_order_id, b.id as booking_id
+                  from payment_orders po
+                  join bookings b on b.id = po.booking_id
+                  {_EXPIRED_PAYMENT_WHERE}
+                  order by coalesce(po.expires_at, po.created_at) asc
+                  limit :batch_size
+                  for update of po, b skip locked
+                ),
+                expired_orders as (
+                  update payment_orders po
+                  set status = 'expired',
+                      updated_at = now()
+                  from due
+                  where po.id = due.payment_order_id
+                  returning po.id
+                ),
+                expired_charges as (
+                  update payment_charges pc
+                  set status = 'expired',
+                      updated_at = now()
+                  from due
+                  where pc.payment_order_id = due.payment_order_id
+                    and pc.status in ('pending', 'processing')
+                  returning pc.id
+                )
+                update bookings b
+                set status = 'cancelada',
+                    payment_flow_status = 'expired',
+                    cancellation_reason = :reason,
+                    canceled_at = coalesce(b.canceled_at, now()),
+                    updated_at = now()
+                from due
+                where b.id = due.booking_id
+                returning b.id, b.teacher_id
+                """
+            ),
+            {**_sweep_params(settings), "batch_size": batch_size, "reason": _CANCELLATION_REASONS[PAYMENT_EXPIRED]},
+        )
+        .mappings()
+        .all()
+    )
+    return [dict(row) for row in rows]
+
+
+def _time_out_pending_decisions(db: Session, settings: Settings, batch_size: int) -> list[dict]:
+    # Unsent orders are canceled locally in the same statement; authorized card orders are returned so the
+    # authorization can be voided at Pagar.me once the slot is released.
+    rows = (
+        db.execute(
+            text(
+                f"""
+                with due as (
+                  select b.id
+                  from bookings b
+                  {_DECISION_TIMEOUT_WHERE}
+                  order by b.updated_at asc
+                  limit :batch_size
+                  for update skip locked
+                ),
+                canceled_orders as (
+                  update payment_orders po
+                  set status = 'canceled',
+                      updated_at = now()
+                  from due
+                  where po.booking_id = due.id
+                    and po.status in ('created', 'pending')
+                  returning po.id
+                ),
+                canceled_bookings as (
+                  update bookings b
+                  set status = 'cancelada',
+                      teacher_decision_status = 'rejected',
+                      teacher_decision_reason = :reason,
+                      teacher_decision_at = now(),
+                      payment_flow_status = case
+                        when b.payment_flow_status = 'paid' then b.payment_flow_status
+                        else 'failed'
+                      end,
+                      cancellation_reason = :reason,
+                      canceled_at = coalesce(b.canceled_at, now()),
+                      updated_at = now()
+                  from due
+                  where b.id = due.id
+                  returning b.id, b.teacher_id
+                )
+                select
+                  cb.id,
+                  cb.teacher_id,
+                  po.id as payment_order_id,
+                  po.provider_order_id,
+                  po.amount_cents,
+                  pc.provider_charge_id
+                from canceled_bookings cb
+                left join payment_orders po
+                  on po.booking_id = cb.id
+                 and po.requested_payment_method = 'credit_card'
+                 and po.status = 'authorized'
+                left join lateral (
+                  select provider_charge_id
+                  from payment_charges
+                  where payment_order_id = po.id
+                  order by created_at desc
+                  limit 1
+                ) pc on true
+                """
+            ),
+            {**_sweep_params(settings), "batch_size": batch_size, "reason": _CANCELLATION_REASONS[DECISION_TIMEOUT]},
+        )
+        .mappings()
+        .all()
+    )
+    return [dict(row) for row in rows]
+
+
+def _load_stranded_authorizations(
+    db: Session,
+    settings: Settings,
+    batch_size: int,
+    after_payment_order_id: str | None,
+) -> list[dict]:
+    # Keyset pages by order id: a void that fails again leaves its order authorized, so the same rows must not
+    # be selected twice in one sweep.
+    rows = (
+        db.execute(
+            text(
+                f"""
+                select
+                  b.id,
+                  b.teacher_id,
+                  po.id as payment_order_id,
+                  po.provider_order_id,
+                  po.amount_cents,
+                  pc.provider_charge_id
+                from payment_orders po
+                join bookings b on b.id = po.booking_id
+                left join lateral (
+                  select provider_charge_id
+                  from payment_charges
+                  where payment_order_id = po.id
+                  order by created_at desc
+                  limit 1
+                ) pc on true
+                {_STRANDED_AUTHORIZATION_WHERE}
+                  and (cast(:after_payment_order_id as uuid) is null or po.id > cast(:after_payment_order_id as uuid))
+                order by po.id asc
+                limit :batch_size
+                """
+            ),
+            {
+                **_sweep_params(settings),
+                "batch_size": batch_size,
+                "after_payment_order_id": after_payment_order_id,
+            },
+        )
+        .mappings()
+        .all()
+    )
+    db.rollback()
+    return [dict(row) for row in rows]
+
+
+def _queue_cancellation_notifications(db: Session, booking_ids: list[str], kind: str) -> int:
+    if not booking_ids:
+        return 0
+    copy = _NOTIFICATION_COPY[kind]
+    inserted = db.execute(
+        text(
+            """
+            insert into notifications (user_id, notification_type, channel, title, body, payload, status)
+            select
+              recipient.user_id,
+              'booking_canceled',
+              'push',
+              recipient.title,
+              recipient.body,
+              jsonb_build_object('booking_id', recipient.booking_id, 'reason', cast(:kind as text)),
+              'queued'
+            from (
+              select b.id as booking_id, p.user_id, cast(:parent_title as text) as title, cast(:parent_body as text) as body
+              from bookings b
+              join parents p on p.id = b.parent_id
+              where b.id = any(cast(:booking_ids as uuid[]))
+              union all
+              select b.id, t.user_id, cast(:teacher_title as text), cast(:teacher_body as text)
+              from bookings b
+              join teachers t on t.id = b.teacher_id
+              where b.id = any(cast(:booking_ids as uuid[]))
+            ) recipient
+            where not exists (
+              select 1
+              from notification_preferences np
+              where np.user_id = recipient.user_id
+                and np.channel = 'push'
+                and np.notification_type = 'booking_canceled'
+                and not np.is_enabled
+            )
+            returning id
+            """
+        ),
+        {
+            "booking_ids": booking_ids,
+            "kind": kind,
+            "parent_title": copy["parent"][0],
+            "parent_body": copy["parent"][1],
+            "teacher_title": copy["teacher"][0],
+            "teacher_body": copy["teacher"][1],
+        },
+    ).all()
+    return len(inserted)
+
+
+def _finish_batch(db: Session, rows: list[dict], kind: str, summary: BookingSweepSummary) -> list[str]:
+    booking_ids = sorted({str(row["id"]) for row in rows})
+    summary.notifications += _queue_cancellation_notifications(db, booking_ids, kind)
+    for teacher_id in sorted({str(row["teacher_id"]) for row in rows}):
+        invalidate_teacher_public_cache(db, teacher_id)
+    BOOKINGS_SWEPT_TOTAL.inc(len(booking_ids), reason=kind)
+    return booking_ids
+
+
+def _void_authorizations(db: Session, rows: list[dict], summary: BookingSweepSummary, cancel: ChargeCanceler) -> None:
+    # Runs after the batch commit: a slow or failing Pagar.me call must not keep the slots locked. Orders
+    # left authorized here are retried by the stranded authorization pass of the next sweep.
+    for row in rows:
+        if not row.get("payment_order_id") or not row.get("provider_charge_id"):
+            continue
+        amount_cents = int(row["amount_cents"] or 0)
+        try:
+            cancel_response = cancel(str(row["provider_charge_id"]), amount_cents)
+        except PagarmeIntegrationError:
+            summary.void_failures += 1
+            SWEEP_AUTHORIZATION_VOIDS_TOTAL.inc(result="failed")
+            logger.warning("Could not void card authorization (payment_order_id=%s).", row["payment_order_id"], exc_info=True)
+            continue
+        try:
+            _update_payment_order_from_provider_response(
+                db,
+                payment_order_id=row["payment_order_id"],
+                payment_method="credit_card",
+                amount_cents=amount_cents,
+                provider_response={
+                    "id": row.get("provider_order_id"),
+                    "code": _order_code("booking", row["id"]),
+                    "status": "canceled",
+                    "amount": amount_cents,
+                    "charges": [dict(cancel_response)],
+                },
+                order_status="canceled",
+                charge_status="canceled",
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        summary.voided_authorizations += 1
+        SWEEP_AUTHORIZATION_VOIDS_TOTAL.inc(result="voided")
+
+
+def _claimed_batches(
+    db: Session,
+    claim: Callable[[Session, Settings, int], list[dict]],
+    *,
+    settings: Settings,
+    batch_size: int,
+    limit: int,
+) -> Iterator[list[dict]]:
+    swept = 0
+    while True:
+        page_size = batch_size if limit <= 0 else min(batch_size, limit - swept)
+        if page_size <= 0:
+            return
+        rows = claim(db, settings, page_size)
+        if not rows:
+            db.rollback()
+            return
+        claimed = len({str(row["id"]) for row in rows})
+        swept += claimed
+        yield rows
+        if claimed < page_size:
+            return
+
+
+def _retry_stranded_authorizations(
+    db: Session,
+    *,
+    settings: Settings,
+    batch_size: int,
+    limit: int,
+    summary: BookingSweepSummary,
+    cancel: ChargeCanceler,
+) -> None:
+    after_payment_order_id: str | None = None
+    while True:
+        page_size = batch_size if limit <= 0 else min(batch_size, limit - summary.stranded_authorizations)
+        if page_size <= 0:
+            return
+        rows = _load_stranded_authorizations(db, settings, page_size, after_payment_order_id)
+        if not rows:
+            return
+        summary.stranded_authorizations += len(rows)
+        _void_authorizations(db, rows, summary, cancel)
+        if len(rows) < page_size:
+            return
+        after_payment_order_id = str(rows[-1]["payment_order_id"])
+
+
+@traced("booking.sweep")
+def sweep_expired_bookings(
+    db: Session,
+    *,
+    limit: int = 0,
+    dry_run: bool = False,
+    settings: Settings | None = None,
+    cancel_authorization: ChargeCanceler | None = None,
+) -> BookingSweepSummary:
+    # Releases slots held by bookings that can no longer go ahead: Pix/boleto payments that expired and
+    # requests the teacher never answered. Each batch is one transaction, and rows are claimed with
+    # `skip locked`, so the sweeper is safe to rerun and to run next to the API and other workers. A last pass
+    # retries the card authorization voids that failed on cancelled bookings, so the parent's hold is released.
+    resolved_settings = settings or get_settings()
+    resolved_cancel = cancel_authorization or _pagarme_charge_canceler(resolved_settings)
+    batch_size = max(1, resolved_settings.booking_sweep_batch_size)
+    summary = BookingSweepSummary()
+    if dry_run:
+        expired, timed_out, stranded = _count_due(db, resolved_settings)
+        summary.expired_payments = expired if limit <= 0 else min(expired, limit)
+        summary.timed_out_decisions = timed_out if limit <= 0 else min(timed_out, limit)
+        summary.stranded_authorizations = stranded if limit <= 0 else min(stranded, limit)
+        return summary
+
+    for rows in _claimed_batches(db, _expire_overdue_payments, settings=resolved_settings, batch_size=batch_size, limit=limit):
+        try:
+            summary.expired_payments += len(_finish_batch(db, rows, PAYMENT_EXPIRED, summary))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    for rows in _claimed_batches(db, _time_out_pending_decisions, settings=resolved_settings, batch_size=batch_size, limit=limit):
+        try:
+            summary.timed_out_decisions += len(_finish_batch(db, rows, DECISION_TIMEOUT, summary))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        _void_authorizations(db, rows, summary, resolved_cancel)
+
+    _retry_stranded_authorizations(
+        db,
+        settings=resolved_settings,
+        batch_size=batch_size,
+        limit=limit,
+        summary=summary,
+        cancel=resolved_cancel,
+    )
+    return summary
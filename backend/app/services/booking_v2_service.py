@@ -1,4 +1,7 @@
+import base64
 import json
+from collections.abc import Mapping
+from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import date, datetime, time, timedelta
 from uuid import UUID, uuid4
@@ -9,7 +12,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.response_cache import invalidate_teacher_public_cache
 from app.core.security import AuthUser
+from app.core.tracing import traced
 from app.schemas.v2_bookings import (
     BookingCancelRequest,
     BookingCompleteRequest,
@@ -62,6 +67,7 @@ class BookingPermissionError(Exception):
 MIN_BOOKING_LEAD_MINUTES = 60
 LOCAL_TZ = ZoneInfo("America/Sao_Paulo")
 DEFAULT_PARENT_SERVICE_FEE_PERCENT = 8.0
+BOOKING_AVATAR_PHOTO_SIZE = 128
 
 
 def _calculate_age_from_birth_month_year(value: date | str | None, reference_date: date | None = None) -> int | None:
@@ -138,6 +144,7 @@ def _build_payment_pricing(base_amount_cents: int) -> dict[str, int]:
     }
 
 
+@traced("booking.require_parent")
 def _require_parent(db: Session, user: AuthUser) -> UUID:
     try:
         require_user_role(db, user.user_id, "parent")
@@ -281,6 +288,7 @@ def _ensure_teacher_supports_modality(teacher: dict, requested_modality: str) ->
         raise BookingValidationError("Selected modality is not offered by this teacher.")
 
 
+@traced("booking.ensure_slot_is_available")
 def _ensure_slot_is_available(
     db: Session,
     teacher_id: UUID,
@@ -353,12 +361,15 @@ def _resolve_active_package_for_booking(
     return package
 
 
-def _load_payment_order_for_booking(db: Session, booking_id: UUID | str) -> dict | None:
-    row = (
+def _load_payment_orders_for_bookings(db: Session, booking_ids: list[str]) -> dict[str, dict]:
+    # Latest order per booking, charges included, in two statements for the whole page.
+    if not booking_ids:
+        return {}
+    rows = (
         db.execute(
             text(
                 """
-                select
+                select distinct on (booking_id)
                   id,
                   parent_id,
                   booking_id,
@@ -376,21 +387,45 @@ def _load_payment_order_for_booking(db: Session, booking_id: UUID | str) -> dict
                   created_at,
                   updated_at
                 from payment_orders
-                where booking_id = :booking_id
-                order by created_at desc
-                limit 1
+                where booking_id = any(cast(:booking_ids as uuid[]))
+                order by booking_id, created_at desc
                 """
             ),
-            {"booking_id": str(booking_id)},
+            {"booking_ids": booking_ids},
         )
         .mappings()
-        .first()
+        .all()
     )
-    return _map_payment_order(db, dict(row)) if row else None
-
-
-def _map_payment_order(db: Session, row: dict) -> dict:
-    charges = (
+    payment_orders = _map_payment_orders(db, [dict(row) for row in rows])
+    return {str(order["booking_id"]): order for order in payment_orders}
+
+
+PAYMENT_ORDER_COLUMNS = """
+  po.id,
+  po.parent_id,
+  po.booking_id,
+  po.package_id,
+  po.provider,
+  po.provider_order_id,
+  po.provider_order_code,
+  po.requested_payment_method,
+  po.amount_cents,
+  po.currency,
+  po.status,
+  po.authorized_at,
+  po.paid_at,
+  po.expires_at,
+  po.created_at,
+  po.updated_at
+"""
+
+
+def _map_payment_orders(db: Session, rows: list[dict], *, include_splits: bool = False) -> list[dict]:
+    # Charges (and splits) for every order come back in one statement each, whatever the page size.
+    if not rows:
+        return []
+    order_ids = [str(row["id"]) for row in rows]
+    charge_rows = (
         db.execute(
             text(
                 """
@@ -424,33 +459,133 @@ def _map_payment_order(db: Session, row: dict) -> dict:
                   created_at,
                   updated_at
                 from payment_charges
-                where payment_order_id = :payment_order_id
-                order by created_at asc
+                where payment_order_id = any(cast(:payment_order_ids as uuid[]))
+                order by payment_order_id, created_at asc
                 """
             ),
-            {"payment_order_id": str(row["id"])},
+            {"payment_order_ids": order_ids},
         )
         .mappings()
         .all()
     )
+    charges_by_order: dict[str, list[dict]] = {order_id: [] for order_id in order_ids}
+    for charge in charge_rows:
+        # The Pix copy-paste code is only returned when the charge is created.
+        charges_by_order.setdefault(str(charge["payment_order_id"]), []).append({**charge, "pix_qr_code": None})
+
+    splits_by_order: dict[str, list[dict]] = {order_id: [] for order_id in order_ids}
+    if include_splits:
+        split_rows = (
+            db.execute(
+                text(
+                    """
+                    select id, payment_order_id, teacher_id, split_role, type, amount_cents, percentage, created_at
+                    from payment_splits
+                    where payment_order_id = any(cast(:payment_order_ids as uuid[]))
+                    order by
+                      payment_order_id,
+                      case split_role when 'platform' then 0 when 'teacher' then 1 else 2 end,
+                      created_at asc
+                    """
+                ),
+                {"payment_order_ids": order_ids},
+            )
+            .mappings()
+            .all()
+        )
+        for split in split_rows:
+            split_payload = dict(split)
+            if split_payload["percentage"] is not None:
+                split_payload["percentage"] = float(split_payload["percentage"])
+            splits_by_order.setdefault(str(split["payment_order_id"]), []).append(split_payload)
+
+    payment_orders = []
+    for row in rows:
+        payment_order = {
+            "id": row["id"],
+            "parent_id": row["parent_id"],
+            "booking_id": row["booking_id"],
+            "package_id": row["package_id"],
+            "provider": row["provider"],
+            "provider_order_id": row["provider_order_id"],
+            "provider_order_code": row["provider_order_code"],
+            "requested_payment_method": row.get("requested_payment_method"),
+            "amount_cents": int(row["amount_cents"] or 0),
+            "currency": row["currency"] or "BRL",
+            "status": row["status"],
+            "authorized_at": row.get("authorized_at"),
+            "paid_at": row.get("paid_at"),
+            "expires_at": row.get("expires_at"),
+            "charges": charges_by_order[str(row["id"])],
+            "splits": splits_by_order[str(row["id"])],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        payment_orders.append(payment_order)
+    return payment_orders
+
+
+def _map_payment_order(db: Session, row: dict) -> dict:
+    return _map_payment_orders(db, [row])[0]
+
+
+def _encode_payment_cursor(row: Mapping[str, object]) -> str:
+    created_at = row["created_at"]
+    created_at_iso = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    raw = f"{created_at_iso}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_payment_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_iso, payment_order_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at_iso), str(UUID(payment_order_id))
+    except (ValueError, UnicodeError) as exc:
+        raise BookingValidationError("Invalid payments cursor.") from exc
+
+
+def _list_payment_orders_page(
+    db: Session,
+    *,
+    where_clause: str,
+    params: dict[str, object],
+    limit: int,
+    offset: int,
+    cursor: str | None,
+    include_splits: bool = False,
+) -> dict:
+    # Keyset pagination on (created_at, id): page N costs the same as page 1. `offset` is only
+    # honoured for callers that have not moved to `cursor` yet.
+    params = {**params, "limit": limit + 1, "offset": offset}
+    keyset_clause = ""
+    if cursor:
+        params["cursor_created_at"], params["cursor_id"] = _decode_payment_cursor(cursor)
+        params["offset"] = 0
+        keyset_clause = "and (po.created_at, po.id) < (:cursor_created_at, cast(:cursor_id as uuid))"
+    rows = (
+        db.execute(
+            text(
+                f"""
+                select
+                {PAYMENT_ORDER_COLUMNS}
+                from payment_orders po
+                where {where_clause}
+                  {keyset_clause}
+                order by po.created_at desc, po.id desc
+                limit :limit
+                offset :offset
+                """
+            ),
+            params,
+        )
+        .mappings()
+        .all()
+    )
+    page = [dict(row) for row in rows[:limit]]
     return {
-        "id": row["id"],
-        "parent_id": row["parent_id"],
-        "booking_id": row["booking_id"],
-        "package_id": row["package_id"],
-        "provider": row["provider"],
-        "provider_order_id": row["provider_order_id"],
-        "provider_order_code": row["provider_order_code"],
-        "requested_payment_method": row.get("requested_payment_method"),
-        "amount_cents": int(row["amount_cents"] or 0),
-        "currency": row["currency"] or "BRL",
-        "status": row["status"],
-        "authorized_at": row.get("authorized_at"),
-        "paid_at": row.get("paid_at"),
-        "expires_at": row.get("expires_at"),
-        "charges": [dict(charge) for charge in charges],
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
+        "payments": _map_payment_orders(db, page, include_splits=include_splits),
+        "next_cursor": _encode_payment_cursor(page[-1]) if len(rows) > limit else None,
     }
 
 
@@ -502,90 +637,135 @@ def _load_booking_row(db: Session, booking_id: UUID) -> dict:
     return dict(row)
 
 
-def _load_latest_follow_up(db: Session, booking_id: UUID | str) -> dict | None:
-    row = (
+def _load_latest_follow_ups(db: Session, booking_ids: list[str]) -> dict[str, dict]:
+    if not booking_ids:
+        return {}
+    rows = (
         db.execute(
             text(
                 """
-                select updated_at, summary, next_steps, objectives, next_objectives, tags, attention_points
+                select booking_id, updated_at, summary, next_steps, objectives, next_objectives, tags, attention_points
                 from booking_follow_ups
-                where booking_id = :booking_id
+                where booking_id = any(cast(:booking_ids as uuid[]))
                 """
             ),
-            {"booking_id": str(booking_id)},
+            {"booking_ids": booking_ids},
         )
         .mappings()
-        .first()
+        .all()
     )
-    if not row:
-        return None
     return {
-        "updated_at": row["updated_at"],
-        "summary": row["summary"],
-        "next_steps": row["next_steps"],
-        "objectives": _normalize_objectives(row.get("objectives")),
-        "next_objectives": _normalize_objectives(row.get("next_objectives")),
-        "tags": list(row["tags"] or []),
-        "attention_points": list(row["attention_points"] or []),
+        str(row["booking_id"]): {
+            "updated_at": row["updated_at"],
+            "summary": row["summary"],
+            "next_steps": row["next_steps"],
+            "objectives": _normalize_objectives(row.get("objectives")),
+            "next_objectives": _normalize_objectives(row.get("next_objectives")),
+            "tags": list(row["tags"] or []),
+            "attention_points": list(row["attention_points"] or []),
+        }
+        for row in rows
     }
 
 
-def _build_booking(db: Session, row: dict, *, actor_parent_id: UUID | None, actor_teacher_id: UUID | None) -> dict:
+def _load_reviewed_booking_ids(db: Session, booking_ids: list[str]) -> set[str]:
+    if not booking_ids:
+        return set()
+    rows = (
+        db.execute(
+            text(
+                """
+                select distinct booking_id
+                from booking_reviews
+                where booking_id = any(cast(:booking_ids as uuid[]))
+                """
+            ),
+            {"booking_ids": booking_ids},
+        )
+        .mappings()
+        .all()
+    )
+    return {str(row["booking_id"]) for row in rows}
+
+
+@traced("booking.build")
+def _build_bookings(
+    db: Session,
+    rows: list[dict],
+    *,
+    actor_parent_id: UUID | None,
+    actor_teacher_id: UUID | None,
+) -> list[dict]:
+    # Reviews, payment orders and follow-ups are loaded for the whole page at once, so a list costs the
+    # same handful of statements whatever its length.
     settings = get_settings()
-    review_exists = db.execute(
-        text("select exists(select 1 from booking_reviews where booking_id = :booking_id)"),
-        {"booking_id": str(row["id"])},
-    ).scalar_one()
-    is_parent_owner = actor_parent_id is not None and str(row["parent_id"]) == str(actor_parent_id)
-    is_teacher_owner = actor_teacher_id is not None and str(row["teacher_id"]) == str(actor_teacher_id)
-    can_reschedule_or_cancel = row["status"] in ("pendente", "confirmada")
+    booking_ids = [str(row["id"]) for row in rows]
+    reviewed_booking_ids = _load_reviewed_booking_ids(db, booking_ids)
+    payment_orders = _load_payment_orders_for_bookings(db, booking_ids)
+    follow_ups = _load_latest_follow_ups(db, booking_ids)
+
+    bookings = []
+    for row in rows:
+        booking_id = str(row["id"])
+        is_parent_owner = actor_parent_id is not None and str(row["parent_id"]) == str(actor_parent_id)
+        is_teacher_owner = actor_teacher_id is not None and str(row["teacher_id"]) == str(actor_teacher_id)
+        can_reschedule_or_cancel = row["status"] in ("pendente", "confirmada")
+        bookings.append(
+            {
+                "id": row["id"],
+                "parent_id": row["parent_id"],
+                "child_id": row["child_id"],
+                "teacher_id": row["teacher_id"],
+                "package_id": row["package_id"],
+                "starts_at": row["starts_at"],
+                "duration_minutes": row["duration_minutes"],
+                "modality": row["modality"],
+                "status": row["status"],
+                "teacher_decision_status": row.get("teacher_decision_status") or "pending",
+                "teacher_decision_reason": row.get("teacher_decision_reason"),
+                "teacher_decision_at": row.get("teacher_decision_at"),
+                "payment_flow_status": row.get("payment_flow_status") or "not_started",
+                "cancellation_reason": row["cancellation_reason"],
+                "confirmed_at": row["confirmed_at"],
+                "completed_at": row["completed_at"],
+                "canceled_at": row["canceled_at"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "child": {"id": row["child_id"], "name": row["child_name"]},
+                "teacher": {
+                    "id": row["teacher_id"],
+                    "display_name": row["teacher_name"],
+                    "profile_photo_url": resolve_teacher_profile_photo_url(
+                        settings,
+                        row["teacher_profile_photo_file_name"],
+                        size=BOOKING_AVATAR_PHOTO_SIZE,
+                    ),
+                },
+                "parent": {"id": row["parent_id"], "display_name": row["parent_name"]},
+                "payment_order": payment_orders.get(booking_id),
+                "latest_follow_up": follow_ups.get(booking_id),
+                "actions": {
+                    "can_reschedule": bool(is_parent_owner and can_reschedule_or_cancel),
+                    "can_cancel": bool(is_parent_owner and can_reschedule_or_cancel),
+                    "can_complete": bool(
+                        is_teacher_owner
+                        and _can_teacher_complete_booking(
+                            booking_status=str(row["status"]),
+                            starts_at=row["starts_at"],
+                            duration_minutes=int(row["duration_minutes"]),
+                        )
+                    ),
+                    "can_review": bool(
+                        is_parent_owner and row["status"] == "concluida" and booking_id not in reviewed_booking_ids
+                    ),
+                },
+            }
+        )
+    return bookings
 
-    return {
-        "id": row["id"],
-        "parent_id": row["parent_id"],
-        "child_id": row["child_id"],
-        "teacher_id": row["teacher_id"],
-        "package_id": row["package_id"],
-        "starts_at": row["starts_at"],
-        "duration_minutes": row["duration_minutes"],
-        "modality": row["modality"],
-        "status": row["status"],
-        "teacher_decision_status": row.get("teacher_decision_status") or "pending",
-        "teacher_decision_reason": row.get("teacher_decision_reason"),
-        "teacher_decision_at": row.get("teacher_decision_at"),
-        "payment_flow_status": row.get("payment_flow_status") or "not_started",
-        "cancellation_reason": row["cancellation_reason"],
-        "confirmed_at": row["confirmed_at"],
-        "completed_at": row["completed_at"],
-        "canceled_at": row["canceled_at"],
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-        "child": {"id": row["child_id"], "name": row["child_name"]},
-        "teacher": {
-            "id": row["teacher_id"],
-            "display_name": row["teacher_name"],
-            "profile_photo_url": resolve_teacher_profile_photo_url(
-                settings,
-                row["teacher_profile_photo_file_name"],
-            ),
-        },
-        "parent": {"id": row["parent_id"], "display_name": row["parent_name"]},
-        "payment_order": _load_payment_order_for_booking(db, row["id"]),
-        "latest_follow_up": _load_latest_follow_up(db, row["id"]),
-        "actions": {
-            "can_reschedule": bool(is_parent_owner and can_reschedule_or_cancel),
-            "can_cancel": bool(is_parent_owner and can_reschedule_or_cancel),
-            "can_complete": bool(
-                is_teacher_owner
-                and _can_teacher_complete_booking(
-                    booking_status=str(row["status"]),
-                    starts_at=row["starts_at"],
-                    duration_minutes=int(row["duration_minutes"]),
-                )
-            ),
-            "can_review": bool(is_parent_owner and row["status"] == "concluida" and not review_exists),
-        },
-    }
+
+def _build_booking(db: Session, row: dict, *, actor_parent_id: UUID | None, actor_teacher_id: UUID | None) -> dict:
+    return _build_bookings(db, [row], actor_parent_id=actor_parent_id, actor_teacher_id=actor_teacher_id)[0]
 
 
 def get_booking_v2(db: Session, user: AuthUser, booking_id: UUID) -> dict:
@@ -665,13 +845,16 @@ def _list_bookings(
         .all()
     )
     return {
-        "bookings": [
-            _build_booking(db, dict(row), actor_parent_id=actor_parent_id, actor_teacher_id=actor_teacher_id)
-            for row in rows
-        ]
+        "bookings": _build_bookings(
+            db,
+            [dict(row) for row in rows],
+            actor_parent_id=actor_parent_id,
+            actor_teacher_id=actor_teacher_id,
+        )
     }
 
 
+@traced("booking.list_parent")
 def list_parent_bookings_v2(
     db: Session,
     user: AuthUser,
@@ -703,6 +886,7 @@ def list_parent_bookings_v2(
     )
 
 
+@traced("booking.list_teacher")
 def list_teacher_bookings_v2(
     db: Session,
     user: AuthUser,
@@ -1177,6 +1361,7 @@ def _order_code(prefix: str, target_id: UUID | str) -> str:
     return f"{prefix}_{str(target_id).replace('-', '')[:24]}"
 
 
+@traced("booking.upsert_payment_splits")
 def _upsert_payment_splits(
     db: Session,
     *,
@@ -1295,6 +1480,7 @@ def _payment_fields_from_provider_response(
     }
 
 
+@traced("booking.create_payment_records")
 def _create_payment_records(
     db: Session,
     *,
@@ -1599,7 +1785,7 @@ def _update_payment_order_from_provider_response(
     return fields
 
 
-def _latest_payment_order_row_for_booking(db: Session, booking_id: UUID | str) -> dict:
+def _find_latest_payment_order_row_for_booking(db: Session, booking_id: UUID | str) -> dict | None:
     row = (
         db.execute(
             text(
@@ -1624,9 +1810,78 @@ def _latest_payment_order_row_for_booking(db: Session, booking_id: UUID | str) -
         .mappings()
         .first()
     )
-    if not row:
+    return dict(row) if row else None
+
+
+def _latest_payment_order_row_for_booking(db: Session, booking_id: UUID | str) -> dict:
+    payment_order = _find_latest_payment_order_row_for_booking(db, booking_id)
+    if not payment_order:
         raise BookingValidationError("Payment order not found for booking.")
-    return dict(row)
+    return payment_order
+
+
+def _void_card_authorization(db: Session, booking_id: UUID | str, payment_order: Mapping[str, object]) -> bool:
+    charge = _latest_charge_row_for_payment_order(db, payment_order["id"])
+    if not charge or not charge.get("provider_charge_id"):
+        return False
+    try:
+        cancel_response = cancel_charge(
+            get_settings(),
+            provider_charge_id=str(charge["provider_charge_id"]),
+            amount_cents=int(payment_order["amount_cents"] or 0),
+        )
+    except PagarmeIntegrationError as exc:
+        raise BookingValidationError(str(exc)) from exc
+    _update_payment_order_from_provider_response(
+        db,
+        payment_order_id=payment_order["id"],
+        payment_method="credit_card",
+        amount_cents=int(payment_order["amount_cents"] or 0),
+        provider_response={
+            "id": payment_order.get("provider_order_id"),
+            "code": _order_code("booking", booking_id),
+            "status": "canceled",
+            "amount": int(payment_order["amount_cents"] or 0),
+            "charges": [cancel_response],
+        },
+        order_status="canceled",
+        charge_status="canceled",
+    )
+    return True
+
+
+def _close_payment_orders_for_canceled_booking(db: Session, booking_id: UUID | str) -> None:
+    # A cancelled booking keeps no open order: otherwise a late webhook or the reconciliation worker could
+    # report it paid or expired and move the booking back to pendente/confirmada.
+    payment_order = _find_latest_payment_order_row_for_booking(db, booking_id)
+    if (
+        payment_order
+        and payment_order.get("requested_payment_method") == "credit_card"
+        and payment_order.get("status") == "authorized"
+    ):
+        _void_card_authorization(db, booking_id, payment_order)
+    db.execute(
+        text(
+            """
+            with canceled_orders as (
+              update payment_orders
+              set status = 'canceled',
+                  updated_at = now()
+              where booking_id = :booking_id
+                and status in ('created', 'pending')
+              returning id
+            )
+            update payment_charges pc
+            set status = 'canceled',
+                canceled_at = coalesce(pc.canceled_at, now()),
+                updated_at = now()
+            from canceled_orders
+            where pc.payment_order_id = canceled_orders.id
+              and pc.status in ('pending', 'processing')
+            """
+        ),
+        {"booking_id": str(booking_id)},
+    )
 
 
 def _latest_charge_row_for_payment_order(db: Session, payment_order_id: UUID | str) -> dict | None:
@@ -1658,12 +1913,13 @@ def _charge_snapshot_to_order_response(
     *,
     payment_order: dict,
     charge_response: dict,
-    booking_id: UUID | str,
+    booking_id: UUID | str | None,
 ) -> dict:
     order = charge_response.get("order") if isinstance(charge_response.get("order"), dict) else {}
+    fallback_code = _order_code("booking", UUID(str(booking_id))) if booking_id else payment_order.get("provider_order_code")
     return {
         "id": order.get("id") or payment_order.get("provider_order_id"),
-        "code": order.get("code") or _order_code("booking", UUID(str(booking_id))),
+        "code": order.get("code") or fallback_code,
         "status": order.get("status") or charge_response.get("status"),
         "amount": charge_response.get("amount") or payment_order.get("amount_cents"),
         "paid_at": charge_response.get("paid_at") or order.get("paid_at"),
@@ -1756,6 +2012,7 @@ def _capture_or_sync_credit_card_charge(
     )
 
 
+@traced("booking.create")
 def create_booking_v2(db: Session, user: AuthUser, payload: BookingCreateRequest) -> dict:
     parent_id = _require_parent(db, user)
     resolved_child_id = _resolve_child_id(db, parent_id, payload.child_id)
@@ -1832,6 +2089,7 @@ def create_booking_v2(db: Session, user: AuthUser, payload: BookingCreateRequest
         if sqlstate == "23505":
             raise BookingConflictError("Selected slot is no longer available.") from exc
         raise
+    invalidate_teacher_public_cache(db, payload.teacher_id)
     if not booking_row:
         raise BookingValidationError("Could not create booking.")
 
@@ -1916,6 +2174,7 @@ def create_booking_v2(db: Session, user: AuthUser, payload: BookingCreateRequest
     return get_booking_v2(db, user, booking_id)
 
 
+@traced("booking.reschedule")
 def reschedule_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: BookingRescheduleRequest) -> dict:
     booking = _load_booking_row(db, booking_id)
     actor_parent_id, _ = get_actor_participant_ids(db, user.user_id)
@@ -1925,6 +2184,7 @@ def reschedule_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload
     return get_booking_v2(db, user, booking_id)
 
 
+@traced("booking.retry_payment")
 def retry_booking_payment_v2(db: Session, user: AuthUser, booking_id: UUID, payload) -> dict:
     booking = _load_booking_row(db, booking_id)
     actor_parent_id, _ = get_actor_participant_ids(db, user.user_id)
@@ -2044,6 +2304,7 @@ def teacher_reschedule_booking_v2(db: Session, user: AuthUser, booking_id: UUID,
     return get_booking_v2(db, user, booking_id)
 
 
+@traced("booking.decide")
 def decide_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: BookingDecisionRequest) -> dict:
     booking = _load_booking_row(db, booking_id)
     _, actor_teacher_id = get_actor_participant_ids(db, user.user_id)
@@ -2148,31 +2409,7 @@ def decide_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: Bo
         payment_order = _latest_payment_order_row_for_booking(db, booking_id)
         next_payment_flow_status = booking.get("payment_flow_status") or "not_started"
         if payment_order.get("requested_payment_method") == "credit_card" and payment_order.get("status") == "authorized":
-            charge = _latest_charge_row_for_payment_order(db, payment_order["id"])
-            if charge and charge.get("provider_charge_id"):
-                try:
-                    cancel_response = cancel_charge(
-                        get_settings(),
-                        provider_charge_id=str(charge["provider_charge_id"]),
-                        amount_cents=int(payment_order["amount_cents"] or 0),
-                    )
-                except PagarmeIntegrationError as exc:
-                    raise BookingValidationError(str(exc)) from exc
-                _update_payment_order_from_provider_response(
-                    db,
-                    payment_order_id=payment_order["id"],
-                    payment_method="credit_card",
-                    amount_cents=int(payment_order["amount_cents"] or 0),
-                    provider_response={
-                        "id": payment_order.get("provider_order_id"),
-                        "code": _order_code("booking", booking_id),
-                        "status": "canceled",
-                        "amount": int(payment_order["amount_cents"] or 0),
-                        "charges": [cancel_response],
-                    },
-                    order_status="canceled",
-                    charge_status="canceled",
-                )
+            if _void_card_authorization(db, booking_id, payment_order):
                 next_payment_flow_status = "failed"
         updated = (
             db.execute(
@@ -2202,9 +2439,11 @@ def decide_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: Bo
             post_thread_message(db, user, UUID(str(thread_payload["thread"]["id"])), ChatMessageCreateRequest(body=message_body))
     if not updated:
         raise BookingNotFoundError("Booking not found.")
+    invalidate_teacher_public_cache(db, booking["teacher_id"])
     return get_booking_v2(db, user, booking_id)
 
 
+@traced("booking.cancel")
 def cancel_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: BookingCancelRequest) -> dict:
     booking = _load_booking_row(db, booking_id)
     actor_parent_id, _ = get_actor_participant_ids(db, user.user_id)
@@ -2232,9 +2471,12 @@ def cancel_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: Bo
     )
     if not updated:
         raise BookingNotFoundError("Booking not found.")
+    _close_payment_orders_for_canceled_booking(db, booking_id)
+    invalidate_teacher_public_cache(db, booking["teacher_id"])
     return get_booking_v2(db, user, booking_id)
 
 
+@traced("booking.complete")
 def complete_booking_v2(db: Session, user: AuthUser, booking_id: UUID, payload: BookingCompleteRequest) -> dict:
     booking = _load_booking_row(db, booking_id)
     _, actor_teacher_id = get_actor_participant_ids(db, user.user_id)
@@ -2371,6 +2613,7 @@ def _reschedule_booking_row(db: Session, booking: dict, starts_at: datetime) ->
         raise
     if not row:
         raise BookingNotFoundError("Booking not found.")
+    invalidate_teacher_public_cache(db, booking["teacher_id"])
     return dict(row)
 
 
@@ -2449,6 +2692,23 @@ def _load_teacher_follow_up_context_data(db: Session, user: AuthUser, booking_id
         .first()
     )
 
+    return {
+        "booking_row": dict(booking_row),
+        **build_teacher_activity_plan_context(
+            booking_row,
+            completed_lessons_with_child=completed_lessons_with_child,
+            latest_previous_follow_up=latest_previous_follow_up,
+        ),
+    }
+
+
+def build_teacher_activity_plan_context(
+    booking_row: Mapping,
+    *,
+    completed_lessons_with_child: int,
+    latest_previous_follow_up: Mapping | None,
+) -> dict:
+    # Shared with the activity plan precompute job so both paths derive the same context_hash.
     if completed_lessons_with_child == 0:
         class_objectives = [{"objective": "Diagnóstico", "achieved": False, "fullfilment_level": 0}]
     else:
@@ -2476,7 +2736,6 @@ def _load_teacher_follow_up_context_data(db: Session, user: AuthUser, booking_id
         latest_follow_up_summary=latest_previous_follow_up.get("summary") if latest_previous_follow_up else None,
     )
     return {
-        "booking_row": dict(booking_row),
         "completed_lessons_with_child": completed_lessons_with_child,
         "class_objectives": class_objectives,
         "parent_focus_points": parent_focus_points,
@@ -2523,13 +2782,26 @@ def get_teacher_follow_up_context_v2(db: Session, user: AuthUser, booking_id: UU
     }
 
 
-def get_teacher_availability_slots_v2(
+@dataclass
+class TeacherAvailabilityData:
+    """What ``load_teacher_availability_v2`` read from the database for ``build_teacher_availability_slots_v2``."""
+
+    teacher_id: UUID
+    date_from: date
+    date_to: date
+    duration_minutes: int
+    schedule_rows: list[dict]
+    booked_by_date: dict[date, set[str]]
+
+
+@traced("booking.availability_slots")
+def load_teacher_availability_v2(
     db: Session,
     teacher_id: UUID,
     date_from: date,
     date_to: date,
     duration_minutes: int,
-) -> dict:
+) -> TeacherAvailabilityData:
     if duration_minutes <= 0:
         raise BookingValidationError("duration_minutes must be greater than zero.")
     if date_to < date_from:
@@ -2578,16 +2850,29 @@ def get_teacher_availability_slots_v2(
         local_starts_at = starts_at.astimezone(LOCAL_TZ) if starts_at.tzinfo else starts_at.replace(tzinfo=LOCAL_TZ)
         booked_by_date.setdefault(local_starts_at.date(), set()).add(local_starts_at.strftime("%H:%M"))
 
+    return TeacherAvailabilityData(
+        teacher_id=teacher_id,
+        date_from=date_from,
+        date_to=date_to,
+        duration_minutes=duration_minutes,
+        schedule_rows=[dict(row) for row in schedule_rows],
+        booked_by_date=booked_by_date,
+    )
+
+
+@traced("booking.availability_slots.build")
+def build_teacher_availability_slots_v2(data: TeacherAvailabilityData) -> dict:
     rows_by_day: dict[int, list[dict]] = {}
-    for row in schedule_rows:
-        rows_by_day.setdefault(int(row["day_of_week"]), []).append(dict(row))
+    for row in data.schedule_rows:
+        rows_by_day.setdefault(int(row["day_of_week"]), []).append(row)
 
+    duration_minutes = data.duration_minutes
     slots = []
     minimum_start = datetime.now(LOCAL_TZ) + timedelta(minutes=MIN_BOOKING_LEAD_MINUTES)
-    current_date = date_from
-    while current_date <= date_to:
+    current_date = data.date_from
+    while current_date <= data.date_to:
         available_starts: list[datetime] = []
-        blocked_times = booked_by_date.get(current_date, set())
+        blocked_times = data.booked_by_date.get(current_date, set())
         for schedule in rows_by_day.get(current_date.weekday(), []):
             start_minutes = _time_to_minutes(schedule["start_time"])
             end_minutes = _time_to_minutes(schedule["end_time"])
@@ -2602,7 +2887,19 @@ def get_teacher_availability_slots_v2(
             slots.append(_availability_slot_day(current_date, sorted(set(available_starts))))
         current_date += timedelta(days=1)
 
-    return {"teacher_id": teacher_id, "teacher_profile_id": teacher_id, "slots": slots}
+    return {"teacher_id": data.teacher_id, "teacher_profile_id": data.teacher_id, "slots": slots}
+
+
+def get_teacher_availability_slots_v2(
+    db: Session,
+    teacher_id: UUID,
+    date_from: date,
+    date_to: date,
+    duration_minutes: int,
+) -> dict:
+    return build_teacher_availability_slots_v2(
+        load_teacher_availability_v2(db, teacher_id, date_from, date_to, duration_minutes)
+    )
 
 
 _WEEKDAY_LABELS_PT_BR = ("Seg.", "Ter.", "Qua.", "Qui.", "Sex.", "Sáb.", "Dom.")
@@ -2661,83 +2958,46 @@ def get_booking_payment_v2(db: Session, user: AuthUser, booking_id: UUID) -> dic
     return payment_order
 
 
-def list_parent_payments_v2(db: Session, user: AuthUser, *, limit: int = 50, offset: int = 0) -> dict:
+def list_parent_payments_v2(
+    db: Session,
+    user: AuthUser,
+    *,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> dict:
     parent_id = _require_parent(db, user)
-    rows = (
-        db.execute(
-            text(
-                """
-                select
-                  id,
-                  parent_id,
-                  booking_id,
-                  package_id,
-                  provider,
-                  provider_order_id,
-                  provider_order_code,
-                  requested_payment_method,
-                  amount_cents,
-                  currency,
-                  status,
-                  authorized_at,
-                  paid_at,
-                  expires_at,
-                  created_at,
-                  updated_at
-                from payment_orders
-                where parent_id = :parent_id
-                order by created_at desc
-                limit :limit
-                offset :offset
-                """
-            ),
-            {"parent_id": str(parent_id), "limit": limit, "offset": offset},
-        )
-        .mappings()
-        .all()
+    return _list_payment_orders_page(
+        db,
+        where_clause="po.parent_id = :parent_id",
+        params={"parent_id": str(parent_id)},
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
-    return {"payments": [_map_payment_order(db, dict(row)) for row in rows]}
 
 
-def list_teacher_payments_v2(db: Session, user: AuthUser, *, limit: int = 50, offset: int = 0) -> dict:
+def list_teacher_payments_v2(
+    db: Session,
+    user: AuthUser,
+    *,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> dict:
     teacher_id = _require_teacher(db, user)
-    rows = (
-        db.execute(
-            text(
-                """
-                select distinct
-                  po.id,
-                  po.parent_id,
-                  po.booking_id,
-                  po.package_id,
-                  po.provider,
-                  po.provider_order_id,
-                  po.provider_order_code,
-                  po.requested_payment_method,
-                  po.amount_cents,
-                  po.currency,
-                  po.status,
-                  po.authorized_at,
-                  po.paid_at,
-                  po.expires_at,
-                  po.created_at,
-                  po.updated_at
-                from payment_orders po
-                left join bookings b on b.id = po.booking_id
-                left join booking_packages bp on bp.id = po.package_id
-                where b.teacher_id = :teacher_id
-                   or bp.teacher_id = :teacher_id
-                order by po.created_at desc
-                limit :limit
-                offset :offset
-                """
-            ),
-            {"teacher_id": str(teacher_id), "limit": limit, "offset": offset},
-        )
-        .mappings()
-        .all()
+    return _list_payment_orders_page(
+        db,
+        where_clause="""(
+                  po.booking_id in (select b.id from bookings b where b.teacher_id = :teacher_id)
+                  or po.package_id in (select bp.id from booking_packages bp where bp.teacher_id = :teacher_id)
+                )""",
+        params={"teacher_id": str(teacher_id)},
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_splits=True,
     )
-    return {"payments": [_map_payment_order(db, dict(row)) for row in rows]}
 
 
 __all__ = [
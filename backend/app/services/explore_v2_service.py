@@ -1,5 +1,5 @@
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
-from math import asin, cos, radians, sin, sqrt
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
@@ -7,6 +7,7 @@ from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.tracing import traced
 from app.schemas.v2_explore import ExploreModalityFilter, ExploreSort
 from app.services.storage_url_service import resolve_teacher_profile_photo_url
 
@@ -17,6 +18,7 @@ class ExploreNotFoundError(Exception):
 
 MIN_BOOKING_LEAD_MINUTES = 60
 LOCAL_TZ = ZoneInfo("America/Sao_Paulo")
+EXPLORE_CARD_PHOTO_SIZE = 256
 
 
 def _time_parts(value: object) -> tuple[int, int]:
@@ -55,14 +57,6 @@ def _to_float(value) -> float | None:
     return float(value)
 
 
-def _haversine_km(lat_a: float, lng_a: float, lat_b: float, lng_b: float) -> float:
-    radius_km = 6371.0
-    dlat = radians(lat_b - lat_a)
-    dlng = radians(lng_b - lng_a)
-    a = sin(dlat / 2) ** 2 + cos(radians(lat_a)) * cos(radians(lat_b)) * sin(dlng / 2) ** 2
-    return 2 * radius_km * asin(sqrt(a))
-
-
 def _normalize_modality_for_slot(teacher_modality: str | None, requested: ExploreModalityFilter | None) -> ExploreModalityFilter:
     if requested:
         return requested
@@ -82,65 +76,82 @@ def _build_slot_datetime(date_value: date, time_value: object) -> datetime:
     )
 
 
-def _load_booked_slots(db: Session, teacher_id: UUID, date_from: date, date_to: date) -> dict[date, set[str]]:
+def _availability_window(
+    available_from: datetime | None,
+    available_to: datetime | None,
+) -> tuple[datetime, datetime, datetime] | None:
+    """(minimum start, window start, window end) in local time, or None when the window is empty."""
+
+    now = datetime.now(LOCAL_TZ)
+    minimum_start = now + timedelta(minutes=MIN_BOOKING_LEAD_MINUTES)
+    start_dt = available_from.astimezone(LOCAL_TZ) if available_from and available_from.tzinfo else available_from
+    end_dt = available_to.astimezone(LOCAL_TZ) if available_to and available_to.tzinfo else available_to
+    if start_dt is None:
+        start_dt = minimum_start
+    elif start_dt.tzinfo is None:
+        start_dt = start_dt.replace(tzinfo=LOCAL_TZ)
+    if end_dt is None:
+        end_dt = start_dt + timedelta(days=21)
+    elif end_dt.tzinfo is None:
+        end_dt = end_dt.replace(tzinfo=LOCAL_TZ)
+    if end_dt.date() < max(start_dt.date(), minimum_start.date()):
+        return None
+    return minimum_start, start_dt, end_dt
+
+
+def _load_booked_slots(
+    db: Session,
+    teacher_ids: list[str],
+    window: tuple[datetime, datetime, datetime] | None,
+) -> dict[str, dict[date, set[str]]]:
+    # One statement for every teacher on the page.
+    if not teacher_ids or window is None:
+        return {}
+    minimum_start, start_dt, end_dt = window
+    date_from = max(start_dt.date(), minimum_start.date())
     start_bound = datetime.combine(date_from, time.min, tzinfo=LOCAL_TZ)
-    end_bound = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=LOCAL_TZ)
+    end_bound = datetime.combine(end_dt.date() + timedelta(days=1), time.min, tzinfo=LOCAL_TZ)
+    stmt = text(
+        """
+        select teacher_id, starts_at
+        from bookings
+        where teacher_id in :teacher_ids
+          and starts_at >= :start_bound
+          and starts_at < :end_bound
+          and status in ('pendente', 'confirmada')
+        """
+    ).bindparams(bindparam("teacher_ids", expanding=True))
     rows = (
-        db.execute(
-            text(
-                """
-                select starts_at
-                from bookings
-                where teacher_id = :teacher_id
-                  and starts_at >= :start_bound
-                  and starts_at < :end_bound
-                  and status in ('pendente', 'confirmada')
-                """
-            ),
-            {"teacher_id": str(teacher_id), "start_bound": start_bound, "end_bound": end_bound},
-        )
+        db.execute(stmt, {"teacher_ids": teacher_ids, "start_bound": start_bound, "end_bound": end_bound})
         .mappings()
         .all()
     )
-    booked: dict[date, set[str]] = {}
+    booked: dict[str, dict[date, set[str]]] = {}
     for row in rows:
         starts_at = row["starts_at"]
         local_starts_at = starts_at.astimezone(LOCAL_TZ) if starts_at.tzinfo else starts_at.replace(tzinfo=LOCAL_TZ)
-        booked.setdefault(local_starts_at.date(), set()).add(local_starts_at.strftime("%H:%M"))
+        booked.setdefault(str(row["teacher_id"]), {}).setdefault(local_starts_at.date(), set()).add(
+            local_starts_at.strftime("%H:%M")
+        )
     return booked
 
 
 def _build_availability_slots(
     *,
     schedule_rows: list[dict],
-    teacher_id: UUID,
-    db: Session,
+    booked: dict[date, set[str]],
+    window: tuple[datetime, datetime, datetime] | None,
     teacher_modality: str | None,
     requested_modality: ExploreModalityFilter | None,
     duration_minutes: int,
-    available_from: datetime | None,
-    available_to: datetime | None,
     max_slots: int,
 ) -> list[dict]:
-    now = datetime.now(LOCAL_TZ)
-    minimum_start = now + timedelta(minutes=MIN_BOOKING_LEAD_MINUTES)
-    start_dt = available_from.astimezone(LOCAL_TZ) if available_from and available_from.tzinfo else available_from
-    end_dt = available_to.astimezone(LOCAL_TZ) if available_to and available_to.tzinfo else available_to
-    if start_dt is None:
-        start_dt = minimum_start
-    elif start_dt.tzinfo is None:
-        start_dt = start_dt.replace(tzinfo=LOCAL_TZ)
-    if end_dt is None:
-        end_dt = start_dt + timedelta(days=21)
-    elif end_dt.tzinfo is None:
-        end_dt = end_dt.replace(tzinfo=LOCAL_TZ)
-
+    if window is None:
+        return []
+    minimum_start, start_dt, end_dt = window
     date_from = max(start_dt.date(), minimum_start.date())
     date_to = end_dt.date()
-    if date_to < date_from:
-        return []
 
-    booked = _load_booked_slots(db, teacher_id, date_from, date_to)
     rows_by_day: dict[int, list[dict]] = {}
     for row in schedule_rows:
         rows_by_day.setdefault(int(row["day_of_week"]), []).append(dict(row))
@@ -211,24 +222,23 @@ def _public_package_plan(row: dict, hourly_rate_cents: int | None, lesson_durati
     }
 
 
-def _load_teacher_packages(db: Session, teacher_id: UUID) -> list[dict]:
-    rows = (
-        db.execute(
-            text(
-                """
-                select id, code, name, description, sessions_count, discount_percent, is_active
-                from package_plans
-                where teacher_id = :teacher_id
-                  and is_active = true
-                order by sessions_count asc, discount_percent desc, name asc
-                """
-            ),
-            {"teacher_id": str(teacher_id)},
-        )
-        .mappings()
-        .all()
-    )
-    return [dict(row) for row in rows]
+def _load_teacher_packages(db: Session, teacher_ids: list[str]) -> dict[str, list[dict]]:
+    if not teacher_ids:
+        return {}
+    stmt = text(
+        """
+        select teacher_id, id, code, name, description, sessions_count, discount_percent, is_active
+        from package_plans
+        where teacher_id in :teacher_ids
+          and is_active = true
+        order by sessions_count asc, discount_percent desc, name asc
+        """
+    ).bindparams(bindparam("teacher_ids", expanding=True))
+    packages: dict[str, list[dict]] = {}
+    for row in db.execute(stmt, {"teacher_ids": teacher_ids}).mappings().all():
+        package = dict(row)
+        packages.setdefault(str(package.pop("teacher_id")), []).append(package)
+    return packages
 
 
 def _load_teacher_latest_reviews(db: Session, teacher_id: UUID, limit: int) -> list[dict]:
@@ -254,7 +264,25 @@ def _load_teacher_latest_reviews(db: Session, teacher_id: UUID, limit: int) -> l
     return [dict(row) for row in rows]
 
 
-def list_explore_teachers(
+@dataclass
+class ExploreTeachersPage:
+    """What ``load_explore_teachers`` read from the database, plus the filters ``build_explore_teachers`` applies."""
+
+    rows: list[dict]
+    schedules_by_teacher: dict[str, list[dict]]
+    booked_by_teacher: dict[str, dict[date, set[str]]]
+    packages_by_teacher: dict[str, list[dict]]
+    window: tuple[datetime, datetime, datetime] | None
+    requires_availability: bool
+    modality: ExploreModalityFilter | None
+    duration_minutes: int | None
+    min_rating: float | None
+    has_reviews: bool | None
+    sort: ExploreSort
+
+
+@traced("explore.list_teachers")
+def load_explore_teachers(
     db: Session,
     *,
     query: str | None = None,
@@ -274,7 +302,7 @@ def list_explore_teachers(
     radius_km: float | None = None,
     limit: int = 50,
     offset: int = 0,
-) -> dict:
+) -> ExploreTeachersPage:
     settings = get_settings()
     where = ["t.is_active = true"]
     params: dict[str, object] = {"limit": limit, "offset": offset}
@@ -329,6 +357,39 @@ def list_explore_teachers(
         where.append("t.hourly_rate_cents <= :max_hourly_rate_cents")
         params["max_hourly_rate_cents"] = max_hourly_rate_cents
 
+    # Distances come from earthdistance (sql/026). The radius filter first prunes with the GiST index on
+    # ll_to_earth(latitude, longitude) through earth_box, then drops the box corners with the exact distance.
+    has_origin = near_lat is not None and near_lng is not None
+    distance_select = "null::float8 as distance_km"
+    order_by = "display_name asc"
+    if has_origin:
+        params["near_lat"] = near_lat
+        params["near_lng"] = near_lng
+        distance_select = (
+            "round((earth_distance(ll_to_earth(:near_lat, :near_lng), "
+            "ll_to_earth(a.latitude::float8, a.longitude::float8)) / 1000)::numeric, 1)::float8 as distance_km"
+        )
+        if radius_km is not None:
+            where.append(
+                """
+                earth_box(ll_to_earth(:near_lat, :near_lng), :radius_m)
+                  @> ll_to_earth(a.latitude::float8, a.longitude::float8)
+                and earth_distance(ll_to_earth(:near_lat, :near_lng), ll_to_earth(a.latitude::float8, a.longitude::float8))
+                  <= :radius_m
+                """
+            )
+            params["radius_m"] = radius_km * 1000
+        if sort == "nearby":
+            # KNN order: the GiST index walks addresses nearest first, so a page reads only its rows instead of
+            # computing and sorting every teacher's distance. cube's <-> is the straight-line distance between the
+            # earth points, which orders exactly like the great-circle distance. The index only covers geocoded
+            # addresses, so a nearby listing leaves teachers without coordinates out.
+            where.append("a.latitude is not null and a.longitude is not null")
+            order_by = (
+                "ll_to_earth(a.latitude::float8, a.longitude::float8) <-> ll_to_earth(:near_lat, :near_lng), "
+                "display_name asc"
+            )
+
     rows = (
         db.execute(
             text(
@@ -344,8 +405,7 @@ def list_explore_teachers(
                   a.city,
                   a.state,
                   a.country,
-                  a.latitude,
-                  a.longitude,
+                  {distance_select},
                   coalesce(skills.skills, '{{}}'::text[]) as skills,
                   reviews.rating_average,
                   coalesce(reviews.review_count, 0) as review_count,
@@ -380,7 +440,7 @@ def list_explore_teachers(
                   limit 1
                 ) latest_review on true
                 where {' and '.join(where)}
-                order by display_name asc
+                order by {order_by}
                 limit :limit
                 offset :offset
                 """
@@ -407,53 +467,68 @@ def list_explore_teachers(
     schedules_by_teacher: dict[str, list[dict]] = {}
     for row in schedule_rows:
         schedules_by_teacher.setdefault(str(row["teacher_id"]), []).append(dict(row))
+    window = _availability_window(available_from, available_to)
+    return ExploreTeachersPage(
+        rows=[dict(row) for row in rows],
+        schedules_by_teacher=schedules_by_teacher,
+        booked_by_teacher=_load_booked_slots(db, teacher_ids, window),
+        packages_by_teacher=_load_teacher_packages(db, teacher_ids),
+        window=window,
+        requires_availability=bool(available_from or available_to),
+        modality=modality,
+        duration_minutes=duration_minutes,
+        min_rating=min_rating,
+        has_reviews=has_reviews,
+        sort=sort,
+    )
 
+
+@traced("explore.list_teachers.build")
+def build_explore_teachers(page: ExploreTeachersPage) -> dict:
+    """Slot generation, photo URL signing, rating filters and sorting; no database access."""
+
+    settings = get_settings()
     teachers = []
-    for row in rows:
-        row_dict = dict(row)
+    for row_dict in page.rows:
         teacher_id = UUID(str(row_dict["teacher_id"]))
-        lesson_duration = int(duration_minutes or row_dict["lesson_duration_minutes"] or 60)
+        lesson_duration = int(page.duration_minutes or row_dict["lesson_duration_minutes"] or 60)
         slots = _build_availability_slots(
-            schedule_rows=schedules_by_teacher.get(str(teacher_id), []),
-            teacher_id=teacher_id,
-            db=db,
+            schedule_rows=page.schedules_by_teacher.get(str(teacher_id), []),
+            booked=page.booked_by_teacher.get(str(teacher_id), {}),
+            window=page.window,
             teacher_modality=row_dict["modality"],
-            requested_modality=modality,
+            requested_modality=page.modality,
             duration_minutes=lesson_duration,
-            available_from=available_from,
-            available_to=available_to,
             max_slots=3,
         )
-        if (available_from or available_to) and not slots:
+        if page.requires_availability and not slots:
             continue
 
         rating_average = _to_float(row_dict["rating_average"])
         review_count = int(row_dict["review_count"] or 0)
-        if min_rating is not None and (rating_average is None or rating_average < min_rating):
+        if page.min_rating is not None and (rating_average is None or rating_average < page.min_rating):
             continue
-        if has_reviews is True and review_count == 0:
+        if page.has_reviews is True and review_count == 0:
             continue
-        if has_reviews is False and review_count > 0:
+        if page.has_reviews is False and review_count > 0:
             continue
 
-        distance_km = None
-        if near_lat is not None and near_lng is not None and row_dict["latitude"] is not None and row_dict["longitude"] is not None:
-            distance_km = round(_haversine_km(near_lat, near_lng, float(row_dict["latitude"]), float(row_dict["longitude"])), 1)
-            if radius_km is not None and distance_km > radius_km:
-                continue
-
-        packages = _load_teacher_packages(db, teacher_id)
+        packages = page.packages_by_teacher.get(str(teacher_id), [])
         teachers.append(
             {
                 "teacher_id": teacher_id,
                 "display_name": row_dict["display_name"],
                 "biography_preview": row_dict["biography"],
-                "profile_photo_url": resolve_teacher_profile_photo_url(settings, row_dict["profile_photo_file_name"]),
+                "profile_photo_url": resolve_teacher_profile_photo_url(
+                    settings,
+                    row_dict["profile_photo_file_name"],
+                    size=EXPLORE_CARD_PHOTO_SIZE,
+                ),
                 "location": {
                     "city": row_dict["city"],
                     "state": row_dict["state"],
                     "country": row_dict["country"] or "BR",
-                    "distance_km": distance_km,
+                    "distance_km": row_dict["distance_km"],
                 },
                 "modality": row_dict["modality"],
                 "hourly_rate_cents": row_dict["hourly_rate_cents"],
@@ -481,6 +556,7 @@ def list_explore_teachers(
             }
         )
 
+    sort = page.sort
     if sort == "soonest_available":
         teachers.sort(key=lambda item: item["availability_summary"]["next_available_at"] or datetime.max.replace(tzinfo=LOCAL_TZ))
     elif sort == "rating":
@@ -489,13 +565,35 @@ def list_explore_teachers(
         teachers.sort(key=lambda item: item["hourly_rate_cents"] if item["hourly_rate_cents"] is not None else 10**12)
     elif sort == "price_high":
         teachers.sort(key=lambda item: item["hourly_rate_cents"] or 0, reverse=True)
-    elif sort == "nearby":
-        teachers.sort(key=lambda item: item["location"]["distance_km"] if item["location"]["distance_km"] is not None else 10**12)
 
     return {"teachers": teachers}
 
 
-def get_explore_teacher_detail(
+def list_explore_teachers(db: Session, **filters) -> dict:
+    return build_explore_teachers(load_explore_teachers(db, **filters))
+
+
+@dataclass
+class ExploreTeacherDetailData:
+    """What ``load_explore_teacher_detail`` read from the database for ``build_explore_teacher_detail``."""
+
+    teacher_id: UUID
+    row: dict
+    schedule_rows: list[dict]
+    booked: dict[date, set[str]]
+    window: tuple[datetime, datetime, datetime] | None
+    package_rows: list[dict]
+    academic_rows: list[dict]
+    experience_rows: list[dict]
+    latest_reviews: list[dict]
+    available_from: datetime | None
+    available_to: datetime | None
+    duration_minutes: int | None
+    modality: ExploreModalityFilter | None
+
+
+@traced("explore.teacher_detail")
+def load_explore_teacher_detail(
     db: Session,
     teacher_id: UUID,
     *,
@@ -503,7 +601,7 @@ def get_explore_teacher_detail(
     available_to: datetime | None = None,
     duration_minutes: int | None = None,
     modality: ExploreModalityFilter | None = None,
-) -> dict:
+) -> ExploreTeacherDetailData:
     settings = get_settings()
     row = (
         db.execute(
@@ -578,23 +676,9 @@ def get_explore_teacher_detail(
         .mappings()
         .all()
     )
-    lesson_duration = int(duration_minutes or row_dict["lesson_duration_minutes"] or 60)
-    slots = _build_availability_slots(
-        schedule_rows=[dict(item) for item in schedule_rows],
-        teacher_id=teacher_id,
-        db=db,
-        teacher_modality=row_dict["modality"],
-        requested_modality=modality,
-        duration_minutes=lesson_duration,
-        available_from=available_from,
-        available_to=available_to,
-        max_slots=12,
-    )
-    date_start = available_from.astimezone(LOCAL_TZ).date() if available_from and available_from.tzinfo else None
-    date_end = available_to.astimezone(LOCAL_TZ).date() if available_to and available_to.tzinfo else None
-    range_days = (date_end - date_start).days + 1 if date_start and date_end and date_end >= date_start else 14
-
-    package_rows = _load_teacher_packages(db, teacher_id)
+    window = _availability_window(available_from, available_to)
+    booked = _load_booked_slots(db, [str(teacher_id)], window).get(str(teacher_id), {})
+    package_rows = _load_teacher_packages(db, [str(teacher_id)]).get(str(teacher_id), [])
     academic_rows = (
         db.execute(
             text(
@@ -630,20 +714,61 @@ def get_explore_teacher_detail(
             .all()
         )
 
-    latest_reviews = _load_teacher_latest_reviews(db, teacher_id, limit=5)
+    return ExploreTeacherDetailData(
+        teacher_id=teacher_id,
+        row=row_dict,
+        schedule_rows=[dict(item) for item in schedule_rows],
+        booked=booked,
+        window=window,
+        package_rows=package_rows,
+        academic_rows=[dict(item) for item in academic_rows],
+        experience_rows=[dict(item) for item in experience_rows],
+        latest_reviews=_load_teacher_latest_reviews(db, teacher_id, limit=5),
+        available_from=available_from,
+        available_to=available_to,
+        duration_minutes=duration_minutes,
+        modality=modality,
+    )
+
+
+@traced("explore.teacher_detail.build")
+def build_explore_teacher_detail(data: ExploreTeacherDetailData) -> dict:
+    """Slot generation, photo URL signing and the response shape; no database access."""
+
+    settings = get_settings()
+    row_dict = data.row
+    package_rows = data.package_rows
+    slots = _build_availability_slots(
+        schedule_rows=data.schedule_rows,
+        booked=data.booked,
+        window=data.window,
+        teacher_modality=row_dict["modality"],
+        requested_modality=data.modality,
+        duration_minutes=int(data.duration_minutes or row_dict["lesson_duration_minutes"] or 60),
+        max_slots=12,
+    )
+    available_from, available_to = data.available_from, data.available_to
+    date_start = available_from.astimezone(LOCAL_TZ).date() if available_from and available_from.tzinfo else None
+    date_end = available_to.astimezone(LOCAL_TZ).date() if available_to and available_to.tzinfo else None
+    range_days = (date_end - date_start).days + 1 if date_start and date_end and date_end >= date_start else 14
 
     return {
-        "teacher_id": teacher_id,
+        "teacher_id": data.teacher_id,
         "display_name": row_dict["display_name"],
         "biography": row_dict["biography"],
         "profile_photo_url": resolve_teacher_profile_photo_url(settings, row_dict["profile_photo_file_name"]),
-        "location": {"city": row_dict["city"], "state": row_dict["state"], "country": row_dict["country"] or "BR"},
+        "location": {
+            "city": row_dict["city"],
+            "state": row_dict["state"],
+            "country": row_dict["country"] or "BR",
+            "distance_km": None,
+        },
         "modality": row_dict["modality"],
         "hourly_rate_cents": row_dict["hourly_rate_cents"],
         "lesson_duration_minutes": row_dict["lesson_duration_minutes"],
         "skills": list(row_dict["skills"] or []),
-        "academic_records": [dict(row) for row in academic_rows],
-        "experiences": [dict(row) for row in experience_rows],
+        "academic_records": data.academic_rows,
+        "experiences": data.experience_rows,
         "rating_summary": {
             "average": _to_float(row_dict["rating_average"]),
             "count": int(row_dict["review_count"] or 0),
@@ -662,5 +787,9 @@ def get_explore_teacher_detail(
             _public_package_plan(row, row_dict["hourly_rate_cents"], row_dict["lesson_duration_minutes"])
             for row in package_rows
         ],
-        "latest_reviews": latest_reviews,
+        "latest_reviews": data.latest_reviews,
     }
+
+
+def get_explore_teacher_detail(db: Session, teacher_id: UUID, **filters) -> dict:
+    return build_explore_teacher_detail(load_explore_teacher_detail(db, teacher_id, **filters))
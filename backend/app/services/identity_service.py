@@ -3,6 +3,8 @@ from uuid import UUID
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.tracing import traced
+
 
 class IdentityNotFoundError(Exception):
     pass
@@ -29,6 +31,7 @@ def require_user_role(db: Session, user_id: str, expected_role: str) -> None:
         raise IdentityPermissionError(f"{expected_role.title()} permission required.")
 
 
+@traced("identity.resolve_parent_id")
 def resolve_parent_id(db: Session, user_id: str) -> UUID:
     parent_id = db.execute(
         text("select id from parents where user_id = :user_id"),
@@ -39,6 +42,7 @@ def resolve_parent_id(db: Session, user_id: str) -> UUID:
     return _uuid(parent_id)
 
 
+@traced("identity.resolve_teacher_id")
 def resolve_teacher_id(db: Session, user_id: str) -> UUID:
     teacher_id = db.execute(
         text("select id from teachers where user_id = :user_id"),
@@ -69,6 +73,7 @@ def resolve_user_id_for_teacher(db: Session, teacher_id: UUID) -> UUID:
     return _uuid(user_id)
 
 
+@traced("identity.get_actor_participant_ids")
 def get_actor_participant_ids(db: Session, user_id: str) -> tuple[UUID | None, UUID | None]:
     row = (
         db.execute(
@@ -8,6 +8,8 @@ from app.core.security import AuthUser
 from app.schemas.v2_bookings import BookingCreateRequest
 from app.schemas.v2_packages import PackagePlanCreateRequest, PackagePlanUpdateRequest, PackagePurchaseCreateRequest
 from app.core.config import get_settings
+from app.core.response_cache import invalidate_teacher_public_cache
+from app.core.tracing import traced
 from app.services.booking_v2_service import (
     BookingConflictError,
     BookingValidationError,
@@ -206,6 +208,7 @@ def create_my_package_plan_v2(db: Session, user: AuthUser, payload: PackagePlanC
         if sqlstate == "23505":
             raise PackageConflictError("Teacher already has a package plan with this code.") from exc
         raise
+    invalidate_teacher_public_cache(db, teacher_id)
     return _map_package_plan(_load_package_plan(db, UUID(str(row["id"]))))
 
 
@@ -255,6 +258,7 @@ def update_my_package_plan_v2(
         if sqlstate == "23505":
             raise PackageConflictError("Teacher already has a package plan with this code.") from exc
         raise
+    invalidate_teacher_public_cache(db, teacher_id)
     return _map_package_plan(_load_package_plan(db, package_plan_id))
 
 
@@ -439,6 +443,7 @@ def create_first_booking_for_active_package_v2(
                 raise PackageValidationError("Could not create first package booking.")
             return None
         booking_id = booking_row["id"]
+        invalidate_teacher_public_cache(db, package["teacher_id"])
         _create_payment_records(
             db,
             parent_id=package["parent_id"],
@@ -566,6 +571,7 @@ def _load_booking_package(db: Session, package_id: UUID) -> dict:
     return package_row
 
 
+@traced("package.create_purchase")
 def create_package_purchase_v2(db: Session, user: AuthUser, payload: PackagePurchaseCreateRequest) -> dict:
     parent_id = _require_parent(db, user)
     child_id = _resolve_child(db, parent_id, payload.child_id)
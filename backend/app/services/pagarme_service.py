@@ -7,8 +7,14 @@ from typing import Any
 from urllib import error, parse, request
 from uuid import uuid4
 
+from app.core.circuit_breaker import CircuitOpenError, circuit_breaker
 from app.core.config import Settings
-from app.core.ssl_utils import build_ssl_context
+from app.core.metrics import observe_outbound_request
+from app.core.ssl_utils import shared_ssl_context
+from app.core.tracing import inject_trace_headers
+
+
+_BREAKER = circuit_breaker("pagarme")
 
 
 class PagarmeIntegrationError(Exception):
@@ -63,17 +69,25 @@ def _json_request(
             "User-Agent": "kidario-backend/1.0",
         },
     )
-    ssl_context = build_ssl_context(settings.pagarme_ca_bundle)
+    ssl_context = shared_ssl_context(settings.pagarme_ca_bundle)
     try:
-        with request.urlopen(req, timeout=settings.pagarme_timeout_seconds, context=ssl_context) as response:
-            payload_raw = response.read().decode("utf-8")
-            return json.loads(payload_raw) if payload_raw else {}
-    except error.HTTPError as exc:
-        payload_raw = exc.read().decode("utf-8") if exc.fp is not None else ""
-        detail = payload_raw or str(exc)
-        raise PagarmeIntegrationError(f"Pagar.me request failed ({exc.code}): {detail}") from exc
-    except error.URLError as exc:
-        raise PagarmeIntegrationError(f"Could not reach Pagar.me: {exc.reason}") from exc
+        with _BREAKER.guard() as breaker_call, observe_outbound_request("pagarme") as call:
+            inject_trace_headers(req)
+            try:
+                with request.urlopen(req, timeout=settings.pagarme_timeout_seconds, context=ssl_context) as response:
+                    payload_raw = response.read().decode("utf-8")
+                    return json.loads(payload_raw) if payload_raw else {}
+            except error.HTTPError as exc:
+                call.status_code = exc.code
+                # Validation errors are answers, not outages.
+                breaker_call.failed = exc.code >= 500 or exc.code == 429
+                payload_raw = exc.read().decode("utf-8") if exc.fp is not None else ""
+                detail = payload_raw or str(exc)
+                raise PagarmeIntegrationError(f"Pagar.me request failed ({exc.code}): {detail}") from exc
+            except error.URLError as exc:
+                raise PagarmeIntegrationError(f"Could not reach Pagar.me: {exc.reason}") from exc
+    except CircuitOpenError as exc:
+        raise PagarmeIntegrationError("Pagar.me is temporarily unavailable. Try again in a few moments.") from exc
 
 
 def create_customer(settings: Settings, *, customer: dict[str, Any]) -> dict[str, Any]:
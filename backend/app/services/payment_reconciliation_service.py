@@ -0,0 +1,266 @@
+import logging
+from collections import Counter
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import REGISTRY
+from app.core.rate_limit import RequestRateLimiter
+from app.core.tracing import traced
+from app.services.booking_v2_service import (
+    _charge_snapshot_to_order_response,
+    _payment_fields_from_provider_response,
+    _update_payment_order_from_provider_response,
+)
+from app.services.pagarme_service import PagarmeIntegrationError, get_charge
+from app.services.payment_v2_service import (
+    NON_TERMINAL_PAYMENT_STATUSES,
+    _apply_payment_order_status_to_targets,
+    _merge_payment_status,
+)
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_RECONCILIATIONS_TOTAL = REGISTRY.counter(
+    "kidario_payment_reconciliations_total",
+    "Payment orders checked against Pagar.me by the reconciliation worker, by result.",
+    ("result",),
+)
+
+ChargeFetcher = Callable[[str], Mapping[str, Any]]
+
+
+@dataclass
+class PaymentReconciliationSummary:
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+
+def _pagarme_charge_fetcher(settings: Settings) -> ChargeFetcher:
+    def _fetch(provider_charge_id: str) -> Mapping[str, Any]:
+        return get_charge(settings, provider_charge_id=provider_charge_id)
+
+    return _fetch
+
+
+_CANDIDATE_FROM = """
+                from payment_orders po
+                left join payment_reconciliation_checks prc on prc.payment_order_id = po.id
+"""
+
+_CANDIDATE_WHERE = """
+                where po.provider = 'pagarme'
+                  and po.status = any(:statuses)
+                  and po.created_at < now() - make_interval(secs => :min_age_seconds)
+                  and (prc.checked_at is null or prc.checked_at < now() - make_interval(secs => :recheck_seconds))
+                  and (
+                    po.booking_id is null
+                    or exists (select 1 from bookings b where b.id = po.booking_id and b.status = 'pendente')
+                  )
+                  and (
+                    po.package_id is null
+                    or exists (
+                      select 1 from booking_packages bp where bp.id = po.package_id and bp.status = 'pending_payment'
+                    )
+                  )
+"""
+
+
+def _candidate_params(settings: Settings) -> dict[str, object]:
+    return {
+        "statuses": sorted(NON_TERMINAL_PAYMENT_STATUSES),
+        "min_age_seconds": settings.payment_reconciliation_min_age_seconds,
+        "recheck_seconds": settings.payment_reconciliation_recheck_seconds,
+    }
+
+
+def _count_candidates(db: Session, settings: Settings) -> int:
+    count = db.execute(text(f"select count(*) {_CANDIDATE_FROM} {_CANDIDATE_WHERE}"), _candidate_params(settings)).scalar_one()
+    db.rollback()
+    return int(count or 0)
+
+
+def _claim_candidates(db: Session, settings: Settings, batch_size: int) -> list[dict]:
+    # Rows are claimed (checked_at bumped) and committed before any provider call, so concurrent workers
+    # skip them and no row lock is held while Pagar.me answers.
+    rows = (
+        db.execute(
+            text(
+                f"""
+                select
+                  po.id,
+                  po.parent_id,
+                  po.booking_id,
+                  po.package_id,
+                  po.provider_order_id,
+                  po.provider_order_code,
+                  po.amount_cents,
+                  po.status,
+                  pc.provider_charge_id,
+                  pc.payment_method,
+                  pc.status as charge_status
+                {_CANDIDATE_FROM}
+                left join lateral (
+                  select provider_charge_id, payment_method, status
+                  from payment_charges
+                  where payment_order_id = po.id
+                  order by created_at desc
+                  limit 1
+                ) pc on true
+                {_CANDIDATE_WHERE}
+                order by prc.checked_at asc nulls first, po.created_at asc
+                limit :batch_size
+                for update of po skip locked
+                """
+            ),
+            {**_candidate_params(settings), "batch_size": batch_size},
+        )
+        .mappings()
+        .all()
+    )
+    if not rows:
+        db.rollback()
+        return []
+    db.execute(
+        text(
+            """
+            insert into payment_reconciliation_checks (payment_order_id, checked_at, attempts)
+            select unnest(cast(:ids as uuid[])), now(), 1
+            on conflict (payment_order_id) do update
+            set checked_at = excluded.checked_at,
+                attempts = payment_reconciliation_checks.attempts + 1
+            """
+        ),
+        {"ids": [str(row["id"]) for row in rows]},
+    )
+    db.commit()
+    return [dict(row) for row in rows]
+
+
+def _apply_snapshots(
+    db: Session,
+    snapshots: list[tuple[dict, Mapping[str, Any]]],
+    summary: PaymentReconciliationSummary,
+) -> None:
+    if not snapshots:
+        return
+    current_rows = (
+        db.execute(
+            text("select id, status from payment_orders where id = any(cast(:ids as uuid[])) for update"),
+            {"ids": [str(candidate["id"]) for candidate, _ in snapshots]},
+        )
+        .mappings()
+        .all()
+    )
+    current_statuses = {str(row["id"]): str(row["status"] or "") for row in current_rows}
+
+    for candidate, charge_response in snapshots:
+        current_status = current_statuses.get(str(candidate["id"]), "")
+        # A webhook or user request may have settled the order since it was claimed.
+        if current_status not in NON_TERMINAL_PAYMENT_STATUSES:
+            summary.unchanged += 1
+            PAYMENT_RECONCILIATIONS_TOTAL.inc(result="unchanged")
+            continue
+        payment_method = str(candidate.get("payment_method") or "pix")
+        amount_cents = int(candidate["amount_cents"] or 0)
+        provider_response = _charge_snapshot_to_order_response(
+            payment_order=candidate,
+            charge_response=dict(charge_response),
+            booking_id=candidate.get("booking_id"),
+        )
+        fields = _payment_fields_from_provider_response(
+            provider_response,
+            payment_method=payment_method,
+            fallback_amount_cents=amount_cents,
+        )
+        order_status = _merge_payment_status(current_status, fields["order_status"])
+        charge_status = _merge_payment_status(candidate.get("charge_status"), fields["charge_status"])
+        if order_status == current_status and charge_status == str(candidate.get("charge_status") or ""):
+            summary.unchanged += 1
+            PAYMENT_RECONCILIATIONS_TOTAL.inc(result="unchanged")
+            continue
+
+        _update_payment_order_from_provider_response(
+            db,
+            payment_order_id=candidate["id"],
+            payment_method=payment_method,
+            amount_cents=amount_cents,
+            provider_response=provider_response,
+            order_status=order_status,
+            charge_status=charge_status,
+        )
+        if order_status != current_status:
+            _apply_payment_order_status_to_targets(db, candidate, order_status)
+        summary.updated += 1
+        summary.statuses[order_status] += 1
+        PAYMENT_RECONCILIATIONS_TOTAL.inc(result="updated")
+
+
+@traced("payment.reconcile")
+def reconcile_stale_payments(
+    db: Session,
+    *,
+    limit: int = 0,
+    dry_run: bool = False,
+    settings: Settings | None = None,
+    fetch_charge: ChargeFetcher | None = None,
+) -> PaymentReconciliationSummary:
+    # Repairs payment orders whose webhook never arrived: claims a batch of stale non-terminal orders,
+    # fetches their charges from Pagar.me concurrently (paced), and applies the changes in one
+    # transaction per batch with the same status rules as the webhook.
+    resolved_settings = settings or get_settings()
+    resolved_fetch = fetch_charge or _pagarme_charge_fetcher(resolved_settings)
+    batch_size = max(1, resolved_settings.payment_reconciliation_batch_size)
+    limiter = RequestRateLimiter(resolved_settings.pagarme_reconciliation_requests_per_minute)
+    summary = PaymentReconciliationSummary()
+    if dry_run:
+        eligible = _count_candidates(db, resolved_settings)
+        summary.scanned = eligible if limit <= 0 else min(eligible, limit)
+        return summary
+
+    def _fetch(candidate: dict) -> Mapping[str, Any] | None:
+        limiter.wait()
+        try:
+            return resolved_fetch(str(candidate["provider_charge_id"]))
+        except PagarmeIntegrationError:
+            logger.warning("Could not fetch Pagar.me charge (payment_order_id=%s).", candidate["id"], exc_info=True)
+            return None
+
+    while True:
+        page_size = batch_size if limit <= 0 else min(batch_size, limit - summary.scanned)
+        if page_size <= 0:
+            break
+        candidates = _claim_candidates(db, resolved_settings, page_size)
+        if not candidates:
+            break
+        summary.scanned += len(candidates)
+        fetchable = [candidate for candidate in candidates if candidate.get("provider_charge_id")]
+        summary.unchanged += len(candidates) - len(fetchable)
+        PAYMENT_RECONCILIATIONS_TOTAL.inc(len(candidates) - len(fetchable), result="unchanged")
+        concurrency = max(1, resolved_settings.payment_reconciliation_concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="payment-reconcile") as executor:
+            responses = list(executor.map(_fetch, fetchable))
+
+        snapshots = []
+        for candidate, response in zip(fetchable, responses):
+            if not isinstance(response, Mapping):
+                summary.failed += 1
+                PAYMENT_RECONCILIATIONS_TOTAL.inc(result="failed")
+                continue
+            snapshots.append((candidate, response))
+        try:
+            _apply_snapshots(db, snapshots, summary)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    return summary
@@ -1,10 +1,12 @@
 import json
+from collections.abc import Mapping
 from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.response_cache import invalidate_teacher_public_cache
 from app.core.security import AuthUser
 from app.schemas.v2_payments import TeacherPayoutProfileUpsertRequest
 from app.services.auth_service import AuthPasswordVerificationError, verify_supabase_password
@@ -605,6 +607,69 @@ def _load_payment_charge_for_webhook(
     return dict(row) if row else None
 
 
+def _apply_payment_order_status_to_targets(db: Session, payment_order: Mapping[str, object], order_status: str) -> None:
+    # Propagates a provider-reported order status to the booking or package it pays for. Only a booking still
+    # pendente moves: a cancelled (or already settled) booking is never revived by a late status. A booking
+    # that moves changes the teacher's free slots, so their cached explore responses go with it.
+    if payment_order["booking_id"]:
+        booking_status = "confirmada" if order_status == "paid" else "pendente"
+        payment_flow_status = {
+            "paid": "paid",
+            "payment_failed": "failed",
+            "expired": "expired",
+            "refunded": "refunded",
+            "authorized": "authorized",
+        }.get(order_status, "awaiting_payment")
+        updated_booking = (
+            db.execute(
+                text(
+                    """
+                    update bookings
+                    set status = :booking_status,
+                        confirmed_at = case when :booking_status = 'confirmada' then coalesce(confirmed_at, now()) else confirmed_at end,
+                        payment_flow_status = :payment_flow_status,
+                        updated_at = now()
+                    where id = :booking_id
+                      and status = 'pendente'
+                    returning teacher_id
+                    """
+                ),
+                {
+                    "booking_id": str(payment_order["booking_id"]),
+                    "booking_status": booking_status,
+                    "payment_flow_status": payment_flow_status,
+                },
+            )
+            .mappings()
+            .first()
+        )
+        if updated_booking:
+            invalidate_teacher_public_cache(db, updated_booking["teacher_id"])
+    if payment_order["package_id"] and order_status == "paid":
+        # Canceled or expired packages stay closed; an already active one is a replayed confirmation.
+        activated = (
+            db.execute(
+                text(
+                    """
+                    update booking_packages
+                    set status = 'active',
+                        valid_from = coalesce(valid_from, now()),
+                        updated_at = now()
+                    where id = :package_id
+                      and status in ('pending_payment', 'active')
+                    returning id, teacher_id
+                    """
+                ),
+                {"package_id": str(payment_order["package_id"])},
+            )
+            .mappings()
+            .first()
+        )
+        if activated:
+            invalidate_teacher_public_cache(db, activated["teacher_id"])
+            create_first_booking_for_active_package_v2(db, payment_order["package_id"])
+
+
 def process_pagarme_webhook_v2(db: Session, payload: dict) -> dict:
     if not isinstance(payload, dict):
         raise PaymentValidationError("Webhook payload must be a JSON object.")
@@ -772,46 +837,7 @@ def process_pagarme_webhook_v2(db: Session, payload: dict) -> dict:
             "provider_response": json.dumps(payload),
         },
     )
-    if payment_order["booking_id"]:
-        booking_status = "confirmada" if order_status == "paid" else "pendente"
-        payment_flow_status = {
-            "paid": "paid",
-            "payment_failed": "failed",
-            "expired": "expired",
-            "refunded": "refunded",
-            "authorized": "authorized",
-        }.get(order_status, "awaiting_payment")
-        db.execute(
-            text(
-                """
-                update bookings
-                set status = :booking_status,
-                    confirmed_at = case when :booking_status = 'confirmada' then coalesce(confirmed_at, now()) else confirmed_at end,
-                    payment_flow_status = :payment_flow_status,
-                    updated_at = now()
-                where id = :booking_id
-                """
-            ),
-            {
-                "booking_id": str(payment_order["booking_id"]),
-                "booking_status": booking_status,
-                "payment_flow_status": payment_flow_status,
-            },
-        )
-    if payment_order["package_id"] and order_status == "paid":
-        db.execute(
-            text(
-                """
-                update booking_packages
-                set status = 'active',
-                    valid_from = coalesce(valid_from, now()),
-                    updated_at = now()
-                where id = :package_id
-                """
-            ),
-            {"package_id": str(payment_order["package_id"])},
-        )
-        create_first_booking_for_active_package_v2(db, payment_order["package_id"])
+    _apply_payment_order_status_to_targets(db, payment_order, order_status)
     db.execute(
         text(
             """
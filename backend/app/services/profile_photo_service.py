@@ -1,17 +1,35 @@
 import importlib
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import lru_cache
 from io import BytesIO
+from types import ModuleType
+from typing import TYPE_CHECKING
 from urllib import error, parse, request
 from uuid import uuid4
 
-from PIL import Image, ImageOps, UnidentifiedImageError
 from sqlalchemy.orm import Session
 
+from app.core.circuit_breaker import CircuitOpenError
 from app.core.config import Settings
+from app.core.metrics import observe_outbound_request
+from app.core.process_pool import ProcessPoolSaturatedError, ProcessPoolTimeoutError, get_image_process_pool
 from app.core.security import AuthUser
-from app.core.ssl_utils import build_ssl_context
+from app.core.ssl_utils import shared_ssl_context
+from app.core.tracing import inject_trace_headers
 from app.schemas.v2_profiles import TeacherProfileUpdateRequest
 from app.services.profile_v2_service import update_teacher_profile_v2
-from app.services.storage_url_service import resolve_teacher_profile_photo_url
+from app.services.storage_url_service import (
+    PROFILE_PHOTO_RENDITION_FORMATS,
+    PROFILE_PHOTO_RENDITION_SIZES,
+    STORAGE_BREAKER,
+    profile_photo_rendition_key,
+    profile_photo_rendition_keys,
+    resolve_teacher_profile_photo_url,
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 ALLOWED_CONTENT_TYPES = {
     "image/jpeg",
@@ -20,8 +38,8 @@ ALLOWED_CONTENT_TYPES = {
     "image/webp",
 }
 
-PROCESSED_CONTENT_TYPE = "image/jpeg"
-PROCESSED_EXTENSION = ".jpg"
+# The largest JPEG rendition is the key persisted on the teacher profile.
+PRIMARY_RENDITION = (PROFILE_PHOTO_RENDITION_SIZES[-1], "jpg")
 
 
 class ProfilePhotoUploadError(Exception):
@@ -30,6 +48,10 @@ class ProfilePhotoUploadError(Exception):
         self.detail = detail
         self.status_code = status_code
 
+    def __reduce__(self):
+        # Raised inside image pool workers; keep status_code when pickled back to the API process.
+        return (type(self), (self.detail, self.status_code))
+
 
 def _encode_storage_path(path: str) -> str:
     return "/".join(parse.quote(part, safe="") for part in path.split("/") if part)
@@ -47,51 +69,114 @@ def _validate_upload_input(settings: Settings, file_bytes: bytes, content_type:
         raise ProfilePhotoUploadError("Tipo de arquivo não suportado. Use JPG, PNG ou WEBP.", status_code=415)
 
 
-def _normalized_processing_settings(settings: Settings) -> tuple[int, int]:
+async def read_profile_photo_upload(upload, max_bytes: int) -> bytes:
+    # Read at most one byte past the limit so oversized uploads are rejected without buffering them.
+    file_bytes = await upload.read(max_bytes + 1)
+    if len(file_bytes) > max_bytes:
+        raise ProfilePhotoUploadError(f"Arquivo excede o limite de {max_bytes} bytes.", status_code=413)
+    return file_bytes
+
+
+def _normalized_processing_settings(settings: Settings) -> tuple[int, int, int]:
     target_size = int(settings.profile_photo_target_size_pixels or 512)
     jpeg_quality = int(settings.profile_photo_jpeg_quality or 82)
-    return max(64, min(target_size, 2048)), max(50, min(jpeg_quality, 95))
+    webp_quality = int(settings.profile_photo_webp_quality or 80)
+    return max(64, min(target_size, 2048)), max(50, min(jpeg_quality, 95)), max(50, min(webp_quality, 95))
+
+
+@lru_cache(maxsize=1)
+def _pil_image() -> ModuleType:
+    # Pillow is only needed once a photo is processed (usually in an image pool worker), not at app startup.
+    return importlib.import_module("PIL.Image")
 
 
-def _to_rgb_image(image: Image.Image) -> Image.Image:
+@lru_cache(maxsize=1)
+def _pil_image_ops() -> ModuleType:
+    return importlib.import_module("PIL.ImageOps")
+
+
+def _to_rgb_image(image: "Image.Image") -> "Image.Image":
     has_alpha = image.mode in {"RGBA", "LA"} or (image.mode == "P" and "transparency" in image.info)
     if not has_alpha:
         return image.convert("RGB")
 
     rgba_image = image.convert("RGBA")
-    background = Image.new("RGB", rgba_image.size, (255, 255, 255))
+    background = _pil_image().new("RGB", rgba_image.size, (255, 255, 255))
     background.paste(rgba_image, mask=rgba_image.getchannel("A"))
     return background
 
 
-def _process_profile_photo_image(settings: Settings, file_bytes: bytes) -> bytes:
-    target_size, jpeg_quality = _normalized_processing_settings(settings)
+def _encode_rendition(image: "Image.Image", extension: str, *, jpeg_quality: int, webp_quality: int) -> bytes:
+    output = BytesIO()
+    if extension == "webp":
+        image.save(output, format="WEBP", quality=webp_quality, method=4)
+    else:
+        image.save(output, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True)
+    return output.getvalue()
+
 
+def _process_profile_photo_bytes(
+    file_bytes: bytes,
+    target_size: int,
+    jpeg_quality: int,
+    webp_quality: int,
+) -> dict[tuple[int, str], bytes]:
+    pil_image = _pil_image()
     try:
-        with Image.open(BytesIO(file_bytes)) as image:
-            image = ImageOps.exif_transpose(image)
+        with pil_image.open(BytesIO(file_bytes)) as image:
+            # JPEG sources decode straight at a reduced scale (never below target_size), which is
+            # most of the CPU time for large phone photos.
+            image.draft("RGB", (target_size, target_size))
+            image = _pil_image_ops().exif_transpose(image)
             if image.width <= 0 or image.height <= 0:
                 raise ProfilePhotoUploadError("A imagem de perfil é inválida.", status_code=422)
 
             side = min(image.width, image.height)
             left = (image.width - side) // 2
             top = (image.height - side) // 2
-            image = image.crop((left, top, left + side, top + side))
-
-            output_size = min(side, target_size)
-            if side > output_size:
-                image = image.resize((output_size, output_size), Image.Resampling.LANCZOS)
-
-            image = _to_rgb_image(image)
-            output = BytesIO()
-            image.save(output, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True)
-            return output.getvalue()
+            image = _to_rgb_image(image.crop((left, top, left + side, top + side)))
+
+            # One decode and crop; each smaller rendition is resized from the previous one. Sizes above
+            # the source (or target_size) reuse the largest image available instead of upscaling.
+            renditions: dict[tuple[int, str], bytes] = {}
+            for size in sorted(PROFILE_PHOTO_RENDITION_SIZES, reverse=True):
+                output_size = min(size, target_size, side)
+                if image.width > output_size:
+                    image = image.resize((output_size, output_size), pil_image.Resampling.LANCZOS)
+                for extension in PROFILE_PHOTO_RENDITION_FORMATS:
+                    renditions[(size, extension)] = _encode_rendition(
+                        image,
+                        extension,
+                        jpeg_quality=jpeg_quality,
+                        webp_quality=webp_quality,
+                    )
+            return renditions
     except ProfilePhotoUploadError:
         raise
-    except (UnidentifiedImageError, OSError, ValueError) as exc:
+    except (pil_image.UnidentifiedImageError, OSError, ValueError, pil_image.DecompressionBombError) as exc:
         raise ProfilePhotoUploadError("Não foi possível processar a imagem. Use JPG, PNG ou WEBP.", status_code=422) from exc
 
 
+def _process_profile_photo_image(settings: Settings, file_bytes: bytes) -> dict[tuple[int, str], bytes]:
+    target_size, jpeg_quality, webp_quality = _normalized_processing_settings(settings)
+    try:
+        return get_image_process_pool().run(
+            _process_profile_photo_bytes,
+            file_bytes,
+            target_size,
+            jpeg_quality,
+            webp_quality,
+            timeout=settings.profile_photo_processing_timeout_seconds,
+        )
+    except ProcessPoolSaturatedError as exc:
+        raise ProfilePhotoUploadError(
+            "Muitas fotos sendo processadas no momento. Tente novamente em alguns segundos.",
+            status_code=429,
+        ) from exc
+    except ProcessPoolTimeoutError as exc:
+        raise ProfilePhotoUploadError("O processamento da imagem demorou demais.", status_code=503) from exc
+
+
 def _upload_via_supabase_storage_rest(
     *,
     settings: Settings,
@@ -122,16 +207,26 @@ def _upload_via_supabase_storage_rest(
             "Content-Type": content_type or "application/octet-stream",
         },
     )
-    ssl_context = build_ssl_context(settings.supabase_jwks_ca_bundle)
+    ssl_context = shared_ssl_context(settings.supabase_jwks_ca_bundle)
 
     try:
-        with request.urlopen(req, timeout=settings.supabase_http_timeout_seconds, context=ssl_context):
-            return
-    except error.HTTPError as exc:
-        detail = exc.read().decode("utf-8") if exc.fp is not None else str(exc)
-        raise ProfilePhotoUploadError(f"Failed to upload profile photo: {detail}", status_code=502) from exc
-    except error.URLError as exc:
-        raise ProfilePhotoUploadError(f"Could not reach storage: {exc.reason}", status_code=503) from exc
+        with STORAGE_BREAKER.guard() as breaker_call, observe_outbound_request("supabase_storage") as call:
+            inject_trace_headers(req)
+            try:
+                with request.urlopen(req, timeout=settings.supabase_http_timeout_seconds, context=ssl_context):
+                    return
+            except error.HTTPError as exc:
+                call.status_code = exc.code
+                breaker_call.failed = exc.code >= 500
+                detail = exc.read().decode("utf-8") if exc.fp is not None else str(exc)
+                raise ProfilePhotoUploadError(f"Failed to upload profile photo: {detail}", status_code=502) from exc
+            except error.URLError as exc:
+                raise ProfilePhotoUploadError(f"Could not reach storage: {exc.reason}", status_code=503) from exc
+    except CircuitOpenError as exc:
+        raise ProfilePhotoUploadError(
+            "Storage is temporarily unavailable. Try again in a few moments.",
+            status_code=503,
+        ) from exc
 
 
 def _delete_via_supabase_storage_rest(*, settings: Settings, bucket: str, object_key: str) -> None:
@@ -150,11 +245,19 @@ def _delete_via_supabase_storage_rest(*, settings: Settings, bucket: str, object
             "Authorization": f"Bearer {settings.supabase_service_role_key}",
         },
     )
-    ssl_context = build_ssl_context(settings.supabase_jwks_ca_bundle)
+    ssl_context = shared_ssl_context(settings.supabase_jwks_ca_bundle)
     try:
-        with request.urlopen(req, timeout=settings.supabase_http_timeout_seconds, context=ssl_context):
-            return
-    except Exception:
+        with STORAGE_BREAKER.guard() as breaker_call, observe_outbound_request("supabase_storage") as call:
+            inject_trace_headers(req)
+            try:
+                with request.urlopen(req, timeout=settings.supabase_http_timeout_seconds, context=ssl_context):
+                    return
+            except Exception:
+                call.failed = True
+                breaker_call.failed = True
+                return
+    except CircuitOpenError:
+        # Old renditions are left behind rather than waiting on a storage outage.
         return
 
 
@@ -168,14 +271,7 @@ def _build_s3_client_config():
     return config_class(signature_version="s3v4")
 
 
-def _upload_via_s3(
-    *,
-    settings: Settings,
-    bucket: str,
-    object_key: str,
-    file_bytes: bytes,
-    content_type: str | None,
-) -> None:
+def _build_s3_upload_client(settings: Settings):
     boto3 = _get_boto3_module()
     client_kwargs = {
         "region_name": settings.storage_s3_region,
@@ -187,15 +283,28 @@ def _upload_via_s3(
     if settings.storage_s3_secret_access_key:
         client_kwargs["aws_secret_access_key"] = settings.storage_s3_secret_access_key
     client_kwargs["config"] = _build_s3_client_config()
+    return boto3.client("s3", **client_kwargs)
 
-    s3_client = boto3.client("s3", **client_kwargs)
-    s3_client.put_object(
-        Bucket=bucket,
-        Key=object_key,
-        Body=file_bytes,
-        ContentType=content_type or "application/octet-stream",
-        CacheControl="public, max-age=31536000, immutable",
-    )
+
+def _upload_via_s3(
+    *,
+    settings: Settings,
+    bucket: str,
+    object_key: str,
+    file_bytes: bytes,
+    content_type: str | None,
+    s3_client=None,
+) -> None:
+    # Clients are thread-safe once built (creating them is not), so concurrent uploads share one.
+    s3_client = s3_client or _build_s3_upload_client(settings)
+    with observe_outbound_request("s3_storage"):
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=object_key,
+            Body=file_bytes,
+            ContentType=content_type or "application/octet-stream",
+            CacheControl="public, max-age=31536000, immutable",
+        )
 
 
 def _delete_via_s3(*, settings: Settings, bucket: str, object_key: str) -> None:
@@ -217,29 +326,30 @@ def _delete_via_s3(*, settings: Settings, bucket: str, object_key: str) -> None:
         return
 
 
-def _upload_photo_blob(
+def _uses_s3_storage(settings: Settings) -> bool:
+    return bool(settings.storage_s3_access_key_id and settings.storage_s3_secret_access_key)
+
+
+def _upload_object(
     *,
     settings: Settings,
-    user_id: str,
-    file_name: str | None,
-    content_type: str | None,
+    object_key: str,
     file_bytes: bytes,
-) -> str:
-    _validate_upload_input(settings, file_bytes, content_type)
-    processed_file_bytes = _process_profile_photo_image(settings, file_bytes)
-    object_key = f"teachers/{user_id}/{uuid4().hex}{PROCESSED_EXTENSION}"
+    content_type: str,
+    s3_client=None,
+) -> None:
     bucket = settings.profile_photos_bucket
-
-    if settings.storage_s3_access_key_id and settings.storage_s3_secret_access_key:
+    if _uses_s3_storage(settings):
         try:
             _upload_via_s3(
                 settings=settings,
                 bucket=bucket,
                 object_key=object_key,
-                file_bytes=processed_file_bytes,
-                content_type=PROCESSED_CONTENT_TYPE,
+                file_bytes=file_bytes,
+                content_type=content_type,
+                s3_client=s3_client,
             )
-            return object_key
+            return
         except Exception as exc:
             raise ProfilePhotoUploadError(f"Failed to upload profile photo to S3: {exc}", status_code=502) from exc
 
@@ -247,9 +357,62 @@ def _upload_photo_blob(
         settings=settings,
         bucket=bucket,
         object_key=object_key,
-        file_bytes=processed_file_bytes,
-        content_type=PROCESSED_CONTENT_TYPE,
+        file_bytes=file_bytes,
+        content_type=content_type,
     )
+
+
+def _upload_photo_blob(
+    *,
+    settings: Settings,
+    user_id: str,
+    file_name: str | None,
+    content_type: str | None,
+    file_bytes: bytes,
+) -> str:
+    _validate_upload_input(settings, file_bytes, content_type)
+    renditions = _process_profile_photo_image(settings, file_bytes)
+    base_key = f"teachers/{user_id}/{uuid4().hex}"
+    object_key = profile_photo_rendition_key(base_key, *PRIMARY_RENDITION)
+
+    try:
+        s3_client = _build_s3_upload_client(settings) if _uses_s3_storage(settings) else None
+    except Exception as exc:
+        raise ProfilePhotoUploadError(f"Failed to upload profile photo to S3: {exc}", status_code=502) from exc
+
+    def _upload(rendition: tuple[int, str]) -> str:
+        size, extension = rendition
+        rendition_key = profile_photo_rendition_key(base_key, size, extension)
+        _upload_object(
+            settings=settings,
+            object_key=rendition_key,
+            file_bytes=renditions[rendition],
+            content_type=PROFILE_PHOTO_RENDITION_FORMATS[extension],
+            s3_client=s3_client,
+        )
+        return rendition_key
+
+    # The smaller renditions upload concurrently; the primary goes last, once every rendition it points to exists.
+    secondary = [rendition for rendition in renditions if rendition != PRIMARY_RENDITION]
+    uploaded_keys: list[str] = []
+    failures: list[ProfilePhotoUploadError] = []
+    concurrency = max(1, min(settings.profile_photo_upload_concurrency, len(secondary)))
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="profile-photo-upload") as executor:
+        # Each upload runs in its own copy of the request context, so its spans join the request trace.
+        futures = [executor.submit(copy_context().run, _upload, rendition) for rendition in secondary]
+        for future in futures:
+            try:
+                uploaded_keys.append(future.result())
+            except ProfilePhotoUploadError as exc:
+                failures.append(exc)
+    try:
+        if failures:
+            raise failures[0]
+        uploaded_keys.append(_upload(PRIMARY_RENDITION))
+    except ProfilePhotoUploadError:
+        for rendition_key in uploaded_keys:
+            _delete_object(settings=settings, object_key=rendition_key)
+        raise
     return object_key
 
 
@@ -270,7 +433,7 @@ def upload_teacher_profile_photo_blob(
     )
 
 
-def delete_teacher_profile_photo_blob(*, settings: Settings, object_key: str) -> None:
+def _delete_object(*, settings: Settings, object_key: str) -> None:
     _delete_via_s3(settings=settings, bucket=settings.profile_photos_bucket, object_key=object_key)
     _delete_via_supabase_storage_rest(
         settings=settings,
@@ -279,6 +442,11 @@ def delete_teacher_profile_photo_blob(*, settings: Settings, object_key: str) ->
     )
 
 
+def delete_teacher_profile_photo_blob(*, settings: Settings, object_key: str) -> None:
+    for rendition_key in profile_photo_rendition_keys(object_key):
+        _delete_object(settings=settings, object_key=rendition_key)
+
+
 def upload_teacher_profile_photo(
     db: Session,
     settings: Settings,
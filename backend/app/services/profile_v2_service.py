@@ -1,9 +1,11 @@
+from typing import TypeVar
 from uuid import UUID, uuid4
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.response_cache import invalidate_teacher_public_cache
 from app.core.security import AuthUser
 from app.schemas.v2_profiles import (
     AddressInput,
@@ -11,9 +13,13 @@ from app.schemas.v2_profiles import (
     ChildUpdateRequest,
     MeUpdateRequest,
     ParentProfileUpdateRequest,
+    TeacherAcademicRecordsOps,
+    TeacherAvailabilityOps,
+    TeacherExperiencesOps,
     TeacherProfileUpdateRequest,
+    TeacherSkillsOps,
 )
-from app.services.address_geocoding_service import enrich_address_coordinates
+from app.services.address_geocoding_service import enrich_address_coordinates, get_geocode_cache
 from app.services.storage_url_service import resolve_teacher_profile_photo_url
 
 
@@ -223,7 +229,7 @@ def _upsert_address(db: Session, address_id: UUID | str | None, payload: Address
         existing is None or values.get("latitude") is None or values.get("longitude") is None
     )
     if should_enrich:
-        values = enrich_address_coordinates(get_settings(), values)
+        values = enrich_address_coordinates(get_settings(), values, cache=get_geocode_cache())
 
     if existing:
         if payload is None:
@@ -577,77 +583,77 @@ def _teacher_row_for_user(db: Session, user_id: str) -> dict:
     return dict(teacher)
 
 
-def get_teacher_profile_v2(db: Session, user: AuthUser) -> dict:
-    settings = get_settings()
-    user_row = _get_user(db, user.user_id)
-    if user_row["role"] != "teacher":
-        raise ProfileConflictError(f"User is registered as role '{user_row['role']}'.")
-    teacher = _teacher_row_for_user(db, user.user_id)
-    address = _load_address(db, teacher["address_id"])
-
-    skill_rows = (
-        db.execute(
-            text(
-                """
-                select id, teacher_id, skill, created_at, updated_at
-                from teacher_skills
-                where teacher_id = :teacher_id
-                order by skill asc
-                """
-            ),
-            {"teacher_id": str(teacher["id"])},
-        )
-        .mappings()
-        .all()
-    )
-    academic_rows = (
-        db.execute(
-            text(
-                """
-                select id, teacher_id, degree_type, course_name, institution, completion_year, created_at, updated_at
-                from teacher_academic_records
-                where teacher_id = :teacher_id
-                order by created_at asc
-                """
-            ),
-            {"teacher_id": str(teacher["id"])},
-        )
-        .mappings()
-        .all()
-    )
-    experience_rows = (
+def _load_teacher_collections(db: Session, teacher_id: UUID | str) -> dict:
+    # One round-trip for every collection, so a save costs the same no matter how many items it touched.
+    row = (
         db.execute(
             text(
                 """
                 select
-                  id, teacher_id, institution, role, coalesce(description, responsibilities) as description,
-                  period_from, period_to, current_position, created_at, updated_at
-                from teacher_experiences
-                where teacher_id = :teacher_id
-                order by created_at asc
-                """
-            ),
-            {"teacher_id": str(teacher["id"])},
-        )
-        .mappings()
-        .all()
-    )
-    availability_rows = (
-        db.execute(
-            text(
-                """
-                select id, teacher_id, day_of_week, start_time, end_time, created_at, updated_at
-                from teacher_availability
-                where teacher_id = :teacher_id
-                order by day_of_week asc, start_time asc
+                  coalesce(
+                    (
+                      select jsonb_agg(to_jsonb(s) order by s.skill asc)
+                      from (
+                        select id, teacher_id, skill, created_at, updated_at
+                        from teacher_skills
+                        where teacher_id = :teacher_id
+                      ) s
+                    ),
+                    '[]'::jsonb
+                  ) as skills,
+                  coalesce(
+                    (
+                      select jsonb_agg(to_jsonb(ar) order by ar.created_at asc)
+                      from (
+                        select id, teacher_id, degree_type, course_name, institution, completion_year, created_at, updated_at
+                        from teacher_academic_records
+                        where teacher_id = :teacher_id
+                      ) ar
+                    ),
+                    '[]'::jsonb
+                  ) as academic_records,
+                  coalesce(
+                    (
+                      select jsonb_agg(to_jsonb(e) order by e.created_at asc)
+                      from (
+                        select
+                          id, teacher_id, institution, role, coalesce(description, responsibilities) as description,
+                          period_from, period_to, current_position, created_at, updated_at
+                        from teacher_experiences
+                        where teacher_id = :teacher_id
+                      ) e
+                    ),
+                    '[]'::jsonb
+                  ) as experiences,
+                  coalesce(
+                    (
+                      select jsonb_agg(to_jsonb(ta) order by ta.day_of_week asc, ta.start_time asc)
+                      from (
+                        select id, teacher_id, day_of_week, start_time, end_time, created_at, updated_at
+                        from teacher_availability
+                        where teacher_id = :teacher_id
+                      ) ta
+                    ),
+                    '[]'::jsonb
+                  ) as availability
                 """
             ),
-            {"teacher_id": str(teacher["id"])},
+            {"teacher_id": str(teacher_id)},
         )
         .mappings()
-        .all()
+        .first()
     )
+    row = row or {}
+    return {
+        "skills": list(row.get("skills") or []),
+        "academic_records": list(row.get("academic_records") or []),
+        "experiences": list(row.get("experiences") or []),
+        "availability": list(row.get("availability") or []),
+    }
+
 
+def _teacher_profile_payload(user_row: dict, teacher: dict, address: dict, collections: dict) -> dict:
+    settings = get_settings()
     return {
         "id": teacher["id"],
         "user": user_row,
@@ -663,15 +669,206 @@ def get_teacher_profile_v2(db: Session, user: AuthUser) -> dict:
         "hide_experience": teacher["hide_experience"],
         "is_active": teacher["is_active"],
         "address": address,
-        "skills": [dict(row) for row in skill_rows],
-        "academic_records": [dict(row) for row in academic_rows],
-        "experiences": [dict(row) for row in experience_rows],
-        "availability": [dict(row) for row in availability_rows],
+        **collections,
         "created_at": teacher["created_at"],
         "updated_at": teacher["updated_at"],
     }
 
 
+def get_teacher_profile_v2(db: Session, user: AuthUser) -> dict:
+    user_row = _get_user(db, user.user_id)
+    if user_row["role"] != "teacher":
+        raise ProfileConflictError(f"User is registered as role '{user_row['role']}'.")
+    teacher = _teacher_row_for_user(db, user.user_id)
+    address = _load_address(db, teacher["address_id"])
+    return _teacher_profile_payload(user_row, teacher, address, _load_teacher_collections(db, teacher["id"]))
+
+
+def _apply_skills_ops(db: Session, teacher_id: UUID, ops: TeacherSkillsOps) -> None:
+    if ops.remove:
+        db.execute(
+            text(
+                """
+                delete from teacher_skills
+                where teacher_id = :teacher_id
+                  and lower(skill) = any(select lower(value) from unnest(cast(:skills as text[])) as value)
+                """
+            ),
+            {"teacher_id": str(teacher_id), "skills": list(ops.remove)},
+        )
+
+    skills: dict[str, str] = {}
+    for skill in ops.add:
+        normalized_skill = skill.strip()
+        if normalized_skill:
+            skills.setdefault(normalized_skill.lower(), normalized_skill)
+    if not skills:
+        return
+    db.execute(
+        text(
+            """
+            insert into teacher_skills (id, teacher_id, skill)
+            select v.id, :teacher_id, v.skill
+            from unnest(cast(:ids as uuid[]), cast(:skills as text[])) as v(id, skill)
+            where not exists (
+              select 1 from teacher_skills ts
+              where ts.teacher_id = :teacher_id and lower(ts.skill) = lower(v.skill)
+            )
+            on conflict do nothing
+            """
+        ),
+        {
+            "teacher_id": str(teacher_id),
+            "ids": [str(uuid4()) for _ in skills],
+            "skills": list(skills.values()),
+        },
+    )
+
+
+_T = TypeVar("_T")
+
+
+def _last_upsert_per_id(items: list[_T]) -> list[_T]:
+    # A single insert ... on conflict cannot update the same row twice, so an id repeated in one request keeps
+    # only its last entry, as the former one-statement-per-item loop did. New items (no id) are all kept.
+    latest: dict[object, _T] = {}
+    for index, item in enumerate(items):
+        latest[item.id if item.id is not None else index] = item
+    return list(latest.values())
+
+
+def _delete_teacher_rows(db: Session, table: str, teacher_id: UUID, ids: list[UUID]) -> None:
+    if not ids:
+        return
+    db.execute(
+        text(f"delete from {table} where teacher_id = :teacher_id and id = any(cast(:ids as uuid[]))"),
+        {"teacher_id": str(teacher_id), "ids": [str(item_id) for item_id in ids]},
+    )
+
+
+def _apply_academic_records_ops(db: Session, teacher_id: UUID, ops: TeacherAcademicRecordsOps) -> None:
+    _delete_teacher_rows(db, "teacher_academic_records", teacher_id, ops.delete_ids)
+    records = _last_upsert_per_id(ops.upsert)
+    if not records:
+        return
+    # Ids owned by another teacher are left untouched by the conflict guard.
+    db.execute(
+        text(
+            """
+            insert into teacher_academic_records
+              (id, teacher_id, degree_type, course_name, institution, completion_year)
+            select v.id, :teacher_id, v.degree_type, v.course_name, v.institution, v.completion_year
+            from unnest(
+              cast(:ids as uuid[]),
+              cast(:degree_types as text[]),
+              cast(:course_names as text[]),
+              cast(:institutions as text[]),
+              cast(:completion_years as text[])
+            ) as v(id, degree_type, course_name, institution, completion_year)
+            on conflict (id) do update
+            set degree_type = excluded.degree_type,
+                course_name = excluded.course_name,
+                institution = excluded.institution,
+                completion_year = excluded.completion_year,
+                updated_at = now()
+            where teacher_academic_records.teacher_id = excluded.teacher_id
+            """
+        ),
+        {
+            "teacher_id": str(teacher_id),
+            "ids": [str(record.id or uuid4()) for record in records],
+            "degree_types": [record.degree_type for record in records],
+            "course_names": [record.course_name for record in records],
+            "institutions": [record.institution for record in records],
+            "completion_years": [record.completion_year for record in records],
+        },
+    )
+
+
+def _apply_experiences_ops(db: Session, teacher_id: UUID, ops: TeacherExperiencesOps) -> None:
+    _delete_teacher_rows(db, "teacher_experiences", teacher_id, ops.delete_ids)
+    experiences = _last_upsert_per_id(ops.upsert)
+    if not experiences:
+        return
+    db.execute(
+        text(
+            """
+            insert into teacher_experiences
+              (
+                id, teacher_id, institution, role, responsibilities, description,
+                period_from, period_to, current_position
+              )
+            select
+              v.id, :teacher_id, v.institution, v.role, v.description, v.description,
+              v.period_from, v.period_to, v.current_position
+            from unnest(
+              cast(:ids as uuid[]),
+              cast(:institutions as text[]),
+              cast(:roles as text[]),
+              cast(:descriptions as text[]),
+              cast(:periods_from as text[]),
+              cast(:periods_to as text[]),
+              cast(:current_positions as boolean[])
+            ) as v(id, institution, role, description, period_from, period_to, current_position)
+            on conflict (id) do update
+            set institution = excluded.institution,
+                role = excluded.role,
+                responsibilities = excluded.description,
+                description = excluded.description,
+                period_from = excluded.period_from,
+                period_to = excluded.period_to,
+                current_position = excluded.current_position,
+                updated_at = now()
+            where teacher_experiences.teacher_id = excluded.teacher_id
+            """
+        ),
+        {
+            "teacher_id": str(teacher_id),
+            "ids": [str(experience.id or uuid4()) for experience in experiences],
+            "institutions": [experience.institution for experience in experiences],
+            "roles": [experience.role for experience in experiences],
+            "descriptions": [experience.description for experience in experiences],
+            "periods_from": [experience.period_from for experience in experiences],
+            "periods_to": [experience.period_to for experience in experiences],
+            "current_positions": [experience.current_position for experience in experiences],
+        },
+    )
+
+
+def _apply_availability_ops(db: Session, teacher_id: UUID, ops: TeacherAvailabilityOps) -> None:
+    _delete_teacher_rows(db, "teacher_availability", teacher_id, ops.delete_ids)
+    slots = _last_upsert_per_id(ops.upsert)
+    if not slots:
+        return
+    db.execute(
+        text(
+            """
+            insert into teacher_availability (id, teacher_id, day_of_week, start_time, end_time)
+            select v.id, :teacher_id, v.day_of_week, v.start_time, v.end_time
+            from unnest(
+              cast(:ids as uuid[]),
+              cast(:days_of_week as smallint[]),
+              cast(:start_times as text[]),
+              cast(:end_times as text[])
+            ) as v(id, day_of_week, start_time, end_time)
+            on conflict (id) do update
+            set day_of_week = excluded.day_of_week,
+                start_time = excluded.start_time,
+                end_time = excluded.end_time,
+                updated_at = now()
+            where teacher_availability.teacher_id = excluded.teacher_id
+            """
+        ),
+        {
+            "teacher_id": str(teacher_id),
+            "ids": [str(slot.id or uuid4()) for slot in slots],
+            "days_of_week": [slot.day_of_week for slot in slots],
+            "start_times": [slot.start_time.isoformat() for slot in slots],
+            "end_times": [slot.end_time.isoformat() for slot in slots],
+        },
+    )
+
+
 def update_teacher_profile_v2(db: Session, user: AuthUser, payload: TeacherProfileUpdateRequest) -> dict:
     user_row = _get_user(db, user.user_id)
     if user_row["role"] != "teacher":
@@ -731,234 +928,78 @@ def update_teacher_profile_v2(db: Session, user: AuthUser, payload: TeacherProfi
     teacher_id = UUID(str(existing_teacher["id"])) if existing_teacher else uuid4()
 
     if existing_teacher:
-        db.execute(
-            text(
-                """
-                update teachers
-                set phone = :phone,
-                    cpf = :cpf,
-                    professional_number = :professional_number,
-                    address_id = :address_id,
-                    modality = :modality,
-                    biography = :biography,
-                    hourly_rate_cents = :hourly_rate_cents,
-                    lesson_duration_minutes = :lesson_duration_minutes,
-                    profile_photo_file_name = :profile_photo_file_name,
-                    hide_experience = :hide_experience,
-                    updated_at = now()
-                where id = :teacher_id
-                """
-            ),
-            {"teacher_id": str(teacher_id), "address_id": str(address_id), **values},
-        )
-    else:
-        db.execute(
-            text(
-                """
-                insert into teachers (
-                  id, user_id, address_id, phone, cpf, professional_number, modality, biography,
-                  hourly_rate_cents, lesson_duration_minutes, profile_photo_file_name, hide_experience
-                )
-                values (
-                  :id, :user_id, :address_id, :phone, :cpf, :professional_number, :modality, :biography,
-                  :hourly_rate_cents, :lesson_duration_minutes, :profile_photo_file_name, :hide_experience
-                )
-                """
-            ),
-            {"id": str(teacher_id), "user_id": user.user_id, "address_id": str(address_id), **values},
-        )
-
-    if payload.skills_ops:
-        for skill in payload.skills_ops.remove:
+        teacher = (
             db.execute(
                 text(
                     """
-                    delete from teacher_skills
-                    where teacher_id = :teacher_id and lower(skill) = lower(:skill)
+                    update teachers
+                    set phone = :phone,
+                        cpf = :cpf,
+                        professional_number = :professional_number,
+                        address_id = :address_id,
+                        modality = :modality,
+                        biography = :biography,
+                        hourly_rate_cents = :hourly_rate_cents,
+                        lesson_duration_minutes = :lesson_duration_minutes,
+                        profile_photo_file_name = :profile_photo_file_name,
+                        hide_experience = :hide_experience,
+                        updated_at = now()
+                    where id = :teacher_id
+                    returning
+                      id, user_id, address_id, phone, cpf, professional_number, modality, biography,
+                      hourly_rate_cents, lesson_duration_minutes, profile_photo_file_name, hide_experience,
+                      is_active, created_at, updated_at
                     """
                 ),
-                {"teacher_id": str(teacher_id), "skill": skill},
+                {"teacher_id": str(teacher_id), "address_id": str(address_id), **values},
             )
-        for skill in payload.skills_ops.add:
-            normalized_skill = skill.strip()
-            if not normalized_skill:
-                continue
-            exists = db.execute(
+            .mappings()
+            .one()
+        )
+    else:
+        teacher = (
+            db.execute(
                 text(
                     """
-                    select exists(
-                      select 1 from teacher_skills
-                      where teacher_id = :teacher_id and lower(skill) = lower(:skill)
+                    insert into teachers (
+                      id, user_id, address_id, phone, cpf, professional_number, modality, biography,
+                      hourly_rate_cents, lesson_duration_minutes, profile_photo_file_name, hide_experience
+                    )
+                    values (
+                      :id, :user_id, :address_id, :phone, :cpf, :professional_number, :modality, :biography,
+                      :hourly_rate_cents, :lesson_duration_minutes, :profile_photo_file_name, :hide_experience
                     )
+                    returning
+                      id, user_id, address_id, phone, cpf, professional_number, modality, biography,
+                      hourly_rate_cents, lesson_duration_minutes, profile_photo_file_name, hide_experience,
+                      is_active, created_at, updated_at
                     """
                 ),
-                {"teacher_id": str(teacher_id), "skill": normalized_skill},
-            ).scalar_one()
-            if not exists:
-                db.execute(
-                    text(
-                        """
-                        insert into teacher_skills (id, teacher_id, skill)
-                        values (:id, :teacher_id, :skill)
-                        """
-                    ),
-                    {"id": str(uuid4()), "teacher_id": str(teacher_id), "skill": normalized_skill},
-                )
-
-    if payload.academic_records_ops:
-        for record_id in payload.academic_records_ops.delete_ids:
-            db.execute(
-                text("delete from teacher_academic_records where id = :id and teacher_id = :teacher_id"),
-                {"id": str(record_id), "teacher_id": str(teacher_id)},
+                {"id": str(teacher_id), "user_id": user.user_id, "address_id": str(address_id), **values},
             )
-        for record in payload.academic_records_ops.upsert:
-            record_id = record.id or uuid4()
-            exists = db.execute(
-                text("select exists(select 1 from teacher_academic_records where id = :id and teacher_id = :teacher_id)"),
-                {"id": str(record_id), "teacher_id": str(teacher_id)},
-            ).scalar_one()
-            params = {
-                "id": str(record_id),
-                "teacher_id": str(teacher_id),
-                "degree_type": record.degree_type,
-                "course_name": record.course_name,
-                "institution": record.institution,
-                "completion_year": record.completion_year,
-            }
-            if exists:
-                db.execute(
-                    text(
-                        """
-                        update teacher_academic_records
-                        set degree_type = :degree_type,
-                            course_name = :course_name,
-                            institution = :institution,
-                            completion_year = :completion_year,
-                            updated_at = now()
-                        where id = :id and teacher_id = :teacher_id
-                        """
-                    ),
-                    params,
-                )
-            else:
-                db.execute(
-                    text(
-                        """
-                        insert into teacher_academic_records
-                          (id, teacher_id, degree_type, course_name, institution, completion_year)
-                        values
-                          (:id, :teacher_id, :degree_type, :course_name, :institution, :completion_year)
-                        """
-                    ),
-                    params,
-                )
+            .mappings()
+            .one()
+        )
 
+    # Each collection is applied with at most one delete and one insert/upsert, whatever its size.
+    if payload.skills_ops:
+        _apply_skills_ops(db, teacher_id, payload.skills_ops)
+    if payload.academic_records_ops:
+        _apply_academic_records_ops(db, teacher_id, payload.academic_records_ops)
     if payload.experiences_ops:
-        for experience_id in payload.experiences_ops.delete_ids:
-            db.execute(
-                text("delete from teacher_experiences where id = :id and teacher_id = :teacher_id"),
-                {"id": str(experience_id), "teacher_id": str(teacher_id)},
-            )
-        for experience in payload.experiences_ops.upsert:
-            experience_id = experience.id or uuid4()
-            exists = db.execute(
-                text("select exists(select 1 from teacher_experiences where id = :id and teacher_id = :teacher_id)"),
-                {"id": str(experience_id), "teacher_id": str(teacher_id)},
-            ).scalar_one()
-            params = {
-                "id": str(experience_id),
-                "teacher_id": str(teacher_id),
-                "institution": experience.institution,
-                "role": experience.role,
-                "description": experience.description,
-                "period_from": experience.period_from,
-                "period_to": experience.period_to,
-                "current_position": experience.current_position,
-            }
-            if exists:
-                db.execute(
-                    text(
-                        """
-                        update teacher_experiences
-                        set institution = :institution,
-                            role = :role,
-                            responsibilities = :description,
-                            description = :description,
-                            period_from = :period_from,
-                            period_to = :period_to,
-                            current_position = :current_position,
-                            updated_at = now()
-                        where id = :id and teacher_id = :teacher_id
-                        """
-                    ),
-                    params,
-                )
-            else:
-                db.execute(
-                    text(
-                        """
-                        insert into teacher_experiences
-                          (
-                            id, teacher_id, institution, role, description,
-                            period_from, period_to, current_position
-                          )
-                        values
-                          (
-                            :id, :teacher_id, :institution, :role, :description,
-                            :period_from, :period_to, :current_position
-                          )
-                        """
-                    ),
-                    params,
-                )
-
+        _apply_experiences_ops(db, teacher_id, payload.experiences_ops)
     if payload.availability_ops:
-        for availability_id in payload.availability_ops.delete_ids:
-            db.execute(
-                text("delete from teacher_availability where id = :id and teacher_id = :teacher_id"),
-                {"id": str(availability_id), "teacher_id": str(teacher_id)},
-            )
-        for slot in payload.availability_ops.upsert:
-            slot_id = slot.id or uuid4()
-            exists = db.execute(
-                text("select exists(select 1 from teacher_availability where id = :id and teacher_id = :teacher_id)"),
-                {"id": str(slot_id), "teacher_id": str(teacher_id)},
-            ).scalar_one()
-            params = {
-                "id": str(slot_id),
-                "teacher_id": str(teacher_id),
-                "day_of_week": slot.day_of_week,
-                "start_time": slot.start_time,
-                "end_time": slot.end_time,
-            }
-            if exists:
-                db.execute(
-                    text(
-                        """
-                        update teacher_availability
-                        set day_of_week = :day_of_week,
-                            start_time = :start_time,
-                            end_time = :end_time,
-                            updated_at = now()
-                        where id = :id and teacher_id = :teacher_id
-                        """
-                    ),
-                    params,
-                )
-            else:
-                db.execute(
-                    text(
-                        """
-                        insert into teacher_availability
-                          (id, teacher_id, day_of_week, start_time, end_time)
-                        values
-                          (:id, :teacher_id, :day_of_week, :start_time, :end_time)
-                        """
-                    ),
-                    params,
-                )
-
-    return get_teacher_profile_v2(db, user)
+        _apply_availability_ops(db, teacher_id, payload.availability_ops)
+
+    invalidate_teacher_public_cache(db, teacher_id)
+    if payload.first_name is not None or payload.last_name is not None:
+        user_row = _get_user(db, user.user_id)
+    return _teacher_profile_payload(
+        user_row,
+        dict(teacher),
+        _load_address(db, address_id),
+        _load_teacher_collections(db, teacher_id),
+    )
 
 
 def set_teacher_activation_v2(db: Session, teacher_id: UUID, is_active: bool) -> dict:
@@ -979,6 +1020,7 @@ def set_teacher_activation_v2(db: Session, teacher_id: UUID, is_active: bool) ->
     )
     if not row:
         raise ProfileNotFoundError("Teacher profile not found.")
+    invalidate_teacher_public_cache(db, row["id"])
     return {
         "status": "ok",
         "teacher_id": UUID(str(row["id"])),
@@ -5,6 +5,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.response_cache import invalidate_teacher_public_cache
 from app.core.security import AuthUser
 from app.schemas.v2_reviews import ReviewCreateRequest, ReviewModerationRequest
 from app.services.identity_service import IdentityNotFoundError, get_actor_participant_ids, resolve_parent_id
@@ -144,6 +145,7 @@ def create_review_v2(db: Session, user: AuthUser, booking_id: UUID, payload: Rev
         raise
     if not row:
         raise ReviewValidationError("Could not create review.")
+    invalidate_teacher_public_cache(db, booking["teacher_id"])
 
     return {
         **dict(row),
@@ -298,6 +300,7 @@ def moderate_review_v2(db: Session, review_id: UUID, payload: ReviewModerationRe
     )
     if not row:
         raise ReviewNotFoundError("Review not found.")
+    invalidate_teacher_public_cache(db, row["teacher_id"])
     return _map_review_row(dict(row))
 
 
@@ -1,14 +1,13 @@
 import logging
 import json
-from collections import deque
-from threading import Lock
-from time import monotonic
 from urllib import error, parse, request
 
 from fastapi import Request
 
 from app.core.config import Settings
-from app.core.ssl_utils import build_ssl_context
+from app.core.metrics import observe_outbound_request
+from app.core.rate_limit import RateLimit, get_rate_limiter
+from app.core.ssl_utils import shared_ssl_context
 from app.schemas.v2_auth import AuthSignupRequest
 
 logger = logging.getLogger(__name__)
@@ -21,56 +20,31 @@ class SignupProtectionError(Exception):
         self.status_code = status_code
 
 
-class _InMemorySignupRateLimiter:
-    def __init__(self) -> None:
-        self._lock = Lock()
-        self._attempts_by_ip: dict[str, deque[float]] = {}
-        self._attempts_by_email: dict[str, deque[float]] = {}
-
-    @staticmethod
-    def _trim(queue: deque[float], *, cutoff: float) -> None:
-        while queue and queue[0] < cutoff:
-            queue.popleft()
-
-    def check_and_mark_attempt(
-        self,
-        *,
-        window_seconds: int,
-        max_attempts_per_ip: int,
-        max_attempts_per_email: int,
-        client_ip: str,
-        email: str,
-    ) -> None:
-        if window_seconds <= 0:
-            return
-
-        now = monotonic()
-        cutoff = now - float(window_seconds)
-        ip_key = (client_ip or "unknown").strip().lower()
-        email_key = email.strip().lower()
-
-        with self._lock:
-            ip_queue = self._attempts_by_ip.setdefault(ip_key, deque())
-            email_queue = self._attempts_by_email.setdefault(email_key, deque())
-            self._trim(ip_queue, cutoff=cutoff)
-            self._trim(email_queue, cutoff=cutoff)
-
-            if max_attempts_per_ip > 0 and len(ip_queue) >= max_attempts_per_ip:
-                raise SignupProtectionError(
-                    "Muitas tentativas de cadastro deste IP. Tente novamente em alguns minutos.",
-                    status_code=429,
-                )
-            if max_attempts_per_email > 0 and len(email_queue) >= max_attempts_per_email:
-                raise SignupProtectionError(
-                    "Muitas tentativas para este e-mail. Tente novamente em alguns minutos.",
-                    status_code=429,
-                )
-
-            ip_queue.append(now)
-            email_queue.append(now)
-
-
-_signup_rate_limiter = _InMemorySignupRateLimiter()
+def _check_signup_rate_limit(*, settings: Settings, client_ip: str, email: str) -> None:
+    window_seconds = settings.signup_rate_limit_window_seconds
+    if window_seconds <= 0:
+        return
+
+    ip_key = f"signup:ip:{(client_ip or 'unknown').strip().lower()}"
+    email_key = f"signup:email:{email.strip().lower()}"
+    decision = get_rate_limiter().hit(
+        "signup",
+        [
+            RateLimit(ip_key, settings.signup_rate_limit_max_attempts_per_ip, window_seconds),
+            RateLimit(email_key, settings.signup_rate_limit_max_attempts_per_email, window_seconds),
+        ],
+    )
+    if decision.allowed:
+        return
+    if decision.key == ip_key:
+        raise SignupProtectionError(
+            "Muitas tentativas de cadastro deste IP. Tente novamente em alguns minutos.",
+            status_code=429,
+        )
+    raise SignupProtectionError(
+        "Muitas tentativas para este e-mail. Tente novamente em alguns minutos.",
+        status_code=429,
+    )
 
 
 def get_client_ip(request_obj: Request, settings: Settings) -> str:
@@ -114,37 +88,39 @@ def _verify_captcha_token(*, settings: Settings, token: str, client_ip: str) ->
         method="POST",
         headers={"Content-Type": "application/x-www-form-urlencoded"},
     )
-    ssl_context = build_ssl_context()
-
-    try:
-        with request.urlopen(
-            verify_request,
-            timeout=settings.signup_captcha_timeout_seconds,
-            context=ssl_context,
-        ) as response:
-            payload_raw = response.read().decode("utf-8")
-    except error.HTTPError as exc:
-        payload_raw = exc.read().decode("utf-8") if exc.fp is not None else ""
-        logger.warning(
-            "Signup captcha provider returned HTTP error (provider=%s status=%s body=%s).",
-            settings.signup_captcha_provider,
-            exc.code,
-            payload_raw[:500],
-        )
-        raise SignupProtectionError(
-            f"Validação anti-spam falhou no provedor ({exc.code}).",
-            status_code=502,
-        ) from exc
-    except error.URLError as exc:
-        logger.warning(
-            "Signup captcha provider unreachable (provider=%s reason=%s).",
-            settings.signup_captcha_provider,
-            exc.reason,
-        )
-        raise SignupProtectionError(
-            "Não foi possível validar o desafio anti-spam. Tente novamente.",
-            status_code=503,
-        ) from exc
+    ssl_context = shared_ssl_context()
+
+    with observe_outbound_request("captcha") as call:
+        try:
+            with request.urlopen(
+                verify_request,
+                timeout=settings.signup_captcha_timeout_seconds,
+                context=ssl_context,
+            ) as response:
+                payload_raw = response.read().decode("utf-8")
+        except error.HTTPError as exc:
+            call.status_code = exc.code
+            payload_raw = exc.read().decode("utf-8") if exc.fp is not None else ""
+            logger.warning(
+                "Signup captcha provider returned HTTP error (provider=%s status=%s body=%s).",
+                settings.signup_captcha_provider,
+                exc.code,
+                payload_raw[:500],
+            )
+            raise SignupProtectionError(
+                f"Validação anti-spam falhou no provedor ({exc.code}).",
+                status_code=502,
+            ) from exc
+        except error.URLError as exc:
+            logger.warning(
+                "Signup captcha provider unreachable (provider=%s reason=%s).",
+                settings.signup_captcha_provider,
+                exc.reason,
+            )
+            raise SignupProtectionError(
+                "Não foi possível validar o desafio anti-spam. Tente novamente.",
+                status_code=503,
+            ) from exc
 
     try:
         parsed_payload = json.loads(payload_raw) if payload_raw else {}
@@ -187,13 +163,7 @@ def enforce_signup_protection(*, settings: Settings, payload: AuthSignupRequest,
     if payload.honeypot and payload.honeypot.strip():
         raise SignupProtectionError("Não foi possível processar o cadastro.", status_code=400)
 
-    _signup_rate_limiter.check_and_mark_attempt(
-        window_seconds=settings.signup_rate_limit_window_seconds,
-        max_attempts_per_ip=settings.signup_rate_limit_max_attempts_per_ip,
-        max_attempts_per_email=settings.signup_rate_limit_max_attempts_per_email,
-        client_ip=client_ip,
-        email=payload.email,
-    )
+    _check_signup_rate_limit(settings=settings, client_ip=client_ip, email=payload.email)
 
     if settings.signup_captcha_required:
         token = (payload.captcha_token or "").strip()
@@ -1,9 +1,22 @@
 import importlib
 import json
+import re
 from urllib import error, parse, request
 
+from app.core.circuit_breaker import CircuitOpenError, circuit_breaker
 from app.core.config import Settings
-from app.core.ssl_utils import build_ssl_context
+from app.core.metrics import observe_outbound_request
+from app.core.ssl_utils import shared_ssl_context
+from app.core.tracing import inject_trace_headers
+
+# Uploaded photos are stored as a rendition set: "<base>/<size>.webp" and "<base>/<size>.jpg" for every
+# size below, with "<base>/512.jpg" kept in teachers.profile_photo_file_name.
+PROFILE_PHOTO_RENDITION_SIZES = (64, 128, 256, 512)
+PROFILE_PHOTO_RENDITION_FORMATS = {"webp": "image/webp", "jpg": "image/jpeg"}
+_RENDITION_KEY_RE = re.compile(r"^(?P<base>.+)/(?P<size>\d+)\.(?P<extension>webp|jpg)$")
+
+# Shared with the uploads in profile_photo_service: both talk to the same Supabase Storage.
+STORAGE_BREAKER = circuit_breaker("supabase_storage")
 
 
 def _get_boto3_module():
@@ -101,6 +114,33 @@ def _extract_signed_url_and_token(payload: dict) -> tuple[str | None, str | None
     return None, None
 
 
+def profile_photo_rendition_key(base_key: str, size: int, extension: str) -> str:
+    return f"{base_key}/{size}.{extension}"
+
+
+def profile_photo_rendition_keys(object_key: str) -> list[str]:
+    match = _RENDITION_KEY_RE.match(object_key)
+    if not match or int(match["size"]) not in PROFILE_PHOTO_RENDITION_SIZES:
+        return [object_key]
+    return [
+        profile_photo_rendition_key(match["base"], size, extension)
+        for size in PROFILE_PHOTO_RENDITION_SIZES
+        for extension in PROFILE_PHOTO_RENDITION_FORMATS
+    ]
+
+
+def _select_rendition_key(object_key: str, size: int | None, image_format: str) -> str:
+    match = _RENDITION_KEY_RE.match(object_key)
+    if not match or int(match["size"]) not in PROFILE_PHOTO_RENDITION_SIZES:
+        # Legacy single-file uploads and external paths have no renditions.
+        return object_key
+    largest = PROFILE_PHOTO_RENDITION_SIZES[-1]
+    requested = size or largest
+    selected = next((candidate for candidate in PROFILE_PHOTO_RENDITION_SIZES if candidate >= requested), largest)
+    extension = image_format if image_format in PROFILE_PHOTO_RENDITION_FORMATS else "jpg"
+    return profile_photo_rendition_key(match["base"], selected, extension)
+
+
 def _create_supabase_signed_url(settings: Settings, object_key: str) -> str | None:
     if not settings.supabase_service_role_key:
         return None
@@ -119,27 +159,40 @@ def _create_supabase_signed_url(settings: Settings, object_key: str) -> str | No
             "Content-Type": "application/json",
         },
     )
-    ssl_context = build_ssl_context(settings.supabase_jwks_ca_bundle)
+    ssl_context = shared_ssl_context(settings.supabase_jwks_ca_bundle)
 
     try:
-        with request.urlopen(req, timeout=settings.supabase_http_timeout_seconds, context=ssl_context) as response:
-            payload_raw = response.read().decode("utf-8")
-            payload = json.loads(payload_raw) if payload_raw else {}
-            signed_value, token = _extract_signed_url_and_token(payload)
-            if isinstance(signed_value, str):
-                absolute_url = _build_absolute_supabase_signed_url(settings, signed_value)
-                if absolute_url:
-                    return _append_token_if_missing(absolute_url, token)
-            if token:
-                base_url = (
-                    f"{settings.supabase_url.rstrip('/')}/storage/v1/object/sign/"
-                    f"{settings.profile_photos_bucket}/{_encode_storage_path(object_key)}"
-                )
-                return _append_token_if_missing(base_url, token)
-            return None
-    except (error.HTTPError, error.URLError, json.JSONDecodeError):
+        with STORAGE_BREAKER.guard() as breaker_call, observe_outbound_request("supabase_storage") as call:
+            inject_trace_headers(req)
+            try:
+                with request.urlopen(req, timeout=settings.supabase_http_timeout_seconds, context=ssl_context) as response:
+                    payload_raw = response.read().decode("utf-8")
+                    payload = json.loads(payload_raw) if payload_raw else {}
+            except error.HTTPError as exc:
+                call.status_code = exc.code
+                breaker_call.failed = exc.code >= 500
+                return None
+            except (error.URLError, json.JSONDecodeError):
+                call.failed = True
+                breaker_call.failed = True
+                return None
+    except CircuitOpenError:
+        # Falls back to the public object URL.
         return None
 
+    signed_value, token = _extract_signed_url_and_token(payload)
+    if isinstance(signed_value, str):
+        absolute_url = _build_absolute_supabase_signed_url(settings, signed_value)
+        if absolute_url:
+            return _append_token_if_missing(absolute_url, token)
+    if token:
+        base_url = (
+            f"{settings.supabase_url.rstrip('/')}/storage/v1/object/sign/"
+            f"{settings.profile_photos_bucket}/{_encode_storage_path(object_key)}"
+        )
+        return _append_token_if_missing(base_url, token)
+    return None
+
 
 def _create_s3_presigned_url(settings: Settings, object_key: str) -> str | None:
     if not (settings.storage_s3_access_key_id and settings.storage_s3_secret_access_key):
@@ -164,7 +217,12 @@ def _create_s3_presigned_url(settings: Settings, object_key: str) -> str | None:
         return None
 
 
-def resolve_teacher_profile_photo_url(settings: Settings, raw_path: str | None) -> str | None:
+def resolve_teacher_profile_photo_url(
+    settings: Settings,
+    raw_path: str | None,
+    size: int | None = None,
+    image_format: str = "jpg",
+) -> str | None:
     if not raw_path:
         return None
     value = raw_path.strip()
@@ -180,6 +238,7 @@ def resolve_teacher_profile_photo_url(settings: Settings, raw_path: str | None)
         object_key = _normalize_object_key(value, settings.profile_photos_bucket)
     if not object_key:
         return None
+    object_key = _select_rendition_key(object_key, size, image_format)
 
     s3_signed_url = _create_s3_presigned_url(settings, object_key)
     if s3_signed_url:
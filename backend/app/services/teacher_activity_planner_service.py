@@ -7,12 +7,24 @@ import ssl
 from dataclasses import dataclass
 from urllib import error, request
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.core.background_jobs import get_activity_plan_job_queue
+from app.core.circuit_breaker import CircuitOpenError, circuit_breaker
 from app.core.config import Settings, get_settings
-from app.core.ssl_utils import build_ssl_context
+from app.core.metrics import observe_outbound_request
+from app.core.ssl_utils import shared_ssl_context
+from app.core.tracing import traced
+from app.db.session import get_session_maker
+
+
+_LLM_BREAKER = circuit_breaker("llm")
+
+
+class ActivityPlanGenerationError(Exception):
+    pass
 
 
 @dataclass
@@ -25,6 +37,11 @@ class TeacherActivityPlanInput:
     latest_follow_up_summary: str | None
 
 
+def activity_plan_llm_configured(settings: Settings) -> bool:
+    return bool(settings.teacher_activity_llm_enabled and settings.teacher_activity_llm_api_key)
+
+
+@traced("activity_plan.generate")
 def generate_teacher_activity_plan(
     planner_input: TeacherActivityPlanInput,
     settings: Settings | None = None,
@@ -32,9 +49,7 @@ def generate_teacher_activity_plan(
     resolved_settings = settings or get_settings()
     fallback_activities = _build_fallback_activities(planner_input)
 
-    if not resolved_settings.teacher_activity_llm_enabled:
-        return {"source": "fallback", "activities": fallback_activities}
-    if not resolved_settings.teacher_activity_llm_api_key:
+    if not activity_plan_llm_configured(resolved_settings):
         return {"source": "fallback", "activities": fallback_activities}
 
     llm_activities = _generate_with_openai(resolved_settings, planner_input)
@@ -52,35 +67,84 @@ def get_or_create_teacher_activity_plan_for_booking(
     planner_input: TeacherActivityPlanInput,
     settings: Settings | None = None,
 ) -> dict:
+    # The LLM is never called on the request path: the fallback plan is stored and returned, and a
+    # background job keyed by (booking_id, context_hash) replaces it once this transaction commits.
     resolved_settings = settings or get_settings()
-    context_hash = _build_context_hash(planner_input)
+    context_hash = build_activity_plan_context_hash(planner_input)
+    fallback_plan = {"source": "fallback", "activities": _build_fallback_activities(planner_input)}
 
     cache_ok, cached_plan_row = _safe_plan_db_operation(db, lambda: _load_cached_plan_row(db, booking_id))
     if not cache_ok:
-        return generate_teacher_activity_plan(planner_input, resolved_settings)
+        return fallback_plan
 
     if cached_plan_row:
         cached_activities = _normalize_activities_payload(cached_plan_row.get("activities"))
         if cached_activities and str(cached_plan_row.get("context_hash") or "") == context_hash:
-            return {
-                "source": str(cached_plan_row.get("source") or "fallback"),
-                "activities": cached_activities,
-            }
+            cached_source = str(cached_plan_row.get("source") or "fallback")
+            if cached_source == "fallback" and activity_plan_llm_configured(resolved_settings):
+                _after_commit(db, lambda: enqueue_activity_plan_generation(booking_id, planner_input, context_hash))
+            return {"source": cached_source, "activities": cached_activities}
 
-    generated_plan = generate_teacher_activity_plan(planner_input, resolved_settings)
-    _safe_plan_db_operation(
+    persisted, _ = _safe_plan_db_operation(
         db,
         lambda: _persist_booking_activity_plan(
             db=db,
             booking_id=booking_id,
             teacher_id=teacher_id,
             child_id=child_id,
-            source=str(generated_plan["source"]),
-            activities=generated_plan["activities"],
+            source=str(fallback_plan["source"]),
+            activities=fallback_plan["activities"],
             context_hash=context_hash,
         ),
     )
-    return generated_plan
+    if persisted and activity_plan_llm_configured(resolved_settings):
+        _after_commit(db, lambda: enqueue_activity_plan_generation(booking_id, planner_input, context_hash))
+    return fallback_plan
+
+
+def enqueue_activity_plan_generation(
+    booking_id: str,
+    planner_input: TeacherActivityPlanInput,
+    context_hash: str,
+) -> bool:
+    return get_activity_plan_job_queue().submit(
+        (booking_id, context_hash),
+        run_activity_plan_job,
+        booking_id,
+        planner_input,
+        context_hash,
+    )
+
+
+@traced("activity_plan.job")
+def run_activity_plan_job(booking_id: str, planner_input: TeacherActivityPlanInput, context_hash: str) -> None:
+    settings = get_settings()
+    db = get_session_maker()()
+    try:
+        cached_plan_row = _load_cached_plan_row(db, booking_id)
+        # Release the connection before the slow LLM call.
+        db.rollback()
+        if not cached_plan_row or str(cached_plan_row.get("context_hash") or "") != context_hash:
+            # Booking context changed (a newer job owns the plan) or the enqueuing transaction never committed.
+            return
+        if str(cached_plan_row.get("source") or "") == "llm":
+            return
+
+        activities = _generate_with_openai(settings, planner_input)
+        if not activities:
+            raise ActivityPlanGenerationError(f"LLM returned no activities for booking {booking_id}.")
+        _store_llm_activities(db, booking_id=booking_id, activities=activities, context_hash=context_hash)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _after_commit(db: Session, callback) -> None:
+    if isinstance(db, Session):
+        event.listen(db, "after_commit", lambda _session: callback(), once=True)
+    else:
+        # Test doubles and ad-hoc connections have no transaction events.
+        callback()
 
 
 def get_cached_teacher_activity_plan_for_booking(
@@ -101,6 +165,53 @@ def get_cached_teacher_activity_plan_for_booking(
     }
 
 
+def bulk_persist_booking_activity_plans(db: Session, plans: list[dict]) -> int:
+    if not plans:
+        return 0
+    payload = [
+        {
+            "booking_id": str(plan["booking_id"]),
+            "teacher_id": str(plan["teacher_id"]),
+            "child_id": str(plan["child_id"]),
+            "source": str(plan["source"]),
+            "activities": plan["activities"],
+            "context_hash": str(plan["context_hash"]),
+        }
+        for plan in plans
+    ]
+    # A fallback never overwrites an LLM plan generated meanwhile for the same context.
+    result = db.execute(
+        text(
+            """
+            insert into booking_activity_plans
+              (booking_id, teacher_id, child_id, source, activities, context_hash, generated_at)
+            select r.booking_id, r.teacher_id, r.child_id, r.source, r.activities, r.context_hash, now()
+            from jsonb_to_recordset(cast(:plans as jsonb)) as r(
+              booking_id uuid,
+              teacher_id uuid,
+              child_id uuid,
+              source text,
+              activities jsonb,
+              context_hash text
+            )
+            on conflict (booking_id)
+            do update set
+              teacher_id = excluded.teacher_id,
+              child_id = excluded.child_id,
+              source = excluded.source,
+              activities = excluded.activities,
+              context_hash = excluded.context_hash,
+              generated_at = now(),
+              updated_at = now()
+            where booking_activity_plans.context_hash <> excluded.context_hash
+               or booking_activity_plans.source = 'fallback'
+            """
+        ),
+        {"plans": json.dumps(payload, ensure_ascii=False)},
+    )
+    return int(result.rowcount or 0)
+
+
 def _safe_plan_db_operation(db: Session, operation):
     try:
         with db.begin_nested():
@@ -141,16 +252,27 @@ def _generate_with_openai(
         },
         method="POST",
     )
-    ssl_context = build_ssl_context(settings.teacher_activity_llm_ca_bundle)
+    ssl_context = shared_ssl_context(settings.teacher_activity_llm_ca_bundle)
 
     try:
-        with request.urlopen(
-            req,
-            timeout=settings.teacher_activity_llm_timeout_seconds,
-            context=ssl_context,
-        ) as response:
-            raw_response = response.read().decode("utf-8")
-    except (error.HTTPError, error.URLError, TimeoutError, ssl.SSLError):
+        with _LLM_BREAKER.guard() as breaker_call, observe_outbound_request("llm") as call:
+            try:
+                with request.urlopen(
+                    req,
+                    timeout=settings.teacher_activity_llm_timeout_seconds,
+                    context=ssl_context,
+                ) as response:
+                    raw_response = response.read().decode("utf-8")
+            except error.HTTPError as exc:
+                call.status_code = exc.code
+                breaker_call.failed = exc.code >= 500 or exc.code == 429
+                return []
+            except (error.URLError, TimeoutError, ssl.SSLError):
+                call.failed = True
+                breaker_call.failed = True
+                return []
+    except CircuitOpenError:
+        # Callers fall back to the deterministic activities.
         return []
 
     try:
@@ -188,7 +310,7 @@ def _build_user_prompt(planner_input: TeacherActivityPlanInput) -> str:
     )
 
 
-def _build_context_hash(planner_input: TeacherActivityPlanInput) -> str:
+def build_activity_plan_context_hash(planner_input: TeacherActivityPlanInput) -> str:
     normalized_payload = {
         "child_name": planner_input.child_name.strip(),
         "child_age": planner_input.child_age,
@@ -315,6 +437,27 @@ def _persist_booking_activity_plan(
     )
 
 
+def _store_llm_activities(db: Session, *, booking_id: str, activities: list[str], context_hash: str) -> None:
+    db.execute(
+        text(
+            """
+            update booking_activity_plans
+            set source = 'llm',
+                activities = cast(:activities as jsonb),
+                generated_at = now(),
+                updated_at = now()
+            where booking_id = :booking_id
+              and context_hash = :context_hash
+            """
+        ),
+        {
+            "booking_id": booking_id,
+            "activities": json.dumps(activities, ensure_ascii=False),
+            "context_hash": context_hash,
+        },
+    )
+
+
 def _build_fallback_activities(planner_input: TeacherActivityPlanInput) -> list[str]:
     is_first_lesson_with_child = planner_input.completed_lessons_with_child == 0
     primary_objective = planner_input.objectives[0] if planner_input.objectives else "Consolidar habilidades da aula"
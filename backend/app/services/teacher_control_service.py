@@ -1,16 +1,29 @@
 from datetime import UTC, date, datetime, timedelta
 import json
+import logging
 import re
 from uuid import UUID
 
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY
 from app.core.security import AuthUser
+from app.core.tracing import traced
 from app.schemas.v2_teacher_control import TeacherControlCenterOverviewResponse, TeacherStudentTimelineResponse
 from app.services.booking_v2_service import BookingNotFoundError, BookingValidationError, get_teacher_availability_slots_v2
 from app.services.identity_service import IdentityNotFoundError, IdentityPermissionError, require_user_role, resolve_teacher_id
-from app.services.teacher_activity_planner_service import get_cached_teacher_activity_plan_for_booking
+from app.services.teacher_activity_planner_service import _normalize_activities_payload
+
+logger = logging.getLogger(__name__)
+
+TEACHER_OVERVIEW_SNAPSHOTS_TOTAL = REGISTRY.counter(
+    "kidario_teacher_overview_snapshots_total",
+    "Teacher control center overview requests by snapshot result (hit, miss, bypass).",
+    ("result",),
+)
 
 
 class TeacherControlPermissionError(Exception):
@@ -139,6 +152,74 @@ def _count_availability_slots(availability: dict) -> int:
     return total
 
 
+def _overview_params_key(*, limit_agenda: int, limit_chats: int, limit_students: int, include_history: bool) -> str:
+    return f"agenda={limit_agenda}:chats={limit_chats}:students={limit_students}:history={int(include_history)}"
+
+
+def _load_overview_snapshot(db: Session, teacher_id: UUID, params_key: str, ttl_seconds: int) -> tuple[int | None, dict | None]:
+    # One indexed read: the teacher's current version plus the snapshot built for it, if still fresh.
+    try:
+        with db.begin_nested():
+            row = (
+                db.execute(
+                    text(
+                        """
+                        select
+                          coalesce(v.version, 0) as version,
+                          s.version as snapshot_version,
+                          s.payload
+                        from (select cast(:teacher_id as uuid) as teacher_id) t
+                        left join teacher_overview_versions v on v.teacher_id = t.teacher_id
+                        left join teacher_overview_snapshots s
+                          on s.teacher_id = t.teacher_id
+                         and s.params_key = :params_key
+                         and s.built_at > now() - make_interval(secs => :ttl_seconds)
+                        """
+                    ),
+                    {"teacher_id": str(teacher_id), "params_key": params_key, "ttl_seconds": ttl_seconds},
+                )
+                .mappings()
+                .first()
+            )
+    except SQLAlchemyError:
+        # sql/023 not applied: serve without snapshots.
+        return None, None
+    if not row:
+        return None, None
+    version = int(row["version"])
+    if row["snapshot_version"] is not None and int(row["snapshot_version"]) == version:
+        return version, row["payload"]
+    return version, None
+
+
+def _store_overview_snapshot(db: Session, teacher_id: UUID, params_key: str, version: int, payload: dict) -> None:
+    # Read endpoints never commit the request session, so the snapshot is written on its own connection.
+    try:
+        with db.get_bind().begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    insert into teacher_overview_snapshots (teacher_id, params_key, version, payload, built_at)
+                    values (:teacher_id, :params_key, :version, cast(:payload as jsonb), now())
+                    on conflict (teacher_id, params_key) do update
+                    set version = excluded.version,
+                        payload = excluded.payload,
+                        built_at = excluded.built_at
+                    where teacher_overview_snapshots.version <= excluded.version
+                    """
+                ),
+                {
+                    "teacher_id": str(teacher_id),
+                    "params_key": params_key,
+                    "version": version,
+                    "payload": json.dumps(payload),
+                },
+            )
+    except SQLAlchemyError:
+        logger.warning("Could not store teacher overview snapshot (teacher_id=%s).", teacher_id, exc_info=True)
+
+
+@traced("teacher_control.overview")
 def get_teacher_control_center_overview(
     db: Session,
     user: AuthUser,
@@ -149,100 +230,194 @@ def get_teacher_control_center_overview(
     include_history: bool = False,
 ) -> dict:
     teacher_id = _require_teacher(db, user)
+    ttl_seconds = get_settings().teacher_overview_snapshot_ttl_seconds
+    params_key = _overview_params_key(
+        limit_agenda=limit_agenda,
+        limit_chats=limit_chats,
+        limit_students=limit_students,
+        include_history=include_history,
+    )
+
+    version, snapshot = (None, None)
+    if ttl_seconds > 0:
+        version, snapshot = _load_overview_snapshot(db, teacher_id, params_key, ttl_seconds)
+    if snapshot is not None:
+        TEACHER_OVERVIEW_SNAPSHOTS_TOTAL.inc(result="hit")
+        return TeacherControlCenterOverviewResponse(**snapshot).model_dump()
+
+    TEACHER_OVERVIEW_SNAPSHOTS_TOTAL.inc(result="miss" if version is not None else "bypass")
+    overview = TeacherControlCenterOverviewResponse(
+        **_build_teacher_control_center_overview(
+            db,
+            teacher_id,
+            limit_agenda=limit_agenda,
+            limit_chats=limit_chats,
+            limit_students=limit_students,
+            include_history=include_history,
+        )
+    )
+    if version is not None:
+        _store_overview_snapshot(db, teacher_id, params_key, version, overview.model_dump(mode="json"))
+    return overview.model_dump()
+
+
+def _build_teacher_control_center_overview(
+    db: Session,
+    teacher_id: UUID,
+    *,
+    limit_agenda: int,
+    limit_chats: int,
+    limit_students: int,
+    include_history: bool,
+) -> dict:
     today = date.today()
     window_end = today + timedelta(days=14)
 
-    counts_row = (
+    summary_row = (
         db.execute(
             text(
                 """
+                with booking_counts as (
+                  select
+                    count(*) filter (
+                      where starts_at >= now()
+                        and status in ('pendente', 'confirmada')
+                        and coalesce(teacher_decision_status, 'pending') <> 'rejected'
+                    ) as upcoming_lessons_count,
+                    count(*) filter (
+                      where starts_at >= now()
+                        and status = 'pendente'
+                        and coalesce(teacher_decision_status, 'pending') = 'pending'
+                    ) as pending_decisions_count,
+                    count(*) filter (
+                      where starts_at >= :window_start
+                        and starts_at < :window_end
+                        and status in ('pendente', 'confirmada')
+                        and coalesce(teacher_decision_status, 'pending') <> 'rejected'
+                    ) as upcoming_lessons_window_count
+                  from bookings
+                  where teacher_id = :teacher_id
+                ),
+                finance as (
+                  select
+                    coalesce(sum(case when b.status = 'concluida' then coalesce(ps.amount_cents, round(po.amount_cents * coalesce(ps.percentage, 0) / 100)::integer, 0) else 0 end), 0) as gross_revenue_total_cents,
+                    coalesce(sum(case when po.status = 'paid' and b.status in ('confirmada', 'concluida') then coalesce(ps.amount_cents, round(po.amount_cents * coalesce(ps.percentage, 0) / 100)::integer, 0) else 0 end), 0) as paid_total_cents,
+                    coalesce(sum(case when po.status in ('created', 'pending', 'authorized') and b.status in ('pendente', 'confirmada', 'concluida') then coalesce(ps.amount_cents, round(po.amount_cents * coalesce(ps.percentage, 0) / 100)::integer, 0) else 0 end), 0) as pending_payment_total_cents,
+                    count(*) filter (where b.status = 'concluida') as completed_lessons_count,
+                    count(*) filter (where po.status = 'paid' and b.status in ('confirmada', 'concluida')) as paid_lessons_count
+                  from bookings b
+                  left join payment_orders po on po.booking_id = b.id
+                  left join payment_splits ps on ps.payment_order_id = po.id and ps.split_role = 'teacher'
+                  where b.teacher_id = :teacher_id
+                )
                 select
-                  count(*) filter (
-                    where starts_at >= now()
-                      and status in ('pendente', 'confirmada')
-                      and coalesce(teacher_decision_status, 'pending') <> 'rejected'
-                  ) as upcoming_lessons_count,
-                  count(*) filter (
-                    where starts_at >= now()
-                      and status = 'pendente'
-                      and coalesce(teacher_decision_status, 'pending') = 'pending'
-                  ) as pending_decisions_count
-                from bookings
-                where teacher_id = :teacher_id
+                  booking_counts.*,
+                  finance.*,
+                  (select coalesce(lesson_duration_minutes, 60) from teachers where id = :teacher_id) as lesson_duration_minutes
+                from booking_counts
+                cross join finance
                 """
             ),
-            {"teacher_id": str(teacher_id)},
+            {
+                "teacher_id": str(teacher_id),
+                "window_start": datetime.combine(today, datetime.min.time()),
+                "window_end": datetime.combine(window_end + timedelta(days=1), datetime.min.time()),
+            },
         )
         .mappings()
         .first()
-    )
+    ) or {}
 
     agenda_rows = (
         db.execute(
             text(
                 """
+                with agenda as (
+                  select
+                    b.id,
+                    b.teacher_id,
+                    b.child_id,
+                    b.parent_id,
+                    b.starts_at,
+                    b.duration_minutes,
+                    b.modality,
+                    b.status,
+                    coalesce(b.teacher_decision_status, 'pending') as teacher_decision_status,
+                    b.teacher_decision_reason,
+                    b.teacher_decision_at,
+                    coalesce(b.payment_flow_status, 'not_started') as payment_flow_status
+                  from bookings b
+                  where b.teacher_id = :teacher_id
+                    and (:include_history = true or b.starts_at >= now())
+                  order by b.starts_at asc
+                  limit :limit_agenda
+                ),
+                child_lessons as (
+                  -- The teacher's lessons with the agenda's children, read once for the whole page.
+                  select b.id, b.child_id, b.starts_at, b.status
+                  from bookings b
+                  where b.teacher_id = :teacher_id
+                    and b.child_id in (select distinct child_id from agenda)
+                ),
+                completed_counter as (
+                  select a.id as booking_id, count(*)::int as completed_lessons_with_child
+                  from agenda a
+                  join child_lessons cl
+                    on cl.child_id = a.child_id
+                   and cl.status = 'concluida'
+                   and cl.starts_at < a.starts_at
+                  group by a.id
+                ),
+                latest_follow_up as (
+                  select distinct on (a.id)
+                    a.id as booking_id,
+                    bf.summary,
+                    bf.next_objectives,
+                    bf.objectives
+                  from agenda a
+                  join child_lessons cl on cl.child_id = a.child_id and cl.starts_at < a.starts_at
+                  join booking_follow_ups bf on bf.booking_id = cl.id
+                  order by a.id, cl.starts_at desc, bf.updated_at desc
+                ),
+                threads as (
+                  select distinct on (t.parent_id, t.child_id)
+                    t.id,
+                    t.parent_id,
+                    t.child_id
+                  from chat_threads t
+                  where t.teacher_id = :teacher_id
+                    and t.child_id in (select distinct child_id from agenda)
+                  order by t.parent_id, t.child_id, coalesce(t.last_message_at, t.updated_at) desc, t.created_at asc
+                )
                 select
-                  b.id,
-                  b.child_id,
-                  b.parent_id,
+                  a.*,
                   p.user_id as parent_user_id,
                   c.name as child_name,
                   c.focus_points as child_focus_points,
-                  b.starts_at,
-                  b.duration_minutes,
-                  b.modality,
-                  b.status,
-                  coalesce(b.teacher_decision_status, 'pending') as teacher_decision_status,
-                  b.teacher_decision_reason,
-                  b.teacher_decision_at,
-                  coalesce(b.payment_flow_status, 'not_started') as payment_flow_status,
-                  ct.id as chat_thread_id,
-                  coalesce(completed_counter.completed_lessons_with_child, 0) as completed_lessons_with_child,
-                  latest_follow_up.summary as latest_follow_up_summary,
-                  latest_follow_up.next_objectives as latest_follow_up_next_objectives,
-                  latest_follow_up.objectives as latest_follow_up_objectives,
-                  last_message.sender_user_id as last_message_sender_user_id
-                from bookings b
-                join parents p on p.id = b.parent_id
-                join children c on c.id = b.child_id
-                left join lateral (
-                  select t.id
-                  from chat_threads t
-                  where t.parent_id = b.parent_id
-                    and t.teacher_id = b.teacher_id
-                    and t.child_id = b.child_id
-                  order by coalesce(t.last_message_at, t.updated_at) desc, t.created_at asc
-                  limit 1
-                ) ct on true
-                left join lateral (
-                  select count(*)::int as completed_lessons_with_child
-                  from bookings b_completed
-                  where b_completed.teacher_id = b.teacher_id
-                    and b_completed.child_id = b.child_id
-                    and b_completed.status = 'concluida'
-                    and b_completed.starts_at < b.starts_at
-                ) completed_counter on true
-                left join lateral (
-                  select bf.summary, bf.next_objectives, bf.objectives
-                  from booking_follow_ups bf
-                  join bookings b_follow_up on b_follow_up.id = bf.booking_id
-                  where b_follow_up.teacher_id = b.teacher_id
-                    and b_follow_up.child_id = b.child_id
-                    and b_follow_up.starts_at < b.starts_at
-                  order by b_follow_up.starts_at desc, bf.updated_at desc
-                  limit 1
-                ) latest_follow_up on true
+                  th.id as chat_thread_id,
+                  coalesce(cc.completed_lessons_with_child, 0) as completed_lessons_with_child,
+                  lf.summary as latest_follow_up_summary,
+                  lf.next_objectives as latest_follow_up_next_objectives,
+                  lf.objectives as latest_follow_up_objectives,
+                  last_message.sender_user_id as last_message_sender_user_id,
+                  bap.source as activity_plan_source,
+                  bap.activities as activity_plan_activities
+                from agenda a
+                join parents p on p.id = a.parent_id
+                join children c on c.id = a.child_id
+                left join threads th on th.parent_id = a.parent_id and th.child_id = a.child_id
+                left join completed_counter cc on cc.booking_id = a.id
+                left join latest_follow_up lf on lf.booking_id = a.id
+                left join booking_activity_plans bap on bap.booking_id = a.id
                 left join lateral (
+                  -- One probe of idx_chat_messages_thread_created_at per distinct thread.
                   select cm.sender_user_id
                   from chat_messages cm
-                  where cm.thread_id = ct.id
+                  where cm.thread_id = th.id
                   order by cm.created_at desc
                   limit 1
                 ) last_message on true
-                where b.teacher_id = :teacher_id
-                  and (:include_history = true or b.starts_at >= now())
-                order by b.starts_at asc
-                limit :limit_agenda
+                order by a.starts_at asc
                 """
             ),
             {"teacher_id": str(teacher_id), "limit_agenda": limit_agenda, "include_history": include_history},
@@ -263,8 +438,6 @@ def get_teacher_control_center_overview(
             latest_follow_up_next_objectives=row.get("latest_follow_up_next_objectives"),
             latest_follow_up_objectives=row.get("latest_follow_up_objectives"),
         )
-        cached_activity_plan = get_cached_teacher_activity_plan_for_booking(db=db, booking_id=str(row["id"]))
-        activity_plan = cached_activity_plan or {"source": "fallback", "activities": []}
         has_unread_messages = (
             bool(row.get("chat_thread_id"))
             and row.get("last_message_sender_user_id") is not None
@@ -290,8 +463,8 @@ def get_teacher_control_center_overview(
                 "completed_lessons_with_child": completed_lessons_with_child,
                 "objectives": objectives,
                 "parent_focus_points": parent_focus_points,
-                "activity_plan_source": activity_plan["source"],
-                "activity_plan": activity_plan["activities"],
+                "activity_plan_source": str(row.get("activity_plan_source") or "fallback"),
+                "activity_plan": _normalize_activities_payload(row.get("activity_plan_activities")),
                 "actions": {
                     "can_accept": _can_teacher_accept_booking(
                         status=status,
@@ -436,83 +609,39 @@ def get_teacher_control_center_overview(
         for row in student_rows
     ]
 
-    finance_row = (
-        db.execute(
-            text(
-                """
-                select
-                  coalesce(sum(case when b.status = 'concluida' then coalesce(ps.amount_cents, round(po.amount_cents * coalesce(ps.percentage, 0) / 100)::integer, 0) else 0 end), 0) as gross_revenue_total_cents,
-                  coalesce(sum(case when po.status = 'paid' and b.status in ('confirmada', 'concluida') then coalesce(ps.amount_cents, round(po.amount_cents * coalesce(ps.percentage, 0) / 100)::integer, 0) else 0 end), 0) as paid_total_cents,
-                  coalesce(sum(case when po.status in ('created', 'pending', 'authorized') and b.status in ('pendente', 'confirmada', 'concluida') then coalesce(ps.amount_cents, round(po.amount_cents * coalesce(ps.percentage, 0) / 100)::integer, 0) else 0 end), 0) as pending_payment_total_cents,
-                  count(*) filter (where b.status = 'concluida') as completed_lessons_count,
-                  count(*) filter (where po.status = 'paid' and b.status in ('confirmada', 'concluida')) as paid_lessons_count
-                from bookings b
-                left join payment_orders po on po.booking_id = b.id
-                left join payment_splits ps on ps.payment_order_id = po.id and ps.split_role = 'teacher'
-                where b.teacher_id = :teacher_id
-                """
-            ),
-            {"teacher_id": str(teacher_id)},
-        )
-        .mappings()
-        .first()
-    )
-
-    lesson_duration_minutes = db.execute(
-        text("select coalesce(lesson_duration_minutes, 60) from teachers where id = :teacher_id"),
-        {"teacher_id": str(teacher_id)},
-    ).scalar()
     try:
         availability = get_teacher_availability_slots_v2(
             db,
             teacher_id,
             date_from=today,
             date_to=window_end,
-            duration_minutes=int(lesson_duration_minutes or 60),
+            duration_minutes=int(summary_row.get("lesson_duration_minutes") or 60),
         )
         available_slots_count = _count_availability_slots(availability)
     except (BookingValidationError, BookingNotFoundError):
         available_slots_count = 0
 
-    upcoming_lessons_window_count = db.execute(
-        text(
-            """
-            select count(*)
-            from bookings
-            where teacher_id = :teacher_id
-              and starts_at >= :window_start
-              and starts_at < :window_end
-              and status in ('pendente', 'confirmada')
-              and coalesce(teacher_decision_status, 'pending') <> 'rejected'
-            """
-        ),
-        {
-            "teacher_id": str(teacher_id),
-            "window_start": datetime.combine(today, datetime.min.time()),
-            "window_end": datetime.combine(window_end + timedelta(days=1), datetime.min.time()),
-        },
-    ).scalar()
-    upcoming_lessons_window_count = int(upcoming_lessons_window_count or 0)
+    upcoming_lessons_window_count = int(summary_row.get("upcoming_lessons_window_count") or 0)
     occupancy_rate_percent = (
         round((upcoming_lessons_window_count / available_slots_count) * 100, 2)
         if available_slots_count > 0
         else 0.0
     )
 
-    payload = {
+    return {
         "generated_at": datetime.now(UTC),
-        "upcoming_lessons_count": int((counts_row or {}).get("upcoming_lessons_count", 0)),
-        "pending_decisions_count": int((counts_row or {}).get("pending_decisions_count", 0)),
+        "upcoming_lessons_count": int(summary_row.get("upcoming_lessons_count") or 0),
+        "pending_decisions_count": int(summary_row.get("pending_decisions_count") or 0),
         "agenda": agenda_payload,
         "chat_threads": chat_payload,
         "students": students_payload,
         "finance": {
             "currency": "BRL",
-            "gross_revenue_total_cents": int((finance_row or {}).get("gross_revenue_total_cents", 0) or 0),
-            "paid_total_cents": int((finance_row or {}).get("paid_total_cents", 0) or 0),
-            "pending_payment_total_cents": int((finance_row or {}).get("pending_payment_total_cents", 0) or 0),
-            "completed_lessons_count": int((finance_row or {}).get("completed_lessons_count", 0) or 0),
-            "paid_lessons_count": int((finance_row or {}).get("paid_lessons_count", 0) or 0),
+            "gross_revenue_total_cents": int(summary_row.get("gross_revenue_total_cents", 0) or 0),
+            "paid_total_cents": int(summary_row.get("paid_total_cents", 0) or 0),
+            "pending_payment_total_cents": int(summary_row.get("pending_payment_total_cents", 0) or 0),
+            "completed_lessons_count": int(summary_row.get("completed_lessons_count", 0) or 0),
+            "paid_lessons_count": int(summary_row.get("paid_lessons_count", 0) or 0),
         },
         "planning": {
             "window_start": today,
@@ -522,7 +651,6 @@ def get_teacher_control_center_overview(
             "occupancy_rate_percent": occupancy_rate_percent,
         },
     }
-    return TeacherControlCenterOverviewResponse(**payload).model_dump()
 
 
 def get_teacher_student_timeline(
@@ -0,0 +1,91 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+# Seeded rows use ids derived from md5("bench:<kind>:<n>") so the runner can address any
+# teacher/parent/child without reading the database. The seed SQL uses the same formula.
+BENCH_EMAIL_DOMAIN = "bench.kidario.test"
+
+CITIES = (
+    ("Sao Paulo", "SP", -23.5505, -46.6333),
+    ("Rio de Janeiro", "RJ", -22.9068, -43.1729),
+    ("Belo Horizonte", "MG", -19.9167, -43.9345),
+    ("Curitiba", "PR", -25.4284, -49.2733),
+    ("Porto Alegre", "RS", -30.0346, -51.2177),
+    ("Salvador", "BA", -12.9777, -38.5016),
+    ("Recife", "PE", -8.0476, -34.8770),
+    ("Brasilia", "DF", -15.7939, -47.8828),
+)
+
+SKILLS = (
+    "Alfabetizacao",
+    "Matematica",
+    "Portugues",
+    "Ingles",
+    "Ciencias",
+    "Reforco escolar",
+    "TDAH",
+    "Dislexia",
+    "Redacao",
+    "Musica",
+)
+
+SKILLS_PER_TEACHER = 3
+LESSON_DURATION_MINUTES = 60
+AVAILABILITY_START = "08:00"
+AVAILABILITY_END = "20:00"
+
+
+@dataclass(frozen=True)
+class SeedVolumes:
+    teachers: int = 2000
+    parents: int = 10000
+    bookings: int = 300000
+    messages: int = 500000
+    future_booking_ratio: float = 0.2
+    review_ratio: float = 0.6
+
+
+def bench_uuid(kind: str, index: int) -> UUID:
+    return UUID(hashlib.md5(f"bench:{kind}:{index}".encode("utf-8")).hexdigest())
+
+
+def teacher_user_id(index: int) -> UUID:
+    return bench_uuid("teacher-user", index)
+
+
+def teacher_id(index: int) -> UUID:
+    return bench_uuid("teacher", index)
+
+
+def parent_user_id(index: int) -> UUID:
+    return bench_uuid("parent-user", index)
+
+
+def child_id(index: int) -> UUID:
+    return bench_uuid("child", index)
+
+
+def mint_access_token(
+    *,
+    secret: str,
+    issuer: str,
+    audience: str,
+    user_id: UUID,
+    email: str,
+    ttl_seconds: int = 3600,
+) -> str:
+    import jwt
+
+    now = int(time.time())
+    claims = {
+        "sub": str(user_id),
+        "email": email,
+        "role": "authenticated",
+        "aud": audience,
+        "iss": issuer,
+        "iat": now,
+        "exp": now + ttl_seconds,
+    }
+    return jwt.encode(claims, secret, algorithm="HS256")
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""Drive the hot API endpoints with concurrent clients and report latency percentiles."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import json
+from pathlib import Path
+import random
+import sys
+import threading
+import time
+from urllib import error, parse, request
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import get_settings
+from app.core.query_inspector import QUERY_COUNT_HEADER
+from benchmarks.fixtures import (
+    BENCH_EMAIL_DOMAIN,
+    CITIES,
+    SKILLS,
+    SeedVolumes,
+    child_id,
+    mint_access_token,
+    parent_user_id,
+    teacher_id,
+    teacher_user_id,
+)
+from benchmarks.stats import (
+    ScenarioResult,
+    compare,
+    format_comparison,
+    format_table,
+    parse_db_query_totals,
+    queries_per_request_delta,
+    summarize,
+)
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+LOCAL_UTC_OFFSET = timezone(timedelta(hours=-3))
+
+
+@dataclass(frozen=True)
+class PlannedRequest:
+    method: str
+    path: str
+    token: str | None = None
+    body: dict | None = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    route: str
+    build: Callable[["BenchContext", random.Random], PlannedRequest]
+
+
+class BenchContext:
+    def __init__(self, *, base_url: str, api_prefix: str, volumes: SeedVolumes, jwt: dict[str, str]) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_prefix = api_prefix
+        self.volumes = volumes
+        self._jwt = jwt
+        self._tokens: dict[str, str] = {}
+        self._tokens_lock = threading.Lock()
+        self.threads_by_parent: dict[int, list[str]] = {}
+
+    def api(self, path: str) -> str:
+        return f"{self.api_prefix}{path}"
+
+    def _token(self, user_id, email: str) -> str:
+        key = str(user_id)
+        with self._tokens_lock:
+            token = self._tokens.get(key)
+            if token is None:
+                token = mint_access_token(user_id=user_id, email=email, **self._jwt)
+                self._tokens[key] = token
+            return token
+
+    def parent_token(self, index: int) -> str:
+        return self._token(parent_user_id(index), f"parent-{index}@{BENCH_EMAIL_DOMAIN}")
+
+    def teacher_token(self, index: int) -> str:
+        return self._token(teacher_user_id(index), f"teacher-{index}@{BENCH_EMAIL_DOMAIN}")
+
+
+def send(ctx: BenchContext, planned: PlannedRequest, timeout: float = 30.0) -> tuple[int, dict[str, str], bytes]:
+    headers = {"Accept": "application/json"}
+    data = None
+    if planned.token:
+        headers["Authorization"] = f"Bearer {planned.token}"
+    if planned.body is not None:
+        headers["Content-Type"] = "application/json"
+        data = json.dumps(planned.body).encode("utf-8")
+    req = request.Request(url=f"{ctx.base_url}{planned.path}", data=data, method=planned.method, headers=headers)
+    try:
+        with request.urlopen(req, timeout=timeout) as response:
+            return response.status, dict(response.headers), response.read()
+    except error.HTTPError as exc:
+        return exc.code, dict(exc.headers or {}), exc.read()
+
+
+def _explore_list(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    params = {"limit": 20, "skill": rng.choice(SKILLS)}
+    if rng.random() < 0.5:
+        city, state, _, _ = rng.choice(CITIES)
+        params.update(city=city, state=state)
+    return PlannedRequest("GET", ctx.api(f"/explore/teachers?{parse.urlencode(params)}"))
+
+
+def _explore_detail(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    return PlannedRequest("GET", ctx.api(f"/explore/teachers/{teacher_id(rng.randrange(ctx.volumes.teachers))}"))
+
+
+def _availability_slots(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    start = date.today() + timedelta(days=rng.randint(0, 30))
+    params = {"from": start.isoformat(), "to": (start + timedelta(days=6)).isoformat(), "duration_minutes": 60}
+    teacher = teacher_id(rng.randrange(ctx.volumes.teachers))
+    return PlannedRequest(
+        "GET",
+        ctx.api(f"/teachers/{teacher}/availability/slots?{parse.urlencode(params)}"),
+        token=ctx.parent_token(rng.randrange(ctx.volumes.parents)),
+    )
+
+
+def _create_booking(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    teacher_index = rng.randrange(ctx.volumes.teachers)
+    parent_index = rng.randrange(ctx.volumes.parents)
+    # Far enough ahead to avoid the seeded agenda; seeded teachers offer 08:00-20:00 every day.
+    day = date.today() + timedelta(days=rng.randint(60, 720))
+    starts_at = datetime.combine(day, datetime.min.time(), LOCAL_UTC_OFFSET).replace(hour=rng.randint(8, 19))
+    return PlannedRequest(
+        "POST",
+        ctx.api("/bookings"),
+        token=ctx.parent_token(parent_index),
+        body={
+            "teacher_id": str(teacher_id(teacher_index)),
+            "child_id": str(child_id(parent_index)),
+            "starts_at": starts_at.isoformat(),
+            "modality": "presencial" if teacher_index % 3 == 1 else "online",
+            "payment_method": "pix",
+        },
+    )
+
+
+def _parent_bookings(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    tab = rng.choice(("upcoming", "past"))
+    return PlannedRequest(
+        "GET",
+        ctx.api(f"/parents/me/bookings?tab={tab}&limit=20"),
+        token=ctx.parent_token(rng.randrange(ctx.volumes.parents)),
+    )
+
+
+def _teacher_bookings(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    tab = rng.choice(("upcoming", "past"))
+    return PlannedRequest(
+        "GET",
+        ctx.api(f"/teachers/me/bookings?tab={tab}&limit=20"),
+        token=ctx.teacher_token(rng.randrange(ctx.volumes.teachers)),
+    )
+
+
+def _chat_threads_for(ctx: BenchContext, parent_index: int) -> PlannedRequest:
+    return PlannedRequest("GET", ctx.api("/chat/threads?limit=30"), token=ctx.parent_token(parent_index))
+
+
+def _chat_threads(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    return _chat_threads_for(ctx, rng.randrange(ctx.volumes.parents))
+
+
+def _chat_messages(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    parent_index = rng.choice(list(ctx.threads_by_parent))
+    thread = rng.choice(ctx.threads_by_parent[parent_index])
+    return PlannedRequest(
+        "GET",
+        ctx.api(f"/chat/threads/{thread}/messages?limit=60"),
+        token=ctx.parent_token(parent_index),
+    )
+
+
+def _teacher_control_center(ctx: BenchContext, rng: random.Random) -> PlannedRequest:
+    return PlannedRequest(
+        "GET",
+        ctx.api("/teacher/control-center/overview"),
+        token=ctx.teacher_token(rng.randrange(ctx.volumes.teachers)),
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("explore_list", "GET", "/explore/teachers", _explore_list),
+        Scenario("explore_detail", "GET", "/explore/teachers/{teacher_id}", _explore_detail),
+        Scenario("availability_slots", "GET", "/teachers/{teacher_id}/availability/slots", _availability_slots),
+        Scenario("booking_create", "POST", "/bookings", _create_booking),
+        Scenario("parent_bookings", "GET", "/parents/me/bookings", _parent_bookings),
+        Scenario("teacher_bookings", "GET", "/teachers/me/bookings", _teacher_bookings),
+        Scenario("chat_threads", "GET", "/chat/threads", _chat_threads),
+        Scenario("chat_messages", "GET", "/chat/threads/{thread_id}/messages", _chat_messages),
+        Scenario("teacher_control_center", "GET", "/teacher/control-center/overview", _teacher_control_center),
+    )
+}
+
+
+def prepare_chat_threads(ctx: BenchContext, sample_parents: int = 200) -> None:
+    for parent_index in range(min(sample_parents, ctx.volumes.parents)):
+        status_code, _, body = send(ctx, _chat_threads_for(ctx, parent_index))
+        if status_code != 200:
+            continue
+        thread_ids = [item["id"] for item in json.loads(body).get("threads", [])]
+        if thread_ids:
+            ctx.threads_by_parent[parent_index] = thread_ids
+    if not ctx.threads_by_parent:
+        raise SystemExit("No chat threads found for seeded parents; run `python -m benchmarks.seed` first.")
+
+
+def fetch_metrics(ctx: BenchContext, token: str | None) -> dict[tuple[str, str], tuple[float, float]] | None:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    try:
+        with request.urlopen(request.Request(f"{ctx.base_url}/metrics", headers=headers), timeout=10) as response:
+            return parse_db_query_totals(response.read().decode("utf-8"))
+    except Exception:
+        return None
+
+
+def run_scenario(
+    ctx: BenchContext,
+    scenario: Scenario,
+    *,
+    duration_seconds: float,
+    warmup_seconds: float,
+    concurrency: int,
+    seed: int,
+) -> tuple[ScenarioResult, float]:
+    result = ScenarioResult(scenario.name)
+    lock = threading.Lock()
+
+    def worker(worker_index: int, deadline: float, record: bool) -> None:
+        rng = random.Random(seed * 1000 + worker_index + (0 if record else 500))
+        while time.perf_counter() < deadline:
+            planned = scenario.build(ctx, rng)
+            started_at = time.perf_counter()
+            try:
+                status_code, headers, _ = send(ctx, planned)
+            except Exception:
+                if record:
+                    with lock:
+                        result.errors += 1
+                continue
+            latency_ms = (time.perf_counter() - started_at) * 1000
+            if not record:
+                continue
+            query_header = headers.get(QUERY_COUNT_HEADER)
+            with lock:
+                result.record(latency_ms, status_code, int(query_header) if query_header else None)
+
+    def run_phase(seconds: float, record: bool) -> float:
+        started_at = time.perf_counter()
+        deadline = started_at + seconds
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for worker_index in range(concurrency):
+                executor.submit(worker, worker_index, deadline, record)
+        return time.perf_counter() - started_at
+
+    if warmup_seconds > 0:
+        run_phase(warmup_seconds, record=False)
+    elapsed = run_phase(duration_seconds, record=True)
+    return result, elapsed
+
+
+def parse_args() -> argparse.Namespace:
+    defaults = SeedVolumes()
+    parser = argparse.ArgumentParser(description="Run the Kidario API benchmark against a running server.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="CSV of scenario names.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per scenario.")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds per scenario.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--teachers", type=int, default=defaults.teachers, help="Must match the seed.")
+    parser.add_argument("--parents", type=int, default=defaults.parents, help="Must match the seed.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for request mixes.")
+    parser.add_argument("--label", default="", help="Free-form label stored with the results.")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/<timestamp>.json).")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against.")
+    parser.add_argument("--metrics-token", default=None, help="Bearer token for /metrics when protected.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    settings = get_settings()
+    if not settings.supabase_jwt_secret:
+        raise SystemExit("KIDARIO_SUPABASE_JWT_SECRET must be set (the server must use the same value).")
+
+    scenario_names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenario_names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+
+    volumes = SeedVolumes(teachers=args.teachers, parents=args.parents)
+    ctx = BenchContext(
+        base_url=args.base_url,
+        api_prefix=settings.api_v2_prefix,
+        volumes=volumes,
+        jwt={
+            "secret": settings.supabase_jwt_secret,
+            "issuer": settings.jwt_issuer,
+            "audience": settings.supabase_jwt_audience,
+        },
+    )
+    if "chat_messages" in scenario_names:
+        prepare_chat_threads(ctx)
+
+    summaries: dict[str, dict] = {}
+    for name in scenario_names:
+        scenario = SCENARIOS[name]
+        metrics_key = (scenario.method, ctx.api(scenario.route))
+        metrics_before = fetch_metrics(ctx, args.metrics_token)
+        result, elapsed = run_scenario(
+            ctx,
+            scenario,
+            duration_seconds=args.duration,
+            warmup_seconds=args.warmup,
+            concurrency=args.concurrency,
+            seed=args.seed,
+        )
+        summary = summarize(result, elapsed)
+        if summary["queries_per_request"] is None and metrics_before is not None:
+            metrics_after = fetch_metrics(ctx, args.metrics_token)
+            if metrics_after is not None:
+                # Includes warm-up requests; the per-request average is unaffected.
+                summary["queries_per_request"] = queries_per_request_delta(metrics_before, metrics_after, [metrics_key])
+        summaries[name] = summary
+        print(f"{name}: {summary['requests']} requests in {elapsed:.1f}s")
+
+    report = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "volumes": {"teachers": volumes.teachers, "parents": volumes.parents},
+        "scenarios": summaries,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print()
+    print(format_table(summaries))
+    print(f"\nResults written to {output}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print()
+        print(format_comparison(compare(baseline, report)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Seed a local Postgres with benchmark-sized data (set-based, one statement per table)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from pathlib import Path
+import sys
+import time
+
+from sqlalchemy import text
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.db.session import get_engine
+from benchmarks.fixtures import (
+    AVAILABILITY_END,
+    AVAILABILITY_START,
+    BENCH_EMAIL_DOMAIN,
+    CITIES,
+    LESSON_DURATION_MINUTES,
+    SKILLS,
+    SKILLS_PER_TEACHER,
+    SeedVolumes,
+)
+
+LOCAL_TIMEZONE = "America/Sao_Paulo"
+SLOTS_PER_DAY = 4
+
+RESET_STATEMENTS = (
+    """
+    create temporary table bench_users on commit drop as
+    select id from public.users where email like '%@' || :domain
+    """,
+    """
+    create temporary table bench_addresses on commit drop as
+    select address_id as id from public.teachers where user_id in (select id from bench_users)
+    union
+    select address_id from public.parents where user_id in (select id from bench_users)
+    """,
+    """
+    delete from public.payment_orders
+    where parent_id in (select id from public.parents where user_id in (select id from bench_users))
+    """,
+    """
+    delete from public.booking_reviews
+    where booking_id in (
+      select id from public.bookings
+      where teacher_id in (select id from public.teachers where user_id in (select id from bench_users))
+    )
+    """,
+    """
+    delete from public.bookings
+    where teacher_id in (select id from public.teachers where user_id in (select id from bench_users))
+    """,
+    """
+    delete from public.booking_packages
+    where teacher_id in (select id from public.teachers where user_id in (select id from bench_users))
+    """,
+    "delete from auth.users where id in (select id from bench_users)",
+    "delete from public.users where id in (select id from bench_users)",
+    "delete from public.addresses where id in (select id from bench_addresses)",
+)
+
+SEED_STEPS: tuple[tuple[str, str], ...] = (
+    (
+        "auth users",
+        """
+        insert into auth.users (id, instance_id, aud, role, email, email_confirmed_at, created_at, updated_at)
+        select md5('bench:teacher-user:' || n)::uuid, '00000000-0000-0000-0000-000000000000'::uuid,
+               'authenticated', 'authenticated', 'teacher-' || n || '@' || :domain, now(), now(), now()
+        from generate_series(0, :teachers - 1) as n
+        union all
+        select md5('bench:parent-user:' || n)::uuid, '00000000-0000-0000-0000-000000000000'::uuid,
+               'authenticated', 'authenticated', 'parent-' || n || '@' || :domain, now(), now(), now()
+        from generate_series(0, :parents - 1) as n
+        on conflict (id) do nothing
+        """,
+    ),
+    (
+        "users",
+        """
+        insert into public.users (id, email, first_name, last_name, role, auth_email_confirmed)
+        select md5('bench:teacher-user:' || n)::uuid, 'teacher-' || n || '@' || :domain,
+               'Professora', 'Bench ' || n, 'teacher', true
+        from generate_series(0, :teachers - 1) as n
+        union all
+        select md5('bench:parent-user:' || n)::uuid, 'parent-' || n || '@' || :domain,
+               'Responsavel', 'Bench ' || n, 'parent', true
+        from generate_series(0, :parents - 1) as n
+        """,
+    ),
+    (
+        "addresses",
+        """
+        insert into public.addresses (id, street, number, district, city, state, postal_code, latitude, longitude)
+        select md5('bench:address:' || kind || ':' || n)::uuid, 'Rua Bench', n::text, 'Centro',
+               city ->> 0, city ->> 1, '01001000',
+               (city ->> 2)::numeric + ((n % 100) - 50) * 0.001,
+               (city ->> 3)::numeric + ((n % 97) - 48) * 0.001
+        from (
+          select kind, n, cast(:cities as jsonb) -> (n % :city_count) as city
+          from (
+            select 'teacher' as kind, n from generate_series(0, :teachers - 1) as n
+            union all
+            select 'parent', n from generate_series(0, :parents - 1) as n
+          ) as people
+        ) as located
+        """,
+    ),
+    (
+        "teachers",
+        """
+        insert into public.teachers (
+          id, user_id, address_id, phone, cpf, modality, biography,
+          hourly_rate_cents, lesson_duration_minutes, is_active
+        )
+        select md5('bench:teacher:' || n)::uuid, md5('bench:teacher-user:' || n)::uuid,
+               md5('bench:address:teacher:' || n)::uuid, '+5511999990000',
+               lpad((90000000000 + n)::text, 11, '0'),
+               (array['online', 'presencial', 'ambos'])[(n % 3) + 1],
+               'Professora de benchmark ' || n,
+               6000 + (n % 10) * 1000, :lesson_duration_minutes, true
+        from generate_series(0, :teachers - 1) as n
+        """,
+    ),
+    (
+        "teacher skills",
+        """
+        insert into public.teacher_skills (teacher_id, skill)
+        select md5('bench:teacher:' || n)::uuid, skills.skill
+        from generate_series(0, :teachers - 1) as n
+        cross join generate_series(0, :skills_per_teacher - 1) as k
+        join lateral (
+          select (cast(:skills as text[]))[((n + k * 3) % cardinality(cast(:skills as text[]))) + 1] as skill
+        ) as skills on true
+        on conflict do nothing
+        """,
+    ),
+    (
+        "teacher availability",
+        """
+        insert into public.teacher_availability (teacher_id, day_of_week, start_time, end_time)
+        select md5('bench:teacher:' || n)::uuid, day, :availability_start, :availability_end
+        from generate_series(0, :teachers - 1) as n
+        cross join generate_series(0, 6) as day
+        """,
+    ),
+    (
+        "payment recipients",
+        """
+        insert into public.payment_provider_recipients (teacher_id, provider, provider_recipient_id, status)
+        select md5('bench:teacher:' || n)::uuid, 'pagarme', 're_bench_' || n, 'active'
+        from generate_series(0, :teachers - 1) as n
+        """,
+    ),
+    (
+        "parents",
+        """
+        insert into public.parents (id, user_id, address_id, phone, birth_date, cpf)
+        select md5('bench:parent:' || n)::uuid, md5('bench:parent-user:' || n)::uuid,
+               md5('bench:address:parent:' || n)::uuid, '+5511988880000', date '1988-01-01',
+               lpad((80000000000 + n)::text, 11, '0')
+        from generate_series(0, :parents - 1) as n
+        """,
+    ),
+    (
+        "children",
+        """
+        insert into public.children (id, parent_id, name, gender, birth_month_year, current_grade)
+        select md5('bench:child:' || n)::uuid, md5('bench:parent:' || n)::uuid, 'Crianca ' || n,
+               (array['girl', 'boy'])[(n % 2) + 1], date '2017-03-01', '2o ano'
+        from generate_series(0, :parents - 1) as n
+        """,
+    ),
+    (
+        "bookings",
+        """
+        insert into public.bookings (
+          id, parent_id, teacher_id, child_id, starts_at, duration_minutes, modality,
+          status, teacher_decision_status, payment_flow_status, currency
+        )
+        select md5('bench:booking:' || k)::uuid,
+               md5('bench:parent:' || p)::uuid,
+               md5('bench:teacher:' || t)::uuid,
+               md5('bench:child:' || p)::uuid,
+               starts_at,
+               :lesson_duration_minutes,
+               'online',
+               case
+                 when starts_at < now() and k % 10 = 0 then 'cancelada'
+                 when starts_at < now() then 'concluida'
+                 when k % 5 = 0 then 'pendente'
+                 else 'confirmada'
+               end,
+               case when starts_at >= now() and k % 5 = 0 then 'pending' else 'accepted' end,
+               case when starts_at >= now() and k % 5 = 0 then 'awaiting_payment' else 'paid' end,
+               'BRL'
+        from (
+          select k,
+                 k % :teachers as t,
+                 ((k % :teachers) * 7 + (k / :teachers) / 4) % :parents as p,
+                 (
+                   (current_date + ((k / :teachers) / :slots_per_day - :past_days + 1))
+                   + make_time(9 + 2 * ((k / :teachers) % :slots_per_day), 0, 0)
+                 ) at time zone :timezone as starts_at
+          from generate_series(0, :bookings - 1) as k
+        ) as planned
+        """,
+    ),
+    (
+        "reviews",
+        """
+        insert into public.booking_reviews (booking_id, rating, comment)
+        select b.id, 3 + (abs(hashtext(b.id::text)) % 3), 'Aula muito boa.'
+        from public.bookings b
+        where b.teacher_id in (select md5('bench:teacher:' || n)::uuid from generate_series(0, :teachers - 1) as n)
+          and b.status = 'concluida'
+          and abs(hashtext(b.id::text)) % 100 < :review_percent
+        """,
+    ),
+    (
+        "chat threads",
+        """
+        insert into public.chat_threads (id, booking_id, parent_id, teacher_id, child_id, status)
+        select distinct on (b.parent_id, b.teacher_id, b.child_id)
+               md5('bench:thread:' || b.id)::uuid, b.id, b.parent_id, b.teacher_id, b.child_id, 'active'
+        from public.bookings b
+        where b.teacher_id in (select md5('bench:teacher:' || n)::uuid from generate_series(0, :teachers - 1) as n)
+        order by b.parent_id, b.teacher_id, b.child_id, b.starts_at desc
+        """,
+    ),
+    (
+        "chat messages",
+        """
+        with threads as (
+          select ct.id, p.user_id as parent_user_id, t.user_id as teacher_user_id,
+                 row_number() over (order by ct.id) - 1 as position
+          from public.chat_threads ct
+          join public.parents p on p.id = ct.parent_id
+          join public.teachers t on t.id = ct.teacher_id
+          where ct.id = md5('bench:thread:' || ct.booking_id)::uuid
+        )
+        insert into public.chat_messages (thread_id, sender_user_id, body, created_at)
+        select th.id,
+               case when m % 2 = 0 then th.parent_user_id else th.teacher_user_id end,
+               'Mensagem de benchmark ' || m,
+               now() - ((:messages - m) * interval '1 minute')
+        from generate_series(0, :messages - 1) as m
+        join threads th on th.position = m % (select count(*) from threads)
+        """,
+    ),
+    (
+        "thread activity",
+        """
+        update public.chat_threads ct
+        set last_message_at = latest.created_at
+        from (
+          select thread_id, max(created_at) as created_at
+          from public.chat_messages
+          group by thread_id
+        ) as latest
+        where latest.thread_id = ct.id
+          and ct.id = md5('bench:thread:' || ct.booking_id)::uuid
+        """,
+    ),
+    ("analyze", "analyze"),
+)
+
+
+def parse_args() -> argparse.Namespace:
+    defaults = SeedVolumes()
+    parser = argparse.ArgumentParser(description="Seed benchmark data into KIDARIO_DATABASE_URL.")
+    parser.add_argument("--teachers", type=int, default=defaults.teachers)
+    parser.add_argument("--parents", type=int, default=defaults.parents)
+    parser.add_argument("--bookings", type=int, default=defaults.bookings)
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--future-ratio", type=float, default=defaults.future_booking_ratio)
+    parser.add_argument("--review-ratio", type=float, default=defaults.review_ratio)
+    parser.add_argument(
+        "--reset-only",
+        action="store_true",
+        help="Remove previously seeded benchmark rows and exit.",
+    )
+    return parser.parse_args()
+
+
+def build_params(args: argparse.Namespace) -> dict[str, object]:
+    bookings_per_teacher = math.ceil(args.bookings / max(1, args.teachers))
+    past_bookings_per_teacher = bookings_per_teacher * (1 - args.future_ratio)
+    return {
+        "domain": BENCH_EMAIL_DOMAIN,
+        "teachers": args.teachers,
+        "parents": args.parents,
+        "bookings": args.bookings,
+        "messages": args.messages,
+        "review_percent": int(args.review_ratio * 100),
+        "past_days": math.ceil(past_bookings_per_teacher / SLOTS_PER_DAY),
+        "slots_per_day": SLOTS_PER_DAY,
+        "timezone": LOCAL_TIMEZONE,
+        "lesson_duration_minutes": LESSON_DURATION_MINUTES,
+        "availability_start": AVAILABILITY_START,
+        "availability_end": AVAILABILITY_END,
+        "skills": list(SKILLS),
+        "skills_per_teacher": SKILLS_PER_TEACHER,
+        "cities": json.dumps([list(city) for city in CITIES]),
+        "city_count": len(CITIES),
+    }
+
+
+def reset(conn, params: dict[str, object]) -> None:
+    for statement in RESET_STATEMENTS:
+        conn.execute(text(statement), params)
+
+
+def main() -> int:
+    args = parse_args()
+    params = build_params(args)
+    engine = get_engine()
+
+    with engine.begin() as conn:
+        reset(conn, params)
+    print("Removed previous benchmark rows.")
+    if args.reset_only:
+        return 0
+
+    for label, statement in SEED_STEPS:
+        started_at = time.perf_counter()
+        with engine.begin() as conn:
+            result = conn.execute(text(statement), params)
+        rows = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else "-"
+        print(f"{label:<22} rows={rows:<10} {time.perf_counter() - started_at:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
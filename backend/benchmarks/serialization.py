@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Compare response serialization paths on the largest API payloads, without a server or database."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.fast_json import _orjson, dumps
+from app.schemas.v2_bookings import BookingsResponse, PaymentOrdersResponse
+from app.schemas.v2_explore import ExploreTeachersResponse, TeacherPublicProfile
+from benchmarks.fixtures import CITIES, SKILLS, bench_uuid, child_id, teacher_id
+from benchmarks.stats import percentile
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+LOCAL_UTC_OFFSET = timezone(timedelta(hours=-3))
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _slots(rng: random.Random, count: int) -> list[dict]:
+    first = datetime(2026, 3, 3, 8, 0, tzinfo=LOCAL_UTC_OFFSET) + timedelta(hours=rng.randint(0, 48))
+    return [
+        {"starts_at": first + timedelta(hours=index), "duration_minutes": 60, "modality": rng.choice(("online", "presencial"))}
+        for index in range(count)
+    ]
+
+
+def _review(rng: random.Random, index: int) -> dict:
+    return {
+        "id": bench_uuid("review", index),
+        "rating": rng.randint(3, 5),
+        "comment": "Aula muito produtiva, a crianca evoluiu bastante na leitura. " * rng.randint(1, 3),
+        "submitted_at": NOW - timedelta(days=rng.randint(1, 300), microseconds=rng.randint(0, 999_999)),
+    }
+
+
+def _teacher_base(rng: random.Random, index: int, slot_count: int) -> dict:
+    city, state, _, _ = CITIES[index % len(CITIES)]
+    slots = _slots(rng, slot_count)
+    return {
+        "teacher_id": teacher_id(index),
+        "display_name": f"Professora Bench {index}",
+        "profile_photo_url": f"https://cdn.kidario.test/teachers/{index}/card.webp",
+        "location": {"city": city, "state": state, "country": "BR", "distance_km": round(rng.uniform(0.5, 30), 1)},
+        "modality": rng.choice(("online", "presencial", "ambos")),
+        "hourly_rate_cents": rng.randrange(6000, 20000, 500),
+        "lesson_duration_minutes": 60,
+        "skills": rng.sample(SKILLS, 3),
+        "rating_summary": {"average": round(rng.uniform(3.5, 5), 2), "count": rng.randint(0, 120)},
+        "availability_summary": {"next_available_at": slots[0]["starts_at"], "preview_slots": slots, "range_days": None},
+        "package_summary": {
+            "has_packages": True,
+            "starting_estimated_amount_cents": rng.randrange(30000, 90000, 1000),
+            "max_discount_percent": 10.0,
+        },
+    }
+
+
+def explore_list_payload(rng: random.Random, size: int) -> dict:
+    teachers = []
+    for index in range(size):
+        teacher = _teacher_base(rng, index, 3)
+        teacher["biography_preview"] = "Pedagoga com experiencia em alfabetizacao e reforco escolar. " * 3
+        teacher["latest_review"] = _review(rng, index)
+        teachers.append(teacher)
+    return {"teachers": teachers}
+
+
+def teacher_detail_payload(rng: random.Random, size: int) -> dict:
+    teacher = _teacher_base(rng, 0, 12)
+    teacher["location"]["distance_km"] = None
+    teacher["availability_summary"]["range_days"] = 14
+    teacher["biography"] = "Pedagoga com experiencia em alfabetizacao e reforco escolar. " * 10
+    teacher["academic_records"] = [
+        {
+            "id": bench_uuid("academic", index),
+            "degree_type": "Graduacao",
+            "course_name": "Pedagogia",
+            "institution": "USP",
+            "completion_year": str(2010 + index),
+        }
+        for index in range(3)
+    ]
+    teacher["experiences"] = [
+        {
+            "id": bench_uuid("experience", index),
+            "institution": "Escola Bench",
+            "role": "Professora",
+            "description": "Turmas de alfabetizacao.",
+            "period_from": "2015",
+            "period_to": None,
+            "current_position": index == 0,
+        }
+        for index in range(4)
+    ]
+    teacher["package_plans"] = [
+        {
+            "id": bench_uuid("package-plan", index),
+            "code": f"pack-{index}",
+            "name": f"Pacote {index}",
+            "description": None,
+            "sessions_count": 4 * (index + 1),
+            "discount_percent": 5.0 * index,
+            "estimated_original_amount_cents": 40000 * (index + 1),
+            "estimated_final_amount_cents": 38000 * (index + 1),
+            "currency": "BRL",
+            "is_active": True,
+        }
+        for index in range(3)
+    ]
+    teacher["latest_reviews"] = [_review(rng, index) for index in range(5)]
+    return teacher
+
+
+def _payment_order(rng: random.Random, index: int, *, with_splits: bool) -> dict:
+    order_id = bench_uuid("payment-order", index)
+    created_at = NOW - timedelta(days=rng.randint(0, 200))
+    amount_cents = rng.randrange(6000, 20000, 500)
+    charge = {
+        "id": bench_uuid("payment-charge", index),
+        "payment_order_id": order_id,
+        "provider": "pagarme",
+        "provider_charge_id": f"ch_{index:016d}",
+        "provider_transaction_id": f"tran_{index:016d}",
+        "payment_method": "credit_card",
+        "status": "paid",
+        "amount_cents": amount_cents,
+        "paid_amount_cents": amount_cents,
+        "installments": 1,
+        "pix_qr_code": None,
+        "pix_qr_code_url": None,
+        "boleto_url": None,
+        "card_brand": "visa",
+        "card_last_four": "4242",
+        "card_holder_name": "RESPONSAVEL BENCH",
+        "authorization_code": "123456",
+        "authorized_at": created_at,
+        "captured_at": created_at,
+        "expires_at": None,
+        "payment_url": None,
+        "boleto_barcode": None,
+        "boleto_line": None,
+        "paid_at": created_at,
+        "failed_at": None,
+        "canceled_at": None,
+        "refunded_at": None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    splits = []
+    if with_splits:
+        splits = [
+            {
+                "id": bench_uuid(f"payment-split-{role}", index),
+                "payment_order_id": order_id,
+                "teacher_id": teacher_id(index) if role == "teacher" else None,
+                "split_role": role,
+                "type": "percentage",
+                "amount_cents": None,
+                "percentage": percentage,
+                "created_at": created_at,
+            }
+            for role, percentage in (("platform", 20.0), ("teacher", 80.0))
+        ]
+    return {
+        "id": order_id,
+        "parent_id": bench_uuid("parent", index % 50),
+        "booking_id": bench_uuid("booking", index),
+        "package_id": None,
+        "provider": "pagarme",
+        "provider_order_id": f"or_{index:016d}",
+        "provider_order_code": f"BK-{index:08d}",
+        "requested_payment_method": "credit_card",
+        "amount_cents": amount_cents,
+        "currency": "BRL",
+        "status": "paid",
+        "authorized_at": created_at,
+        "paid_at": created_at,
+        "expires_at": None,
+        "charges": [charge],
+        "splits": splits,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def bookings_payload(rng: random.Random, size: int) -> dict:
+    bookings = []
+    for index in range(size):
+        starts_at = NOW + timedelta(days=rng.randint(-60, 60), hours=rng.randint(0, 10))
+        bookings.append(
+            {
+                "id": bench_uuid("booking", index),
+                "parent_id": bench_uuid("parent", index % 50),
+                "child_id": child_id(index % 50),
+                "teacher_id": teacher_id(index),
+                "package_id": None,
+                "starts_at": starts_at,
+                "duration_minutes": 60,
+                "modality": "online",
+                "status": "confirmada",
+                "teacher_decision_status": "accepted",
+                "teacher_decision_reason": None,
+                "teacher_decision_at": starts_at - timedelta(days=2),
+                "payment_flow_status": "paid",
+                "cancellation_reason": None,
+                "confirmed_at": starts_at - timedelta(days=2),
+                "completed_at": None,
+                "canceled_at": None,
+                "created_at": starts_at - timedelta(days=3),
+                "updated_at": starts_at - timedelta(days=2),
+                "child": {"id": child_id(index % 50), "name": "Crianca Bench"},
+                "teacher": {
+                    "id": teacher_id(index),
+                    "display_name": f"Professora Bench {index}",
+                    "profile_photo_url": f"https://cdn.kidario.test/teachers/{index}/avatar.webp",
+                },
+                "parent": {"id": bench_uuid("parent", index % 50), "display_name": "Responsavel Bench"},
+                "payment_order": _payment_order(rng, index, with_splits=False),
+                "latest_follow_up": {
+                    "updated_at": starts_at,
+                    "summary": "Boa evolucao na leitura de silabas complexas.",
+                    "next_steps": "Praticar leitura em voz alta.",
+                    "objectives": [{"objective": "Ler frases curtas", "achieved": True, "fullfilment_level": 4}],
+                    "next_objectives": [{"objective": "Ler textos curtos", "achieved": False, "fullfilment_level": 0}],
+                    "tags": ["leitura"],
+                    "attention_points": [],
+                },
+                "actions": {"can_reschedule": True, "can_cancel": True, "can_complete": False, "can_review": False},
+            }
+        )
+    return {"bookings": bookings}
+
+
+def payments_payload(rng: random.Random, size: int) -> dict:
+    return {"payments": [_payment_order(rng, index, with_splits=True) for index in range(size)], "next_cursor": "abc"}
+
+
+PAYLOADS: dict[str, tuple[type[BaseModel], Callable[[random.Random, int], dict]]] = {
+    "explore_list": (ExploreTeachersResponse, explore_list_payload),
+    "explore_detail": (TeacherPublicProfile, teacher_detail_payload),
+    "parent_bookings": (BookingsResponse, bookings_payload),
+    "teacher_payments": (PaymentOrdersResponse, payments_payload),
+}
+
+
+def current_path(model: type[BaseModel]) -> Callable[[dict], bytes]:
+    adapter = TypeAdapter(model)
+
+    def _render(data: dict) -> bytes:
+        # The endpoint builds the model, then FastAPI validates the return value against response_model and
+        # serializes it.
+        return adapter.dump_json(adapter.validate_python(model(**data)))
+
+    return _render
+
+
+def _time_ms(render: Callable[[dict], bytes], data: dict, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        render(data)
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return samples
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark validated vs fast JSON serialization of API payloads.")
+    parser.add_argument("--payloads", default=",".join(PAYLOADS), help="CSV of payload names.")
+    parser.add_argument("--size", type=int, default=100, help="Items per list payload (the endpoints' max limit).")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/serialization-<timestamp>.json).")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    names = [name.strip() for name in args.payloads.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PAYLOADS]
+    if unknown:
+        raise SystemExit(f"Unknown payloads: {', '.join(unknown)}. Available: {', '.join(PAYLOADS)}")
+
+    encoder = "orjson" if _orjson() is not None else "pydantic_core"
+    results: dict[str, dict] = {}
+    for name in names:
+        model, build = PAYLOADS[name]
+        data = build(random.Random(args.seed), args.size)
+        render_current = current_path(model)
+        validated_body = render_current(data)
+        fast_body = dumps(data)
+        if json.loads(validated_body) != json.loads(fast_body):
+            raise SystemExit(f"{name}: fast JSON output differs from the validated response.")
+
+        for render in (render_current, dumps):
+            _time_ms(render, data, max(1, args.iterations // 10))
+        current_ms = _time_ms(render_current, data, args.iterations)
+        fast_ms = _time_ms(dumps, data, args.iterations)
+        results[name] = {
+            "bytes": len(fast_body),
+            "current_p50_ms": round(percentile(current_ms, 50), 3),
+            "current_p95_ms": round(percentile(current_ms, 95), 3),
+            "fast_p50_ms": round(percentile(fast_ms, 50), 3),
+            "fast_p95_ms": round(percentile(fast_ms, 95), 3),
+        }
+        results[name]["speedup"] = round(results[name]["current_p50_ms"] / max(results[name]["fast_p50_ms"], 1e-6), 1)
+
+    header = f"{'payload':<18}{'bytes':>9}{'cur p50':>10}{'cur p95':>10}{'fast p50':>10}{'fast p95':>10}{'speedup':>9}"
+    print(f"encoder: {encoder}, {args.size} items per list, {args.iterations} iterations\n")
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['bytes']:>9}{result['current_p50_ms']:>10.3f}{result['current_p95_ms']:>10.3f}"
+            f"{result['fast_p50_ms']:>10.3f}{result['fast_p95_ms']:>10.3f}{result['speedup']:>8.1f}x"
+        )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "encoder": encoder,
+        "size": args.size,
+        "iterations": args.iterations,
+        "payloads": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"serialization-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
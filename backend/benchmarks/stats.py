@@ -0,0 +1,130 @@
+import math
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+_DB_QUERIES_SAMPLE_RE = re.compile(
+    r'^kidario_http_request_db_queries_(sum|count)\{method="([^"]+)",route="([^"]+)"\} ([0-9.e+-]+)$'
+)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies_ms: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+
+    def record(self, latency_ms: float, status_code: int, query_count: int | None) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        if query_count is not None:
+            self.queries.append(query_count)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return float(ordered[lower])
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(result: ScenarioResult, elapsed_seconds: float) -> dict:
+    total = len(result.latencies_ms)
+    ok = sum(count for status_code, count in result.statuses.items() if 200 <= status_code < 400)
+    summary = {
+        "requests": total,
+        "ok": ok,
+        "errors": result.errors,
+        "statuses": {str(code): count for code, count in sorted(result.statuses.items())},
+        "throughput_rps": round(total / elapsed_seconds, 2) if elapsed_seconds > 0 else 0.0,
+        "p50_ms": round(percentile(result.latencies_ms, 50), 2),
+        "p95_ms": round(percentile(result.latencies_ms, 95), 2),
+        "p99_ms": round(percentile(result.latencies_ms, 99), 2),
+        "max_ms": round(max(result.latencies_ms, default=0.0), 2),
+        "queries_per_request": None,
+    }
+    if result.queries:
+        summary["queries_per_request"] = round(sum(result.queries) / len(result.queries), 2)
+    return summary
+
+
+def parse_db_query_totals(metrics_text: str) -> dict[tuple[str, str], tuple[float, float]]:
+    """Returns {(method, route): (sum, count)} from the /metrics queries-per-request histogram."""
+    totals: dict[tuple[str, str], list[float]] = {}
+    for line in metrics_text.splitlines():
+        match = _DB_QUERIES_SAMPLE_RE.match(line.strip())
+        if not match:
+            continue
+        kind, method, route, value = match.groups()
+        entry = totals.setdefault((method, route), [0.0, 0.0])
+        entry[0 if kind == "sum" else 1] = float(value)
+    return {key: (values[0], values[1]) for key, values in totals.items()}
+
+
+def queries_per_request_delta(
+    before: dict[tuple[str, str], tuple[float, float]],
+    after: dict[tuple[str, str], tuple[float, float]],
+    keys: Iterable[tuple[str, str]],
+) -> float | None:
+    total_sum = 0.0
+    total_count = 0.0
+    for key in keys:
+        sum_after, count_after = after.get(key, (0.0, 0.0))
+        sum_before, count_before = before.get(key, (0.0, 0.0))
+        total_sum += sum_after - sum_before
+        total_count += count_after - count_before
+    if total_count <= 0:
+        return None
+    return round(total_sum / total_count, 2)
+
+
+def compare(baseline: dict, current: dict) -> list[dict]:
+    rows = []
+    for name, scenario in current.get("scenarios", {}).items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        row = {"scenario": name}
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request"):
+            old, new = previous.get(metric), scenario.get(metric)
+            if old is None or new is None:
+                row[metric] = None
+                continue
+            change = ((new - old) / old * 100) if old else 0.0
+            row[metric] = {"baseline": old, "current": new, "change_pct": round(change, 1)}
+        rows.append(row)
+    return rows
+
+
+def format_table(summaries: dict[str, dict]) -> str:
+    header = f"{'scenario':<22}{'reqs':>7}{'ok':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>8}"
+    lines = [header, "-" * len(header)]
+    for name, summary in summaries.items():
+        queries = summary["queries_per_request"]
+        lines.append(
+            f"{name:<22}{summary['requests']:>7}{summary['ok']:>7}{summary['throughput_rps']:>9.1f}"
+            f"{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}"
+            f"{(f'{queries:.1f}' if queries is not None else '-'):>8}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list[dict]) -> str:
+    lines = [f"{'scenario':<22}{'metric':<22}{'baseline':>10}{'current':>10}{'change':>9}"]
+    for row in rows:
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request"):
+            values = row.get(metric)
+            if values is None:
+                continue
+            lines.append(
+                f"{row['scenario']:<22}{metric:<22}{values['baseline']:>10}{values['current']:>10}"
+                f"{values['change_pct']:>+8.1f}%"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Geocode existing addresses that have no latitude/longitude yet.
+
+Run from backend/ (requires KIDARIO_GOOGLE_GEOCODING_API_KEY):
+
+    .venv/bin/python scripts/backfill_address_coordinates.py --limit 500
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import get_settings
+from app.db.session import get_session_maker
+from app.services.address_geocoding_service import backfill_address_coordinates
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Geocode addresses missing coordinates.")
+    parser.add_argument("--limit", type=int, default=0, help="Max addresses to scan (0 = no limit).")
+    parser.add_argument("--dry-run", action="store_true", help="Only count addresses missing coordinates.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    settings = get_settings()
+    if not settings.google_geocoding_enabled and not args.dry_run:
+        print("[error] KIDARIO_GOOGLE_GEOCODING_API_KEY is not set.")
+        return 2
+
+    with get_session_maker()() as db:
+        summary = backfill_address_coordinates(db, settings=settings, limit=max(0, args.limit), dry_run=args.dry_run)
+
+    print(f"[done] scanned={summary.scanned} geocoded={summary.geocoded} failed={summary.failed}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
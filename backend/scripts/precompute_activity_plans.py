@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Precompute activity plans for upcoming confirmed bookings.
+
+Meant to run on a schedule (e.g. every 15 minutes from cron) from backend/:
+
+    .venv/bin/python scripts/precompute_activity_plans.py
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+from uuid import UUID
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import get_settings
+from app.db.session import get_session_maker
+from app.services.activity_plan_precompute_service import precompute_upcoming_activity_plans
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompute activity plans for upcoming confirmed bookings.")
+    parser.add_argument("--teacher-id", help="Only bookings of this teacher_id (UUID).")
+    parser.add_argument("--limit", type=int, default=0, help="Max bookings to scan (0 = no limit).")
+    parser.add_argument("--dry-run", action="store_true", help="Only count bookings with a missing/stale plan.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.teacher_id:
+        try:
+            UUID(args.teacher_id)
+        except ValueError:
+            print(f"[error] Invalid --teacher-id: {args.teacher_id}")
+            return 2
+
+    settings = get_settings()
+    with get_session_maker()() as db:
+        summary = precompute_upcoming_activity_plans(
+            db,
+            settings=settings,
+            teacher_id=args.teacher_id,
+            limit=max(0, args.limit),
+            dry_run=args.dry_run,
+        )
+
+    print(
+        f"[done] horizon={settings.activity_plan_precompute_horizon_days}d scanned={summary.scanned} "
+        f"stale={summary.stale} written={summary.written} sources={dict(summary.sources)}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Reconcile stale Pagar.me payment orders whose webhook never arrived.
+
+Meant to run on a schedule (e.g. every 5 minutes from cron) from backend/:
+
+    .venv/bin/python scripts/reconcile_payments.py
+
+or as a long-running worker with `--interval-seconds 300`.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import get_settings
+from app.db.session import get_session_maker
+from app.services.payment_reconciliation_service import reconcile_stale_payments
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Reconcile stale payment orders against Pagar.me.")
+    parser.add_argument("--limit", type=int, default=0, help="Max payment orders per run (0 = no limit).")
+    parser.add_argument("--dry-run", action="store_true", help="Only count payment orders due for a check.")
+    parser.add_argument(
+        "--interval-seconds",
+        type=float,
+        default=0,
+        help="Keep running and reconcile every N seconds (0 = run once).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    settings = get_settings()
+    if not settings.pagarme_enabled:
+        print("[error] KIDARIO_PAGARME_SECRET_KEY is not set.")
+        return 2
+
+    while True:
+        with get_session_maker()() as db:
+            summary = reconcile_stale_payments(db, settings=settings, limit=max(0, args.limit), dry_run=args.dry_run)
+        print(
+            f"[done] scanned={summary.scanned} updated={summary.updated} unchanged={summary.unchanged} "
+            f"failed={summary.failed} statuses={dict(summary.statuses)}"
+        )
+        if args.interval_seconds <= 0:
+            return 0
+        time.sleep(args.interval_seconds)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Cancel pending bookings whose Pix/boleto payment expired or whose teacher never answered.
+
+Also retries card authorization voids that failed on cancelled bookings.
+
+Meant to run on a schedule (e.g. every 5 minutes from cron) from backend/:
+
+    .venv/bin/python scripts/sweep_expired_bookings.py
+
+or as a long-running worker with `--interval-seconds 300`.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.config import get_settings
+from app.db.session import get_session_maker
+from app.services.booking_lifecycle_service import sweep_expired_bookings
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Release slots held by expired or unanswered bookings.")
+    parser.add_argument("--limit", type=int, default=0, help="Max bookings per pass and run (0 = no limit).")
+    parser.add_argument("--dry-run", action="store_true", help="Only count bookings due for the sweep.")
+    parser.add_argument(
+        "--interval-seconds",
+        type=float,
+        default=0,
+        help="Keep running and sweep every N seconds (0 = run once).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    settings = get_settings()
+
+    while True:
+        with get_session_maker()() as db:
+            summary = sweep_expired_bookings(db, settings=settings, limit=max(0, args.limit), dry_run=args.dry_run)
+        print(
+            f"[done] expired_payments={summary.expired_payments} timed_out_decisions={summary.timed_out_decisions} "
+            f"stranded_authorizations={summary.stranded_authorizations} "
+            f"voided_authorizations={summary.voided_authorizations} void_failures={summary.void_failures} "
+            f"notifications={summary.notifications}"
+        )
+        if args.interval_seconds <= 0:
+            return 0
+        time.sleep(args.interval_seconds)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,16 @@
+-- Shared backend for the public explore response cache (KIDARIO_RESPONSE_CACHE_BACKEND=postgres).
+-- Unlogged: entries are disposable and are rebuilt on demand after a crash.
+create unlogged table if not exists public.response_cache_entries (
+  cache_key text primary key,
+  etag text not null,
+  body bytea not null,
+  tags text[] not null default '{}',
+  expires_at timestamptz not null,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists idx_response_cache_entries_tags
+  on public.response_cache_entries using gin (tags);
+
+create index if not exists idx_response_cache_entries_expires_at
+  on public.response_cache_entries (expires_at);
@@ -0,0 +1,131 @@
+-- Teacher control center overview snapshots.
+-- Every table the overview reads bumps a per-teacher version through the triggers below; a cached
+-- snapshot is served only while its version still matches, so any booking, chat, follow-up, plan or
+-- payment change invalidates it in the writing transaction, whichever code path (API, webhook, job,
+-- script) made it.
+create table if not exists public.teacher_overview_versions (
+  teacher_id uuid primary key references public.teachers(id) on delete cascade,
+  version bigint not null default 1,
+  updated_at timestamptz not null default now()
+);
+
+-- Unlogged: snapshots are disposable and are rebuilt on demand after a crash.
+create unlogged table if not exists public.teacher_overview_snapshots (
+  teacher_id uuid not null,
+  params_key text not null,
+  version bigint not null,
+  payload jsonb not null,
+  built_at timestamptz not null default now(),
+  primary key (teacher_id, params_key)
+);
+
+alter table public.teacher_overview_versions enable row level security;
+alter table public.teacher_overview_snapshots enable row level security;
+
+-- security definer: triggers also fire for writes made by `authenticated` clients, which have no
+-- access to the version table.
+create or replace function public.bump_teacher_overview_version(target_teacher_id uuid)
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+  insert into public.teacher_overview_versions (teacher_id)
+  select target_teacher_id
+  where target_teacher_id is not null
+  on conflict (teacher_id) do update
+  set version = public.teacher_overview_versions.version + 1,
+      updated_at = now();
+$$;
+
+create or replace function public.resolve_overview_teacher_id(source_table text, row_data jsonb)
+returns uuid
+language sql
+stable
+as $$
+  select case source_table
+    when 'teachers' then (row_data->>'id')::uuid
+    when 'chat_messages' then (
+      select ct.teacher_id from public.chat_threads ct where ct.id = (row_data->>'thread_id')::uuid
+    )
+    when 'booking_follow_ups' then (
+      select b.teacher_id from public.bookings b where b.id = (row_data->>'booking_id')::uuid
+    )
+    when 'payment_orders' then (
+      select b.teacher_id from public.bookings b where b.id = (row_data->>'booking_id')::uuid
+    )
+    else (row_data->>'teacher_id')::uuid
+  end;
+$$;
+
+create or replace function public.touch_teacher_overview()
+returns trigger
+language plpgsql
+as $$
+declare
+  new_teacher_id uuid;
+  old_teacher_id uuid;
+begin
+  if tg_op <> 'DELETE' then
+    new_teacher_id := public.resolve_overview_teacher_id(tg_table_name, to_jsonb(new));
+  end if;
+  if tg_op <> 'INSERT' then
+    old_teacher_id := public.resolve_overview_teacher_id(tg_table_name, to_jsonb(old));
+  end if;
+
+  perform public.bump_teacher_overview_version(new_teacher_id);
+  if old_teacher_id is distinct from new_teacher_id then
+    perform public.bump_teacher_overview_version(old_teacher_id);
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_touch_teacher_overview on public.bookings;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.bookings
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.chat_threads;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.chat_threads
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.chat_messages;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.chat_messages
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.booking_follow_ups;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.booking_follow_ups
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.booking_activity_plans;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.booking_activity_plans
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.payment_orders;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.payment_orders
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.payment_splits;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.payment_splits
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.teacher_availability;
+create trigger trg_touch_teacher_overview
+after insert or update or delete on public.teacher_availability
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.teachers;
+create trigger trg_touch_teacher_overview
+after update of lesson_duration_minutes on public.teachers
+for each row execute function public.touch_teacher_overview();
+
+-- Agenda rebuild: the teacher's lessons per child in start order.
+create index if not exists idx_bookings_teacher_child_starts_at
+  on public.bookings (teacher_id, child_id, starts_at);
@@ -0,0 +1,12 @@
+-- Shared backend for request rate limits (KIDARIO_RATE_LIMIT_BACKEND=postgres).
+-- One row per limited key holding its GCRA "theoretical arrival time"; a row whose tat has passed is a
+-- full bucket and is purged. Unlogged: losing the buckets after a crash only resets the limits.
+create unlogged table if not exists public.rate_limit_buckets (
+  bucket_key text primary key,
+  tat timestamptz not null
+);
+
+create index if not exists idx_rate_limit_buckets_tat
+  on public.rate_limit_buckets (tat);
+
+alter table public.rate_limit_buckets enable row level security;
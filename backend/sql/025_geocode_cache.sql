@@ -0,0 +1,21 @@
+-- Persistent cache for ViaCEP (cache_kind = 'postal_code') and Google Geocoding (cache_kind = 'address')
+-- lookups. A null payload is a cached negative result ("not found" or a brief provider failure).
+create table if not exists public.geocode_cache (
+  cache_kind text not null check (cache_kind in ('postal_code', 'address')),
+  cache_key text not null,
+  payload jsonb,
+  expires_at timestamptz not null,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  primary key (cache_kind, cache_key)
+);
+
+create index if not exists idx_geocode_cache_expires_at
+  on public.geocode_cache (expires_at);
+
+alter table public.geocode_cache enable row level security;
+
+-- Backfill scan: addresses still missing coordinates.
+create index if not exists idx_addresses_missing_coordinates
+  on public.addresses (id)
+  where latitude is null or longitude is null;
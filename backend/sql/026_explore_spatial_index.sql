@@ -0,0 +1,10 @@
+-- Radius search and distance ordering for explore (`near_lat`/`near_lng`/`radius_km`, `sort=nearby`).
+-- earthdistance models the Earth as a sphere on top of cube; ll_to_earth() is immutable, so addresses get a
+-- GiST expression index that `earth_box(...) @> ll_to_earth(...)` uses for bounding-box pruning.
+create extension if not exists cube;
+create extension if not exists earthdistance;
+
+create index if not exists idx_addresses_earth_location
+  on public.addresses
+  using gist (ll_to_earth(latitude::float8, longitude::float8))
+  where latitude is not null and longitude is not null;
@@ -0,0 +1,7 @@
+-- Payment history pages (`GET /parents/me/payments`, `GET /teachers/me/payments`) are read by keyset on
+-- (created_at desc, id desc); charges and splits are then loaded for the whole page with `= any(:ids)`.
+create index if not exists idx_payment_orders_parent_created_at_id
+  on public.payment_orders (parent_id, created_at desc, id desc);
+
+create index if not exists idx_payment_charges_order_created_at
+  on public.payment_charges (payment_order_id, created_at);
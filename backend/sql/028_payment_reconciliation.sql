@@ -0,0 +1,16 @@
+-- Payment reconciliation worker (scripts/reconcile_payments.py).
+-- Check bookkeeping lives outside payment_orders so claiming an order does not bump its updated_at or the
+-- teacher overview version (sql/023).
+create table if not exists public.payment_reconciliation_checks (
+  payment_order_id uuid primary key references public.payment_orders(id) on delete cascade,
+  checked_at timestamptz not null default now(),
+  attempts integer not null default 0
+);
+
+alter table public.payment_reconciliation_checks enable row level security;
+
+-- Candidates: Pagar.me orders still waiting for a final status.
+create index if not exists idx_payment_orders_reconciliation_candidates
+  on public.payment_orders (created_at)
+  where provider = 'pagarme'
+    and status in ('created', 'pending', 'processing', 'authorized', 'waiting_capture');
@@ -0,0 +1,20 @@
+-- Booking lifecycle sweeper (scripts/sweep_expired_bookings.py).
+-- The indexes only cover bookings still holding a slot, so they stay small as history grows.
+
+-- Pix/boleto orders awaiting payment, by expiry.
+create index if not exists idx_payment_orders_awaiting_expiry
+  on public.payment_orders (expires_at)
+  where booking_id is not null
+    and status in ('created', 'pending')
+    and requested_payment_method in ('pix', 'boleto');
+
+create index if not exists idx_payment_charges_open_expiry
+  on public.payment_charges (payment_order_id, expires_at)
+  where status in ('pending', 'processing')
+    and expires_at is not null;
+
+-- Requests still waiting for the teacher's answer.
+create index if not exists idx_bookings_pending_decision
+  on public.bookings (updated_at)
+  where status = 'pendente'
+    and teacher_decision_status = 'pending';
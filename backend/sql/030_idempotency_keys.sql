@@ -0,0 +1,19 @@
+-- Idempotency-Key support for booking creation, payment retry and package purchase (app/core/idempotency.py).
+-- A key is claimed in the same transaction as the write it protects, so concurrent duplicates wait on the
+-- primary key until the first request commits. Expired rows are reclaimed on reuse and purged in batches.
+create table if not exists public.idempotency_keys (
+  user_id text not null,
+  scope text not null,
+  idempotency_key text not null,
+  request_hash text not null,
+  response_status integer,
+  response_body bytea,
+  created_at timestamptz not null default now(),
+  expires_at timestamptz not null,
+  primary key (user_id, scope, idempotency_key)
+);
+
+create index if not exists idx_idempotency_keys_expires_at
+  on public.idempotency_keys (expires_at);
+
+alter table public.idempotency_keys enable row level security;
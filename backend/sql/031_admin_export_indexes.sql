@@ -0,0 +1,15 @@
+-- Admin exports (GET /api/v2/admin/exports/{dataset}).
+-- Each export streams in (date desc, id) order; matching indexes let Postgres walk them instead of sorting
+-- the whole table before the first row is sent.
+
+create index if not exists idx_bookings_starts_at_id
+  on public.bookings (starts_at desc, id);
+
+create index if not exists idx_payment_orders_created_at_id
+  on public.payment_orders (created_at desc, id);
+
+create index if not exists idx_payment_splits_created_at_id
+  on public.payment_splits (created_at desc, id);
+
+create index if not exists idx_booking_reviews_submitted_at_id
+  on public.booking_reviews (submitted_at desc, id);
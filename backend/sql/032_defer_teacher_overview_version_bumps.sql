@@ -0,0 +1,60 @@
+-- Bump teacher overview versions at commit instead of at each write.
+-- The sql/023 triggers ran right after every row write, so the writing transaction held the teacher's
+-- teacher_overview_versions row lock until it ended. Booking creation keeps its transaction open across the
+-- Pagar.me order call, so every other write for that teacher (and every snapshot rebuild reading it) queued
+-- behind the payment provider. Deferred constraint triggers run the same bump during COMMIT: the version still
+-- changes atomically with the data, but the row lock is held only for the commit itself.
+
+drop trigger if exists trg_touch_teacher_overview on public.bookings;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.bookings
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.chat_threads;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.chat_threads
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.chat_messages;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.chat_messages
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.booking_follow_ups;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.booking_follow_ups
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.booking_activity_plans;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.booking_activity_plans
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.payment_orders;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.payment_orders
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.payment_splits;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.payment_splits
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.teacher_availability;
+create constraint trigger trg_touch_teacher_overview
+after insert or update or delete on public.teacher_availability
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
+
+drop trigger if exists trg_touch_teacher_overview on public.teachers;
+create constraint trigger trg_touch_teacher_overview
+after update of lesson_duration_minutes on public.teachers
+deferrable initially deferred
+for each row execute function public.touch_teacher_overview();
@@ -0,0 +1,6 @@
+-- Booking lifecycle sweeper: card authorizations left on cancelled bookings after a failed void.
+-- Authorized card orders only exist until the teacher answers, so the index stays small.
+create index if not exists idx_payment_orders_authorized_cards
+  on public.payment_orders (id)
+  where status = 'authorized'
+    and requested_payment_method = 'credit_card';
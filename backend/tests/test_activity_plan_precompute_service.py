@@ -0,0 +1,118 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from app.services import activity_plan_precompute_service as precompute
+from app.services.activity_plan_precompute_service import precompute_activity_plans
+
+
+class _Result:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _PagedSession:
+    def __init__(self, pages) -> None:
+        self.pages = list(pages)
+        self.params: list[dict] = []
+        self.commits = 0
+
+    def execute(self, _statement, params=None):
+        self.params.append(params)
+        return _Result(self.pages.pop(0) if self.pages else [])
+
+    def rollback(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def _row(index: int, plan_context_hash: str | None, plan_source: str | None = "fallback") -> dict:
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{index}",
+        "teacher_id": "teacher-1",
+        "child_id": "child-1",
+        "starts_at": datetime(2026, 11, 2, 14, tzinfo=UTC) + timedelta(hours=index),
+        "child_name": "Luca",
+        "child_birth_month_year": "2018-03",
+        "child_focus_points": "Leitura; atenção",
+        "completed_lessons_with_child": 0,
+        "latest_follow_up_booking_id": None,
+        "latest_follow_up_summary": None,
+        "latest_follow_up_objectives": None,
+        "latest_follow_up_next_objectives": None,
+        "plan_context_hash": plan_context_hash,
+        "plan_source": plan_source,
+    }
+
+
+def _settings(**overrides) -> SimpleNamespace:
+    values = {
+        "teacher_activity_llm_enabled": False,
+        "teacher_activity_llm_api_key": None,
+        "activity_plan_precompute_batch_size": 2,
+        "activity_plan_precompute_concurrency": 4,
+        "teacher_activity_llm_requests_per_minute": 0,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_precompute_writes_only_missing_or_outdated_plans_in_bulk(monkeypatch) -> None:
+    monkeypatch.setattr(precompute, "build_activity_plan_context_hash", lambda _planner_input: "hash-now")
+    written: list[list[dict]] = []
+    monkeypatch.setattr(
+        precompute,
+        "bulk_persist_booking_activity_plans",
+        lambda _db, plans: written.append(plans) or len(plans),
+    )
+    db = _PagedSession([[_row(1, None), _row(2, "hash-now")], [_row(3, "hash-old")]])
+
+    summary = precompute_activity_plans(db, settings=_settings())
+
+    assert (summary.scanned, summary.stale, summary.written) == (3, 2, 2)
+    assert [[plan["booking_id"][-1] for plan in page] for page in written] == [["1"], ["3"]]
+    assert all(plan["context_hash"] == "hash-now" and plan["source"] == "fallback" for page in written for plan in page)
+    assert db.commits == 2
+    # The second page continues after the last booking of the first (keyset pagination).
+    assert db.params[1]["cursor_id"].endswith("2")
+
+
+def test_precompute_retries_fallback_plans_when_llm_is_configured(monkeypatch) -> None:
+    monkeypatch.setattr(precompute, "build_activity_plan_context_hash", lambda _planner_input: "hash-now")
+    monkeypatch.setattr(
+        precompute,
+        "generate_teacher_activity_plan",
+        lambda _planner_input, _settings: {"source": "llm", "activities": ["Leitura guiada"]},
+    )
+    written: list[dict] = []
+    monkeypatch.setattr(
+        precompute,
+        "bulk_persist_booking_activity_plans",
+        lambda _db, plans: written.extend(plans) or len(plans),
+    )
+    db = _PagedSession([[_row(1, "hash-now", "fallback"), _row(2, "hash-now", "llm")]])
+
+    summary = precompute_activity_plans(
+        db,
+        settings=_settings(teacher_activity_llm_enabled=True, teacher_activity_llm_api_key="sk-test"),
+    )
+
+    assert summary.sources == {"llm": 1}
+    assert [plan["booking_id"][-1] for plan in written] == ["1"]
+
+
+def test_dry_run_counts_without_writing(monkeypatch) -> None:
+    monkeypatch.setattr(precompute, "bulk_persist_booking_activity_plans", lambda *_args: 1 / 0)
+    db = _PagedSession([[_row(1, None)]])
+
+    summary = precompute_activity_plans(db, settings=_settings(), dry_run=True)
+
+    assert (summary.scanned, summary.stale, summary.written) == (1, 1, 0)
+
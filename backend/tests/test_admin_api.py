@@ -288,3 +288,86 @@ def test_patch_admin_review_returns_review(client: TestClient, monkeypatch: pyte
     body = response.json()
     assert body["status"] == "hidden"
     assert body["is_public"] is False
+
+
+class _ExportResult:
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def partitions(self):
+        for start in range(0, len(self._rows), 2):
+            yield self._rows[start : start + 2]
+
+
+class _ExportSession(AbstractContextManager["_ExportSession"]):
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.executed: list[tuple[str, dict | None, dict | None]] = []
+
+    def __enter__(self) -> "_ExportSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def execute(self, statement, params=None, execution_options=None):
+        self.executed.append((str(statement), params, execution_options))
+        return _ExportResult(self.rows)
+
+    def rollback(self) -> None:
+        pass
+
+
+def test_export_admin_dataset_streams_filtered_csv(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services import admin_export_service
+
+    session = _ExportSession(
+        [
+            {"payment_order_id": UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"), "status": "paid", "amount_cents": 12000},
+            {"payment_order_id": UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"), "status": "paid", "amount_cents": 9000},
+            {"payment_order_id": UUID("cccccccc-cccc-cccc-cccc-cccccccccccc"), "status": "=cmd()", "amount_cents": 0},
+        ]
+    )
+    monkeypatch.setattr(admin_export_service, "get_session_maker", lambda: lambda: session)
+
+    response = client.get(
+        "/api/v2/admin/exports/payment_orders?status=paid&from=2026-01-01T00:00:00Z&to=2026-02-01T00:00:00Z"
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "kidario-payment-orders-" in response.headers["content-disposition"]
+    assert response.text.splitlines() == [
+        "payment_order_id,status,amount_cents",
+        "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa,paid,12000",
+        "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb,paid,9000",
+        "cccccccc-cccc-cccc-cccc-cccccccccccc,'=cmd(),0",
+    ]
+    assert "read only" in session.executed[0][0]
+    export_sql, params, options = session.executed[1]
+    assert "po.created_at >= :date_from" in export_sql and "po.status = :status" in export_sql
+    assert params["status"] == "paid"
+    assert options == {"yield_per": 1000}
+
+
+def test_export_admin_dataset_streams_ndjson(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services import admin_export_service
+
+    session = _ExportSession([{"teacher_id": "t-1", "is_active": True}, {"teacher_id": "t-2", "is_active": False}])
+    monkeypatch.setattr(admin_export_service, "get_session_maker", lambda: lambda: session)
+
+    response = client.get("/api/v2/admin/exports/teachers?format=ndjson&status=active")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.splitlines() == ['{"teacher_id": "t-1", "is_active": true}', '{"teacher_id": "t-2", "is_active": false}']
+
+
+def test_export_admin_dataset_rejects_status_filter_without_status(client: TestClient) -> None:
+    response = client.get("/api/v2/admin/exports/parents?status=active")
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "The parents export has no status filter."
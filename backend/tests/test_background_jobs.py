@@ -0,0 +1,56 @@
+import threading
+
+from app.core.background_jobs import BackgroundJobQueue
+
+
+def test_duplicate_keys_share_one_run_while_in_flight() -> None:
+    queue = BackgroundJobQueue("test-dedupe", workers=1, max_pending=5)
+    started = threading.Event()
+    release = threading.Event()
+    runs: list[str] = []
+
+    def _job(name: str) -> None:
+        started.set()
+        release.wait(timeout=5)
+        runs.append(name)
+
+    try:
+        assert queue.submit(("booking-1", "hash"), _job, "first") is True
+        assert started.wait(timeout=5)
+        assert queue.submit(("booking-1", "hash"), _job, "duplicate") is False
+        release.set()
+        assert queue.wait_idle(timeout=5)
+        assert queue.submit(("booking-1", "hash"), _job, "after") is True
+        assert queue.wait_idle(timeout=5)
+    finally:
+        queue.shutdown()
+
+    assert runs == ["first", "after"]
+
+
+def test_failed_job_is_retried_until_it_succeeds() -> None:
+    queue = BackgroundJobQueue("test-retry", workers=0, max_pending=1, max_attempts=3, retry_backoff_seconds=0)
+    attempts: list[int] = []
+
+    def _flaky_job() -> None:
+        attempts.append(len(attempts) + 1)
+        if len(attempts) < 3:
+            raise RuntimeError("LLM timeout")
+
+    assert queue.submit("booking-1", _flaky_job) is True
+
+    assert attempts == [1, 2, 3]
+    assert queue.wait_idle(timeout=0)
+
+
+def test_queue_rejects_new_keys_when_full() -> None:
+    queue = BackgroundJobQueue("test-full", workers=1, max_pending=0)
+    release = threading.Event()
+
+    try:
+        assert queue.submit("booking-1", release.wait, 5) is True
+        assert queue.submit("booking-2", release.wait, 5) is False
+    finally:
+        release.set()
+        queue.wait_idle(timeout=5)
+        queue.shutdown()
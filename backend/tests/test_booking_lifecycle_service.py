@@ -0,0 +1,176 @@
+from types import SimpleNamespace
+
+from app.services import booking_lifecycle_service as lifecycle
+from app.services.booking_lifecycle_service import sweep_expired_bookings
+from app.services.pagarme_service import PagarmeIntegrationError
+
+
+class _Result:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def scalar_one(self):
+        return self._rows
+
+
+class _SweepSession:
+    def __init__(self, *, expired: list[dict], timed_out: list[dict], stranded: list[dict] | None = None) -> None:
+        self.expired = expired
+        self.timed_out = timed_out
+        self.stranded = stranded or []
+        self.stranded_pages: list[str | None] = []
+        self.statements: list[str] = []
+        self.notified: list[tuple[str, list[str]]] = []
+        self.commits = 0
+        self.info: dict = {}
+
+    def _claim(self, rows: list[dict], batch_size: int) -> tuple[list[dict], list[dict]]:
+        claimed_ids = list(dict.fromkeys(row["id"] for row in rows))[:batch_size]
+        return [row for row in rows if row["id"] in claimed_ids], [row for row in rows if row["id"] not in claimed_ids]
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "expired_charges as" in sql:
+            page, self.expired = self._claim(self.expired, params["batch_size"])
+            return _Result(page)
+        if "canceled_bookings as" in sql:
+            page, self.timed_out = self._claim(self.timed_out, params["batch_size"])
+            return _Result(page)
+        if "after_payment_order_id" in sql:
+            after = params["after_payment_order_id"]
+            self.stranded_pages.append(after)
+            rows = [row for row in self.stranded if after is None or row["payment_order_id"] > after]
+            return _Result(rows[: params["batch_size"]])
+        if "insert into notifications" in sql:
+            self.notified.append((params["kind"], params["booking_ids"]))
+            return _Result([object()] * (2 * len(params["booking_ids"])))
+        return _Result([])
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+
+def _settings(**overrides) -> SimpleNamespace:
+    values = {
+        "booking_payment_expiry_grace_seconds": 300,
+        "booking_decision_timeout_hours": 48,
+        "booking_sweep_batch_size": 2,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _booking(index: int, **extra) -> dict:
+    return {"id": f"10000000-0000-0000-0000-00000000000{index}", "teacher_id": "teacher-1", **extra}
+
+
+def test_sweep_expired_bookings_cancels_in_batches_and_notifies(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle, "_update_payment_order_from_provider_response", lambda db, **kwargs: None)
+    canceled_charges: list[str] = []
+    db = _SweepSession(
+        expired=[_booking(1), _booking(2), _booking(3)],
+        timed_out=[_booking(4, payment_order_id=None, provider_charge_id=None)],
+    )
+
+    summary = sweep_expired_bookings(
+        db,
+        settings=_settings(),
+        cancel_authorization=lambda charge_id, amount: canceled_charges.append(charge_id) or {"id": charge_id},
+    )
+
+    assert (summary.expired_payments, summary.timed_out_decisions) == (3, 1)
+    assert summary.notifications == 8
+    assert [kind for kind, _ in db.notified] == ["payment_expired", "payment_expired", "decision_timeout"]
+    assert db.notified[0][1] == [_booking(1)["id"], _booking(2)["id"]]
+    assert canceled_charges == []
+    # One transaction per claimed batch: two for expired payments, one for the decision timeout.
+    assert db.commits == 3
+    assert all("skip locked" in sql for sql in db.statements if "with due as" in sql)
+
+
+def test_sweep_expired_bookings_voids_authorized_cards_after_commit(monkeypatch) -> None:
+    updates: list[dict] = []
+    monkeypatch.setattr(
+        lifecycle,
+        "_update_payment_order_from_provider_response",
+        lambda db, **kwargs: updates.append(kwargs),
+    )
+    db = _SweepSession(
+        expired=[],
+        timed_out=[
+            _booking(1, payment_order_id="po-1", provider_order_id="or_1", amount_cents=12000, provider_charge_id="ch_1"),
+            _booking(2, payment_order_id="po-2", provider_order_id="or_2", amount_cents=9000, provider_charge_id="ch_2"),
+        ],
+    )
+
+    def _cancel(charge_id: str, amount_cents: int) -> dict:
+        if charge_id == "ch_2":
+            raise PagarmeIntegrationError("Pagar.me request failed (500).")
+        return {"id": charge_id, "status": "canceled", "amount": amount_cents}
+
+    summary = sweep_expired_bookings(db, settings=_settings(), cancel_authorization=_cancel)
+
+    assert summary.timed_out_decisions == 2
+    assert (summary.voided_authorizations, summary.void_failures) == (1, 1)
+    assert [(update["payment_order_id"], update["order_status"]) for update in updates] == [("po-1", "canceled")]
+    assert db.commits == 2
+
+
+def test_sweep_expired_bookings_dry_run_only_counts() -> None:
+    db = _SweepSession(expired=[], timed_out=[])
+    db.execute = lambda statement, params=None: _Result(7)
+
+    summary = sweep_expired_bookings(db, settings=_settings(), dry_run=True, limit=5)
+
+    assert (summary.expired_payments, summary.timed_out_decisions) == (5, 5)
+    assert summary.stranded_authorizations == 5
+    assert db.commits == 0
+
+
+def test_sweep_expired_bookings_retries_voids_left_on_cancelled_bookings(monkeypatch) -> None:
+    updates: list[str] = []
+    monkeypatch.setattr(
+        lifecycle,
+        "_update_payment_order_from_provider_response",
+        lambda db, **kwargs: updates.append(kwargs["payment_order_id"]),
+    )
+    db = _SweepSession(
+        expired=[],
+        timed_out=[],
+        stranded=[
+            _booking(
+                index,
+                payment_order_id=f"po-{index}",
+                provider_order_id=f"or_{index}",
+                amount_cents=9000,
+                provider_charge_id=f"ch_{index}",
+            )
+            for index in (1, 2, 3)
+        ],
+    )
+    attempts: list[str] = []
+
+    def _cancel(charge_id: str, amount_cents: int) -> dict:
+        attempts.append(charge_id)
+        if charge_id == "ch_1":
+            raise PagarmeIntegrationError("Pagar.me request failed (500).")
+        return {"id": charge_id, "status": "canceled", "amount": amount_cents}
+
+    summary = sweep_expired_bookings(db, settings=_settings(), cancel_authorization=_cancel)
+
+    assert summary.stranded_authorizations == 3
+    assert (summary.voided_authorizations, summary.void_failures) == (2, 1)
+    assert updates == ["po-2", "po-3"]
+    # Pages move past the failed order instead of selecting it again in the same sweep.
+    assert attempts == ["ch_1", "ch_2", "ch_3"]
+    assert db.stranded_pages == [None, "po-2"]
@@ -165,6 +165,74 @@ def test_post_booking_returns_created(client: TestClient, monkeypatch: pytest.Mo
     assert body["payment_order"]["amount_cents"] == 12000
 
 
+class _IdempotencyResult:
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+class _IdempotencySession(_DummySession):
+    def __init__(self) -> None:
+        self.keys: dict[tuple, dict] = {}
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "insert into idempotency_keys" in sql:
+            identity = (params["user_id"], params["scope"], params["key"])
+            if identity in self.keys:
+                return _IdempotencyResult([])
+            self.keys[identity] = {"request_hash": params["request_hash"], "response_status": None, "response_body": None}
+            return _IdempotencyResult([{"idempotency_key": params["key"]}])
+        if "update idempotency_keys" in sql:
+            self.keys[(params["user_id"], params["scope"], params["key"])].update(
+                response_status=params["response_status"],
+                response_body=params["response_body"],
+            )
+        if "from idempotency_keys" in sql:
+            row = self.keys.get((params["user_id"], params["scope"], params["key"]))
+            return _IdempotencyResult([row] if row else [])
+        return _IdempotencyResult([])
+
+
+def test_post_booking_with_idempotency_key_replays_stored_response(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _IdempotencySession()
+    app.dependency_overrides[get_db] = lambda: session
+    calls: list[object] = []
+    monkeypatch.setattr(
+        bookings_endpoints,
+        "create_booking_v2",
+        lambda db, user, payload: calls.append(payload) or _booking(),
+    )
+    payload = {
+        "teacher_id": str(TEACHER_ID),
+        "child_id": str(CHILD_ID),
+        "starts_at": "2026-06-25T14:00:00-03:00",
+        "duration_minutes": 60,
+        "modality": "online",
+        "payment_method": "pix",
+    }
+    headers = {"Idempotency-Key": "booking-attempt-1"}
+
+    first = client.post("/api/v2/bookings", json=payload, headers=headers)
+    retry = client.post("/api/v2/bookings", json=payload, headers=headers)
+    reused = client.post("/api/v2/bookings", json={**payload, "duration_minutes": 90}, headers=headers)
+
+    assert len(calls) == 1
+    assert (first.status_code, first.headers["Idempotent-Replayed"]) == (201, "false")
+    assert (retry.status_code, retry.headers["Idempotent-Replayed"]) == (201, "true")
+    assert retry.json() == first.json()
+    assert first.json()["id"] == str(BOOKING_ID)
+    assert reused.status_code == 422
+
+
 def test_get_parent_bookings_returns_lessons(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
     def _fake_list_parent_bookings_v2(db, user, tab, status, child_id, limit, offset):
         return {"bookings": [_booking(status="confirmada")]}
@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.circuit_breaker import CIRCUIT_BREAKER_STATE, CircuitBreaker, CircuitOpenError
+from app.core.config import get_settings
+from app.services import address_geocoding_service as geocoding
+from app.services import pagarme_service
+from app.services.address_geocoding_service import enrich_address_coordinates
+from app.services.pagarme_service import PagarmeIntegrationError, get_charge
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _settings(**overrides) -> SimpleNamespace:
+    values = {
+        "circuit_breaker_enabled": True,
+        "circuit_breaker_window_size": 4,
+        "circuit_breaker_minimum_calls": 4,
+        "circuit_breaker_failure_rate_threshold": 0.5,
+        "circuit_breaker_slow_call_seconds": 2.0,
+        "circuit_breaker_open_seconds": 30.0,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _reject(name: str):
+    def _acquire() -> None:
+        raise CircuitOpenError(name, 10.0)
+
+    return _acquire
+
+
+def _call(breaker: CircuitBreaker, *, fail: bool = False, clock: _Clock | None = None, duration: float = 0.0) -> None:
+    with breaker.guard() as call:
+        if clock is not None:
+            clock.now += duration
+        call.failed = fail
+
+
+def test_circuit_opens_on_failure_rate_and_probes_after_cooldown() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker("test_provider", settings_provider=_settings, clock=clock)
+
+    _call(breaker)
+    _call(breaker, fail=True)
+    _call(breaker)
+    assert breaker.state == "closed"
+    _call(breaker, fail=True)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        _call(breaker)
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    with breaker.guard():
+        # Only one probe at a time while half-open.
+        with pytest.raises(CircuitOpenError):
+            _call(breaker)
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures_and_failed_probe_reopens() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker("slow_provider", settings_provider=_settings, clock=clock)
+
+    for _ in range(4):
+        _call(breaker, clock=clock, duration=3.0)
+    assert breaker.state == "open"
+
+    clock.now += 30
+    with pytest.raises(TimeoutError):
+        with breaker.guard():
+            raise TimeoutError
+    assert breaker.state == "open"
+
+
+def test_disabled_breaker_never_rejects() -> None:
+    breaker = CircuitBreaker("disabled_provider", settings_provider=lambda: _settings(circuit_breaker_enabled=False))
+
+    for _ in range(10):
+        _call(breaker, fail=True)
+
+    assert breaker.state == "closed"
+
+
+def test_open_pagarme_circuit_fails_fast_without_calling_provider(monkeypatch) -> None:
+    monkeypatch.setattr(pagarme_service._BREAKER, "_acquire", _reject("pagarme"))
+    monkeypatch.setattr(pagarme_service.request, "urlopen", lambda *args, **kwargs: pytest.fail("Pagar.me was called."))
+    settings = get_settings().model_copy(
+        update={"pagarme_secret_key": "sk_test", "pagarme_base_url": "https://api.pagar.me/core/v5"}
+    )
+
+    with pytest.raises(PagarmeIntegrationError, match="temporarily unavailable"):
+        get_charge(settings, provider_charge_id="ch_1")
+
+
+def test_open_geocoding_circuit_skips_lookup_without_caching(monkeypatch) -> None:
+    monkeypatch.setattr(geocoding._VIACEP_BREAKER, "_acquire", _reject("viacep"))
+    monkeypatch.setattr(geocoding._GOOGLE_GEOCODING_BREAKER, "_acquire", _reject("google_geocoding"))
+    stored: list[tuple] = []
+
+    class _Cache:
+        def get(self, kind, key):
+            return False, None
+
+        def set(self, kind, key, payload, ttl_seconds):
+            stored.append((kind, key, payload))
+
+    settings = SimpleNamespace(
+        google_geocoding_enabled=True,
+        google_geocoding_api_key="key",
+        google_geocoding_base_url="https://maps.example/geocode",
+        google_geocoding_timeout_seconds=5,
+        google_geocoding_ca_bundle=None,
+        viacep_base_url="https://viacep.example/ws",
+        viacep_timeout_seconds=4,
+        viacep_ca_bundle=None,
+    )
+    values = {"street": "Rua A", "number": "10", "city": "São Paulo", "state": "SP", "postal_code": "01001-000"}
+
+    enriched = enrich_address_coordinates(
+        settings,
+        values,
+        http_json_get=lambda url, timeout, ca: pytest.fail("Provider was called."),
+        cache=_Cache(),
+    )
+
+    assert "latitude" not in enriched
+    assert stored == []
+
+
+def test_state_gauge_reports_the_current_state() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker("gauge_provider", settings_provider=_settings, clock=clock)
+    for _ in range(4):
+        _call(breaker, fail=True)
+    assert CIRCUIT_BREAKER_STATE.value(breaker="gauge_provider") == 2
+
+    # A breaker rebuilt under the same name (settings reload, tests) starts closed instead of adding to the old value.
+    CircuitBreaker("gauge_provider", settings_provider=_settings, clock=clock)
+    assert CIRCUIT_BREAKER_STATE.value(breaker="gauge_provider") == 0
@@ -0,0 +1,129 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import BROTLI, GZIP, CompressionMiddleware, negotiate_encoding
+from app.core.config import get_settings
+from app.core.metrics import render_metrics
+
+_ROWS = [{"teacher_id": index, "display_name": f"Professora {index}", "city": "Sao Paulo"} for index in range(200)]
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    def large() -> dict:
+        return {"teachers": _ROWS}
+
+    @app.get("/small")
+    def small() -> dict:
+        return {"ok": True}
+
+    @app.get("/image")
+    def image() -> Response:
+        return Response(content=b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse((json.dumps(row).encode() + b"\n" for row in _ROWS), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_negotiate_encoding_honours_quality_values() -> None:
+    assert negotiate_encoding("gzip, deflate, br", (BROTLI, GZIP)) == BROTLI
+    assert negotiate_encoding("br;q=0.5, gzip", (BROTLI, GZIP)) == GZIP
+    assert negotiate_encoding("br", (GZIP,)) is None
+    assert negotiate_encoding("*;q=0.1", (BROTLI, GZIP)) == BROTLI
+    assert negotiate_encoding("gzip;q=0, identity", (GZIP,)) is None
+    assert negotiate_encoding(None, (GZIP,)) is None
+
+
+def test_large_json_is_gzipped_and_small_responses_are_left_alone() -> None:
+    client = TestClient(_app())
+
+    large = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["vary"] == "Accept-Encoding"
+    assert int(large.headers["content-length"]) < len(identity.content) / 4
+    assert large.json() == {"teachers": _ROWS}
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in image.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert 'kidario_http_response_compression_ratio_count{encoding="gzip"}' in render_metrics()
+
+
+def test_streaming_response_is_compressed_chunk_by_chunk() -> None:
+    messages: list[dict] = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def _receive() -> dict:
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()
+
+    async def _send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"accept-encoding", b"gzip")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(_app()(scope, _receive, _send))
+
+    start = messages[0]
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    bodies = [message for message in messages[1:] if message["type"] == "http.response.body"]
+    first_chunk = decoder.decompress(bodies[0]["body"])
+    # Each chunk is flushed, so the client can decode rows before the stream ends.
+    assert first_chunk.startswith(b'{"teacher_id": 0')
+    decoded = first_chunk + b"".join(decoder.decompress(message["body"]) for message in bodies[1:])
+    assert decoded.decode().splitlines()[-1] == json.dumps(_ROWS[-1])
+    assert gzip.decompress(b"".join(message["body"] for message in bodies)) == decoded
+
+
+def test_compression_can_be_disabled(monkeypatch) -> None:
+    settings = get_settings().model_copy(update={"compression_enabled": False})
+    monkeypatch.setattr(compression, "get_settings", lambda: settings)
+
+    response = TestClient(_app()).get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_brotli_is_preferred_when_installed() -> None:
+    pytest.importorskip("brotli")
+    compression._brotli.cache_clear()
+
+    response = TestClient(_app()).get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == {"teachers": _ROWS}
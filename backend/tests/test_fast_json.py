@@ -0,0 +1,59 @@
+import json
+import random
+from decimal import Decimal
+from uuid import UUID
+
+from app.core import fast_json
+from app.core.config import get_settings
+from app.core.fast_json import FastJSONResponse, dumps, trusted_content
+from app.schemas.v2_bookings import BookingsResponse, PaymentOrdersResponse
+from app.schemas.v2_explore import ExploreTeachersResponse, TeacherPublicProfile
+from benchmarks.serialization import (
+    bookings_payload,
+    explore_list_payload,
+    payments_payload,
+    teacher_detail_payload,
+)
+
+
+def test_fast_json_matches_validated_output_for_trusted_payloads() -> None:
+    cases = (
+        (ExploreTeachersResponse, explore_list_payload),
+        (TeacherPublicProfile, teacher_detail_payload),
+        (BookingsResponse, bookings_payload),
+        (PaymentOrdersResponse, payments_payload),
+    )
+    for model, build in cases:
+        data = build(random.Random(7), 5)
+        assert json.loads(dumps(data)) == json.loads(model(**data).model_dump_json())
+
+
+def test_fast_json_falls_back_to_pydantic_encoder(monkeypatch) -> None:
+    data = explore_list_payload(random.Random(7), 3)
+    with_orjson = dumps(data)
+    monkeypatch.setattr(fast_json, "_orjson", lambda: None)
+
+    assert json.loads(dumps(data)) == json.loads(with_orjson)
+    assert dumps({"amount": Decimal("4.50")}) == b'{"amount":"4.50"}'
+
+
+def test_fast_json_encodes_uuid_subclasses_from_asyncpg() -> None:
+    class _DriverUUID(UUID):
+        pass
+
+    value = _DriverUUID("11111111-1111-1111-1111-111111111111")
+
+    assert dumps({"id": value}) == b'{"id":"11111111-1111-1111-1111-111111111111"}'
+
+
+def test_trusted_content_validates_unless_fast_json_is_enabled(monkeypatch) -> None:
+    data = {"bookings": []}
+    assert get_settings().fast_json_responses_enabled is False
+
+    validated = trusted_content(data, BookingsResponse)
+    assert isinstance(validated, BookingsResponse)
+    assert FastJSONResponse(validated).body == b'{"bookings":[]}'
+
+    settings = get_settings().model_copy(update={"fast_json_responses_enabled": True})
+    monkeypatch.setattr(fast_json, "get_settings", lambda: settings)
+    assert trusted_content(data, BookingsResponse) is data
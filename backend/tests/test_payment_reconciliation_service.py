@@ -0,0 +1,220 @@
+from types import SimpleNamespace
+from uuid import UUID
+
+from app.schemas.v2_bookings import BookingCancelRequest
+from app.services import booking_v2_service
+from app.services import payment_reconciliation_service as reconciliation
+from app.services.pagarme_service import PagarmeIntegrationError
+from app.services.payment_reconciliation_service import reconcile_stale_payments
+from app.services.payment_v2_service import _apply_payment_order_status_to_targets
+
+
+class _FakePagarmeCharges:
+    """Local stand-in for `GET /charges/{id}`: returns canned charges or raises like the real client."""
+
+    def __init__(self, charges: dict[str, dict]) -> None:
+        self.charges = charges
+        self.calls: list[str] = []
+
+    def __call__(self, provider_charge_id: str) -> dict:
+        self.calls.append(provider_charge_id)
+        charge = self.charges.get(provider_charge_id)
+        if charge is None:
+            raise PagarmeIntegrationError("Pagar.me request failed (404).")
+        return charge
+
+
+class _Result:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar_one(self):
+        return self._rows
+
+
+class _ReconciliationSession:
+    def __init__(self, candidates: list[dict]) -> None:
+        self.candidates = candidates
+        self.statements: list[str] = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "for update of po skip locked" in sql:
+            page, self.candidates = self.candidates[: params["batch_size"]], self.candidates[params["batch_size"] :]
+            return _Result(page)
+        if "select id, status from payment_orders" in sql:
+            return _Result([{"id": order_id, "status": "pending"} for order_id in params["ids"]])
+        return _Result([])
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+
+def _candidate(index: int, *, provider_charge_id: str | None = None, payment_method: str = "pix") -> dict:
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{index}",
+        "parent_id": "parent-1",
+        "booking_id": f"10000000-0000-0000-0000-00000000000{index}",
+        "package_id": None,
+        "provider_order_id": f"or_{index}",
+        "provider_order_code": f"booking_{index}",
+        "amount_cents": 12000,
+        "status": "pending",
+        "provider_charge_id": provider_charge_id if provider_charge_id is not None else f"ch_{index}",
+        "payment_method": payment_method,
+        "charge_status": "pending",
+    }
+
+
+def _settings(**overrides) -> SimpleNamespace:
+    values = {
+        "payment_reconciliation_min_age_seconds": 900,
+        "payment_reconciliation_recheck_seconds": 900,
+        "payment_reconciliation_batch_size": 2,
+        "payment_reconciliation_concurrency": 2,
+        "pagarme_reconciliation_requests_per_minute": 0,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_reconcile_stale_payments_applies_provider_status_in_batches(monkeypatch) -> None:
+    updates: list[dict] = []
+    targets: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        reconciliation,
+        "_update_payment_order_from_provider_response",
+        lambda db, **kwargs: updates.append(kwargs),
+    )
+    monkeypatch.setattr(
+        reconciliation,
+        "_apply_payment_order_status_to_targets",
+        lambda db, payment_order, order_status: targets.append((payment_order["id"], order_status)),
+    )
+    provider = _FakePagarmeCharges(
+        {
+            "ch_1": {"id": "ch_1", "status": "paid", "amount": 12000, "paid_amount": 12000},
+            "ch_2": {"id": "ch_2", "status": "pending", "amount": 12000},
+            "ch_3": {"id": "ch_3", "status": "failed", "amount": 12000},
+        }
+    )
+    db = _ReconciliationSession([_candidate(1), _candidate(2), _candidate(3), _candidate(4)])
+
+    summary = reconcile_stale_payments(db, settings=_settings(), fetch_charge=provider)
+
+    assert sorted(provider.calls) == ["ch_1", "ch_2", "ch_3", "ch_4"]
+    assert (summary.scanned, summary.updated, summary.unchanged, summary.failed) == (4, 2, 1, 1)
+    assert [(update["payment_order_id"], update["order_status"]) for update in updates] == [
+        (_candidate(1)["id"], "paid"),
+        (_candidate(3)["id"], "payment_failed"),
+    ]
+    assert targets == [(_candidate(1)["id"], "paid"), (_candidate(3)["id"], "payment_failed")]
+    # Two batches of two: each is claimed and then applied in its own transaction.
+    assert db.commits == 4
+
+
+def test_reconcile_stale_payments_skips_orders_without_provider_charge(monkeypatch) -> None:
+    monkeypatch.setattr(reconciliation, "_update_payment_order_from_provider_response", lambda db, **kwargs: None)
+    provider = _FakePagarmeCharges({})
+    db = _ReconciliationSession([_candidate(1, provider_charge_id="")])
+
+    summary = reconcile_stale_payments(db, settings=_settings(), fetch_charge=provider)
+
+    assert provider.calls == []
+    assert (summary.scanned, summary.unchanged) == (1, 1)
+
+
+def test_reconcile_stale_payments_dry_run_only_counts(monkeypatch) -> None:
+    provider = _FakePagarmeCharges({})
+    db = _ReconciliationSession([])
+    monkeypatch.setattr(db, "execute", lambda statement, params=None: _Result(7))
+
+    summary = reconcile_stale_payments(db, settings=_settings(), fetch_charge=provider, dry_run=True, limit=5)
+
+    assert summary.scanned == 5
+    assert provider.calls == []
+    assert db.commits == 0
+
+
+class _CancelledBookingSession:
+    """A booking row and its pix order; updates only apply when their guard matches the stored status."""
+
+    def __init__(self) -> None:
+        self.booking = {"id": "10000000-0000-0000-0000-000000000001", "status": "pendente", "teacher_id": "teacher-1"}
+        self.order = {
+            "id": "00000000-0000-0000-0000-000000000001",
+            "booking_id": self.booking["id"],
+            "package_id": None,
+            "requested_payment_method": "pix",
+            "provider_order_id": "or_1",
+            "amount_cents": 12000,
+            "status": "pending",
+        }
+
+    def _is_candidate(self, sql: str) -> bool:
+        # The reconciliation candidate filter: open order, and its booking still waiting for payment.
+        assert "b.status = 'pendente'" in sql
+        return self.order["status"] == "pending" and self.booking["status"] == "pendente"
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if sql.lstrip().startswith("update bookings") and "set status = 'cancelada'" in sql:
+            self.booking["status"] = "cancelada"
+            return _Result([{"id": self.booking["id"]}])
+        if "from payment_orders" in sql and "order by created_at desc" in sql:
+            return _Result([dict(self.order)])
+        if "update payment_orders" in sql:
+            if self.order["status"] in ("created", "pending"):
+                self.order["status"] = "canceled"
+            return _Result([])
+        if "update bookings" in sql:
+            if "and status = 'pendente'" not in sql or self.booking["status"] == "pendente":
+                self.booking["status"] = params["booking_status"]
+            return _Result([])
+        if "select count(*)" in sql:
+            return _Result(int(self._is_candidate(sql)))
+        raise AssertionError(f"Unexpected statement: {sql}")
+
+    def rollback(self) -> None:
+        pass
+
+
+def test_cancelled_booking_is_not_revived_when_its_order_expires(monkeypatch) -> None:
+    db = _CancelledBookingSession()
+    monkeypatch.setattr(
+        booking_v2_service,
+        "_load_booking_row",
+        lambda db, booking_id: dict(db.booking, parent_id="parent-1"),
+    )
+    monkeypatch.setattr(booking_v2_service, "get_actor_participant_ids", lambda db, user_id: ("parent-1", None))
+    monkeypatch.setattr(booking_v2_service, "invalidate_teacher_public_cache", lambda db, teacher_id: None)
+    monkeypatch.setattr(booking_v2_service, "get_booking_v2", lambda db, user, booking_id: dict(db.booking))
+    settings = _settings()
+
+    booking_v2_service.cancel_booking_v2(
+        db,
+        SimpleNamespace(user_id="user-1"),
+        UUID(db.booking["id"]),
+        BookingCancelRequest(reason="Mudanca de planos"),
+    )
+
+    # Cancelling closes the order, so the reconciliation worker no longer picks it up...
+    assert db.order["status"] == "canceled"
+    assert reconciliation._count_candidates(db, settings) == 0
+    # ...and a late expiry (webhook or a worker that claimed it earlier) leaves the booking cancelled.
+    _apply_payment_order_status_to_targets(db, db.order, "expired")
+    assert db.booking["status"] == "cancelada"
@@ -123,3 +123,34 @@ def test_sync_teacher_payment_recipient_refreshes_existing_pending_recipient(mon
 
     assert result["provider_recipient_id"] == "rp_teacher"
     assert result["recipient_status"] == "active"
+
+
+class _BookingStatusSession:
+    def __init__(self, updated_row) -> None:
+        self.updated_row = updated_row
+        self.statements: list[str] = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return _MappingResult(self.updated_row)
+
+
+def test_payment_status_change_invalidates_the_teachers_explore_cache(monkeypatch) -> None:
+    invalidated: list[object] = []
+    monkeypatch.setattr(
+        payment_v2_service,
+        "invalidate_teacher_public_cache",
+        lambda db, teacher_id: invalidated.append(teacher_id),
+    )
+    teacher_id = UUID("33333333-3333-3333-3333-333333333333")
+    payment_order = {"booking_id": UUID("44444444-4444-4444-4444-444444444444"), "package_id": None}
+
+    payment_v2_service._apply_payment_order_status_to_targets(
+        _BookingStatusSession({"teacher_id": teacher_id}),
+        payment_order,
+        "expired",
+    )
+    # A booking that is no longer pendente is left alone, and so is the cache.
+    payment_v2_service._apply_payment_order_status_to_targets(_BookingStatusSession(None), payment_order, "paid")
+
+    assert invalidated == [teacher_id]
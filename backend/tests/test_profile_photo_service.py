@@ -1,3 +1,5 @@
+import threading
+import time
 from io import BytesIO
 from types import SimpleNamespace
 
@@ -9,6 +11,7 @@ from app.services.profile_photo_service import (
     ProfilePhotoUploadError,
     _process_profile_photo_image,
     _upload_photo_blob,
+    delete_teacher_profile_photo_blob,
 )
 
 
@@ -17,6 +20,9 @@ def _settings(**overrides) -> SimpleNamespace:
         "profile_photo_max_upload_bytes": 5_242_880,
         "profile_photo_target_size_pixels": 512,
         "profile_photo_jpeg_quality": 82,
+        "profile_photo_webp_quality": 80,
+        "profile_photo_processing_timeout_seconds": 20.0,
+        "profile_photo_upload_concurrency": 4,
         "profile_photos_bucket": "teacher-profile-photos",
         "storage_s3_access_key_id": None,
         "storage_s3_secret_access_key": None,
@@ -40,21 +46,25 @@ def _open_image(file_bytes: bytes) -> Image.Image:
     return Image.open(BytesIO(file_bytes))
 
 
-def test_process_profile_photo_center_crops_and_resizes_to_jpeg() -> None:
-    processed = _process_profile_photo_image(_settings(), _image_bytes((1200, 800)))
+def test_process_profile_photo_builds_webp_and_jpeg_renditions() -> None:
+    renditions = _process_profile_photo_image(_settings(), _image_bytes((1200, 800)))
 
-    with _open_image(processed) as image:
-        assert image.format == "JPEG"
-        assert image.mode == "RGB"
-        assert image.size == (512, 512)
+    assert set(renditions) == {(size, ext) for size in (64, 128, 256, 512) for ext in ("webp", "jpg")}
+    for (size, extension), file_bytes in renditions.items():
+        with _open_image(file_bytes) as image:
+            assert image.format == ("WEBP" if extension == "webp" else "JPEG")
+            assert image.mode == "RGB"
+            assert image.size == (size, size)
 
 
 def test_process_profile_photo_does_not_upscale_small_images() -> None:
-    processed = _process_profile_photo_image(_settings(), _image_bytes((128, 128), image_format="WEBP"))
+    renditions = _process_profile_photo_image(_settings(), _image_bytes((128, 128), image_format="WEBP"))
 
-    with _open_image(processed) as image:
+    with _open_image(renditions[(512, "jpg")]) as image:
         assert image.format == "JPEG"
         assert image.size == (128, 128)
+    with _open_image(renditions[(64, "webp")]) as image:
+        assert image.size == (64, 64)
 
 
 def test_process_profile_photo_rejects_invalid_image_bytes() -> None:
@@ -64,11 +74,11 @@ def test_process_profile_photo_rejects_invalid_image_bytes() -> None:
     assert exc_info.value.status_code == 422
 
 
-def test_upload_photo_blob_sends_processed_jpeg_to_storage(monkeypatch: pytest.MonkeyPatch) -> None:
-    captured: dict[str, object] = {}
+def test_upload_photo_blob_stores_renditions_under_deterministic_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    uploads: list[dict[str, object]] = []
 
     def _fake_upload_via_supabase_storage_rest(**kwargs) -> None:
-        captured.update(kwargs)
+        uploads.append(kwargs)
 
     monkeypatch.setattr(
         profile_photo_service,
@@ -85,11 +95,103 @@ def test_upload_photo_blob_sends_processed_jpeg_to_storage(monkeypatch: pytest.M
     )
 
     assert object_key.startswith("teachers/user-123/")
-    assert object_key.endswith(".jpg")
-    assert captured["bucket"] == "teacher-profile-photos"
-    assert captured["object_key"] == object_key
-    assert captured["content_type"] == "image/jpeg"
+    assert object_key.endswith("/512.jpg")
+    base_key = object_key.rsplit("/", 1)[0]
+    assert {upload["object_key"] for upload in uploads} == {
+        f"{base_key}/{size}.{ext}" for size in (64, 128, 256, 512) for ext in ("webp", "jpg")
+    }
+    assert all(upload["bucket"] == "teacher-profile-photos" for upload in uploads)
 
-    with _open_image(captured["file_bytes"]) as image:
+    primary = uploads[-1]
+    assert primary["object_key"] == object_key
+    assert primary["content_type"] == "image/jpeg"
+    with _open_image(primary["file_bytes"]) as image:
         assert image.format == "JPEG"
         assert image.size == (512, 512)
+    webp_upload = next(upload for upload in uploads if upload["object_key"] == f"{base_key}/128.webp")
+    assert webp_upload["content_type"] == "image/webp"
+
+
+def test_upload_photo_blob_removes_uploaded_renditions_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    uploaded: list[str] = []
+    deleted: list[str] = []
+    lock = threading.Lock()
+
+    def _fake_upload_via_supabase_storage_rest(**kwargs) -> None:
+        if kwargs["object_key"].endswith("/128.webp"):
+            raise ProfilePhotoUploadError("storage down", status_code=503)
+        with lock:
+            uploaded.append(kwargs["object_key"])
+
+    monkeypatch.setattr(
+        profile_photo_service,
+        "_upload_via_supabase_storage_rest",
+        _fake_upload_via_supabase_storage_rest,
+    )
+    monkeypatch.setattr(
+        profile_photo_service,
+        "_delete_object",
+        lambda *, settings, object_key: deleted.append(object_key),
+    )
+
+    with pytest.raises(ProfilePhotoUploadError) as exc_info:
+        _upload_photo_blob(
+            settings=_settings(),
+            user_id="user-123",
+            file_name="original.png",
+            content_type="image/png",
+            file_bytes=_image_bytes((600, 600)),
+        )
+
+    assert exc_info.value.status_code == 503
+    # The primary rendition is never written when a smaller one failed.
+    assert len(uploaded) == 6
+    assert not any(key.endswith("/512.jpg") for key in uploaded)
+    assert sorted(deleted) == sorted(uploaded)
+
+
+def test_upload_photo_blob_uploads_secondary_renditions_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def _slow_upload_via_supabase_storage_rest(**kwargs) -> None:
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    monkeypatch.setattr(
+        profile_photo_service,
+        "_upload_via_supabase_storage_rest",
+        _slow_upload_via_supabase_storage_rest,
+    )
+
+    _upload_photo_blob(
+        settings=_settings(profile_photo_upload_concurrency=4),
+        user_id="user-123",
+        file_name="original.png",
+        content_type="image/png",
+        file_bytes=_image_bytes((600, 600)),
+    )
+
+    assert max_active == 4
+
+
+def test_delete_profile_photo_blob_removes_every_rendition(monkeypatch: pytest.MonkeyPatch) -> None:
+    deleted: list[str] = []
+    monkeypatch.setattr(
+        profile_photo_service,
+        "_delete_object",
+        lambda *, settings, object_key: deleted.append(object_key),
+    )
+
+    delete_teacher_profile_photo_blob(settings=_settings(), object_key="teachers/u/abc/512.jpg")
+    delete_teacher_profile_photo_blob(settings=_settings(), object_key="teachers/u/legacy.jpg")
+
+    assert len(deleted) == 9
+    assert "teachers/u/abc/64.webp" in deleted
+    assert deleted[-1] == "teachers/u/legacy.jpg"
@@ -0,0 +1,267 @@
+from datetime import datetime, time, timedelta, timezone
+from uuid import UUID
+
+import pytest
+
+from app.core.query_inspector import record_statement
+from app.core.security import AuthUser
+from app.services.booking_v2_service import list_parent_bookings_v2
+from app.services.chat_service import list_threads
+from app.services.explore_v2_service import get_explore_teacher_detail, list_explore_teachers
+
+PAGE_SIZE = 10
+PARENT_ID = UUID(int=1)
+CHILD_ID = UUID(int=2)
+NOW = datetime(2026, 5, 26, 10, 0, tzinfo=timezone.utc)
+
+
+class _Result:
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def mappings(self) -> "_Result":
+        return self
+
+    def all(self) -> list:
+        return list(self._rows)
+
+    def first(self) -> dict | None:
+        return self._rows[0] if self._rows else None
+
+    def scalar(self) -> object:
+        return next(iter(self._rows[0].values())) if self._rows else None
+
+    scalar_one = scalar
+
+
+class _ScriptedSession:
+    """Answers each statement with the rows of the first route whose SQL fragment it contains.
+
+    Every statement goes through ``record_statement``, so ``assert_max_queries`` counts it as the engine
+    hook would.
+    """
+
+    def __init__(self, routes: list[tuple[str, list[dict]]]) -> None:
+        self.routes = routes
+
+    def execute(self, statement, params=None) -> _Result:
+        sql = str(statement)
+        record_statement(sql, params)
+        for fragment, rows in self.routes:
+            if fragment in sql:
+                return _Result(rows)
+        raise AssertionError(f"Unexpected statement: {sql}")
+
+
+def _teacher_id(index: int) -> UUID:
+    return UUID(int=1000 + index)
+
+
+def _teacher_row(index: int) -> dict:
+    return {
+        "teacher_id": _teacher_id(index),
+        "display_name": f"Professora {index}",
+        "profile_photo_file_name": None,
+        "biography": "Bio",
+        "modality": "online",
+        "hourly_rate_cents": 10000,
+        "lesson_duration_minutes": 60,
+        "hide_experience": False,
+        "city": "Sao Paulo",
+        "state": "SP",
+        "country": "BR",
+        "distance_km": None,
+        "skills": ["leitura"],
+        "rating_average": 4.5,
+        "review_count": 2,
+        "latest_review_id": None,
+        "latest_review_rating": None,
+        "latest_review_comment": None,
+        "latest_review_submitted_at": None,
+    }
+
+
+def _explore_routes(teacher_count: int) -> list[tuple[str, list[dict]]]:
+    return [
+        ("from teachers t", [_teacher_row(index) for index in range(teacher_count)]),
+        (
+            "from teacher_availability",
+            [
+                {"teacher_id": _teacher_id(index), "day_of_week": day, "start_time": time(9), "end_time": time(12)}
+                for index in range(teacher_count)
+                for day in range(7)
+            ],
+        ),
+        ("from bookings", []),
+        (
+            "from package_plans",
+            [
+                {
+                    "teacher_id": _teacher_id(index),
+                    "id": UUID(int=2000 + index),
+                    "code": "PACK4",
+                    "name": "Pacote 4 aulas",
+                    "description": None,
+                    "sessions_count": 4,
+                    "discount_percent": 10,
+                    "is_active": True,
+                }
+                for index in range(teacher_count)
+            ],
+        ),
+        ("from teacher_academic_records", []),
+        ("from teacher_experiences", []),
+        ("from booking_reviews br", []),
+    ]
+
+
+def _booking_row(index: int) -> dict:
+    return {
+        "id": UUID(int=3000 + index),
+        "parent_id": PARENT_ID,
+        "child_id": CHILD_ID,
+        "teacher_id": _teacher_id(index),
+        "package_id": None,
+        "starts_at": NOW + timedelta(days=index + 1),
+        "duration_minutes": 60,
+        "modality": "online",
+        "status": "concluida",
+        "teacher_decision_status": "accepted",
+        "teacher_decision_reason": None,
+        "teacher_decision_at": NOW,
+        "payment_flow_status": "paid",
+        "cancellation_reason": None,
+        "confirmed_at": NOW,
+        "completed_at": None,
+        "canceled_at": None,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "child_name": "Bia",
+        "teacher_name": f"Professora {index}",
+        "teacher_profile_photo_file_name": None,
+        "parent_name": "Responsavel",
+    }
+
+
+def _payment_order_row(index: int) -> dict:
+    return {
+        "id": UUID(int=4000 + index),
+        "parent_id": PARENT_ID,
+        "booking_id": UUID(int=3000 + index),
+        "package_id": None,
+        "provider": "pagarme",
+        "provider_order_id": f"or_{index}",
+        "provider_order_code": None,
+        "requested_payment_method": "pix",
+        "amount_cents": 10000,
+        "currency": "BRL",
+        "status": "paid",
+        "authorized_at": None,
+        "paid_at": NOW,
+        "expires_at": None,
+        "created_at": NOW,
+        "updated_at": NOW,
+    }
+
+
+def _booking_routes(booking_count: int) -> list[tuple[str, list[dict]]]:
+    return [
+        ("select role from users", [{"role": "parent"}]),
+        ("select id from parents", [{"id": PARENT_ID}]),
+        ("from bookings b", [_booking_row(index) for index in range(booking_count)]),
+        ("from booking_reviews", [{"booking_id": UUID(int=3000)}]),
+        ("from payment_orders", [_payment_order_row(index) for index in range(booking_count)]),
+        (
+            "from payment_charges",
+            [
+                {"id": UUID(int=5000 + index), "payment_order_id": UUID(int=4000 + index), "status": "paid"}
+                for index in range(booking_count)
+            ],
+        ),
+        (
+            "from booking_follow_ups",
+            [
+                {
+                    "booking_id": UUID(int=3000 + index),
+                    "updated_at": NOW,
+                    "summary": "Boa aula",
+                    "next_steps": None,
+                    "objectives": None,
+                    "next_objectives": None,
+                    "tags": [],
+                    "attention_points": [],
+                }
+                for index in range(booking_count)
+            ],
+        ),
+    ]
+
+
+@pytest.mark.parametrize("teacher_count", [1, PAGE_SIZE])
+def test_explore_list_query_count_does_not_grow_with_the_page(assert_max_queries, teacher_count: int) -> None:
+    db = _ScriptedSession(_explore_routes(teacher_count))
+
+    with assert_max_queries(4):
+        result = list_explore_teachers(db, limit=PAGE_SIZE)
+
+    assert len(result["teachers"]) == teacher_count
+    assert all(teacher["package_summary"]["has_packages"] for teacher in result["teachers"])
+    assert all(teacher["availability_summary"]["preview_slots"] for teacher in result["teachers"])
+
+
+def test_explore_detail_query_budget(assert_max_queries) -> None:
+    db = _ScriptedSession(_explore_routes(1))
+
+    with assert_max_queries(7):
+        detail = get_explore_teacher_detail(db, _teacher_id(0))
+
+    assert [plan["code"] for plan in detail["package_plans"]] == ["PACK4"]
+    assert detail["availability_summary"]["preview_slots"]
+
+
+@pytest.mark.parametrize("booking_count", [1, PAGE_SIZE])
+def test_parent_bookings_list_query_count_does_not_grow_with_the_page(assert_max_queries, booking_count: int) -> None:
+    db = _ScriptedSession(_booking_routes(booking_count))
+
+    with assert_max_queries(7):
+        result = list_parent_bookings_v2(db, AuthUser(user_id=str(UUID(int=9))), tab="past", limit=PAGE_SIZE)
+
+    bookings = result["bookings"]
+    assert len(bookings) == booking_count
+    assert [booking["payment_order"]["provider_order_id"] for booking in bookings] == [
+        f"or_{index}" for index in range(booking_count)
+    ]
+    assert all(len(booking["payment_order"]["charges"]) == 1 for booking in bookings)
+    assert all(booking["latest_follow_up"]["summary"] == "Boa aula" for booking in bookings)
+    # Only the first booking has a review already.
+    assert [booking["actions"]["can_review"] for booking in bookings] == [False] + [True] * (booking_count - 1)
+
+
+def test_chat_threads_query_budget(assert_max_queries) -> None:
+    threads = [
+        {
+            "id": UUID(int=6000 + index),
+            "booking_id": UUID(int=3000 + index),
+            "parent_id": PARENT_ID,
+            "teacher_id": _teacher_id(index),
+            "child_id": CHILD_ID,
+            "status": "active",
+            "booking_status": "confirmada",
+            "has_active_booking": True,
+            "created_at": NOW,
+            "updated_at": NOW,
+            "last_message_at": NOW,
+        }
+        for index in range(PAGE_SIZE)
+    ]
+    db = _ScriptedSession(
+        [
+            ("left join parents p on p.user_id = u.id", [{"parent_id": PARENT_ID, "teacher_id": None}]),
+            ("dedup_threads", threads),
+        ]
+    )
+
+    with assert_max_queries(2):
+        result = list_threads(db, AuthUser(user_id=str(UUID(int=9))), limit=PAGE_SIZE)
+
+    assert len(result["threads"]) == PAGE_SIZE
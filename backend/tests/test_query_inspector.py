@@ -0,0 +1,98 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import get_settings
+from app.core.query_inspector import (
+    QueryLog,
+    RecordedStatement,
+    _explain,
+    capture_queries,
+    install_query_inspection,
+    report_request_queries,
+)
+
+
+def _engine():
+    return install_query_inspection(create_engine("sqlite://"))
+
+
+def test_capture_queries_records_normalized_statements() -> None:
+    engine = _engine()
+
+    with capture_queries() as log:
+        with engine.connect() as conn:
+            conn.execute(text("select   1\n  as value"))
+
+    assert log.count == 1
+    assert log.statements[0].statement == "select 1 as value"
+
+
+def test_assert_max_queries_fails_when_budget_is_exceeded(assert_max_queries) -> None:
+    engine = _engine()
+
+    with assert_max_queries(2):
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+
+    with pytest.raises(AssertionError, match="Expected at most 1 SQL statements"):
+        with assert_max_queries(1):
+            with engine.connect() as conn:
+                for value in range(3):
+                    conn.execute(text("select :value"), {"value": value})
+
+
+def test_report_flags_repeated_statements_with_different_parameters(caplog: pytest.LogCaptureFixture) -> None:
+    log = QueryLog(
+        statements=[
+            RecordedStatement(statement="select * from packages where id = ?", parameters=(index,), duration_ms=1.0)
+            for index in range(6)
+        ]
+        + [RecordedStatement(statement="select 1", parameters=(), duration_ms=1.0)]
+    )
+
+    with caplog.at_level(logging.WARNING, logger="kidario.sql"):
+        report_request_queries(log, get_settings(), method="GET", path="/api/v2/x", request_id="req-1")
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "executions=6" in message
+    assert "distinct_parameters=6" in message
+    assert "select * from packages where id = ?" in message
+
+
+class _FailingExplainCursor:
+    def __init__(self, executed: list[str]) -> None:
+        self.executed = executed
+
+    def execute(self, statement, parameters=None) -> None:
+        self.executed.append(statement)
+        if statement.startswith("EXPLAIN"):
+            raise RuntimeError("syntax error")
+
+    def close(self) -> None:
+        pass
+
+
+def test_failing_explain_is_rolled_back_to_its_savepoint() -> None:
+    executed: list[str] = []
+    conn = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        connection=SimpleNamespace(
+            dbapi_connection=SimpleNamespace(cursor=lambda: _FailingExplainCursor(executed)),
+        ),
+    )
+
+    plan = _explain(conn, "select * from bookings where id = %(id)s", {"id": 1})
+
+    assert plan == "EXPLAIN failed: syntax error"
+    # The request's transaction stays usable: only the savepoint is rolled back.
+    assert executed == [
+        "SAVEPOINT kidario_explain",
+        "EXPLAIN select * from bookings where id = %(id)s",
+        "ROLLBACK TO SAVEPOINT kidario_explain",
+        "RELEASE SAVEPOINT kidario_explain",
+    ]
@@ -0,0 +1,109 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import warmup
+from app.core.config import get_settings
+from app.core.metrics import render_metrics
+from app.core.ssl_utils import shared_ssl_context
+from benchmarks.import_time import measure_import, parse_importtime
+
+
+class _FakeConnection:
+    def __init__(self, engine: "_FakeEngine") -> None:
+        self.engine = engine
+
+    def exec_driver_sql(self, statement: str) -> None:
+        self.engine.statements.append(statement)
+
+    def close(self) -> None:
+        self.engine.open -= 1
+
+
+class _FakeEngine:
+    def __init__(self) -> None:
+        self.open = 0
+        self.max_open = 0
+        self.statements: list[str] = []
+
+    def connect(self) -> _FakeConnection:
+        self.open += 1
+        self.max_open = max(self.max_open, self.open)
+        return _FakeConnection(self)
+
+
+def test_app_import_defers_heavy_dependencies() -> None:
+    run = measure_import("app.main")
+
+    assert run.deferred_loaded == []
+    assert run.module_ms > 0
+
+
+def test_parse_importtime_keeps_first_import_of_each_module() -> None:
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   app.core.config",
+            "import time:      2500 |       4100 | app.main",
+            "import time:        10 |         10 | app.main",
+        ]
+    )
+
+    assert parse_importtime(output) == {"app.core.config": 0.12, "app.main": 4.1}
+
+
+def test_warm_up_opens_pool_connections_and_prefetches_jwks(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _FakeEngine()
+    verifier = SimpleNamespace(prefetched=0)
+
+    def _prefetch() -> int:
+        verifier.prefetched += 1
+        return 1
+
+    verifier.prefetch_jwks = _prefetch
+    monkeypatch.setattr("app.db.session.get_engine", lambda: engine)
+    monkeypatch.setattr("app.core.security.get_jwt_verifier", lambda: verifier)
+    settings = get_settings().model_copy(update={"warmup_database_connections": 3})
+
+    results = warmup.warm_up(settings)
+
+    assert results == {"database": True, "ssl": True, "jwks": True}
+    assert engine.max_open == 3
+    assert engine.open == 0
+    assert engine.statements == ["select 1"] * 3
+    assert verifier.prefetched == 1
+    assert shared_ssl_context.cache_info().currsize >= 1
+
+
+def test_warm_up_failures_are_logged_not_raised(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _unreachable():
+        raise OSError("database unreachable")
+
+    monkeypatch.setattr("app.db.session.get_engine", _unreachable)
+    monkeypatch.setattr(
+        "app.core.security.get_jwt_verifier",
+        lambda: SimpleNamespace(prefetch_jwks=lambda: 1),
+    )
+
+    results = warmup.warm_up(get_settings())
+
+    assert results == {"database": False, "ssl": True, "jwks": True}
+    assert 'kidario_warmup_failures_total{step="database"}' in render_metrics()
+
+
+def test_lifespan_starts_warm_up_only_when_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.main import app
+
+    warmed = threading.Event()
+    monkeypatch.setattr(warmup, "warm_up", lambda settings=None: warmed.set())
+
+    with TestClient(app):
+        pass
+    assert not warmed.wait(0.1)
+
+    settings = get_settings().model_copy(update={"warmup_enabled": True})
+    monkeypatch.setattr(warmup, "get_settings", lambda: settings)
+    with TestClient(app):
+        assert warmed.wait(5)
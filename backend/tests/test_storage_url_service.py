@@ -54,3 +54,27 @@ def test_resolve_teacher_profile_photo_url_keeps_external_url() -> None:
     url = "https://cdn.third-party.example/photo.jpg"
 
     assert resolve_teacher_profile_photo_url(_settings(), url) == url
+
+
+def test_resolve_teacher_profile_photo_url_picks_smallest_adequate_rendition(monkeypatch) -> None:
+    monkeypatch.setattr(storage_url_service, "_create_s3_presigned_url", lambda settings, object_key: None)
+    monkeypatch.setattr(
+        storage_url_service,
+        "_create_supabase_signed_url",
+        lambda settings, object_key: f"https://cdn.example/{object_key}",
+    )
+    stored_key = "teachers/user/abc123/512.jpg"
+
+    # JPEG by default: every client decodes it. WebP is opt-in for callers that know the client accepts it.
+    assert resolve_teacher_profile_photo_url(_settings(), stored_key, size=100) == (
+        "https://cdn.example/teachers/user/abc123/128.jpg"
+    )
+    assert resolve_teacher_profile_photo_url(_settings(), stored_key, size=64, image_format="webp") == (
+        "https://cdn.example/teachers/user/abc123/64.webp"
+    )
+    assert resolve_teacher_profile_photo_url(_settings(), stored_key, size=2048) == (
+        "https://cdn.example/teachers/user/abc123/512.jpg"
+    )
+    assert resolve_teacher_profile_photo_url(_settings(), "teachers/user/legacy.jpg", size=64) == (
+        "https://cdn.example/teachers/user/legacy.jpg"
+    )
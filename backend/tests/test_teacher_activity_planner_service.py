@@ -1,11 +1,14 @@
 from types import SimpleNamespace
 
+import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.services import teacher_activity_planner_service as planner
 from app.services.teacher_activity_planner_service import (
+    ActivityPlanGenerationError,
     TeacherActivityPlanInput,
     get_or_create_teacher_activity_plan_for_booking,
+    run_activity_plan_job,
 )
 
 
@@ -95,3 +98,89 @@ def test_activity_plan_persist_failure_uses_savepoint_and_keeps_generated_plan(m
     assert plan["activities"]
     assert db.begin_nested_calls == 2
     assert db.exits == [None, SQLAlchemyError]
+
+
+def _llm_settings():
+    return SimpleNamespace(
+        teacher_activity_llm_enabled=True,
+        teacher_activity_llm_api_key="sk-test",
+    )
+
+
+def test_activity_plan_returns_fallback_and_queues_llm_job(monkeypatch) -> None:
+    db = _DummySession()
+    persisted: list[dict] = []
+    queued: list[tuple] = []
+
+    monkeypatch.setattr(planner, "_load_cached_plan_row", lambda _db, _booking_id: None)
+    monkeypatch.setattr(planner, "_persist_booking_activity_plan", lambda **kwargs: persisted.append(kwargs))
+    monkeypatch.setattr(planner, "_generate_with_openai", lambda *_args: pytest.fail("LLM called on request path"))
+    monkeypatch.setattr(
+        planner,
+        "enqueue_activity_plan_generation",
+        lambda booking_id, planner_input, context_hash: queued.append((booking_id, context_hash)),
+    )
+
+    plan = get_or_create_teacher_activity_plan_for_booking(
+        db=db,
+        booking_id="booking-id",
+        teacher_id="teacher-id",
+        child_id="child-id",
+        planner_input=_planner_input(),
+        settings=_llm_settings(),
+    )
+
+    assert plan["source"] == "fallback"
+    assert persisted[0]["source"] == "fallback"
+    assert queued == [("booking-id", persisted[0]["context_hash"])]
+
+
+class _JobSession:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+
+    def rollback(self) -> None:
+        self.calls.append("rollback")
+
+    def commit(self) -> None:
+        self.calls.append("commit")
+
+    def close(self) -> None:
+        self.calls.append("close")
+
+
+def _patch_job_session(monkeypatch, cached_row: dict | None) -> _JobSession:
+    session = _JobSession()
+    monkeypatch.setattr(planner, "get_settings", _llm_settings)
+    monkeypatch.setattr(planner, "get_session_maker", lambda: lambda: session)
+    monkeypatch.setattr(planner, "_load_cached_plan_row", lambda _db, _booking_id: cached_row)
+    return session
+
+
+def test_activity_plan_job_replaces_fallback_for_same_context(monkeypatch) -> None:
+    session = _patch_job_session(monkeypatch, {"source": "fallback", "context_hash": "hash-1", "activities": []})
+    monkeypatch.setattr(planner, "_generate_with_openai", lambda _settings, _input: ["Leitura compartilhada"])
+
+    run_activity_plan_job("booking-id", _planner_input(), "hash-1")
+
+    sql, params = session.statements[-1]
+    assert "update booking_activity_plans" in sql
+    assert params["context_hash"] == "hash-1"
+    assert session.calls == ["rollback", "commit", "close"]
+
+
+def test_activity_plan_job_skips_stale_context_and_raises_for_retry(monkeypatch) -> None:
+    session = _patch_job_session(monkeypatch, {"source": "fallback", "context_hash": "hash-2", "activities": []})
+    monkeypatch.setattr(planner, "_generate_with_openai", lambda *_args: pytest.fail("stale job called the LLM"))
+
+    run_activity_plan_job("booking-id", _planner_input(), "hash-1")
+    assert session.statements == []
+
+    _patch_job_session(monkeypatch, {"source": "fallback", "context_hash": "hash-1", "activities": []})
+    monkeypatch.setattr(planner, "_generate_with_openai", lambda _settings, _input: [])
+    with pytest.raises(ActivityPlanGenerationError):
+        run_activity_plan_job("booking-id", _planner_input(), "hash-1")
@@ -17,6 +17,7 @@ from app.api.v2.endpoints import teacher_control as teacher_control_endpoints
 from app.core.security import AuthUser
 from app.db.session import get_db
 from app.main import app
+from app.services import teacher_control_service
 from app.services.teacher_control_service import _can_teacher_accept_booking, _count_availability_slots
 
 
@@ -181,6 +182,79 @@ def test_can_teacher_accept_booking_blocks_failed_payment_flow() -> None:
     )
 
 
+def _empty_overview_payload() -> dict:
+    return {
+        "generated_at": "2026-02-25T10:00:00Z",
+        "upcoming_lessons_count": 2,
+        "pending_decisions_count": 0,
+        "agenda": [],
+        "chat_threads": [],
+        "students": [],
+        "finance": {
+            "currency": "BRL",
+            "gross_revenue_total_cents": 0,
+            "paid_total_cents": 0,
+            "pending_payment_total_cents": 0,
+            "completed_lessons_count": 0,
+            "paid_lessons_count": 0,
+        },
+        "planning": {
+            "window_start": "2026-02-25",
+            "window_end": "2026-03-11",
+            "available_slots_count": 0,
+            "upcoming_lessons_count": 2,
+            "occupancy_rate_percent": 0.0,
+        },
+    }
+
+
+def test_control_center_overview_serves_matching_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    teacher_id = UUID("dddddddd-dddd-dddd-dddd-dddddddddddd")
+    user = AuthUser(user_id="3472def4-1d03-4350-b2c2-20c7fa27d430", email="t@kidario.test", role="authenticated")
+    monkeypatch.setattr(teacher_control_service, "_require_teacher", lambda db, user: teacher_id)
+    monkeypatch.setattr(
+        teacher_control_service,
+        "_load_overview_snapshot",
+        lambda db, tid, params_key, ttl: (4, _empty_overview_payload()),
+    )
+
+    def _fail_build(*args, **kwargs):
+        raise AssertionError("snapshot hit must not rebuild the overview")
+
+    monkeypatch.setattr(teacher_control_service, "_build_teacher_control_center_overview", _fail_build)
+
+    overview = teacher_control_service.get_teacher_control_center_overview(_DummySession(), user)
+
+    assert overview["upcoming_lessons_count"] == 2
+
+
+def test_control_center_overview_rebuilds_and_stores_snapshot_on_miss(monkeypatch: pytest.MonkeyPatch) -> None:
+    teacher_id = UUID("dddddddd-dddd-dddd-dddd-dddddddddddd")
+    user = AuthUser(user_id="3472def4-1d03-4350-b2c2-20c7fa27d430", email="t@kidario.test", role="authenticated")
+    stored = []
+    monkeypatch.setattr(teacher_control_service, "_require_teacher", lambda db, user: teacher_id)
+    monkeypatch.setattr(teacher_control_service, "_load_overview_snapshot", lambda db, tid, params_key, ttl: (7, None))
+    monkeypatch.setattr(
+        teacher_control_service,
+        "_build_teacher_control_center_overview",
+        lambda db, tid, **kwargs: _empty_overview_payload(),
+    )
+    monkeypatch.setattr(
+        teacher_control_service,
+        "_store_overview_snapshot",
+        lambda db, tid, params_key, version, payload: stored.append((params_key, version, payload)),
+    )
+
+    overview = teacher_control_service.get_teacher_control_center_overview(_DummySession(), user, limit_agenda=5)
+
+    assert overview["upcoming_lessons_count"] == 2
+    assert len(stored) == 1
+    params_key, version, payload = stored[0]
+    assert params_key == "agenda=5:chats=8:students=8:history=0"
+    assert version == 7
+    assert payload["planning"]["window_start"] == "2026-02-25"
+
+
 def test_get_teacher_student_timeline_returns_ok(
     client: TestClient,
     monkeypatch: pytest.MonkeyPatch,
@@ -1,5 +1,6 @@
 import os
 from contextlib import AbstractContextManager
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 from uuid import UUID
 
@@ -19,7 +20,7 @@ from app.core.security import AuthUser
 from app.db.session import get_db
 from app.main import app
 from app.schemas.v2_payments import TeacherPayoutProfileUpsertRequest
-from app.services import payment_v2_service
+from app.services import booking_v2_service, payment_v2_service
 
 
 NOW = "2026-05-26T10:00:00Z"
@@ -331,7 +332,7 @@ def test_get_v2_booking_payment_returns_order_with_charges(
 
 
 def test_get_v2_parent_payments(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(payments_endpoints, "list_parent_payments_v2", lambda db, user, limit, offset: {"payments": [_payment_order()]})
+    monkeypatch.setattr(payments_endpoints, "list_parent_payments_v2", lambda db, user, limit, offset, cursor: {"payments": [_payment_order()]})
 
     response = client.get("/api/v2/parents/me/payments")
 
@@ -339,6 +340,73 @@ def test_get_v2_parent_payments(client: TestClient, monkeypatch: pytest.MonkeyPa
     assert response.json()["payments"][0]["provider"] == "legacy"
 
 
+class _PaymentHistorySession:
+    def __init__(self, orders: list[dict]) -> None:
+        self.orders = orders
+        self.statements: list[tuple[str, dict]] = []
+        self._rows: list[dict] = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params or {}))
+        if "from payment_orders po" in sql:
+            self._rows = self.orders[: params["limit"]]
+        elif "from payment_charges" in sql:
+            self._rows = [
+                {**_payment_order()["charges"][0], "id": order["id"], "payment_order_id": order["id"]}
+                for order in self.orders
+                if str(order["id"]) in params["payment_order_ids"]
+            ]
+        else:
+            self._rows = []
+        return self
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+def test_list_parent_payments_batches_charges_and_pages_by_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    orders = [
+        {
+            **{key: value for key, value in _payment_order().items() if key != "charges"},
+            "id": UUID(f"55555555-5555-5555-5555-{index:012d}"),
+            "created_at": datetime(2026, 5, 26, 10, 0, tzinfo=timezone.utc) - timedelta(minutes=index),
+        }
+        for index in range(30)
+    ]
+    monkeypatch.setattr(booking_v2_service, "_require_parent", lambda db, user: UUID("11111111-1111-1111-1111-111111111111"))
+    user = AuthUser(user_id="3472def4-1d03-4350-b2c2-20c7fa27d430", email="hello@kidario.com", role="authenticated")
+
+    db = _PaymentHistorySession(orders)
+    first_page = booking_v2_service.list_parent_payments_v2(db, user, limit=20)
+
+    assert len(db.statements) == 2
+    assert len(first_page["payments"]) == 20
+    assert all(len(payment["charges"]) == 1 for payment in first_page["payments"])
+    assert first_page["next_cursor"]
+
+    db = _PaymentHistorySession(orders[20:])
+    second_page = booking_v2_service.list_parent_payments_v2(db, user, limit=20, cursor=first_page["next_cursor"])
+
+    sql, params = db.statements[0]
+    assert "(po.created_at, po.id) < (:cursor_created_at, cast(:cursor_id as uuid))" in sql
+    assert params["cursor_created_at"] == orders[19]["created_at"]
+    assert params["cursor_id"] == str(orders[19]["id"])
+    assert len(second_page["payments"]) == 10
+    assert second_page["next_cursor"] is None
+
+
+def test_list_parent_payments_rejects_malformed_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(booking_v2_service, "_require_parent", lambda db, user: UUID("11111111-1111-1111-1111-111111111111"))
+    user = AuthUser(user_id="3472def4-1d03-4350-b2c2-20c7fa27d430", email="hello@kidario.com", role="authenticated")
+
+    with pytest.raises(booking_v2_service.BookingValidationError):
+        booking_v2_service.list_parent_payments_v2(_PaymentHistorySession([]), user, cursor="not-a-cursor")
+
+
 def test_pagarme_webhook_returns_503_when_basic_auth_is_not_configured(
     client: TestClient,
     monkeypatch: pytest.MonkeyPatch,
@@ -11,8 +11,10 @@ os.environ.setdefault(
 )
 
 from app.api.v2.endpoints import explore as explore_endpoints
-from app.db.session import get_db
+from app.core.response_cache import get_response_cache, invalidate_teacher_public_cache
+from app.db.session import ThreadedReadSession, get_async_db, get_db
 from app.main import app
+from app.services.explore_v2_service import list_explore_teachers
 
 
 NOW = "2026-05-26T10:00:00Z"
@@ -22,12 +24,26 @@ class _DummySession:
     pass
 
 
+def _stub_list(monkeypatch: pytest.MonkeyPatch, fake_load) -> None:
+    # The fake load returns the finished payload, so the build step only passes it through.
+    monkeypatch.setattr(explore_endpoints, "load_explore_teachers", fake_load)
+    monkeypatch.setattr(explore_endpoints, "build_explore_teachers", lambda page: page)
+
+
+def _stub_detail(monkeypatch: pytest.MonkeyPatch, fake_load) -> None:
+    monkeypatch.setattr(explore_endpoints, "load_explore_teacher_detail", fake_load)
+    monkeypatch.setattr(explore_endpoints, "build_explore_teacher_detail", lambda loaded: loaded)
+
+
 @pytest.fixture
 def client() -> TestClient:
+    get_response_cache().clear()
     app.dependency_overrides[get_db] = lambda: _DummySession()
+    app.dependency_overrides[get_async_db] = lambda: ThreadedReadSession(_DummySession())
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    get_response_cache().clear()
 
 
 def _teacher_search_result() -> dict:
@@ -76,7 +92,8 @@ def test_get_v2_explore_teachers_accepts_discovery_filters(
     client: TestClient,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    def _fake_list_explore_teachers(db, **kwargs):
+    def _fake_load_explore_teachers(db, **kwargs):
+        assert isinstance(db, _DummySession)
         assert kwargs["query"] == "matematica"
         assert kwargs["modality"] == "online"
         assert kwargs["min_rating"] == 4
@@ -84,7 +101,7 @@ def test_get_v2_explore_teachers_accepts_discovery_filters(
         assert kwargs["sort"] == "soonest_available"
         return {"teachers": [_teacher_search_result()]}
 
-    monkeypatch.setattr(explore_endpoints, "list_explore_teachers", _fake_list_explore_teachers)
+    _stub_list(monkeypatch, _fake_load_explore_teachers)
 
     response = client.get(
         "/api/v2/explore/teachers"
@@ -103,7 +120,7 @@ def test_get_v2_explore_teacher_detail_is_self_contained(
     client: TestClient,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    def _fake_get_explore_teacher_detail(db, teacher_id, **kwargs):
+    def _fake_load_explore_teacher_detail(db, teacher_id, **kwargs):
         result = _teacher_search_result()
         return {
             "teacher_id": teacher_id,
@@ -137,7 +154,7 @@ def test_get_v2_explore_teacher_detail_is_self_contained(
             "latest_reviews": [result["latest_review"]],
         }
 
-    monkeypatch.setattr(explore_endpoints, "get_explore_teacher_detail", _fake_get_explore_teacher_detail)
+    _stub_detail(monkeypatch, _fake_load_explore_teacher_detail)
 
     response = client.get("/api/v2/explore/teachers/11111111-1111-1111-1111-111111111111")
 
@@ -147,3 +164,116 @@ def test_get_v2_explore_teacher_detail_is_self_contained(
     assert body["availability_summary"]["preview_slots"]
     assert body["latest_reviews"][0]["rating"] == 5
     assert body["package_plans"][0]["estimated_final_amount_cents"] == 43200
+
+
+def test_get_v2_explore_teachers_serves_repeat_queries_from_cache(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+
+    def _fake_load_explore_teachers(db, **kwargs):
+        calls.append(kwargs)
+        return {"teachers": [_teacher_search_result()]}
+
+    _stub_list(monkeypatch, _fake_load_explore_teachers)
+
+    first = client.get("/api/v2/explore/teachers?city=Sao%20Paulo&sort=relevance")
+    second = client.get("/api/v2/explore/teachers?sort=relevance&city=%20sao%20paulo%20")
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert len(calls) == 1
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+
+
+def test_get_v2_explore_teacher_detail_returns_304_for_matching_etag(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _fake_load_explore_teacher_detail(db, teacher_id, **kwargs):
+        result = _teacher_search_result()
+        return {
+            **result,
+            "teacher_id": teacher_id,
+            "biography": "Bio completa",
+            "academic_records": [],
+            "experiences": [],
+            "package_plans": [],
+            "latest_reviews": [],
+        }
+
+    _stub_detail(monkeypatch, _fake_load_explore_teacher_detail)
+    url = "/api/v2/explore/teachers/11111111-1111-1111-1111-111111111111"
+
+    first = client.get(url)
+    revalidated = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+
+
+def test_teacher_changes_invalidate_cached_explore_responses(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls = []
+
+    def _fake_load_explore_teachers(db, **kwargs):
+        calls.append(kwargs)
+        return {"teachers": [_teacher_search_result()]}
+
+    _stub_list(monkeypatch, _fake_load_explore_teachers)
+
+    client.get("/api/v2/explore/teachers")
+    invalidate_teacher_public_cache(_DummySession(), "11111111-1111-1111-1111-111111111111")
+    response = client.get("/api/v2/explore/teachers")
+
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(calls) == 2
+
+
+class _CapturingSession:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params or {}))
+        return self
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return []
+
+
+def test_list_explore_teachers_filters_and_orders_by_distance_in_sql() -> None:
+    db = _CapturingSession()
+
+    list_explore_teachers(db, sort="nearby", near_lat=-23.55, near_lng=-46.63, radius_km=5, limit=10, offset=20)
+
+    sql, params = db.statements[0]
+    assert "earth_box(ll_to_earth(:near_lat, :near_lng), :radius_m)" in sql
+    assert "order by ll_to_earth(a.latitude::float8, a.longitude::float8) <-> ll_to_earth(:near_lat, :near_lng)" in sql
+    assert params["radius_m"] == 5000
+    assert (params["limit"], params["offset"]) == (10, 20)
+
+
+def test_nearby_sort_without_radius_orders_by_the_spatial_index() -> None:
+    db = _CapturingSession()
+
+    list_explore_teachers(db, sort="nearby", near_lat=-23.55, near_lng=-46.63)
+
+    sql, params = db.statements[0]
+    # No radius: the GiST index on ll_to_earth still serves the order through its partial predicate.
+    assert "earth_box" not in sql
+    assert "a.latitude is not null and a.longitude is not null" in sql
+    assert "<-> ll_to_earth(:near_lat, :near_lng)" in sql
+    assert "radius_m" not in params
@@ -14,7 +14,7 @@ os.environ.setdefault(
 from app.api.deps import get_current_admin, get_current_user
 from app.api.v2.endpoints import notifications as notifications_endpoints
 from app.core.security import AuthUser
-from app.db.session import get_db
+from app.db.session import ThreadedReadSession, get_async_db, get_db
 from app.main import app
 
 
@@ -49,6 +49,7 @@ def client() -> TestClient:
     app.dependency_overrides[get_current_user] = lambda: auth_user
     app.dependency_overrides[get_current_admin] = lambda: admin_user
     app.dependency_overrides[get_db] = lambda: _DummySession()
+    app.dependency_overrides[get_async_db] = lambda: ThreadedReadSession(_DummySession())
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
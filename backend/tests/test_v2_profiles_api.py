@@ -13,9 +13,13 @@ os.environ.setdefault(
 
 from app.api.deps import get_current_user
 from app.api.v2.endpoints import profiles as profiles_v2_endpoints
+from app.core.config import get_settings
 from app.core.security import AuthUser
 from app.db.session import get_db
 from app.main import app
+from app.schemas.v2_profiles import TeacherProfile, TeacherProfileUpdateRequest
+from app.services.profile_photo_service import ProfilePhotoUploadError
+from app.services.profile_v2_service import update_teacher_profile_v2
 
 
 NOW = "2026-05-26T10:00:00Z"
@@ -220,3 +224,146 @@ def test_v2_children_crud_routes(client: TestClient, monkeypatch: pytest.MonkeyP
     assert delete_response.status_code == 200
     assert list_response.json()["children"][0]["name"] == "Lucas"
     assert delete_response.json()["child_id"] == "33333333-3333-3333-3333-333333333333"
+
+
+def test_v2_teacher_photo_upload_returns_429_when_image_pool_is_saturated(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _fake_upload_teacher_profile_photo(db, settings, user, file_name, content_type, file_bytes):
+        raise ProfilePhotoUploadError("Muitas fotos sendo processadas no momento.", status_code=429)
+
+    monkeypatch.setattr(profiles_v2_endpoints, "upload_teacher_profile_photo", _fake_upload_teacher_profile_photo)
+
+    response = client.post(
+        "/api/v2/teachers/me/photo",
+        files={"file": ("foto.png", b"fake-image-content", "image/png")},
+    )
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "5"
+
+
+def test_v2_teacher_photo_upload_rejects_oversized_file_before_processing(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "profile_photo_max_upload_bytes", 10)
+
+    def _unexpected_upload(*args, **kwargs):
+        raise AssertionError("oversized uploads must not reach processing")
+
+    monkeypatch.setattr(profiles_v2_endpoints, "upload_teacher_profile_photo", _unexpected_upload)
+
+    response = client.post(
+        "/api/v2/teachers/me/photo",
+        files={"file": ("foto.png", b"x" * 64, "image/png")},
+    )
+
+    assert response.status_code == 413
+
+
+class _TeacherProfileSession:
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.statements: list[tuple[str, dict]] = []
+        self._row: dict | None = None
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params or {}))
+        teacher = {
+            "id": UUID("44444444-4444-4444-4444-444444444444"),
+            "user_id": _user()["id"],
+            "address_id": _address()["id"],
+            "phone": None,
+            "cpf": "12345678900",
+            "professional_number": None,
+            "modality": "online",
+            "biography": None,
+            "hourly_rate_cents": 12000,
+            "lesson_duration_minutes": 60,
+            "profile_photo_file_name": None,
+            "hide_experience": False,
+            "is_active": True,
+            "created_at": NOW,
+            "updated_at": NOW,
+        }
+        if "from users" in sql:
+            self._row = _user(role="teacher")
+        elif "from teachers" in sql or "update teachers" in sql:
+            self._row = teacher
+        elif "from addresses" in sql:
+            self._row = _address()
+        elif "as availability" in sql:
+            self._row = {"skills": [], "academic_records": [], "experiences": [], "availability": []}
+        else:
+            self._row = None
+        return self
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self._row
+
+    def one(self):
+        return self._row
+
+
+def _availability_grid(slots: int) -> dict:
+    return {
+        "upsert": [
+            {"day_of_week": index % 7, "start_time": f"{8 + index // 7:02d}:00", "end_time": f"{9 + index // 7:02d}:00"}
+            for index in range(slots)
+        ],
+        "delete_ids": [f"00000000-0000-0000-0000-{index:012d}" for index in range(slots)],
+    }
+
+
+def test_update_v2_teacher_profile_issues_constant_statements_per_collection() -> None:
+    user = AuthUser(user_id=str(_user()["id"]), email="hello@kidario.com", role="authenticated")
+    counts = []
+    for size in (1, 40):
+        db = _TeacherProfileSession()
+        payload = TeacherProfileUpdateRequest(
+            skills_ops={"add": [f"Skill {index}" for index in range(size)] + ["skill 0"], "remove": ["Antiga"]},
+            availability_ops=_availability_grid(size),
+        )
+        profile = update_teacher_profile_v2(db, user, payload)
+        TeacherProfile.model_validate(profile)
+        counts.append(len(db.statements))
+
+    assert counts[0] == counts[1]
+    availability_sql, availability_params = next(
+        (sql, params) for sql, params in db.statements if "insert into teacher_availability" in sql
+    )
+    assert "on conflict (id) do update" in availability_sql
+    assert len(availability_params["ids"]) == 40
+    assert availability_params["start_times"][0] == "08:00:00"
+    skills_params = next(params for sql, params in db.statements if "insert into teacher_skills" in sql)
+    assert len(skills_params["skills"]) == 40
+
+
+
+def test_update_v2_teacher_profile_keeps_the_last_upsert_for_a_repeated_id() -> None:
+    user = AuthUser(user_id=str(_user()["id"]), email="hello@kidario.com", role="authenticated")
+    slot_id = "55555555-5555-5555-5555-555555555555"
+    db = _TeacherProfileSession()
+    payload = TeacherProfileUpdateRequest(
+        availability_ops={
+            "upsert": [
+                {"id": slot_id, "day_of_week": 0, "start_time": "08:00", "end_time": "09:00"},
+                {"day_of_week": 1, "start_time": "08:00", "end_time": "09:00"},
+                {"id": slot_id, "day_of_week": 2, "start_time": "10:00", "end_time": "11:00"},
+            ],
+        },
+    )
+
+    update_teacher_profile_v2(db, user, payload)
+
+    params = next(params for sql, params in db.statements if "insert into teacher_availability" in sql)
+    # Postgres rejects an insert ... on conflict that touches the same row twice.
+    assert params["ids"].count(slot_id) == 1
+    assert len(params["ids"]) == 2
+    assert (params["days_of_week"][0], params["start_times"][0]) == (2, "10:00:00")